@@ -3,14 +3,23 @@ Trump Tracker Backend Package
 
 This package provides functionality for tracking and analyzing economic promises
 through FRED data integration and AI-powered analysis.
+
+Public names are resolved lazily so that importing a lightweight submodule
+(e.g. ``backend.storage.snapshot`` in a read-only replica) does not pull in
+``anthropic``, ``fredapi`` or pandas.
 """
 
-from backend.services.inflation_tracker import InflationTracker
-from backend.services.data_fetcher import FREDDataFetcher
-from backend.services.data_analyzer import InflationAnalyzer
-from backend.services.config import SERIES_IDS, HISTORICAL_START_DATES
-from backend.database import get_session
-from backend.fred_api import get_fred_client
+import importlib
+
+_LAZY_ATTRIBUTES = {
+    'InflationTracker': 'backend.services.inflation_tracker',
+    'FREDDataFetcher': 'backend.services.data_fetcher',
+    'InflationAnalyzer': 'backend.services.data_analyzer',
+    'SERIES_IDS': 'backend.services.config',
+    'HISTORICAL_START_DATES': 'backend.services.config',
+    'get_session': 'backend.database',
+    'get_fred_client': 'backend.fred_api',
+}
 
 __all__ = [
     'InflationTracker',
@@ -23,3 +32,14 @@ __all__ = [
 ]
 
 __version__ = '1.0.0'
+
+def __getattr__(name):
+    module_name = _LAZY_ATTRIBUTES.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name), name)
+    globals()[name] = value
+    return value
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
@@ -0,0 +1,42 @@
+from flask import jsonify, Blueprint, send_file
+from datetime import datetime
+from typing import Dict, Any, Tuple
+from backend.core.exceptions import handle_errors, ValidationError
+from backend.core.profiling import list_artifacts, artifact_path, ProfilingError
+from backend.middleware.security import require_admin
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Administrative endpoints; every route requires X-Admin-Token
+admin = Blueprint('admin', __name__)
+
+@admin.route('/v1/admin/profiles', methods=['GET'])
+@handle_errors
+@require_admin
+def list_profiles() -> Tuple[Dict[str, Any], int]:
+    """List stored profiling artifacts, newest first."""
+    return jsonify({
+        'status': 'Success',
+        'profiles': list_artifacts(),
+        'timestamp': datetime.now().isoformat()
+    }), 200
+
+@admin.route('/v1/admin/profiles/<name>', methods=['GET'])
+@handle_errors
+@require_admin
+def download_profile(name: str):
+    """Download a profiling artifact."""
+    try:
+        path = artifact_path(name)
+    except ProfilingError as e:
+        raise ValidationError(str(e))
+    except FileNotFoundError:
+        return jsonify({
+            'status': 'Error',
+            'error': 'Not found',
+            'message': f"No profile named {name}",
+            'timestamp': datetime.now().isoformat()
+        }), 404
+    mimetype = 'text/plain' if name.endswith('.folded') else 'application/octet-stream'
+    return send_file(path, mimetype=mimetype, as_attachment=True, download_name=name)
@@ -0,0 +1,67 @@
+"""
+Read-only API routes for autoscaled serving replicas.
+
+Every response comes from the shared metrics snapshot published by ingest.
+This module deliberately imports only Flask and the snapshot layer: the
+FRED and Anthropic clients are never constructed and no API credentials are
+required to start.
+"""
+
+from flask import jsonify, Blueprint, Response
+from datetime import datetime
+from typing import Dict, Any, Tuple
+from backend.core.exceptions import handle_errors, ServiceInitializationError, ReadOnlyError
+from backend.storage.snapshot import Snapshot, get_snapshot_reader
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Same blueprint name as the full API so endpoint names match
+api = Blueprint('api', __name__)
+
+def snapshot_response(snapshot: Snapshot) -> Response:
+    """Build a JSON response from the snapshot bytes, copied once per snapshot."""
+    return Response(
+        get_snapshot_reader().body(snapshot),
+        status=200,
+        mimetype='application/json',
+        headers={'X-Snapshot-Generation': str(snapshot.generation)}
+    )
+
+@api.route('/v1/health', methods=['GET'])
+def health_check() -> Tuple[Dict[str, Any], int]:
+    """Health check endpoint."""
+    snapshot = get_snapshot_reader().read()
+    if snapshot is None:
+        return jsonify({
+            'status': 'unhealthy',
+            'timestamp': datetime.now().isoformat(),
+            'error': 'No metrics snapshot has been published yet'
+        }), 503
+    return jsonify({
+        'status': 'healthy',
+        'timestamp': datetime.now().isoformat(),
+        'version': '1.0.0',
+        'services': {
+            'mode': 'read-only',
+            'snapshot_generation': snapshot.generation,
+            'snapshot_created_at': datetime.fromtimestamp(snapshot.created_at).isoformat()
+        }
+    }), 200
+
+@api.route('/v1/inflation/data', methods=['GET'])
+@handle_errors
+def get_inflation_data() -> Response:
+    """Get current inflation data from the shared snapshot."""
+    snapshot = get_snapshot_reader().read()
+    if snapshot is None:
+        raise ServiceInitializationError('No metrics snapshot has been published yet')
+    return snapshot_response(snapshot)
+
+@api.route('/v1/inflation/initialize', methods=['POST'], endpoint='initialize_data')
+@api.route('/v1/inflation/update', methods=['POST'], endpoint='update_data')
+@api.route('/v1/inflation/backup', methods=['POST'], endpoint='backup_data')
+@handle_errors
+def reject_write() -> Tuple[Dict[str, Any], int]:
+    """Reject write operations on read-only replicas."""
+    raise ReadOnlyError('This instance is read-only; send writes to the ingest service')
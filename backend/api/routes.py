@@ -1,11 +1,13 @@
-from flask import jsonify, Blueprint
+from flask import jsonify, Blueprint, request
 from datetime import datetime
 from typing import Dict, Any, Tuple
 from flask_limiter.util import get_remote_address
 from flask_limiter import Limiter
 from backend.core.exceptions import handle_errors, ServiceInitializationError, ValidationError
-from backend.services.inflation_tracker import InflationTracker
+from backend.storage.snapshot import get_snapshot_reader, publish_snapshot
+from backend.api.readonly import snapshot_response
 import logging
+import threading
 
 logger = logging.getLogger(__name__)
 
@@ -14,19 +16,34 @@ api = Blueprint('api', __name__)
 
 # Initialize FRED API client as a global variable
 fred_client = None
+_fred_client_lock = threading.Lock()
 
 def get_fred_client():
     """Get or initialize FRED client."""
     global fred_client
     if fred_client is None:
-        try:
-            fred_client = InflationTracker()
-            logger.info("FRED client initialized successfully")
-        except Exception as e:
-            logger.error(f"Failed to initialize FRED client: {str(e)}")
-            raise ServiceInitializationError(f"Failed to initialize FRED client: {str(e)}")
+        with _fred_client_lock:
+            if fred_client is None:
+                try:
+                    from backend.services.inflation_tracker import InflationTracker
+                    fred_client = InflationTracker()
+                    logger.info("FRED client initialized successfully")
+                except Exception as e:
+                    logger.error(f"Failed to initialize FRED client: {str(e)}")
+                    raise ServiceInitializationError(f"Failed to initialize FRED client: {str(e)}")
     return fred_client
 
+def reset_fred_client() -> None:
+    """Drop the per-process FRED client so it is rebuilt on next use.
+
+    Called from the WSGI server's post-fork hook: a client created in the
+    master before forking would share HTTP connections and locks with every
+    worker.
+    """
+    global fred_client, _fred_client_lock
+    fred_client = None
+    _fred_client_lock = threading.Lock()
+
 def validate_client() -> None:
     """Validate FRED client is initialized."""
     if get_fred_client() is None:
@@ -79,13 +96,80 @@ def backup_data() -> Tuple[Dict[str, Any], int]:
 @handle_errors
 def get_inflation_data() -> Tuple[Dict[str, Any], int]:
     """Get current inflation data."""
+    # Serve the shared snapshot published by ingest when one exists
+    snapshot = get_snapshot_reader().read()
+    if snapshot is not None:
+        return snapshot_response(snapshot)
+
     client = get_fred_client()
     data = client.get_inflation_data()
+    try:
+        publish_snapshot(data, if_absent=True)
+    except OSError as e:
+        logger.warning(f"Could not publish metrics snapshot: {str(e)}")
     
-    # Log response data for debugging
-    logger.info("API Response Data:")
-    logger.info(f"Metrics: {list(data.get('metrics', {}).keys())}")
-    logger.info(f"Analysis present: {'analysis' in data}")
-    logger.info(f"Timestamp: {data.get('timestamp')}")
+    logger.debug("API response metrics: %s", list(data.get('metrics', {}).keys()))
     
     return jsonify(data), 200
+
+@api.route('/v1/inflation/correlation', methods=['GET'])
+@handle_errors
+def get_correlation() -> Tuple[Dict[str, Any], int]:
+    """Correlation of the registered series on a common monthly or weekly grid."""
+    from backend.services.analytics import AGGREGATIONS, FREQUENCIES, correlation_table, get_frame
+
+    frequency = request.args.get('frequency', 'monthly')
+    how = request.args.get('how', 'mean')
+    on = request.args.get('on', 'changes')
+    if frequency not in FREQUENCIES:
+        raise ValidationError(f"frequency must be one of {', '.join(FREQUENCIES)}")
+    if how not in AGGREGATIONS:
+        raise ValidationError(f"how must be one of {', '.join(AGGREGATIONS)}")
+    if on not in ('changes', 'levels'):
+        raise ValidationError("on must be 'changes' or 'levels'")
+    since = request.args.get('since')
+    try:
+        since = datetime.strptime(since, '%Y-%m-%d') if since else None
+    except ValueError:
+        raise ValidationError(f"Invalid since date: {since}")
+
+    frame = get_frame(frequency=frequency, how=how, start_date=since)
+    return jsonify({
+        'status': 'Success',
+        'frequency': frequency,
+        'how': how,
+        'on': on,
+        'periods': len(frame.dates),
+        'correlation': correlation_table(frame, on),
+        'timestamp': datetime.now().isoformat()
+    }), 200
+
+@api.route('/v1/inflation/range', methods=['GET'])
+@handle_errors
+def get_range() -> Tuple[Dict[str, Any], int]:
+    """Change, annualized rate and averages of one series between two dates."""
+    from backend.services.analytics import get_range_summary
+    from backend.services.config import INAUGURATION_DATE
+    from backend.services.registry import get_registry
+
+    series = request.args.get('series', '')
+    registry = get_registry()
+    spec = registry.get(series) or registry.by_name(series)
+    if spec is None:
+        raise ValidationError(f"Unknown series: {series}")
+    dates = {}
+    for param, default in (('start', INAUGURATION_DATE), ('end', None)):
+        value = request.args.get(param, default)
+        try:
+            dates[param] = datetime.strptime(value, '%Y-%m-%d') if value else None
+        except ValueError:
+            raise ValidationError(f"Invalid {param} date: {value}")
+
+    summary = get_range_summary(spec.series_id, dates['start'], dates['end'])
+    return jsonify({
+        'status': 'Success',
+        'series_id': spec.series_id,
+        'name': spec.name,
+        **summary._asdict(),
+        'timestamp': datetime.now().isoformat()
+    }), 200
@@ -1,17 +1,18 @@
 import logging
-from backend.core.config import init_environment
+from backend.core.config import init_environment, AppConfig
 from backend.core.factory import create_app
+from backend.core.structured_logging import configure_logging
 from backend.database import init_db
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
 logger = logging.getLogger(__name__)
 
 def main():
-    """Main application entry point."""
+    """Development server entry point.
+
+    For production use the WSGI entry point instead:
+    ``gunicorn -c backend/gunicorn.conf.py backend.wsgi:app``
+    """
+    configure_logging()
     try:
         # Initialize environment variables
         init_environment()
@@ -21,7 +22,7 @@ def main():
         
         # Create and run Flask application
         app = create_app()
-        app.run(host='0.0.0.0', port=5003, debug=True)
+        app.run(host=AppConfig.HOST, port=AppConfig.PORT, debug=AppConfig.DEBUG)
         
     except Exception as e:
         logger.error(f"Application startup failed: {str(e)}")
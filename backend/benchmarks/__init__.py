@@ -0,0 +1,6 @@
+"""
+Performance benchmarks for the Trump Tracker backend.
+
+Benchmarks are plain scripts and are not collected by pytest. Run them from
+the project root, e.g. ``python -m backend.benchmarks.bench_serving``.
+"""
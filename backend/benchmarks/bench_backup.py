@@ -0,0 +1,149 @@
+"""
+Backup duration and reader latency while a backup runs.
+
+A scratch database is loaded with synthetic series, then ``--readers``
+threads read the last year of random series (``get_series_data`` on a read
+session) and one writer appends an observation per commit while each
+backup method runs:
+
+    idle       no backup (reader baseline)
+    file_copy  ``shutil.copy2`` of the live file (the old backup_database)
+    one_step   online backup API in a single step
+    paced      online backup API, ``--pages`` pages per step with
+               ``--sleep-ms`` between steps
+
+Reported per method as JSON: backup seconds, size, steps and restarts, and
+read latency percentiles while it ran.
+
+Example:
+    python -m backend.benchmarks.bench_backup --series 50 \\
+        --observations 1000000 --readers 4 --pages 256 --sleep-ms 5
+"""
+
+import argparse
+import json
+import logging
+import os
+import random
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Dict, List
+
+from backend import database
+from backend.benchmarks import synthetic
+from backend.benchmarks.bench_hot_paths import _revision
+from backend.benchmarks.bench_serving import _percentile
+from backend.storage.backup import BackupPolicy, create_backup
+
+METHODS = ('idle', 'file_copy', 'one_step', 'paced')
+
+def _reader(ids: List[str], stop: threading.Event, seed: int, latencies: List[float]) -> None:
+    rng = random.Random(seed)
+    year_ago = datetime.now() - timedelta(days=365)
+    while not stop.is_set():
+        start = time.perf_counter()
+        session = database.get_read_session()
+        try:
+            database.get_series_data(session, rng.choice(ids), start_date=year_ago)
+        finally:
+            session.close()
+        latencies.append(time.perf_counter() - start)
+
+def _writer(stop: threading.Event, writes: List[int]) -> None:
+    day = datetime(1900, 1, 1)
+    while not stop.is_set():
+        session = database.get_session()
+        try:
+            database.bulk_store_series_data(session, 'BACKUPWRITER', [{'date': day, 'value': 1.0}])
+            session.commit()
+            writes.append(1)
+        finally:
+            session.close()
+        day += timedelta(days=1)
+        time.sleep(0.01)
+
+def _backup(method: str, directory: str, args) -> Dict:
+    if method == 'idle':
+        time.sleep(args.idle_seconds)
+        return {}
+    if method == 'file_copy':
+        target = os.path.join(directory, 'copy.db')
+        start = time.perf_counter()
+        shutil.copy2(database.DB_PATH, target)
+        return {'seconds': round(time.perf_counter() - start, 3), 'bytes': os.path.getsize(target)}
+    if method == 'one_step':
+        policy = BackupPolicy(pages_per_step=-1, compress=False, verify=False)
+    else:
+        policy = BackupPolicy(pages_per_step=args.pages, step_sleep_ms=args.sleep_ms,
+                              compress=args.compress, verify=False)
+    result = create_backup(database.DB_PATH, directory, policy)
+    return {
+        'seconds': result.seconds,
+        'bytes': result.bytes,
+        'steps': result.steps,
+        'restarts': result.restarts,
+    }
+
+def run_method(method: str, ids: List[str], args) -> Dict:
+    """Run one backup method under concurrent readers and a writer."""
+    stop = threading.Event()
+    latencies: List[float] = []
+    writes: List[int] = []
+    threads = [
+        threading.Thread(target=_reader, args=(ids, stop, args.seed + i, latencies))
+        for i in range(args.readers)
+    ] + [threading.Thread(target=_writer, args=(stop, writes))]
+    for thread in threads:
+        thread.start()
+    with tempfile.TemporaryDirectory() as directory:
+        backup = _backup(method, directory, args)
+    stop.set()
+    for thread in threads:
+        thread.join()
+
+    latencies.sort()
+    return {
+        'backup': backup,
+        'reads': len(latencies),
+        'writes': len(writes),
+        'read_p50_ms': round(_percentile(latencies, 50) * 1000, 2),
+        'read_p95_ms': round(_percentile(latencies, 95) * 1000, 2),
+        'read_p99_ms': round(_percentile(latencies, 99) * 1000, 2),
+    }
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--methods', nargs='+', choices=METHODS, default=list(METHODS))
+    parser.add_argument('--series', type=int, default=50)
+    parser.add_argument('--observations', type=int, default=1_000_000)
+    parser.add_argument('--readers', type=int, default=4)
+    parser.add_argument('--pages', type=int, default=256, help='pages per paced backup step')
+    parser.add_argument('--sleep-ms', type=float, default=5.0, help='pause between paced steps')
+    parser.add_argument('--compress', action='store_true', help='gzip the paced backup')
+    parser.add_argument('--idle-seconds', type=float, default=2.0)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    configured, configured_profile = database.DB_PATH, database.ENGINE_PROFILE
+    results = {'revision': _revision(), 'config': vars(args), 'methods': {}}
+    with tempfile.TemporaryDirectory() as tmp:
+        try:
+            database.configure_database(os.path.join(tmp, 'fred_data.db'))
+            database.init_db()
+            print(f"Loading {args.series} series x {args.observations} observations...", file=sys.stderr)
+            synthetic.populate(database.engine, args.series, args.observations, seed=args.seed)
+            ids = synthetic.series_ids(args.series)
+            for method in args.methods:
+                print(f"Running {method}...", file=sys.stderr)
+                results['methods'][method] = run_method(method, ids, args)
+        finally:
+            database.configure_database(configured, configured_profile)
+    print(json.dumps(results, indent=2))
+
+if __name__ == '__main__':
+    main()
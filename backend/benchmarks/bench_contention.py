@@ -0,0 +1,153 @@
+"""
+Mixed read/write contention benchmark for SQLite engine profiles.
+
+For each profile in ``backend.storage.sqlite_engine.PROFILES`` a scratch
+database is loaded with synthetic series, then ``--readers`` threads read
+the last year of random series (``get_series_data`` on a read session)
+while ``--writers`` threads each append ``--batch`` new observations per
+commit to their own series (``bulk_store_series_data``). Operations per
+second, latency percentiles and "database is locked" failures are reported
+per profile as JSON.
+
+Example:
+    python -m backend.benchmarks.bench_contention --readers 8 --writers 2 \\
+        --duration 10 --profiles wal legacy
+"""
+
+import argparse
+import json
+import logging
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+from collections import defaultdict
+from datetime import datetime, timedelta
+from typing import Dict, List
+
+from sqlalchemy.exc import OperationalError
+
+from backend import database
+from backend.benchmarks import synthetic
+from backend.benchmarks.bench_hot_paths import _revision
+from backend.benchmarks.bench_serving import _percentile
+from backend.storage.sqlite_engine import PROFILES
+
+class _Results:
+    """Latencies and failures per operation, shared by worker threads."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.latencies: Dict[str, List[float]] = defaultdict(list)
+        self.errors: Dict[str, int] = defaultdict(int)
+
+    def add(self, operation: str, latency: float) -> None:
+        with self._lock:
+            self.latencies[operation].append(latency)
+
+    def fail(self, operation: str) -> None:
+        with self._lock:
+            self.errors[operation] += 1
+
+    def summary(self, elapsed: float) -> Dict:
+        result = {}
+        for operation in ('read', 'write'):
+            latencies = sorted(self.latencies[operation])
+            result[operation] = {
+                'ops': len(latencies),
+                'ops_per_second': round(len(latencies) / elapsed, 1),
+                'errors': self.errors[operation],
+                'p50_ms': round(_percentile(latencies, 50) * 1000, 2),
+                'p95_ms': round(_percentile(latencies, 95) * 1000, 2),
+                'p99_ms': round(_percentile(latencies, 99) * 1000, 2),
+            }
+        return result
+
+def _reader(ids: List[str], stop_at: float, seed: int, results: _Results) -> None:
+    rng = random.Random(seed)
+    year_ago = datetime.now() - timedelta(days=365)
+    while time.perf_counter() < stop_at:
+        start = time.perf_counter()
+        session = database.get_read_session()
+        try:
+            database.get_series_data(session, rng.choice(ids), start_date=year_ago)
+            results.add('read', time.perf_counter() - start)
+        except OperationalError:
+            results.fail('read')
+        finally:
+            session.close()
+
+def _writer(index: int, batch: int, stop_at: float, results: _Results) -> None:
+    series_id = f"WRITER{index:03d}"
+    day = datetime(2000, 1, 1)
+    while time.perf_counter() < stop_at:
+        points = [{'date': day + timedelta(days=i), 'value': 100.0 + i} for i in range(batch)]
+        start = time.perf_counter()
+        session = database.get_session()
+        try:
+            database.bulk_store_series_data(session, series_id, points)
+            session.commit()
+            results.add('write', time.perf_counter() - start)
+            day += timedelta(days=batch)
+        except OperationalError:
+            session.rollback()
+            results.fail('write')
+        finally:
+            session.close()
+
+def run_profile(name: str, args) -> Dict:
+    """Load a scratch database with one profile and run the mixed workload."""
+    profile = PROFILES[name]
+    with tempfile.TemporaryDirectory() as tmp:
+        database.configure_database(os.path.join(tmp, 'fred_data.db'), profile)
+        database.init_db()
+        synthetic.populate(database.engine, args.series, args.observations, seed=args.seed)
+        ids = synthetic.series_ids(args.series)
+
+        results = _Results()
+        stop_at = time.perf_counter() + args.duration
+        threads = [
+            threading.Thread(target=_reader, args=(ids, stop_at, args.seed + i, results))
+            for i in range(args.readers)
+        ] + [
+            threading.Thread(target=_writer, args=(i, args.batch, stop_at, results))
+            for i in range(args.writers)
+        ]
+        started = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - started
+        database.engine.dispose()
+        database.read_engine.dispose()
+
+    return {'profile': profile._asdict(), **results.summary(elapsed)}
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--profiles', nargs='+', choices=sorted(PROFILES), default=['wal', 'legacy'])
+    parser.add_argument('--readers', type=int, default=8)
+    parser.add_argument('--writers', type=int, default=2)
+    parser.add_argument('--batch', type=int, default=100, help='observations per write transaction')
+    parser.add_argument('--series', type=int, default=20)
+    parser.add_argument('--observations', type=int, default=200_000)
+    parser.add_argument('--duration', type=float, default=10.0, help='seconds per profile')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    configured = database.ENGINE_PROFILE
+    results = {'revision': _revision(), 'config': vars(args), 'profiles': {}}
+    try:
+        for name in args.profiles:
+            print(f"Running profile {name}...", file=sys.stderr)
+            results['profiles'][name] = run_profile(name, args)
+    finally:
+        database.configure_database(database.DB_PATH, configured)
+    print(json.dumps(results, indent=2))
+
+if __name__ == '__main__':
+    main()
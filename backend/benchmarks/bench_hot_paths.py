@@ -0,0 +1,272 @@
+"""
+Storage, read and serving hot paths at synthetic scale.
+
+Each scale (``<series>x<observations>``) gets a fresh SQLite database in a
+temporary directory, bulk-loaded from ``synthetic``. The synthetic series
+are registered in its series registry so ``get_inflation_metrics`` and the
+data endpoint cover every series.
+
+Benchmarks:
+    store_series_data.new       insert ``--store-points`` into a new series
+    store_series_data.existing  re-store points that are already present
+    get_series_data.full        full history of one series
+    get_series_data.last_year   the window ``get_inflation_metrics`` reads
+    validate_series_data        ``_validate_series_data`` on a full history
+    get_inflation_metrics       all series, through the database
+    get_inflation_metrics.series_cache
+                                all series, from warm columnar cache files
+    http.data.cold              GET /api/v1/inflation/data with no snapshot
+                                (database read plus snapshot publish)
+    http.data.snapshot          GET /api/v1/inflation/data from the snapshot
+
+Results are written as JSON; ``--compare`` checks them against an earlier
+run and exits non-zero if any median regressed by more than ``--tolerance``.
+
+Example:
+    python -m backend.benchmarks.bench_hot_paths --scales 10x10000,1000x1000000 \\
+        --output results.json
+    python -m backend.benchmarks.bench_hot_paths --compare results.json
+"""
+
+import argparse
+import json
+import logging
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List, Tuple
+
+from backend import database
+from backend.benchmarks import synthetic
+from backend.core.config import AppConfig
+from backend.services.registry import refresh_registry
+from backend.storage import columnar, snapshot
+
+DEFAULT_SCALES = '10x10000,100x100000,1000x1000000,10000x1000000'
+DATA_PATH = '/api/v1/inflation/data'
+
+def parse_scales(value: str) -> List[Tuple[int, int]]:
+    """Parse ``10x10000,100x100000`` into ``(series, observations)`` pairs."""
+    scales = []
+    for item in value.split(','):
+        n_series, _, observations = item.strip().partition('x')
+        scales.append((int(n_series), int(observations)))
+    return scales
+
+def _summarize(timings: List[float]) -> Dict:
+    """Summarize timings in milliseconds."""
+    timings = sorted(timings)
+    return {
+        'runs': len(timings),
+        'mean_ms': round(statistics.fmean(timings) * 1e3, 3),
+        'p50_ms': round(timings[len(timings) // 2] * 1e3, 3),
+        'p95_ms': round(timings[min(len(timings) - 1, int(len(timings) * 0.95))] * 1e3, 3),
+        'min_ms': round(timings[0] * 1e3, 3),
+    }
+
+def _measure(fn: Callable[[int], None], repeats: int, setup: Callable[[int], None] = None) -> Dict:
+    """Time ``fn(i)`` for each repeat; ``setup(i)`` runs untimed beforehand."""
+    timings = []
+    for i in range(repeats):
+        if setup is not None:
+            setup(i)
+        start = time.perf_counter()
+        fn(i)
+        timings.append(time.perf_counter() - start)
+    return _summarize(timings)
+
+def _bench_storage(ids: List[str], per_series: int, args) -> Dict:
+    """Benchmarks that call the database layer directly."""
+    from backend.services.data_fetcher import FREDDataFetcher
+
+    results = {}
+    sample = ids[:args.sample]
+    year_ago = datetime.now() - timedelta(days=365)
+    existing_points = synthetic.generate_points(ids[0], per_series, seed=args.seed)[-args.store_points:]
+
+    def store_new(i):
+        series_id = f"NEW{i:05d}"
+        points = synthetic.generate_points(series_id, args.store_points, seed=args.seed)
+        with database.get_session() as session:
+            database.store_series_data(session, series_id, points, synthetic.metadata(series_id))
+
+    def store_existing(i):
+        with database.get_session() as session:
+            database.store_series_data(session, ids[0], existing_points, synthetic.metadata(ids[0]))
+
+    def read(start_date):
+        def run(i):
+            with database.get_session() as session:
+                database.get_series_data(session, sample[i % len(sample)], start_date=start_date)
+        return run
+
+    results['store_series_data.new'] = _measure(store_new, args.repeats)
+    results['store_series_data.existing'] = _measure(store_existing, args.repeats)
+    results['get_series_data.full'] = _measure(read(None), args.repeats)
+    results['get_series_data.last_year'] = _measure(read(year_ago), args.repeats)
+
+    fetcher = FREDDataFetcher()
+    with database.get_session() as session:
+        rows = database.get_series_data(session, ids[0])
+    results['validate_series_data'] = _measure(lambda i: fetcher._validate_series_data(rows), args.repeats)
+    results['get_inflation_metrics'] = _measure(lambda i: fetcher.get_inflation_metrics(), args.repeats)
+
+    enabled, cache = AppConfig.SERIES_CACHE_ENABLED, columnar._cache
+    with tempfile.TemporaryDirectory() as cache_dir:
+        AppConfig.SERIES_CACHE_ENABLED = True
+        columnar._cache = columnar.SeriesCache(cache_dir)
+        try:
+            fetcher.get_inflation_metrics()  # builds the cache files
+            results['get_inflation_metrics.series_cache'] = _measure(
+                lambda i: fetcher.get_inflation_metrics(), args.repeats
+            )
+        finally:
+            AppConfig.SERIES_CACHE_ENABLED, columnar._cache = enabled, cache
+    return results
+
+def _bench_http(tmp: str, args) -> Dict:
+    """Benchmarks of the data endpoint through the Flask test client."""
+    from backend.api import routes
+    from backend.core.factory import create_app
+
+    snapshot.SNAPSHOT_PATH = os.path.join(tmp, 'metrics.snap')
+    snapshot._reader = None
+    routes.reset_fred_client()
+    # The limiter reads this when the app is created
+    AppConfig.RATE_LIMIT_ENABLED = False
+    app = create_app(read_only=False)
+    client = app.test_client()
+
+    def get(i):
+        response = client.get(DATA_PATH)
+        if response.status_code != 200:
+            raise RuntimeError(f"{DATA_PATH} returned {response.status_code}")
+
+    def drop_snapshot(i):
+        if os.path.exists(snapshot.SNAPSHOT_PATH):
+            os.unlink(snapshot.SNAPSHOT_PATH)
+
+    # The first request also constructs InflationTracker; keep it out of the timings
+    get(0)
+    results = {
+        'http.data.cold': _measure(get, args.repeats, setup=drop_snapshot),
+        'http.data.snapshot': _measure(get, args.repeats * 10),
+    }
+    routes.reset_fred_client()
+    return results
+
+def run_scale(n_series: int, observations: int, args) -> Dict:
+    """Load one synthetic scale into a scratch database and run every benchmark."""
+    with tempfile.TemporaryDirectory() as tmp:
+        database.configure_database(os.path.join(tmp, 'fred_data.db'))
+        database.init_db()
+        start = time.perf_counter()
+        loaded = synthetic.populate(database.engine, n_series, observations, seed=args.seed)
+        synthetic.register(database.engine, n_series)
+        load_s = time.perf_counter() - start
+
+        refresh_registry()
+        try:
+            ids = synthetic.series_ids(n_series)
+            results = _bench_storage(ids, max(observations // n_series, 1), args)
+            results.update(_bench_http(tmp, args))
+        finally:
+            database.engine.dispose()
+
+    return {
+        'series': n_series,
+        'observations': loaded,
+        'load_s': round(load_s, 3),
+        'benchmarks': results,
+    }
+
+def compare(results: Dict, baseline: Dict, tolerance: float) -> List[Dict]:
+    """Return benchmarks whose median slowed down by more than ``tolerance``."""
+    regressions = []
+    for scale, current in results['scales'].items():
+        previous = baseline.get('scales', {}).get(scale)
+        if previous is None:
+            continue
+        for name, stats in current['benchmarks'].items():
+            before = previous['benchmarks'].get(name)
+            if before is None or before['p50_ms'] <= 0:
+                continue
+            ratio = stats['p50_ms'] / before['p50_ms']
+            if ratio > 1 + tolerance:
+                regressions.append({
+                    'scale': scale,
+                    'benchmark': name,
+                    'baseline_p50_ms': before['p50_ms'],
+                    'p50_ms': stats['p50_ms'],
+                    'ratio': round(ratio, 2),
+                })
+    return regressions
+
+def _revision() -> str:
+    """Short git revision of the tree being measured, if available."""
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'],
+            capture_output=True, text=True, check=True,
+            cwd=os.path.dirname(os.path.abspath(__file__))
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--scales', type=parse_scales, default=parse_scales(DEFAULT_SCALES),
+                        help=f"comma-separated <series>x<observations> (default {DEFAULT_SCALES})")
+    parser.add_argument('--repeats', type=int, default=5)
+    parser.add_argument('--sample', type=int, default=20, help='series cycled through by per-series reads')
+    parser.add_argument('--store-points', type=int, default=1000)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', help='write results JSON here instead of stdout')
+    parser.add_argument('--compare', metavar='BASELINE', help='results JSON from an earlier run')
+    parser.add_argument('--tolerance', type=float, default=0.2,
+                        help='allowed median slowdown before a regression is reported (default 0.2)')
+    args = parser.parse_args()
+
+    # Service constructors validate that keys are set; nothing here calls out
+    os.environ.setdefault('FRED_API_KEY', 'benchmark')
+    os.environ.setdefault('ANTHROPIC_API_KEY', 'benchmark')
+    logging.disable(logging.CRITICAL)
+
+    results = {
+        'revision': _revision(),
+        'timestamp': datetime.now().isoformat(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'config': {'repeats': args.repeats, 'store_points': args.store_points, 'seed': args.seed},
+        'scales': {},
+    }
+    for n_series, observations in args.scales:
+        print(f"Running {n_series} series x {observations} observations...", file=sys.stderr)
+        results['scales'][f"{n_series}x{observations}"] = run_scale(n_series, observations, args)
+
+    output = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(output + '\n')
+    else:
+        print(output)
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.tolerance)
+        for regression in regressions:
+            print(
+                "REGRESSION {scale} {benchmark}: {baseline_p50_ms}ms -> {p50_ms}ms ({ratio}x)".format(**regression),
+                file=sys.stderr
+            )
+        if regressions:
+            sys.exit(1)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,145 @@
+"""
+Scan benchmarks for the ORM and compact storage layouts.
+
+Each scale (``<series>x<observations>``) is bulk-loaded from ``synthetic``
+into a ``fred_data`` database, which is then copied and converted with
+``compact.migrate(drop_legacy=True)``. Both files are measured with the
+same reads:
+
+    scan.full                   raw SQL rows of one series' full history
+    scan.last_year              raw SQL rows of the last 365 days
+    get_series_data.full        ``get_series_data`` records, full history
+    get_series_data.last_year   ``get_series_data`` records, last 365 days
+
+along with file size, bytes per observation and migration time.
+
+Example:
+    python -m backend.benchmarks.bench_layout --scales 10x100000,100x1000000 \\
+        --output layout.json
+"""
+
+import argparse
+import json
+import logging
+import os
+import shutil
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from typing import Dict
+
+from sqlalchemy import create_engine, text
+
+from backend import database
+from backend.benchmarks import synthetic
+from backend.benchmarks.bench_hot_paths import _measure, _revision, parse_scales
+from backend.storage import compact
+
+DEFAULT_SCALES = '10x100000,100x1000000'
+
+_LEGACY_SCAN = text('SELECT date, value FROM fred_data WHERE series_id = :series_id AND date >= :start ORDER BY date')
+
+def _bench_layout(path: str, layout: str, ids, args) -> Dict:
+    """Run every read against one database file in one layout."""
+    since = datetime.now() - timedelta(days=365)
+    results = {}
+    engine = create_engine(f'sqlite:///{path}')
+    try:
+        with engine.connect() as conn:
+            def scan(i, start):
+                series_id = ids[i % len(ids)]
+                if layout == 'compact':
+                    key = compact.series_key(conn, series_id)
+                    conn.execute(
+                        text('SELECT day, value FROM fred_points WHERE series_key = :key AND day >= :day ORDER BY day'),
+                        {'key': key, 'day': compact.epoch_day(start)}
+                    ).all()
+                else:
+                    conn.execute(_LEGACY_SCAN, {'series_id': series_id, 'start': str(start)}).all()
+
+            results['scan.full'] = _measure(lambda i: scan(i, datetime(1900, 1, 1)), args.repeats)
+            results['scan.last_year'] = _measure(lambda i: scan(i, since), args.repeats)
+    finally:
+        engine.dispose()
+
+    database.configure_database(path)
+    database.STORAGE_LAYOUT = layout
+    session = database.get_session()
+    try:
+        results['get_series_data.full'] = _measure(
+            lambda i: database.get_series_data(session, ids[i % len(ids)]), args.repeats
+        )
+        results['get_series_data.last_year'] = _measure(
+            lambda i: database.get_series_data(session, ids[i % len(ids)], start_date=since), args.repeats
+        )
+    finally:
+        session.close()
+        database.engine.dispose()
+    return results
+
+def run_scale(n_series: int, observations: int, args) -> Dict:
+    """Load one scale, migrate a copy to the compact layout and benchmark both."""
+    layout = database.STORAGE_LAYOUT
+    with tempfile.TemporaryDirectory() as tmp:
+        legacy_path = os.path.join(tmp, 'legacy.db')
+        compact_path = os.path.join(tmp, 'compact.db')
+
+        database.configure_database(legacy_path)
+        database.STORAGE_LAYOUT = 'orm'
+        database.init_db()
+        loaded = synthetic.populate(database.engine, n_series, observations, seed=args.seed)
+        database.engine.dispose()
+
+        shutil.copyfile(legacy_path, compact_path)
+        engine = create_engine(f'sqlite:///{compact_path}')
+        migration = compact.migrate(engine, drop_legacy=True)
+        engine.dispose()
+
+        ids = synthetic.series_ids(n_series)[:args.sample]
+        try:
+            layouts = {
+                'orm': {'bytes': os.path.getsize(legacy_path), **_bench_layout(legacy_path, 'orm', ids, args)},
+                'compact': {'bytes': os.path.getsize(compact_path), **_bench_layout(compact_path, 'compact', ids, args)},
+            }
+        finally:
+            database.STORAGE_LAYOUT = layout
+    for stats in layouts.values():
+        stats['bytes_per_observation'] = round(stats['bytes'] / max(loaded, 1), 1)
+    return {
+        'series': n_series,
+        'observations': loaded,
+        'migration_s': migration['seconds'],
+        'layouts': layouts,
+    }
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--scales', type=parse_scales, default=parse_scales(DEFAULT_SCALES),
+                        help=f"comma-separated <series>x<observations> (default {DEFAULT_SCALES})")
+    parser.add_argument('--repeats', type=int, default=5)
+    parser.add_argument('--sample', type=int, default=20, help='series cycled through by per-series reads')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', help='write results JSON here instead of stdout')
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    results = {
+        'revision': _revision(),
+        'timestamp': datetime.now().isoformat(),
+        'config': {'repeats': args.repeats, 'seed': args.seed},
+        'scales': {},
+    }
+    for n_series, observations in args.scales:
+        print(f"Running {n_series} series x {observations} observations...", file=sys.stderr)
+        results['scales'][f"{n_series}x{observations}"] = run_scale(n_series, observations, args)
+
+    output = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(output + '\n')
+    else:
+        print(output)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,195 @@
+"""
+Offline end-to-end load test of ingest, analysis and serving.
+
+Starts ``FakeFRED`` and ``FakeAnthropic`` from ``fake_services``, then a
+gunicorn server whose ``FREDDataFetcher`` and ``InflationAnalyzer`` point at
+them, with a scratch database and snapshot. After ``POST initialize`` the
+clients drive mixed traffic: each request is a ``POST update`` with
+probability ``--update-ratio`` and a ``GET data`` otherwise. Throughput and
+latency percentiles per operation, HTTP status counts and the fakes' own
+response counts (including injected failures) are reported as JSON.
+
+Example:
+    python -m backend.benchmarks.bench_load --workers 2 --clients 16 \\
+        --duration 30 --update-ratio 0.05 --latency-ms 80 --jitter-ms 40 \\
+        --error-rate 0.02 --rate-limit-rate 0.05 --release-interval 5
+"""
+
+import argparse
+import http.client
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter, defaultdict
+from typing import Dict, List
+
+from backend.benchmarks.bench_serving import CONFIG_PATH, PROJECT_ROOT, _free_port, _percentile, _wait_until_ready
+from backend.benchmarks.fake_services import FakeAnthropic, FakeFRED, add_fault_arguments, fault_profile
+
+DATA_PATH = '/api/v1/inflation/data'
+UPDATE_PATH = '/api/v1/inflation/update'
+INITIALIZE_PATH = '/api/v1/inflation/initialize'
+
+class _Recorder:
+    """Latencies and status codes per operation, shared by client threads."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.latencies: Dict[str, List[float]] = defaultdict(list)
+        self.statuses: Dict[str, Counter] = defaultdict(Counter)
+
+    def add(self, operation: str, latency: float, status: int) -> None:
+        with self._lock:
+            self.latencies[operation].append(latency)
+            self.statuses[operation][str(status)] += 1
+
+    def summary(self, elapsed: float) -> Dict:
+        result = {}
+        for operation, latencies in sorted(self.latencies.items()):
+            latencies = sorted(latencies)
+            result[operation] = {
+                'requests': len(latencies),
+                'requests_per_second': round(len(latencies) / elapsed, 2),
+                'p50_ms': round(_percentile(latencies, 50) * 1000, 2),
+                'p95_ms': round(_percentile(latencies, 95) * 1000, 2),
+                'p99_ms': round(_percentile(latencies, 99) * 1000, 2),
+                'max_ms': round(latencies[-1] * 1000, 2),
+                'statuses': dict(self.statuses[operation]),
+            }
+        return result
+
+def _request(port: int, method: str, path: str, timeout: float) -> int:
+    """Issue one request on a fresh connection and return the status code."""
+    conn = http.client.HTTPConnection('127.0.0.1', port, timeout=timeout)
+    try:
+        conn.request(method, path)
+        response = conn.getresponse()
+        response.read()
+        return response.status
+    finally:
+        conn.close()
+
+def _client_loop(port: int, stop_at: float, update_ratio: float, seed: int, recorder: _Recorder) -> None:
+    """Send a random mix of reads and updates until ``stop_at``."""
+    rng = random.Random(seed)
+    conn = http.client.HTTPConnection('127.0.0.1', port, timeout=300)
+    while time.perf_counter() < stop_at:
+        if rng.random() < update_ratio:
+            operation, method, path = 'update', 'POST', UPDATE_PATH
+        else:
+            operation, method, path = 'data', 'GET', DATA_PATH
+        start = time.perf_counter()
+        try:
+            conn.request(method, path)
+            response = conn.getresponse()
+            response.read()
+            status = response.status
+        except (OSError, http.client.HTTPException):
+            status = 0
+            conn.close()
+            conn = http.client.HTTPConnection('127.0.0.1', port, timeout=300)
+        recorder.add(operation, time.perf_counter() - start, status)
+    conn.close()
+
+def run(args) -> Dict:
+    faults = fault_profile(args)
+    with FakeFRED(faults, args.release_interval) as fred, \
+            FakeAnthropic(faults, args.output_tokens) as claude, \
+            tempfile.TemporaryDirectory() as tmp:
+        port = _free_port()
+        env = dict(os.environ)
+        env.update({
+            'FRED_API_KEY': 'loadtest',
+            'ANTHROPIC_API_KEY': 'loadtest',
+            'FRED_API_URL': f"{fred.url}/fred",
+            'ANTHROPIC_BASE_URL': claude.url,
+            'FRED_DB_PATH': os.path.join(tmp, 'fred_data.db'),
+            'SNAPSHOT_PATH': os.path.join(tmp, 'metrics.snap'),
+            'READ_ONLY': '0',
+            'RATELIMIT_ENABLED': '0',
+            # FakeFRED releases daily observations, not on the series' schedules
+            'RELEASE_RULES_ENABLED': '0',
+            'LOG_LEVEL': 'WARNING',
+            'WEB_CONCURRENCY': str(args.workers),
+            'GUNICORN_THREADS': str(args.threads),
+            'GUNICORN_TIMEOUT': '300',
+            'HOST': '127.0.0.1',
+            'PORT': str(port),
+        })
+        server = subprocess.Popen(
+            [sys.executable, '-m', 'gunicorn', '-c', CONFIG_PATH, '--access-logfile', os.devnull, 'backend.wsgi:app'],
+            cwd=PROJECT_ROOT,
+            env=env,
+            stdout=subprocess.DEVNULL,
+            stderr=None if args.server_logs else subprocess.DEVNULL,
+        )
+        try:
+            _wait_until_ready(port, '/api/v1/health')
+
+            start = time.perf_counter()
+            status = _request(port, 'POST', INITIALIZE_PATH, timeout=600)
+            initialize = {'status': status, 'seconds': round(time.perf_counter() - start, 3)}
+            if status != 200:
+                raise RuntimeError(f"Initialization returned {status}; lower the injected error rate")
+
+            recorder = _Recorder()
+            stop_at = time.perf_counter() + args.duration
+            pool = [
+                threading.Thread(target=_client_loop, args=(port, stop_at, args.update_ratio, args.seed + i, recorder))
+                for i in range(args.clients)
+            ]
+            started = time.perf_counter()
+            for thread in pool:
+                thread.start()
+            for thread in pool:
+                thread.join()
+            elapsed = time.perf_counter() - started
+        finally:
+            server.terminate()
+            server.wait(timeout=60)
+
+        operations = recorder.summary(elapsed)
+        return {
+            'config': {
+                'workers': args.workers,
+                'threads': args.threads,
+                'clients': args.clients,
+                'duration_s': args.duration,
+                'update_ratio': args.update_ratio,
+                'faults': faults._asdict(),
+                'release_interval_s': args.release_interval,
+            },
+            'initialize': initialize,
+            'elapsed_s': round(elapsed, 3),
+            'requests_per_second': round(sum(op['requests'] for op in operations.values()) / elapsed, 2),
+            'operations': operations,
+            'upstream': {'fred': fred.stats(), 'anthropic': claude.stats()},
+        }
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--workers', type=int, default=2)
+    parser.add_argument('--threads', type=int, default=4)
+    parser.add_argument('--clients', type=int, default=16, help='concurrent keep-alive connections')
+    parser.add_argument('--duration', type=float, default=30.0, help='seconds of mixed traffic')
+    parser.add_argument('--update-ratio', type=float, default=0.05, help='fraction of requests that are updates')
+    parser.add_argument('--output-tokens', type=int, default=300, help='tokens in each fake analysis')
+    parser.add_argument('--server-logs', action='store_true', help="show gunicorn's stderr")
+    parser.add_argument('--output', help='write results JSON here instead of stdout')
+    add_fault_arguments(parser)
+    args = parser.parse_args()
+
+    output = json.dumps(run(args), indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(output + '\n')
+    else:
+        print(output)
+
+if __name__ == '__main__':
+    main()
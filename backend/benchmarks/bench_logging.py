@@ -0,0 +1,77 @@
+"""
+Request latency with logging off, synchronous, and through the queue pipeline.
+
+Requests go through the Flask test client against a read-only app serving a
+temporary snapshot, so only the middleware and logging cost differ between
+modes. Output goes to ``os.devnull`` to exclude terminal speed.
+
+Example:
+    python -m backend.benchmarks.bench_logging --requests 5000
+"""
+
+import argparse
+import json
+import logging
+import os
+import statistics
+import tempfile
+import time
+from typing import Dict
+
+from backend.core.config import AppConfig
+from backend.core.factory import create_app
+from backend.core.structured_logging import TEXT_FORMAT, configure_logging, shutdown_logging
+from backend.storage import snapshot
+
+def _measure(client, path: str, requests: int) -> Dict:
+    """Time individual requests and summarize in microseconds."""
+    for _ in range(100):
+        client.get(path)
+    timings = []
+    for _ in range(requests):
+        start = time.perf_counter()
+        client.get(path)
+        timings.append(time.perf_counter() - start)
+    timings.sort()
+    return {
+        'mean_us': round(statistics.fmean(timings) * 1e6, 1),
+        'p50_us': round(timings[len(timings) // 2] * 1e6, 1),
+        'p99_us': round(timings[int(len(timings) * 0.99)] * 1e6, 1),
+    }
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--requests', type=int, default=5000)
+    parser.add_argument('--level', default='INFO')
+    args = parser.parse_args()
+
+    path = '/api/v1/inflation/data'
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp, open(os.devnull, 'w') as devnull:
+        snapshot.SNAPSHOT_PATH = os.path.join(tmp, 'metrics.snap')
+        snapshot.publish_snapshot({'status': 'Success', 'metrics': {}})
+
+        # The limiter reads this when the app is created
+        AppConfig.RATE_LIMIT_ENABLED = False
+        app = create_app(read_only=True)
+        client = app.test_client()
+        root = logging.getLogger()
+
+        logging.disable(logging.CRITICAL)
+        results['off'] = _measure(client, path, args.requests)
+        logging.disable(logging.NOTSET)
+
+        handler = logging.StreamHandler(devnull)
+        handler.setFormatter(logging.Formatter(TEXT_FORMAT))
+        root.handlers = [handler]
+        root.setLevel(args.level)
+        results['sync'] = _measure(client, path, args.requests)
+
+        configure_logging(level=args.level, fmt='json', stream=devnull)
+        results['pipeline'] = _measure(client, path, args.requests)
+        shutdown_logging()
+
+    print(json.dumps({'path': path, 'level': args.level, 'results': results}, indent=2))
+
+if __name__ == '__main__':
+    main()
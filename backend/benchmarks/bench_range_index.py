@@ -0,0 +1,115 @@
+"""
+Range queries from the prefix-sum index versus scanning stored rows.
+
+For each ``--points`` length a scratch database holds one synthetic daily
+series of that many observations. ``--queries`` random ``(start, end)``
+ranges are answered (change between the two dates and average over the
+range) both ways. Reported per length as JSON (``_measure`` timings):
+
+    scan.ranges         ``get_series_arrays`` of each range, then the change and mean
+    index.ranges        ``RangeIndex.summary`` of each range
+    index.build         ``RangeIndex.from_arrays`` over the whole series
+    index.append        appending one day to the built index
+    cache.revalidate    ``RangeIndexCache.get`` with no new data stored
+    cache.extend        ``RangeIndexCache.get`` after one new day was stored
+
+Example:
+    python -m backend.benchmarks.bench_range_index --points 1000 10000 100000 --queries 200
+"""
+
+import argparse
+import json
+import logging
+import os
+import random
+import sys
+import tempfile
+from typing import Dict
+
+import numpy as np
+
+from backend import database
+from backend.benchmarks import synthetic
+from backend.benchmarks.bench_hot_paths import _measure, _revision
+from backend.services.analytics import RangeIndexCache
+from backend.storage.prefix_index import RangeIndex
+
+def run_length(n_points: int, args) -> Dict:
+    """Load one series of ``n_points`` in a scratch database and time each path."""
+    with tempfile.TemporaryDirectory() as tmp:
+        database.configure_database(os.path.join(tmp, 'fred_data.db'))
+        database.init_db()
+        synthetic.populate(database.engine, 1, n_points, seed=args.seed)
+        series_id = synthetic.series_ids(1)[0]
+
+        session = database.get_read_session()
+        try:
+            dates, values = database.get_series_arrays(session, series_id)
+            rng = random.Random(args.seed)
+            ranges = [
+                tuple(dates[sorted(rng.randrange(n_points) for _ in range(2))].astype('M8[ms]').tolist())
+                for _ in range(args.queries)
+            ]
+
+            def scan(i):
+                for start, end in ranges:
+                    window = database.get_series_arrays(session, series_id, start_date=start, end_date=end)[1]
+                    window[-1] / window[0] - 1, window.mean()
+
+            index = RangeIndex.from_arrays(series_id, dates, values)
+            next_day = dates[-1:] + np.arange(1, args.repeats + 1)
+            cache = RangeIndexCache()
+            cache.get(session, series_id)
+
+            def store_next_day(i):
+                with database.get_session() as writer:
+                    database.bulk_store_series_data(writer, series_id, [
+                        {'date': next_day[i].astype('M8[ms]').tolist(), 'value': float(values[-1])}
+                    ])
+                    writer.commit()
+
+            results = {
+                'scan.ranges': _measure(scan, args.repeats),
+                'index.ranges': _measure(
+                    lambda i: [index.summary(start, end) for start, end in ranges], args.repeats),
+                'index.build': _measure(
+                    lambda i: RangeIndex.from_arrays(series_id, dates, values), args.repeats),
+                'index.append': _measure(
+                    lambda i: index.append(next_day[i:i + 1], values[-1:]), args.repeats),
+                'cache.revalidate': _measure(lambda i: cache.get(session, series_id), args.repeats),
+                'cache.extend': _measure(lambda i: cache.get(session, series_id), args.repeats, store_next_day),
+            }
+        finally:
+            session.close()
+        database.engine.dispose()
+        database.read_engine.dispose()
+
+    return {
+        'benchmarks': results,
+        'us_per_range': {
+            path: round(results[f"{path}.ranges"]['p50_ms'] * 1000 / args.queries, 2)
+            for path in ('scan', 'index')
+        },
+    }
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--points', type=int, nargs='+', default=[1000, 10000, 100000])
+    parser.add_argument('--queries', type=int, default=200, help='random ranges per repeat')
+    parser.add_argument('--repeats', type=int, default=5)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    configured, configured_profile = database.DB_PATH, database.ENGINE_PROFILE
+    results = {'revision': _revision(), 'config': vars(args), 'lengths': {}}
+    try:
+        for n_points in args.points:
+            print(f"Running {n_points} points...", file=sys.stderr)
+            results['lengths'][str(n_points)] = run_length(n_points, args)
+    finally:
+        database.configure_database(configured, configured_profile)
+    print(json.dumps(results, indent=2))
+
+if __name__ == '__main__':
+    main()
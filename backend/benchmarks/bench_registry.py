@@ -0,0 +1,110 @@
+"""
+Series registry lookups, ingest planning and the read path at 1,000+ series.
+
+For each ``--series`` count a scratch database is loaded with that many
+synthetic series of ``--points`` observations, all registered in
+``series_registry`` with a monthly release rule and stored today, so none
+is due. Reported per count as JSON (``_measure`` timings):
+
+    registry.load           ``load_registry`` from the database
+    lookup.registry         ``--lookups`` ``SeriesRegistry.get`` calls
+    lookup.linear_scan      the same lookups as ``in SERIES_IDS.values()``
+    metadata.per_series     one ``FREDSeries`` query per series (the old read path)
+    metadata.batched        one ``IN`` query for every series
+    update.planning         ``update_daily_data`` with no series due
+    get_inflation_metrics   the full read path over every series
+
+Example:
+    python -m backend.benchmarks.bench_registry --series 1000 5000 --points 400
+"""
+
+import argparse
+import json
+import logging
+import os
+import random
+import sys
+import tempfile
+from datetime import date
+from typing import Dict
+from unittest.mock import Mock
+
+from backend import database
+from backend.benchmarks import synthetic
+from backend.benchmarks.bench_hot_paths import _measure, _revision
+from backend.database import FREDSeries
+from backend.services import registry
+
+def run_scale(n_series: int, args) -> Dict:
+    """Load and register ``n_series`` series in a scratch database and time each path."""
+    from backend.services.data_fetcher import FREDDataFetcher
+
+    with tempfile.TemporaryDirectory() as tmp:
+        database.configure_database(os.path.join(tmp, 'fred_data.db'))
+        database.init_db()
+        synthetic.populate(database.engine, n_series, n_series * args.points, seed=args.seed)
+        synthetic.register(database.engine, n_series, release_rule=f"monthly:{date.today().day}")
+        registry.refresh_registry()
+
+        rng = random.Random(args.seed)
+        ids = synthetic.series_ids(n_series)
+        lookups = [rng.choice(ids) for _ in range(args.lookups)]
+        mapping = synthetic.registry(n_series)
+        current = registry.get_registry()
+        results = {}
+
+        session = database.get_read_session()
+        try:
+            results['registry.load'] = _measure(lambda i: registry.load_registry(session), args.repeats)
+            results['lookup.registry'] = _measure(
+                lambda i: [current.get(series_id) for series_id in lookups], args.repeats)
+            results['lookup.linear_scan'] = _measure(
+                lambda i: [series_id in mapping.values() for series_id in lookups], args.repeats)
+            results['metadata.per_series'] = _measure(lambda i: [
+                session.query(FREDSeries).filter_by(series_id=series_id).first() for series_id in ids
+            ], args.repeats)
+            results['metadata.batched'] = _measure(lambda i: session.query(FREDSeries).filter(
+                FREDSeries.series_id.in_(current.series_ids())).all(), args.repeats)
+        finally:
+            session.close()
+
+        fetcher = FREDDataFetcher()
+        fetcher._fetch_series = Mock(side_effect=RuntimeError('no series should be due'))
+        outcomes = fetcher.update_daily_data()
+        results['update.planning'] = _measure(lambda i: fetcher.update_daily_data(), args.repeats)
+        results['get_inflation_metrics'] = _measure(lambda i: fetcher.get_inflation_metrics(), args.repeats)
+        database.engine.dispose()
+        database.read_engine.dispose()
+
+    return {
+        'registered': len(current),
+        'not_due': sum(outcome == 'not_due' for outcome in outcomes.values()),
+        'benchmarks': results,
+        'get_inflation_metrics_us_per_series': round(
+            results['get_inflation_metrics']['p50_ms'] * 1000 / n_series, 1),
+    }
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--series', type=int, nargs='+', default=[1000, 5000])
+    parser.add_argument('--points', type=int, default=400, help='observations per series')
+    parser.add_argument('--lookups', type=int, default=1000)
+    parser.add_argument('--repeats', type=int, default=3)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    os.environ.setdefault('FRED_API_KEY', 'benchmark')
+    configured, configured_profile = database.DB_PATH, database.ENGINE_PROFILE
+    results = {'revision': _revision(), 'config': vars(args), 'scales': {}}
+    try:
+        for n_series in args.series:
+            print(f"Running {n_series} series...", file=sys.stderr)
+            results['scales'][str(n_series)] = run_scale(n_series, args)
+    finally:
+        database.configure_database(configured, configured_profile)
+        registry.refresh_registry()
+    print(json.dumps(results, indent=2))
+
+if __name__ == '__main__':
+    main()
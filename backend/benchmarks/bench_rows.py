@@ -0,0 +1,110 @@
+"""
+Load time and memory per row of the series read paths.
+
+Loads one synthetic series of ``--rows`` observations into a scratch
+database and reads it back through:
+
+    orm       ``session.query(FREDData)...all()``, the previous read path
+    records   ``get_series_data``: Core ``select(date, value)`` into
+              ``SeriesPoint`` records
+    arrays    ``get_series_arrays``: parallel ``datetime64[D]``/``float64``
+
+With ``FRED_STORAGE_LAYOUT=compact`` the series is migrated to the compact
+tables after loading, so ``records`` and ``arrays`` read those instead.
+For each path the median load time and the bytes per row still allocated
+while the result is held (``tracemalloc``) are reported as JSON.
+
+Example:
+    python -m backend.benchmarks.bench_rows --rows 100000 --repeats 5
+"""
+
+import argparse
+import gc
+import json
+import logging
+import os
+import statistics
+import tempfile
+import time
+import tracemalloc
+from typing import Callable, Dict
+
+from backend import database
+from backend.benchmarks import synthetic
+from backend.benchmarks.bench_hot_paths import _revision
+from backend.storage import compact
+
+def _orm(session, series_id):
+    return session.query(database.FREDData)\
+        .filter(database.FREDData.series_id == series_id)\
+        .order_by(database.FREDData.date)\
+        .all()
+
+PATHS = {
+    'orm': _orm,
+    'records': database.get_series_data,
+    'arrays': database.get_series_arrays,
+}
+
+def _bench_path(load: Callable, series_id: str, rows: int, repeats: int) -> Dict:
+    """Time ``load`` on fresh sessions, then measure what its result retains."""
+    timings = []
+    for _ in range(repeats):
+        session = database.get_session()
+        try:
+            start = time.perf_counter()
+            load(session, series_id)
+            timings.append(time.perf_counter() - start)
+        finally:
+            session.close()
+
+    session = database.get_session()
+    try:
+        gc.collect()
+        tracemalloc.start()
+        before = tracemalloc.get_traced_memory()[0]
+        result = load(session, series_id)
+        retained, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        del result
+    finally:
+        session.close()
+
+    return {
+        'p50_ms': round(statistics.median(timings) * 1e3, 3),
+        'min_ms': round(min(timings) * 1e3, 3),
+        'bytes_per_row': round((retained - before) / rows, 1),
+        'peak_bytes_per_row': round((peak - before) / rows, 1),
+    }
+
+def run(rows: int, repeats: int, seed: int) -> Dict:
+    with tempfile.TemporaryDirectory() as tmp:
+        database.configure_database(os.path.join(tmp, 'fred_data.db'))
+        database.init_db()
+        synthetic.populate(database.engine, 1, rows, seed=seed)
+        if database.STORAGE_LAYOUT == 'compact':
+            compact.migrate(database.engine)
+        series_id = synthetic.series_ids(1)[0]
+        try:
+            results = {name: _bench_path(load, series_id, rows, repeats) for name, load in PATHS.items()}
+        finally:
+            database.engine.dispose()
+    return results
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=100_000)
+    parser.add_argument('--repeats', type=int, default=5)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    print(json.dumps({
+        'revision': _revision(),
+        'rows': args.rows,
+        'storage_layout': database.STORAGE_LAYOUT,
+        'paths': run(args.rows, args.repeats, args.seed),
+    }, indent=2))
+
+if __name__ == '__main__':
+    main()
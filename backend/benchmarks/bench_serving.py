@@ -0,0 +1,139 @@
+"""
+Throughput benchmark for the production WSGI server across worker counts.
+
+Starts ``gunicorn -c backend/gunicorn.conf.py backend.wsgi:app`` once per
+worker count, drives it with keep-alive HTTP clients for a fixed duration and
+reports requests per second and latency percentiles as JSON.
+
+Example:
+    python -m backend.benchmarks.bench_serving --workers 1 2 4 --threads 4 \\
+        --path /api/v1/health --duration 10
+"""
+
+import argparse
+import http.client
+import json
+import os
+import socket
+import subprocess
+import sys
+import threading
+import time
+from typing import Dict, List
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+CONFIG_PATH = os.path.join(PROJECT_ROOT, 'backend', 'gunicorn.conf.py')
+
+def _free_port() -> int:
+    """Ask the OS for an unused TCP port."""
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+def _wait_until_ready(port: int, path: str, timeout: float = 30.0) -> None:
+    """Poll the server until it answers any HTTP response."""
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            conn = http.client.HTTPConnection('127.0.0.1', port, timeout=1)
+            conn.request('GET', path)
+            conn.getresponse().read()
+            conn.close()
+            return
+        except OSError:
+            time.sleep(0.2)
+    raise RuntimeError(f"Server on port {port} did not start within {timeout}s")
+
+def _client_loop(port: int, path: str, stop_at: float, latencies: List[float], errors: List[int]) -> None:
+    """Issue requests over one keep-alive connection until ``stop_at``."""
+    conn = http.client.HTTPConnection('127.0.0.1', port, timeout=10)
+    while time.perf_counter() < stop_at:
+        start = time.perf_counter()
+        try:
+            conn.request('GET', path)
+            response = conn.getresponse()
+            response.read()
+            if response.status >= 500:
+                errors.append(response.status)
+        except (OSError, http.client.HTTPException):
+            errors.append(0)
+            conn.close()
+            conn = http.client.HTTPConnection('127.0.0.1', port, timeout=10)
+            continue
+        latencies.append(time.perf_counter() - start)
+    conn.close()
+
+def _percentile(sorted_values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(pct / 100 * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+def run_once(workers: int, threads: int, clients: int, path: str, duration: float) -> Dict:
+    """Benchmark a single gunicorn configuration."""
+    port = _free_port()
+    env = dict(os.environ)
+    env.update({
+        'WEB_CONCURRENCY': str(workers),
+        'GUNICORN_THREADS': str(threads),
+        'HOST': '127.0.0.1',
+        'PORT': str(port),
+        'RATELIMIT_ENABLED': '0',
+    })
+    server = subprocess.Popen(
+        [sys.executable, '-m', 'gunicorn', '-c', CONFIG_PATH, '--access-logfile', os.devnull, 'backend.wsgi:app'],
+        cwd=PROJECT_ROOT,
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        _wait_until_ready(port, path)
+        latencies: List[float] = []
+        errors: List[int] = []
+        stop_at = time.perf_counter() + duration
+        pool = [
+            threading.Thread(target=_client_loop, args=(port, path, stop_at, latencies, errors))
+            for _ in range(clients)
+        ]
+        started = time.perf_counter()
+        for thread in pool:
+            thread.start()
+        for thread in pool:
+            thread.join()
+        elapsed = time.perf_counter() - started
+    finally:
+        server.terminate()
+        server.wait(timeout=30)
+
+    latencies.sort()
+    return {
+        'workers': workers,
+        'threads': threads,
+        'clients': clients,
+        'requests': len(latencies),
+        'errors': len(errors),
+        'requests_per_second': round(len(latencies) / elapsed, 1),
+        'p50_ms': round(_percentile(latencies, 50) * 1000, 2),
+        'p95_ms': round(_percentile(latencies, 95) * 1000, 2),
+        'p99_ms': round(_percentile(latencies, 99) * 1000, 2),
+    }
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4, 8])
+    parser.add_argument('--threads', type=int, default=4)
+    parser.add_argument('--clients', type=int, default=32, help='concurrent keep-alive connections')
+    parser.add_argument('--path', default='/api/v1/health')
+    parser.add_argument('--duration', type=float, default=10.0, help='seconds per configuration')
+    args = parser.parse_args()
+
+    results = [
+        run_once(workers, args.threads, args.clients, args.path, args.duration)
+        for workers in args.workers
+    ]
+    print(json.dumps({'path': args.path, 'results': results}, indent=2))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,90 @@
+"""
+Cold-start benchmark for full and read-only serving modes.
+
+Each sample runs in a fresh interpreter and measures the time to import
+``backend.wsgi`` (app construction) and to answer the first health check,
+which in full mode constructs ``InflationTracker``. A snapshot is published
+to a temporary path first so both modes have data to serve.
+
+Example:
+    python -m backend.benchmarks.bench_startup --runs 5
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Dict
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+CHILD_SCRIPT = """
+import json, sys, time
+start = time.perf_counter()
+from backend.wsgi import app
+imported = time.perf_counter()
+response = app.test_client().get('/api/v1/health')
+first_request = time.perf_counter()
+print(json.dumps({
+    'import_s': imported - start,
+    'first_request_s': first_request - imported,
+    'status': response.status_code,
+    'modules': len(sys.modules),
+    'heavy_modules': sorted(m for m in ('anthropic', 'fredapi', 'pandas', 'sqlalchemy') if m in sys.modules),
+}))
+"""
+
+def run_child(read_only: bool, snapshot_path: str) -> Dict:
+    """Start one fresh interpreter and collect its timings."""
+    env = dict(os.environ)
+    env.update({
+        'READ_ONLY': '1' if read_only else '0',
+        'SNAPSHOT_PATH': snapshot_path,
+        'RATELIMIT_ENABLED': '0',
+    })
+    if not read_only:
+        env.setdefault('FRED_API_KEY', 'benchmark')
+        env.setdefault('ANTHROPIC_API_KEY', 'benchmark')
+    started = time.perf_counter()
+    output = subprocess.run(
+        [sys.executable, '-c', CHILD_SCRIPT],
+        cwd=PROJECT_ROOT, env=env, capture_output=True, text=True, check=True
+    ).stdout
+    result = json.loads(output.strip().splitlines()[-1])
+    result['process_s'] = time.perf_counter() - started
+    return result
+
+def summarize(samples) -> Dict:
+    """Median of each timing across runs."""
+    return {
+        'import_ms': round(statistics.median(s['import_s'] for s in samples) * 1000, 1),
+        'first_request_ms': round(statistics.median(s['first_request_s'] for s in samples) * 1000, 1),
+        'process_ms': round(statistics.median(s['process_s'] for s in samples) * 1000, 1),
+        'modules': samples[-1]['modules'],
+        'heavy_modules': samples[-1]['heavy_modules'],
+        'status': samples[-1]['status'],
+    }
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--runs', type=int, default=5)
+    args = parser.parse_args()
+
+    sys.path.insert(0, PROJECT_ROOT)
+    from backend.storage.snapshot import publish_snapshot
+
+    with tempfile.TemporaryDirectory() as tmp:
+        snapshot_path = os.path.join(tmp, 'metrics.snap')
+        publish_snapshot({'status': 'Success', 'metrics': {}}, snapshot_path)
+        results = {
+            mode: summarize([run_child(mode == 'read_only', snapshot_path) for _ in range(args.runs)])
+            for mode in ('full', 'read_only')
+        }
+    print(json.dumps(results, indent=2))
+
+if __name__ == '__main__':
+    main()
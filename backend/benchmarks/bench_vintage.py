@@ -0,0 +1,113 @@
+"""
+Size and as-of query latency of the vintage store.
+
+For each ``--series`` x ``--observations`` scale, a scratch database records
+``--snapshots`` monthly vintages of every series in which a
+``--revision-rate`` fraction of the trailing ``--window`` observations is
+revised (``record_vintage``). Reported per scale as JSON:
+
+- rows stored versus one row per observation per snapshot (what keeping
+  full snapshots would cost) and the database file size
+- median latency of ``as_of`` queries for the latest vintage, a vintage
+  halfway back and the first one, over a full series and its last year
+
+Example:
+    python -m backend.benchmarks.bench_vintage --scales 10x1000,50x10000 \\
+        --snapshots 24 --window 24 --revision-rate 0.25
+"""
+
+import argparse
+import json
+import logging
+import os
+import random
+import sys
+import tempfile
+from datetime import datetime, timedelta
+from typing import Dict
+
+from sqlalchemy import text
+
+from backend import database
+from backend.benchmarks.bench_hot_paths import _measure, _revision, parse_scales
+from backend.storage import vintage
+
+def _load(series: int, observations: int, args) -> Dict:
+    """Record the synthetic vintages; returns their realtime starts."""
+    rng = random.Random(args.seed)
+    first_day = datetime(2024, 1, 1) - timedelta(days=observations)
+    starts = [datetime(2024, 1, 1) + timedelta(days=30 * i) for i in range(args.snapshots)]
+    session = database.get_session()
+    try:
+        for s in range(series):
+            series_id = f"VINTAGE{s:04d}"
+            values = [100.0 + rng.random() for _ in range(observations)]
+            for i, start in enumerate(starts):
+                if i:
+                    for offset in range(max(observations - args.window, 0), observations):
+                        if rng.random() < args.revision_rate:
+                            values[offset] = round(values[offset] + rng.uniform(-0.5, 0.5), 3)
+                points = ({'date': first_day + timedelta(days=d), 'value': values[d]} for d in range(observations))
+                vintage.record_vintage(session, series_id, points, start)
+            session.commit()
+    finally:
+        session.close()
+    return starts
+
+def run_scale(series: int, observations: int, args) -> Dict:
+    with tempfile.TemporaryDirectory() as tmp:
+        database.configure_database(os.path.join(tmp, 'fred_data.db'))
+        database.init_db()
+        starts = _load(series, observations, args)
+        session = database.get_read_session()
+        try:
+            rows = session.execute(text('SELECT COUNT(*) FROM fred_vintages')).scalar()
+            plan = session.execute(text(
+                'EXPLAIN QUERY PLAN ' + vintage._AS_OF.text), {'series_key': 1, 't': 0}).all()
+            year_ago = datetime(2024, 1, 1) - timedelta(days=365)
+            queries = {}
+            ids = [f"VINTAGE{random.randrange(series):04d}" for _ in range(args.repeat)]
+            for label, as_of in (('latest', starts[-1]), ('middle', starts[len(starts) // 2]), ('first', starts[0])):
+                queries[f'as_of.{label}.full'] = _measure(
+                    lambda i: vintage.as_of(session, ids[i], as_of), args.repeat)
+                queries[f'as_of.{label}.last_year'] = _measure(
+                    lambda i: vintage.as_of(session, ids[i], as_of, start_date=year_ago), args.repeat)
+        finally:
+            session.close()
+        with database.engine.connect() as conn:
+            conn.execute(text('PRAGMA wal_checkpoint(TRUNCATE)'))
+        size = os.path.getsize(database.DB_PATH)
+        database.engine.dispose()
+        database.read_engine.dispose()
+
+    return {
+        'rows': rows,
+        'full_snapshot_rows': series * observations * args.snapshots,
+        'bytes': size,
+        'plan': [row[-1] for row in plan],
+        'queries': queries,
+    }
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--scales', type=parse_scales, default=parse_scales('10x1000,50x10000'))
+    parser.add_argument('--snapshots', type=int, default=24)
+    parser.add_argument('--window', type=int, default=24, help='trailing observations open to revision')
+    parser.add_argument('--revision-rate', type=float, default=0.25)
+    parser.add_argument('--repeat', type=int, default=20)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    configured, configured_profile = database.DB_PATH, database.ENGINE_PROFILE
+    results = {'revision': _revision(), 'config': {**vars(args), 'scales': args.scales}, 'scales': {}}
+    try:
+        for series, observations in args.scales:
+            print(f"Running {series} series x {observations} observations...", file=sys.stderr)
+            results['scales'][f"{series}x{observations}"] = run_scale(series, observations, args)
+    finally:
+        database.configure_database(configured, configured_profile)
+    print(json.dumps(results, indent=2))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,149 @@
+"""
+Write throughput with per-caller commits versus the single-writer queue.
+
+For each caller count in ``--callers`` and batch size in ``--batch-sizes``,
+caller threads each write ``--writes`` batches of new observations to
+their own series into a scratch database:
+
+    direct   every batch opens a session and commits it
+             (``write_series_data`` + ``commit``)
+    queued   every batch is submitted to a ``WriteQueue`` and the caller
+             waits on its future
+
+Reported per mode: batches and observations per second, caller latency
+percentiles, commits issued and "database is locked" failures.
+
+Example:
+    python -m backend.benchmarks.bench_write_queue --callers 1 4 16 \\
+        --batch-sizes 1 10 100 --writes 50 [--profile legacy]
+"""
+
+import argparse
+import json
+import logging
+import os
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Dict, List
+
+from sqlalchemy import event
+from sqlalchemy.exc import OperationalError
+
+from backend import database
+from backend.benchmarks.bench_hot_paths import _revision
+from backend.benchmarks.bench_serving import _percentile
+from backend.storage.sqlite_engine import PROFILES
+from backend.storage.write_queue import WriteQueue
+
+def _points(start: int, batch: int) -> List[Dict]:
+    day = datetime(2000, 1, 1)
+    return [{'date': day + timedelta(days=start + i), 'value': float(start + i)} for i in range(batch)]
+
+def _direct(series_id: str, points: List[Dict]) -> None:
+    session = database.get_session()
+    try:
+        database.write_series_data(session, series_id, points, {})
+        session.commit()
+    except Exception:
+        session.rollback()
+        raise
+    finally:
+        session.close()
+
+def _count_commits(engine, profile, commits: List[int]) -> None:
+    """Append to ``commits`` for every transaction committed on ``engine``.
+
+    Without explicit transaction control (a shared pool) pysqlite commits
+    each released savepoint on its own, so those count as commits too and
+    the session's final commit usually has nothing left to commit.
+    """
+    def commit(connection):
+        if connection.connection.dbapi_connection.in_transaction:
+            commits.append(1)
+    event.listen(engine, 'commit', commit)
+    if profile.shared_pool:
+        event.listen(engine, 'release_savepoint', lambda connection, name, context: commits.append(1))
+
+def run_once(mode: str, callers: int, batch: int, writes: int, profile) -> Dict:
+    """Run one mode at one caller count and batch size on a fresh database."""
+    with tempfile.TemporaryDirectory() as tmp:
+        database.configure_database(os.path.join(tmp, 'fred_data.db'), profile)
+        database.init_db()
+        write_queue = WriteQueue() if mode == 'queued' else None
+        latencies: List[float] = []
+        errors: List[int] = []
+        commits: List[int] = []
+        _count_commits(database.engine, profile, commits)
+
+        def caller(index: int) -> None:
+            series_id = f"CALLER{index:03d}"
+            for i in range(writes):
+                points = _points(i * batch, batch)
+                start = time.perf_counter()
+                try:
+                    if write_queue is None:
+                        _direct(series_id, points)
+                    else:
+                        write_queue.submit(database.write_series_data, series_id, points, {}).result()
+                    latencies.append(time.perf_counter() - start)
+                except OperationalError:
+                    errors.append(1)
+
+        threads = [threading.Thread(target=caller, args=(i,)) for i in range(callers)]
+        started = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - started
+        if write_queue is not None:
+            write_queue.close()
+        database.engine.dispose()
+        database.read_engine.dispose()
+
+    latencies.sort()
+    return {
+        'batches_per_second': round(len(latencies) / elapsed, 1),
+        'observations_per_second': round(len(latencies) * batch / elapsed, 1),
+        'p50_ms': round(_percentile(latencies, 50) * 1000, 2),
+        'p95_ms': round(_percentile(latencies, 95) * 1000, 2),
+        'commits': len(commits),
+        'errors': len(errors),
+    }
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--callers', type=int, nargs='+', default=[1, 4, 16])
+    parser.add_argument('--batch-sizes', type=int, nargs='+', default=[1, 10, 100])
+    parser.add_argument('--writes', type=int, default=50, help='batches per caller')
+    parser.add_argument('--profile', choices=sorted(PROFILES), default='wal', help='SQLite engine profile')
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    configured, configured_profile = database.DB_PATH, database.ENGINE_PROFILE
+    profile = PROFILES[args.profile]
+    results = []
+    try:
+        for callers in args.callers:
+            for batch in args.batch_sizes:
+                print(f"Running {callers} callers x batches of {batch}...", file=sys.stderr)
+                results.append({
+                    'callers': callers,
+                    'batch': batch,
+                    'direct': run_once('direct', callers, batch, args.writes, profile),
+                    'queued': run_once('queued', callers, batch, args.writes, profile),
+                })
+    finally:
+        database.configure_database(configured, configured_profile)
+    print(json.dumps({
+        'revision': _revision(),
+        'profile': args.profile,
+        'writes_per_caller': args.writes,
+        'results': results,
+    }, indent=2))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,320 @@
+"""
+Local stand-ins for the FRED and Anthropic APIs.
+
+``FakeFRED`` answers ``/fred/series/observations`` and ``/fred/series`` with
+XML in the format ``fredapi`` parses; ``FakeAnthropic`` answers
+``/v1/messages`` with JSON in the format the ``anthropic`` SDK expects. Both
+inject latency, server errors and rate-limit responses according to a
+``FaultProfile`` and count every response by endpoint and status.
+
+The app is pointed at them with ``FRED_API_URL`` and ``ANTHROPIC_BASE_URL``.
+They can also be run on their own, e.g. for manual testing:
+
+    python -m backend.benchmarks.fake_services --fred-port 8081 \\
+        --anthropic-port 8082 --latency-ms 50 --error-rate 0.01
+"""
+
+import argparse
+import json
+import random
+import threading
+import time
+from collections import Counter
+from datetime import date, datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, NamedTuple, Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+from xml.sax.saxutils import quoteattr
+
+HISTORY_START = date(2000, 1, 1)
+
+class FaultProfile(NamedTuple):
+    """Latency and failure injection applied to every request."""
+    latency_ms: float = 0.0
+    jitter_ms: float = 0.0
+    error_rate: float = 0.0
+    rate_limit_rate: float = 0.0
+    retry_after: int = 1
+    seed: int = 0
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send(self, status: int, body: bytes, content_type: str, headers: Dict[str, str] = None) -> None:
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+class _FakeServer:
+    """A threaded HTTP server with fault injection and response counting."""
+
+    handler_class = _Handler
+
+    def __init__(self, faults: FaultProfile = None, host: str = '127.0.0.1', port: int = 0):
+        self.faults = faults or FaultProfile()
+        self._rng = random.Random(self.faults.seed)
+        self._lock = threading.Lock()
+        self._responses = Counter()
+        self._httpd = ThreadingHTTPServer((host, port), self.handler_class)
+        self._httpd.daemon_threads = True
+        self._httpd.fake = self
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> '_FakeServer':
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def inject(self) -> Optional[str]:
+        """Sleep for the configured latency and pick an injected failure, if any.
+
+        Returns ``'rate_limit'``, ``'error'`` or ``None``.
+        """
+        with self._lock:
+            jitter = self._rng.uniform(-1, 1) * self.faults.jitter_ms
+            roll = self._rng.random()
+        delay = max(0.0, self.faults.latency_ms + jitter) / 1000
+        if delay:
+            time.sleep(delay)
+        if roll < self.faults.rate_limit_rate:
+            return 'rate_limit'
+        if roll < self.faults.rate_limit_rate + self.faults.error_rate:
+            return 'error'
+        return None
+
+    def record(self, endpoint: str, status: int) -> None:
+        with self._lock:
+            self._responses[(endpoint, status)] += 1
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        """Response counts as ``{endpoint: {status: count}}``."""
+        with self._lock:
+            items = list(self._responses.items())
+        result: Dict[str, Dict[str, int]] = {}
+        for (endpoint, status), count in sorted(items):
+            result.setdefault(endpoint, {})[str(status)] = count
+        return result
+
+class _FREDHandler(_Handler):
+    def do_GET(self):
+        fake: FakeFRED = self.server.fake
+        request = urlparse(self.path)
+        params = {key: values[0] for key, values in parse_qs(request.query).items()}
+        endpoint = request.path.rstrip('/')
+
+        if endpoint not in ('/fred/series/observations', '/fred/series'):
+            status, body = 404, fake.error_xml(404, 'Not Found.')
+        elif not params.get('series_id') or not params.get('api_key'):
+            status, body = 400, fake.error_xml(400, 'Bad Request.  Variable series_id and api_key are required.')
+        else:
+            failure = fake.inject()
+            if failure == 'rate_limit':
+                status, body = 429, fake.error_xml(429, 'Too Many Requests.  Exceeded Rate Limit')
+            elif failure == 'error':
+                status, body = 500, fake.error_xml(500, 'Internal Server Error.')
+            elif endpoint == '/fred/series':
+                status, body = 200, fake.series_xml(params['series_id'])
+            else:
+                status, body = 200, fake.observations_xml(
+                    params['series_id'], params.get('observation_start'), params.get('observation_end')
+                )
+
+        fake.record(endpoint, status)
+        self._send(status, body, 'text/xml; charset=UTF-8')
+
+class FakeFRED(_FakeServer):
+    """FRED stand-in serving deterministic daily random walks for any series ID.
+
+    History starts on 2000-01-01 and runs to today. With ``release_interval``
+    set, one further day of observations is "released" every that many
+    seconds, so repeated updates keep finding new data.
+    """
+
+    handler_class = _FREDHandler
+
+    def __init__(self, faults: FaultProfile = None, release_interval: float = 0.0, **kwargs):
+        super().__init__(faults, **kwargs)
+        self.release_interval = release_interval
+        self._started = time.monotonic()
+        self._history: Dict[str, List[Tuple[date, float]]] = {}
+
+    def today(self) -> date:
+        """The latest observation date currently published."""
+        released = 0
+        if self.release_interval > 0:
+            released = int((time.monotonic() - self._started) // self.release_interval)
+        return date.today() + timedelta(days=released)
+
+    def _series_history(self, series_id: str, until: date) -> List[Tuple[date, float]]:
+        with self._lock:
+            history = self._history.get(series_id)
+            if history is None or history[-1][0] < until:
+                rng = random.Random(f"{self.faults.seed}:{series_id}")
+                value = rng.uniform(50, 500)
+                history = []
+                for day in range((until - HISTORY_START).days + 366):
+                    value = max(1.0, value * (1 + rng.gauss(0.0001, 0.002)))
+                    history.append((HISTORY_START + timedelta(days=day), value))
+                self._history[series_id] = history
+        return history
+
+    def observations_xml(self, series_id: str, start: str = None, end: str = None) -> bytes:
+        today = self.today()
+        start_date = datetime.strptime(start, '%Y-%m-%d').date() if start else HISTORY_START
+        end_date = min(datetime.strptime(end, '%Y-%m-%d').date(), today) if end else today
+        points = [
+            (day, value) for day, value in self._series_history(series_id, today)
+            if start_date <= day <= end_date
+        ]
+        rows = ''.join(
+            f'<observation realtime_start="{today}" realtime_end="{today}" '
+            f'date="{day}" value="{value:.3f}"/>'
+            for day, value in points
+        )
+        return (
+            '<?xml version="1.0" encoding="utf-8" ?>'
+            f'<observations realtime_start="{today}" realtime_end="{today}" '
+            f'observation_start="{start_date}" observation_end="{end_date}" units="lin" '
+            f'output_type="1" file_type="xml" order_by="observation_date" sort_order="asc" '
+            f'count="{len(points)}" offset="0" limit="100000">{rows}</observations>'
+        ).encode('utf-8')
+
+    def series_xml(self, series_id: str) -> bytes:
+        today = self.today()
+        return (
+            '<?xml version="1.0" encoding="utf-8" ?>'
+            f'<seriess realtime_start="{today}" realtime_end="{today}">'
+            f'<series id={quoteattr(series_id)} realtime_start="{today}" realtime_end="{today}" '
+            f'title={quoteattr(f"Synthetic series {series_id}")} observation_start="{HISTORY_START}" '
+            f'observation_end="{today}" frequency="Daily" frequency_short="D" units="Index" '
+            f'units_short="Index" seasonal_adjustment="Not Seasonally Adjusted" '
+            f'seasonal_adjustment_short="NSA" last_updated="{today} 07:31:02-05" popularity="50"/>'
+            '</seriess>'
+        ).encode('utf-8')
+
+    @staticmethod
+    def error_xml(code: int, message: str) -> bytes:
+        return (
+            '<?xml version="1.0" encoding="utf-8" ?>'
+            f'<error code="{code}" message={quoteattr(message)}/>'
+        ).encode('utf-8')
+
+class _AnthropicHandler(_Handler):
+    def do_POST(self):
+        fake: FakeAnthropic = self.server.fake
+        endpoint = urlparse(self.path).path
+        length = int(self.headers.get('Content-Length') or 0)
+        try:
+            request = json.loads(self.rfile.read(length) or b'{}')
+        except ValueError:
+            request = None
+
+        headers = {'request-id': f"req_fake_{time.monotonic_ns()}"}
+        if endpoint != '/v1/messages':
+            status, body = 404, fake.error_json('not_found_error', 'Not found')
+        elif not isinstance(request, dict) or not request.get('messages'):
+            status, body = 400, fake.error_json('invalid_request_error', 'messages: field required')
+        else:
+            failure = fake.inject()
+            if failure == 'rate_limit':
+                status, body = 429, fake.error_json('rate_limit_error', 'Number of requests has exceeded your rate limit')
+                headers['retry-after'] = str(fake.faults.retry_after)
+            elif failure == 'error':
+                status, body = 500, fake.error_json('api_error', 'Internal server error')
+            else:
+                status, body = 200, fake.message_json(request)
+
+        fake.record(endpoint, status)
+        self._send(status, body, 'application/json', headers)
+
+class FakeAnthropic(_FakeServer):
+    """Anthropic Messages API stand-in returning canned analyses."""
+
+    handler_class = _AnthropicHandler
+
+    def __init__(self, faults: FaultProfile = None, output_tokens: int = 300, **kwargs):
+        super().__init__(faults, **kwargs)
+        self.output_tokens = output_tokens
+
+    def message_json(self, request: Dict) -> bytes:
+        prompt = ''.join(
+            message['content'] if isinstance(message.get('content'), str) else json.dumps(message.get('content'))
+            for message in request['messages']
+        )
+        text = ("Synthetic analysis. " * (self.output_tokens // 3 + 1))[:self.output_tokens * 4]
+        return json.dumps({
+            'id': f"msg_fake_{time.monotonic_ns()}",
+            'type': 'message',
+            'role': 'assistant',
+            'model': request.get('model', 'fake'),
+            'content': [{'type': 'text', 'text': text}],
+            'stop_reason': 'end_turn',
+            'stop_sequence': None,
+            'usage': {'input_tokens': len(prompt) // 4, 'output_tokens': self.output_tokens},
+        }).encode('utf-8')
+
+    @staticmethod
+    def error_json(error_type: str, message: str) -> bytes:
+        return json.dumps({'type': 'error', 'error': {'type': error_type, 'message': message}}).encode('utf-8')
+
+def add_fault_arguments(parser: argparse.ArgumentParser) -> None:
+    """Command-line options shared by scripts that start the fakes."""
+    parser.add_argument('--latency-ms', type=float, default=0.0, help='added latency per upstream request')
+    parser.add_argument('--jitter-ms', type=float, default=0.0, help='uniform +/- jitter on the latency')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='fraction of upstream requests answered 500')
+    parser.add_argument('--rate-limit-rate', type=float, default=0.0, help='fraction answered 429')
+    parser.add_argument('--release-interval', type=float, default=0.0,
+                        help='seconds between new daily FRED observations (0 disables)')
+    parser.add_argument('--seed', type=int, default=0)
+
+def fault_profile(args: argparse.Namespace) -> FaultProfile:
+    return FaultProfile(
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        error_rate=args.error_rate,
+        rate_limit_rate=args.rate_limit_rate,
+        seed=args.seed,
+    )
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--fred-port', type=int, default=8081)
+    parser.add_argument('--anthropic-port', type=int, default=8082)
+    add_fault_arguments(parser)
+    args = parser.parse_args()
+
+    faults = fault_profile(args)
+    with FakeFRED(faults, args.release_interval, port=args.fred_port) as fred, \
+            FakeAnthropic(faults, port=args.anthropic_port) as claude:
+        print(f"FRED_API_URL={fred.url}/fred")
+        print(f"ANTHROPIC_BASE_URL={claude.url}")
+        try:
+            while True:
+                time.sleep(3600)
+        except KeyboardInterrupt:
+            print(json.dumps({'fred': fred.stats(), 'anthropic': claude.stats()}, indent=2))
+
+if __name__ == '__main__':
+    main()
@@ -1,13 +1,10 @@
 import os
+import tempfile
 from dotenv import load_dotenv
 import logging
 from typing import List
+from backend.core.structured_logging import parse_sample_rates
 
-# Configure logging
-logging.basicConfig(
-    level=logging.DEBUG,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
 logger = logging.getLogger(__name__)
 
 class ConfigurationError(Exception):
@@ -21,10 +18,17 @@ def validate_environment() -> None:
     if missing_vars:
         raise ConfigurationError(f"Missing required environment variables: {', '.join(missing_vars)}")
 
-def init_environment() -> None:
-    """Initialize and validate environment variables."""
+def init_environment(require_credentials: bool = True) -> None:
+    """Initialize and validate environment variables.
+
+    Read-only replicas never call FRED or Anthropic and pass
+    ``require_credentials=False`` to skip API key validation.
+    """
     logger.info("Loading environment variables...")
     load_dotenv(override=True)
+    if not require_credentials:
+        logger.info("Skipping API credential validation (read-only mode)")
+        return
     try:
         validate_environment()
         logger.info("Environment variables loaded and validated:")
@@ -38,14 +42,96 @@ def init_environment() -> None:
         logger.error(f"Environment validation failed: {str(e)}")
         raise
 
+def _env_flag(name: str, default: bool) -> bool:
+    """Read a boolean flag from the environment."""
+    value = os.environ.get(name)
+    if value is None:
+        return default
+    return value.strip().lower() in ('1', 'true', 'yes', 'on')
+
 class AppConfig:
     """Application configuration settings."""
-    DEBUG: bool = True
-    HOST: str = '0.0.0.0'
-    PORT: int = 5003
-    RATE_LIMIT_DEFAULT: str = "1 per second"
-    RATE_LIMIT_STORAGE: str = "memory://"
+    DEBUG: bool = _env_flag('FLASK_DEBUG', True)
+    HOST: str = os.environ.get('HOST', '0.0.0.0')
+    PORT: int = int(os.environ.get('PORT', 5003))
+    RATE_LIMIT_DEFAULT: str = os.environ.get('RATE_LIMIT_DEFAULT', "5 per second")
+    # Shared by all workers on the host, outside the source tree; use
+    # "memory://" for per-process limits
+    RATE_LIMIT_STORAGE: str = os.environ.get(
+        'RATE_LIMIT_STORAGE',
+        f"sqlite:///{os.path.join(tempfile.gettempdir(), 'trumptracker-rate-limits.db')}"
+    )
+    RATE_LIMIT_ENABLED: bool = _env_flag('RATELIMIT_ENABLED', True)
+    # Budget consumed per request by endpoint (default 1). Must not exceed the
+    # smallest limit above or the endpoint can never be called.
+    RATE_LIMIT_COSTS = {
+        'api.initialize_data': 5,
+        'api.update_data': 5,
+        'api.backup_data': 3
+    }
     CORS_ENABLED: bool = True
+
+    # Logging (see backend/core/structured_logging.py). Sample rates are
+    # comma-separated "key=rate" pairs, e.g. "INFO=0.1,DEBUG=0.01"
+    LOG_LEVEL: str = os.environ.get('LOG_LEVEL', 'INFO')
+    LOG_FORMAT: str = os.environ.get('LOG_FORMAT', 'json')
+    LOG_SAMPLE_RATES = parse_sample_rates(os.environ.get('LOG_SAMPLE_RATES', ''))
+    LOG_ROUTE_SAMPLE_RATES = parse_sample_rates(os.environ.get('LOG_ROUTE_SAMPLE_RATES', ''))
+
+    # On-demand profiling (see backend/core/profiling.py). Requests are only
+    # profiled when enabled and the X-Admin-Token header matches.
+    PROFILING_ENABLED: bool = _env_flag('PROFILING_ENABLED', False)
+    ADMIN_TOKEN: str = os.environ.get('ADMIN_TOKEN', '')
+    PROFILE_MODE: str = os.environ.get('PROFILE_MODE', 'sampling')
+    PROFILE_SAMPLE_INTERVAL: float = float(os.environ.get('PROFILE_SAMPLE_INTERVAL', 0.001))
+    PROFILE_DIR: str = os.environ.get(
+        'PROFILE_DIR',
+        os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'profiles')
+    )
+    PROFILE_MAX_ARTIFACTS: int = int(os.environ.get('PROFILE_MAX_ARTIFACTS', 50))
+    PROFILE_INGEST: bool = _env_flag('PROFILE_INGEST', False)
+
+    # Span tracing of ingest runs (see backend/core/tracing.py)
+    TRACING_ENABLED: bool = _env_flag('TRACING_ENABLED', False)
+    TRACE_EXPORT_PATH: str = os.environ.get(
+        'TRACE_EXPORT_PATH',
+        os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'traces', 'spans.jsonl')
+    )
+
+    # Columnar series cache (see backend/storage/columnar.py), synced by
+    # ingest and read by get_inflation_metrics instead of the database
+    SERIES_CACHE_ENABLED: bool = _env_flag('SERIES_CACHE_ENABLED', False)
+
+    # Hand ingest and analysis writes to one writer thread per process
+    # (see backend/storage/write_queue.py)
+    WRITE_QUEUE_ENABLED: bool = _env_flag('WRITE_QUEUE_ENABLED', False)
+
+    # Re-fetch each series' trailing window on update (REVISION_WINDOW_DAYS in
+    # backend/services/config.py) and write it only when its digest changed
+    REVISION_CHECK_ENABLED: bool = _env_flag('REVISION_CHECK_ENABLED', False)
+
+    # Skip series whose latest release is already stored (release rules in
+    # backend/services/registry.py); off, every update fetches every series
+    RELEASE_RULES_ENABLED: bool = _env_flag('RELEASE_RULES_ENABLED', True)
+
+    # Keep every published value with its realtime span (see
+    # backend/storage/vintage.py); implies the revision check
+    VINTAGES_ENABLED: bool = _env_flag('VINTAGES_ENABLED', False)
+
+    # Ingest the related series of each registered series in rate-limited
+    # waves and report them as components (see backend/services/families.py)
+    FAMILY_INGEST_ENABLED: bool = _env_flag('FAMILY_INGEST_ENABLED', False)
+
+    # Read-only replicas serve the metrics snapshot without upstream clients
+    READ_ONLY: bool = _env_flag('READ_ONLY', False)
+
+    # Production WSGI server (see backend/gunicorn.conf.py)
+    WORKERS: int = int(os.environ.get('WEB_CONCURRENCY', (os.cpu_count() or 1) * 2 + 1))
+    THREADS: int = int(os.environ.get('GUNICORN_THREADS', 4))
+    WORKER_TIMEOUT: int = int(os.environ.get('GUNICORN_TIMEOUT', 120))
+    GRACEFUL_TIMEOUT: int = int(os.environ.get('GUNICORN_GRACEFUL_TIMEOUT', 30))
+    MAX_REQUESTS: int = int(os.environ.get('GUNICORN_MAX_REQUESTS', 1000))
+    MAX_REQUESTS_JITTER: int = int(os.environ.get('GUNICORN_MAX_REQUESTS_JITTER', 100))
     
     # Security Headers
     SECURITY_HEADERS = {
@@ -23,6 +23,14 @@ class BackupError(Exception):
     """Error in backup operation."""
     pass
 
+class ReadOnlyError(Exception):
+    """Write operation attempted on a read-only instance."""
+    pass
+
+class AuthorizationError(Exception):
+    """Request lacks the credentials required for an admin operation."""
+    pass
+
 def create_error_response(error: str, message: str, status: str = 'Error') -> Dict[str, Any]:
     """Create a standardized error response."""
     return {
@@ -56,6 +64,12 @@ def handle_errors(f):
                 'Processing failed',
                 str(e)
             )), 422
+        except (ReadOnlyError, AuthorizationError) as e:
+            logger.warning(f"Forbidden request: {str(e)}")
+            return jsonify(create_error_response(
+                'Forbidden',
+                str(e)
+            )), 403
         except BackupError as e:
             logger.error(f"Backup error: {str(e)}")
             return jsonify(create_error_response(
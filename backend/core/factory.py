@@ -4,22 +4,44 @@ from flask_limiter import Limiter
 from flask_limiter.util import get_remote_address
 from backend.core.config import AppConfig
 from backend.core.exceptions import handle_rate_limit_exceeded
+from backend.core.rate_limit import endpoint_cost
 from backend.middleware.security import add_security_headers, log_request_info
-from backend.api.routes import api
+from backend.middleware.metrics import start_request_timer, record_request_metrics, metrics_endpoint
+from backend.middleware.profiling import (
+    start_request_profile,
+    finish_request_profile,
+    teardown_request_profile
+)
+from backend.api.admin import admin
+from typing import Optional
+
+def create_app(read_only: Optional[bool] = None) -> Flask:
+    """Create and configure the Flask application.
+
+    In read-only mode only the snapshot-backed routes are registered, so the
+    services stack (FRED, Anthropic, pandas) is never imported.
+    """
+    if read_only is None:
+        read_only = AppConfig.READ_ONLY
+    if read_only:
+        from backend.api.readonly import api
+    else:
+        from backend.api.routes import api
 
-def create_app() -> Flask:
-    """Create and configure the Flask application."""
     app = Flask(__name__)
+    app.config['READ_ONLY'] = read_only
     
     # Configure CORS
     if AppConfig.CORS_ENABLED:
         CORS(app)
     
     # Configure rate limiting
+    app.config.setdefault('RATELIMIT_ENABLED', AppConfig.RATE_LIMIT_ENABLED)
     limiter = Limiter(
         app=app,
         key_func=get_remote_address,
-        default_limits=["5 per second"],  # More lenient default limit
+        default_limits=[AppConfig.RATE_LIMIT_DEFAULT],
+        default_limits_cost=endpoint_cost(AppConfig.RATE_LIMIT_COSTS),
         storage_uri=AppConfig.RATE_LIMIT_STORAGE
     )
     
@@ -27,10 +49,19 @@ def create_app() -> Flask:
     app.errorhandler(429)(handle_rate_limit_exceeded)
     
     # Register middleware
+    app.before_request(start_request_profile)
+    app.after_request(finish_request_profile)
+    app.teardown_request(teardown_request_profile)
+    app.before_request(start_request_timer)
+    app.after_request(record_request_metrics)
     app.after_request(add_security_headers)
     app.before_request(log_request_info)
+
+    # Prometheus scrape endpoint, exempt from rate limiting
+    app.add_url_rule('/metrics', 'metrics', limiter.exempt(metrics_endpoint))
     
     # Register blueprints
     app.register_blueprint(api, url_prefix='/api')
+    app.register_blueprint(admin, url_prefix='/api')
     
     return app
@@ -0,0 +1,241 @@
+"""
+In-process metrics with a Prometheus text exposition endpoint.
+
+A deliberately small, dependency-free subset of the Prometheus client:
+counters and fixed-bucket histograms with labels. Recording an observation
+on a labelled child is a bisect and two in-place additions, a few hundred
+nanoseconds. Updates rely on the GIL instead of a lock: an increment can
+in principle be lost on a free-threaded interpreter, which is acceptable for
+monitoring data and keeps locks off the hot path.
+
+Metrics are per process; with several gunicorn workers each scrape returns
+the counters of the worker that served it (``pid`` is exported so series
+from different workers stay distinct).
+
+Usage:
+    HTTP_REQUEST_SECONDS.labels('api.get_inflation_data', 'GET').observe(0.012)
+
+    @timed(DB_QUERY_SECONDS, 'get_series_data')
+    def get_series_data(...): ...
+"""
+
+import os
+import threading
+import time
+from bisect import bisect_left
+from functools import wraps
+from typing import Dict, List, Sequence, Tuple
+
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+def _escape(value: str) -> str:
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: Tuple = ()) -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    pairs.extend(f'{name}="{_escape(value)}"' for name, value in extra)
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+class _CounterChild:
+    __slots__ = ('value',)
+
+    def __init__(self):
+        self.value = 0.0
+
+    def inc(self, amount: float = 1.0) -> None:
+        self.value += amount
+
+class _HistogramChild:
+    __slots__ = ('bounds', 'counts', 'sum')
+
+    def __init__(self, bounds: Tuple[float, ...]):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.sum += value
+
+    def time(self) -> '_Timer':
+        """Context manager observing the elapsed wall time in seconds."""
+        return _Timer(self)
+
+class _Timer:
+    __slots__ = ('child', 'start')
+
+    def __init__(self, child: _HistogramChild):
+        self.child = child
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.child.observe(time.perf_counter() - self.start)
+        return False
+
+class _Metric:
+    """Base class holding labelled children."""
+
+    kind = ''
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 registry: 'Registry' = None):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children: Dict[Tuple[str, ...], object] = {}
+        self._lock = threading.Lock()
+        (registry or REGISTRY).register(self)
+
+    def _new_child(self):
+        raise NotImplementedError
+
+    def labels(self, *values: str):
+        child = self._children.get(values)
+        if child is None:
+            if len(values) != len(self.labelnames):
+                raise ValueError(f"{self.name} expects labels {self.labelnames}, got {values}")
+            with self._lock:
+                child = self._children.setdefault(values, self._new_child())
+        return child
+
+    def render(self) -> List[str]:
+        raise NotImplementedError
+
+class Counter(_Metric):
+    """A monotonically increasing count."""
+
+    kind = 'counter'
+
+    def _new_child(self) -> _CounterChild:
+        return _CounterChild()
+
+    def inc(self, amount: float = 1.0) -> None:
+        """Increment the unlabelled counter."""
+        self.labels().inc(amount)
+
+    def render(self) -> List[str]:
+        pid = (('pid', os.getpid()),)
+        return [
+            f"{self.name}{_format_labels(self.labelnames, values, pid)} {child.value}"
+            for values, child in list(self._children.items())
+        ]
+
+class Histogram(_Metric):
+    """Observations counted into fixed cumulative buckets."""
+
+    kind = 'histogram'
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS, registry: 'Registry' = None):
+        self.buckets = tuple(sorted(buckets))
+        super().__init__(name, documentation, labelnames, registry)
+
+    def _new_child(self) -> _HistogramChild:
+        return _HistogramChild(self.buckets)
+
+    def observe(self, value: float) -> None:
+        """Observe a value on the unlabelled histogram."""
+        self.labels().observe(value)
+
+    def render(self) -> List[str]:
+        lines = []
+        pid = ('pid', os.getpid())
+        for values, child in list(self._children.items()):
+            counts, total = list(child.counts), child.sum
+            count = sum(counts)
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (float('inf'),), counts):
+                cumulative += bucket_count
+                le = '+Inf' if bound == float('inf') else repr(bound)
+                labels = _format_labels(self.labelnames, values, (pid, ('le', le)))
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            labels = _format_labels(self.labelnames, values, (pid,))
+            lines.append(f"{self.name}_sum{labels} {total}")
+            lines.append(f"{self.name}_count{labels} {count}")
+        return lines
+
+class Registry:
+    """Collection of metrics rendered together on ``/metrics``."""
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+
+    def register(self, metric: _Metric) -> None:
+        if metric.name in self._metrics:
+            raise ValueError(f"Duplicate metric name: {metric.name}")
+        self._metrics[metric.name] = metric
+
+    def render(self) -> str:
+        """Render all metrics in the Prometheus text exposition format."""
+        lines = []
+        for metric in self._metrics.values():
+            lines.append(f"# HELP {metric.name} {metric.documentation}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            lines.extend(metric.render())
+        return '\n'.join(lines) + '\n'
+
+REGISTRY = Registry()
+
+def timed(histogram: Histogram, *labels: str):
+    """Decorator observing a function's wall time on ``histogram``."""
+    child = histogram.labels(*labels)
+
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                child.observe(time.perf_counter() - start)
+        return wrapper
+    return decorator
+
+# Flask routes
+HTTP_REQUEST_SECONDS = Histogram(
+    'http_request_duration_seconds', 'Flask request latency.', ('endpoint', 'method'))
+HTTP_REQUESTS_TOTAL = Counter(
+    'http_requests_total', 'Flask requests by status code.', ('endpoint', 'method', 'status'))
+
+# Database
+DB_QUERY_SECONDS = Histogram(
+    'db_query_duration_seconds', 'Latency of database operations.', ('operation',))
+
+DB_WRITE_FLUSH_SECONDS = Histogram(
+    'db_write_flush_duration_seconds', 'Latency of write queue flush transactions.')
+DB_WRITE_FLUSH_BATCHES = Histogram(
+    'db_write_flush_batches', 'Write batches committed per flush.',
+    buckets=(1, 2, 5, 10, 20, 50, 100, 200, 500, 1000))
+DB_WRITE_BATCHES_TOTAL = Counter(
+    'db_write_batches_total', 'Write queue batches by outcome.', ('result',))
+DB_BACKUP_SECONDS = Histogram(
+    'db_backup_duration_seconds', 'Duration of online database backups, including verification.')
+DB_BACKUPS_TOTAL = Counter(
+    'db_backups_total', 'Database backups by outcome.', ('result',))
+
+# Ingest
+INGEST_SERIES_UPDATES_TOTAL = Counter(
+    'ingest_series_updates_total', 'Series checked by update_daily_data by outcome.', ('result',))
+INGEST_FAMILY_MEMBERS_TOTAL = Counter(
+    'ingest_family_members_total', 'Family member series ingested by outcome.', ('result',))
+INGEST_FAMILY_WAVE_SECONDS = Histogram(
+    'ingest_family_wave_duration_seconds', 'Duration of one family ingest wave, fetch and store.', ('family',))
+
+# Upstream APIs
+FRED_REQUEST_SECONDS = Histogram(
+    'fred_request_duration_seconds', 'Latency of FRED API calls.', ('call',))
+FRED_ERRORS_TOTAL = Counter(
+    'fred_errors_total', 'Failed FRED API calls.', ('call',))
+ANTHROPIC_REQUEST_SECONDS = Histogram(
+    'anthropic_request_duration_seconds', 'Latency of Anthropic messages calls.', ('model',))
+ANTHROPIC_TOKENS_TOTAL = Counter(
+    'anthropic_tokens_total', 'Anthropic token usage.', ('model', 'type'))
+ANTHROPIC_ERRORS_TOTAL = Counter(
+    'anthropic_errors_total', 'Failed Anthropic calls by error type.', ('error',))
+
+# Caches
+ANALYSIS_CACHE_TOTAL = Counter(
+    'analysis_cache_requests_total', 'AnalysisCache lookups by result.', ('result',))
@@ -0,0 +1,195 @@
+"""
+On-demand profiling of single requests and ingest jobs.
+
+Two profilers are available:
+
+- ``sampling``: a background thread samples the target thread's stack every
+  ``PROFILE_SAMPLE_INTERVAL`` seconds and writes collapsed stacks
+  (``frame;frame;frame count``), the input format of ``flamegraph.pl``,
+  speedscope and inferno. Overhead is low and independent of call count;
+  resolution is bounded by the interpreter's GIL switch interval (5 ms by
+  default) for CPU-bound code.
+- ``deterministic``: ``cProfile`` with exact call counts, saved as a pstats
+  file for ``snakeviz``/``flameprof``.
+
+Artifacts are written to ``PROFILE_DIR`` and rotated to the newest
+``PROFILE_MAX_ARTIFACTS``.
+"""
+
+import cProfile
+import logging
+import os
+import re
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from backend.core.config import AppConfig
+
+logger = logging.getLogger(__name__)
+
+PROFILE_MODES = ('sampling', 'deterministic')
+_ARTIFACT_PATTERN = re.compile(r'^[\w.-]+\.(folded|prof)$')
+_active = threading.local()
+
+class ProfilingError(Exception):
+    """Error starting or storing a profile."""
+    pass
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+class SamplingProfiler:
+    """Sample one thread's call stack at a fixed interval."""
+
+    def __init__(self, thread_id: int, interval: float = None):
+        self.thread_id = thread_id
+        self.interval = interval or AppConfig.PROFILE_SAMPLE_INTERVAL
+        self.stacks: Counter = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name='sampling-profiler', daemon=True)
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None:
+                continue
+            stack = []
+            while frame is not None:
+                stack.append(_frame_label(frame))
+                frame = frame.f_back
+            self.stacks[';'.join(reversed(stack))] += 1
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join()
+
+    def write(self, path: str) -> None:
+        """Write collapsed stacks, one ``stack count`` line per unique stack."""
+        with open(path, 'w') as f:
+            for stack, count in self.stacks.most_common():
+                f.write(f"{stack} {count}\n")
+
+class DeterministicProfiler:
+    """Instrument every call on the current thread with cProfile."""
+
+    def __init__(self):
+        self.profile = cProfile.Profile()
+
+    def start(self) -> None:
+        self.profile.enable()
+
+    def stop(self) -> None:
+        self.profile.disable()
+
+    def write(self, path: str) -> None:
+        self.profile.dump_stats(path)
+
+class ProfileSession:
+    """A running profile that is saved as an artifact when finished."""
+
+    def __init__(self, name: str, mode: str = None):
+        mode = mode or AppConfig.PROFILE_MODE
+        if mode not in PROFILE_MODES:
+            raise ProfilingError(f"Unknown profile mode: {mode}")
+        self.name = re.sub(r'[^\w.-]+', '_', name).strip('_') or 'profile'
+        self.mode = mode
+        self.profiler = (
+            SamplingProfiler(threading.get_ident()) if mode == 'sampling' else DeterministicProfiler()
+        )
+        self.started_at = None
+        self.artifact: Optional[str] = None
+
+    def start(self) -> 'ProfileSession':
+        if getattr(_active, 'session', None) is not None:
+            raise ProfilingError("A profile is already running on this thread")
+        _active.session = self
+        self.started_at = time.perf_counter()
+        try:
+            self.profiler.start()
+        except BaseException:
+            # Leave the thread free for the next profile
+            _active.session = None
+            raise
+        return self
+
+    def finish(self) -> str:
+        """Stop profiling and store the artifact; returns its file name."""
+        if self.artifact is not None:
+            return self.artifact
+        try:
+            self.profiler.stop()
+        finally:
+            _active.session = None
+        elapsed_ms = (time.perf_counter() - self.started_at) * 1000
+        extension = 'folded' if self.mode == 'sampling' else 'prof'
+        stamp = datetime.now().strftime('%Y%m%d-%H%M%S-%f')
+        self.artifact = f"{stamp}-{self.name}.{extension}"
+
+        os.makedirs(AppConfig.PROFILE_DIR, exist_ok=True)
+        self.profiler.write(os.path.join(AppConfig.PROFILE_DIR, self.artifact))
+        _rotate_artifacts()
+        logger.info(f"Stored {self.mode} profile {self.artifact} ({elapsed_ms:.1f} ms)")
+        return self.artifact
+
+def is_profiling() -> bool:
+    """Whether a profile is already running on the current thread."""
+    return getattr(_active, 'session', None) is not None
+
+@contextmanager
+def profile_job(name: str, mode: str = None):
+    """Profile a block of work, e.g. an ingest job, and store the artifact.
+
+    Yields ``None`` without profiling when the enclosing request is already
+    being profiled.
+    """
+    if is_profiling():
+        yield None
+        return
+    session = ProfileSession(name, mode).start()
+    try:
+        yield session
+    finally:
+        session.finish()
+
+def _rotate_artifacts() -> None:
+    """Delete the oldest artifacts beyond ``PROFILE_MAX_ARTIFACTS``."""
+    artifacts = list_artifacts()
+    for artifact in artifacts[AppConfig.PROFILE_MAX_ARTIFACTS:]:
+        try:
+            os.remove(os.path.join(AppConfig.PROFILE_DIR, artifact['name']))
+        except OSError as e:
+            logger.warning(f"Could not remove profile {artifact['name']}: {str(e)}")
+
+def list_artifacts() -> List[Dict]:
+    """List stored profiles, newest first."""
+    if not os.path.isdir(AppConfig.PROFILE_DIR):
+        return []
+    artifacts = []
+    for entry in os.scandir(AppConfig.PROFILE_DIR):
+        if entry.is_file() and _ARTIFACT_PATTERN.match(entry.name):
+            stat = entry.stat()
+            artifacts.append({
+                'name': entry.name,
+                'format': 'collapsed-stacks' if entry.name.endswith('.folded') else 'pstats',
+                'size_bytes': stat.st_size,
+                'created': datetime.fromtimestamp(stat.st_mtime).isoformat()
+            })
+    return sorted(artifacts, key=lambda a: a['name'], reverse=True)
+
+def artifact_path(name: str) -> str:
+    """Resolve an artifact name to its path, rejecting anything unsafe."""
+    if not _ARTIFACT_PATTERN.match(name):
+        raise ProfilingError(f"Invalid profile name: {name}")
+    path = os.path.join(AppConfig.PROFILE_DIR, name)
+    if not os.path.isfile(path):
+        raise FileNotFoundError(name)
+    return path
@@ -0,0 +1,139 @@
+"""
+Shared rate-limit storage for flask-limiter.
+
+``memory://`` keeps counters inside each worker, so a "5 per second" limit
+becomes "5 per second per process" and resets on restart. ``SQLiteStorage``
+keeps fixed-window counters in a small local SQLite file in WAL mode that all
+workers on the host share. Each increment is a single atomic UPSERT inside an
+immediate transaction.
+
+Importing this module registers the ``sqlite://`` scheme with ``limits``:
+    Limiter(storage_uri='sqlite:////var/lib/trumptracker/rate_limits.db')
+"""
+
+import logging
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict
+from urllib.parse import urlparse
+
+from flask import request
+from limits.storage import Storage
+
+logger = logging.getLogger(__name__)
+
+class SQLiteStorage(Storage):
+    """Fixed-window rate-limit counters in a shared SQLite database."""
+
+    STORAGE_SCHEME = ['sqlite']
+
+    # Purge expired counters once every this many increments per process
+    PURGE_INTERVAL = 1000
+
+    def __init__(self, uri: str, wrap_exceptions: bool = False, **options):
+        self.path = urlparse(uri).path
+        if not self.path:
+            raise ValueError(f"Rate limit storage URI has no database path: {uri}")
+        self.timeout = float(options.pop('timeout', 5.0))
+        self._local = threading.local()
+        self._increments = 0
+        super().__init__(uri, wrap_exceptions=wrap_exceptions, **options)
+        self._init_schema()
+
+    @property
+    def base_exceptions(self):
+        return sqlite3.Error
+
+    def _connection(self) -> sqlite3.Connection:
+        """Get this thread's connection, reopening it after a fork."""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=self.timeout, isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    @contextmanager
+    def _transaction(self):
+        """Run statements in an immediate (write-locked) transaction."""
+        conn = self._connection()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            yield conn
+            conn.execute('COMMIT')
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+
+    def _init_schema(self) -> None:
+        self._connection().execute(
+            'CREATE TABLE IF NOT EXISTS rate_limits ('
+            ' key TEXT PRIMARY KEY,'
+            ' count INTEGER NOT NULL,'
+            ' expires_at REAL NOT NULL'
+            ') WITHOUT ROWID'
+        )
+
+    def incr(self, key: str, expiry: int, elastic_expiry: bool = False, amount: int = 1) -> int:
+        """Atomically add ``amount`` to the counter, starting a new window if expired."""
+        now = time.time()
+        with self._transaction() as conn:
+            conn.execute(
+                'INSERT INTO rate_limits (key, count, expires_at) VALUES (?, ?, ?) '
+                'ON CONFLICT(key) DO UPDATE SET '
+                ' count = CASE WHEN expires_at <= ? THEN excluded.count ELSE count + excluded.count END,'
+                ' expires_at = CASE WHEN expires_at <= ? OR ? THEN excluded.expires_at ELSE expires_at END',
+                (key, amount, now + expiry, now, now, int(elastic_expiry))
+            )
+            count = conn.execute('SELECT count FROM rate_limits WHERE key = ?', (key,)).fetchone()[0]
+
+        self._increments += 1
+        if self._increments % self.PURGE_INTERVAL == 0:
+            self._purge_expired()
+        return count
+
+    def get(self, key: str) -> int:
+        row = self._connection().execute(
+            'SELECT count FROM rate_limits WHERE key = ? AND expires_at > ?', (key, time.time())
+        ).fetchone()
+        return row[0] if row else 0
+
+    def get_expiry(self, key: str) -> float:
+        row = self._connection().execute(
+            'SELECT expires_at FROM rate_limits WHERE key = ?', (key,)
+        ).fetchone()
+        return row[0] if row else time.time()
+
+    def check(self) -> bool:
+        try:
+            self._connection().execute('SELECT 1').fetchone()
+            return True
+        except sqlite3.Error:
+            return False
+
+    def reset(self) -> int:
+        with self._transaction() as conn:
+            return conn.execute('DELETE FROM rate_limits').rowcount
+
+    def clear(self, key: str) -> None:
+        with self._transaction() as conn:
+            conn.execute('DELETE FROM rate_limits WHERE key = ?', (key,))
+
+    def _purge_expired(self) -> None:
+        try:
+            with self._transaction() as conn:
+                removed = conn.execute('DELETE FROM rate_limits WHERE expires_at <= ?', (time.time(),)).rowcount
+            logger.debug(f"Purged {removed} expired rate limit counters")
+        except sqlite3.Error as e:
+            logger.warning(f"Failed to purge expired rate limit counters: {str(e)}")
+
+def endpoint_cost(costs: Dict[str, int]) -> Callable[[], int]:
+    """Build a ``default_limits_cost`` callable from per-endpoint weights."""
+    def cost() -> int:
+        return costs.get(request.endpoint, 1)
+    return cost
@@ -0,0 +1,178 @@
+"""
+Structured, sampled logging that keeps formatting off the request path.
+
+Log calls on request threads only create a ``LogRecord`` and push it onto a
+bounded queue. A background ``QueueListener`` thread does all formatting and
+I/O. Records can be sampled per level and per route before they are queued,
+so a busy endpoint can keep 1% of its INFO lines while warnings and errors
+are always kept.
+
+Configure once per process from an entry point:
+    configure_logging()
+
+Worker processes must call ``restart_after_fork()`` because the listener
+thread does not survive ``fork``.
+"""
+
+import atexit
+import json
+import logging
+import os
+import queue
+import random
+import sys
+from contextvars import ContextVar
+from logging.handlers import QueueHandler, QueueListener
+from typing import Dict, Optional
+
+_current_route: ContextVar[Optional[str]] = ContextVar('current_route', default=None)
+
+def set_request_route(route: Optional[str]) -> None:
+    """Record the route template of the request being handled."""
+    _current_route.set(route)
+
+def parse_sample_rates(spec: str) -> Dict[str, float]:
+    """Parse ``"INFO=0.1,/api/v1/health=0.01"`` into a rate mapping."""
+    rates = {}
+    for item in filter(None, (part.strip() for part in spec.split(','))):
+        key, _, value = item.rpartition('=')
+        rates[key.strip()] = float(value)
+    return rates
+
+class SamplingFilter(logging.Filter):
+    """Drop a fraction of records by level and by route.
+
+    Records at WARNING and above are never dropped. The effective keep rate
+    is the product of the level rate and the route rate.
+    """
+
+    def __init__(self, level_rates: Dict[str, float] = None, route_rates: Dict[str, float] = None):
+        super().__init__()
+        self.level_rates = {
+            logging.getLevelName(level.upper()): rate
+            for level, rate in (level_rates or {}).items()
+        }
+        self.route_rates = dict(route_rates or {})
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        route = _current_route.get()
+        record.route = route
+        if record.levelno >= logging.WARNING:
+            return True
+        rate = self.level_rates.get(record.levelno, 1.0)
+        if route is not None:
+            rate *= self.route_rates.get(route, 1.0)
+        return rate >= 1.0 or random.random() < rate
+
+class DeferredQueueHandler(QueueHandler):
+    """Queue records without formatting them on the calling thread.
+
+    The stock ``QueueHandler.prepare`` renders the message so records can be
+    pickled; records here never leave the process, so formatting is left to
+    the listener thread. Records are dropped (and counted) rather than
+    blocking when the queue is full.
+    """
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+class JsonFormatter(logging.Formatter):
+    """Format records as single-line JSON objects."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            'ts': self.formatTime(record),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+            'pid': record.process,
+            'thread': record.threadName,
+        }
+        route = getattr(record, 'route', None)
+        if route is not None:
+            entry['route'] = route
+        if record.exc_info:
+            entry['exception'] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+TEXT_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+
+_handler: Optional[DeferredQueueHandler] = None
+_listener: Optional[QueueListener] = None
+_settings: Dict = {}
+
+def _start(settings: Dict) -> None:
+    """Install the queue handler on the root logger and start the listener."""
+    global _handler, _listener
+
+    output = logging.StreamHandler(settings['stream'])
+    output.setFormatter(JsonFormatter() if settings['fmt'] == 'json' else logging.Formatter(TEXT_FORMAT))
+
+    log_queue = queue.Queue(maxsize=settings['queue_size'])
+    handler = DeferredQueueHandler(log_queue)
+    handler.addFilter(SamplingFilter(settings['level_rates'], settings['route_rates']))
+
+    root = logging.getLogger()
+    for existing in list(root.handlers):
+        root.removeHandler(existing)
+    root.addHandler(handler)
+    root.setLevel(settings['level'])
+
+    listener = QueueListener(log_queue, output, respect_handler_level=True)
+    listener.start()
+    _handler, _listener = handler, listener
+
+def configure_logging(level: str = None, fmt: str = None, level_rates: Dict[str, float] = None,
+                      route_rates: Dict[str, float] = None, stream=None, queue_size: int = 10000) -> None:
+    """Route all logging through the background queue pipeline.
+
+    Defaults come from ``AppConfig`` (``LOG_LEVEL``, ``LOG_FORMAT``,
+    ``LOG_SAMPLE_RATES``, ``LOG_ROUTE_SAMPLE_RATES``). Safe to call again to
+    reconfigure.
+    """
+    from backend.core.config import AppConfig
+
+    shutdown_logging()
+    _settings.update({
+        'level': (level or AppConfig.LOG_LEVEL).upper(),
+        'fmt': fmt or AppConfig.LOG_FORMAT,
+        'level_rates': AppConfig.LOG_SAMPLE_RATES if level_rates is None else level_rates,
+        'route_rates': AppConfig.LOG_ROUTE_SAMPLE_RATES if route_rates is None else route_rates,
+        'stream': stream or sys.stderr,
+        'queue_size': queue_size,
+        'pid': os.getpid(),
+    })
+    _start(_settings)
+
+def restart_after_fork() -> None:
+    """Start a fresh queue and listener thread in a forked worker."""
+    global _listener
+    if not _settings or _settings.get('pid') == os.getpid():
+        return
+    # The parent's listener thread does not exist in this process
+    _listener = None
+    _settings['pid'] = os.getpid()
+    _start(_settings)
+
+def shutdown_logging() -> None:
+    """Flush queued records and stop the listener thread."""
+    global _listener
+    if _listener is not None and _settings.get('pid') == os.getpid():
+        _listener.stop()
+    _listener = None
+
+def dropped_records() -> int:
+    """Number of records dropped because the queue was full."""
+    return _handler.dropped if _handler is not None else 0
+
+atexit.register(shutdown_logging)
@@ -0,0 +1,209 @@
+"""
+Span-based tracing for ingestion and analysis runs.
+
+Wrap each stage in ``span``; nesting follows the call stack through a
+context variable, so sub-steps (FRED fetch, validation, store, prompt render,
+Claude call) become children of the stage that runs them. Finished spans are
+appended to ``TRACE_EXPORT_PATH`` as JSON lines. When tracing is disabled
+``span`` yields a shared no-op object and costs one attribute check.
+
+Inspect an export from the command line:
+    python -m backend.core.tracing backend/traces/spans.jsonl
+    python -m backend.core.tracing spans.jsonl --chrome trace.json
+
+The first form prints the critical path of each trace; the second converts
+spans to Chrome trace-event JSON for chrome://tracing or Perfetto.
+"""
+
+import argparse
+import json
+import logging
+import os
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, List, Optional
+
+from backend.core.config import AppConfig
+
+logger = logging.getLogger(__name__)
+
+class Span:
+    """A timed unit of work within a trace."""
+
+    __slots__ = ('name', 'trace_id', 'span_id', 'parent_id', 'start', '_start_perf',
+                 'duration', 'attributes', 'status')
+
+    def __init__(self, name: str, parent: Optional['Span'] = None, attributes: Dict[str, Any] = None):
+        self.name = name
+        self.trace_id = parent.trace_id if parent else uuid.uuid4().hex
+        self.span_id = uuid.uuid4().hex[:16]
+        self.parent_id = parent.span_id if parent else None
+        self.start = time.time()
+        self._start_perf = time.perf_counter()
+        self.duration = None
+        self.attributes = dict(attributes or {})
+        self.status = 'ok'
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        self.attributes[key] = value
+
+    def end(self) -> None:
+        self.duration = time.perf_counter() - self._start_perf
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'trace_id': self.trace_id,
+            'span_id': self.span_id,
+            'parent_id': self.parent_id,
+            'name': self.name,
+            'start': self.start,
+            'duration_ms': round(self.duration * 1000, 3),
+            'status': self.status,
+            'attributes': self.attributes
+        }
+
+class _NoopSpan:
+    """Stand-in yielded when tracing is disabled."""
+
+    __slots__ = ()
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        pass
+
+_NOOP_SPAN = _NoopSpan()
+_current_span: ContextVar[Optional[Span]] = ContextVar('current_span', default=None)
+
+class JsonLinesExporter:
+    """Append finished spans to a file, one JSON object per line."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+
+    def export(self, span: Span) -> None:
+        line = json.dumps(span.to_dict(), default=str) + '\n'
+        with self._lock:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            with open(self.path, 'a') as f:
+                f.write(line)
+
+_exporter: Optional[JsonLinesExporter] = None
+
+def get_exporter() -> JsonLinesExporter:
+    """Get the process-wide span exporter."""
+    global _exporter
+    if _exporter is None or _exporter.path != AppConfig.TRACE_EXPORT_PATH:
+        _exporter = JsonLinesExporter(AppConfig.TRACE_EXPORT_PATH)
+    return _exporter
+
+@contextmanager
+def span(name: str, **attributes):
+    """Trace a block as a child of the current span."""
+    if not AppConfig.TRACING_ENABLED:
+        yield _NOOP_SPAN
+        return
+    current = Span(name, _current_span.get(), attributes)
+    token = _current_span.set(current)
+    try:
+        yield current
+    except BaseException as e:
+        current.status = 'error'
+        current.set_attribute('error', f"{type(e).__name__}: {e}")
+        raise
+    finally:
+        current.end()
+        _current_span.reset(token)
+        try:
+            get_exporter().export(current)
+        except OSError as e:
+            logger.warning(f"Failed to export span {name}: {str(e)}")
+
+def load_spans(path: str) -> List[Dict[str, Any]]:
+    """Read exported spans from a JSON lines file."""
+    with open(path) as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+def critical_path(spans: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Return the chain of spans that determined the end time of a trace.
+
+    Starting at the root, repeatedly follow the child that finished last,
+    then the child that finished last before that one started, and so on.
+    Each returned span carries ``self_ms``: time on the path not covered by
+    a child on the path.
+    """
+    children: Dict[Optional[str], List[Dict[str, Any]]] = {}
+    for s in spans:
+        children.setdefault(s['parent_id'], []).append(s)
+    roots = children.get(None, [])
+    if not roots:
+        return []
+
+    def end(s):
+        return s['start'] + s['duration_ms'] / 1000
+
+    path = []
+
+    def walk(node, depth):
+        entry = dict(node, depth=depth)
+        path.append(entry)
+        covered = 0.0
+        boundary = end(node)
+        kids = sorted(children.get(node['span_id'], []), key=end, reverse=True)
+        chain = []
+        for kid in kids:
+            if end(kid) <= boundary + 1e-6:
+                chain.append(kid)
+                boundary = kid['start']
+        for kid in reversed(chain):
+            covered += kid['duration_ms']
+            walk(kid, depth + 1)
+        entry['self_ms'] = round(node['duration_ms'] - covered, 3)
+
+    walk(max(roots, key=lambda s: s['duration_ms']), 0)
+    return path
+
+def to_chrome_trace(spans: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Convert spans to Chrome trace-event format (complete events)."""
+    lanes: Dict[str, int] = {}
+    events = []
+    for s in spans:
+        events.append({
+            'name': s['name'],
+            'ph': 'X',
+            'ts': s['start'] * 1e6,
+            'dur': s['duration_ms'] * 1000,
+            'pid': 1,
+            'tid': lanes.setdefault(s['trace_id'], len(lanes) + 1),
+            'args': dict(s['attributes'], status=s['status'])
+        })
+    return {'traceEvents': events, 'displayTimeUnit': 'ms'}
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Summarize exported trace spans.')
+    parser.add_argument('path', nargs='?', default=AppConfig.TRACE_EXPORT_PATH)
+    parser.add_argument('--chrome', help='write Chrome trace-event JSON to this path')
+    args = parser.parse_args()
+
+    spans = load_spans(args.path)
+    if args.chrome:
+        with open(args.chrome, 'w') as f:
+            json.dump(to_chrome_trace(spans), f)
+        print(f"Wrote {len(spans)} spans to {args.chrome}")
+        return
+
+    traces: Dict[str, List[Dict[str, Any]]] = {}
+    for s in spans:
+        traces.setdefault(s['trace_id'], []).append(s)
+    for trace_id, trace_spans in traces.items():
+        print(f"trace {trace_id} ({len(trace_spans)} spans)")
+        for entry in critical_path(trace_spans):
+            label = entry['name']
+            if 'series_id' in entry['attributes']:
+                label += f" [{entry['attributes']['series_id']}]"
+            print(f"  {'  ' * entry['depth']}{label}: {entry['duration_ms']:.1f} ms (self {entry['self_ms']:.1f} ms)")
+
+if __name__ == '__main__':
+    main()
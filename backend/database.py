@@ -1,22 +1,41 @@
-from sqlalchemy import create_engine, Column, Integer, Float, String, DateTime, Index, Text
+from sqlalchemy import Column, Integer, Float, String, DateTime, Index, Text, UniqueConstraint, bindparam, cast, func, select, text
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 import os
+import hashlib
 import logging
+import struct
 from datetime import datetime
+from typing import List, Optional, Tuple
+import numpy as np
+from backend.core.metrics import DB_QUERY_SECONDS, timed
+from backend.storage import backup, compact, vintage
+from backend.storage.sqlite_engine import EngineProfile, create_reader_engine, create_writer_engine, profile_from_env
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
 logger = logging.getLogger(__name__)
 
 # Initialize SQLAlchemy
 Base = declarative_base()
-DB_PATH = os.path.join(os.path.dirname(__file__), 'fred_data.db')
-engine = create_engine(f'sqlite:///{DB_PATH}', pool_size=10, max_overflow=20)
+DB_PATH = os.environ.get('FRED_DB_PATH', os.path.join(os.path.dirname(__file__), 'fred_data.db'))
+# Journaling, pragmas and pool sizes (see backend/storage/sqlite_engine.py)
+ENGINE_PROFILE = profile_from_env()
+
+def _create_engines(db_path: str, profile: EngineProfile):
+    """Writer engine and, unless the profile shares one pool, a reader engine"""
+    writer = create_writer_engine(db_path, profile)
+    reader = writer if profile.shared_pool else create_reader_engine(db_path, profile)
+    return writer, reader
+
+engine, read_engine = _create_engines(DB_PATH, ENGINE_PROFILE)
 Session = sessionmaker(bind=engine)
+ReadSession = sessionmaker(bind=read_engine)
+
+# 'orm' keeps observations in fred_data; 'compact' uses the clustered
+# integer-keyed tables in backend.storage.compact
+STORAGE_LAYOUTS = ('orm', 'compact')
+STORAGE_LAYOUT = os.environ.get('FRED_STORAGE_LAYOUT', 'orm')
+if STORAGE_LAYOUT not in STORAGE_LAYOUTS:
+    raise ValueError(f"FRED_STORAGE_LAYOUT must be one of {', '.join(STORAGE_LAYOUTS)}, got {STORAGE_LAYOUT!r}")
 
 class FREDSeries(Base):
     """Model for storing FRED series metadata"""
@@ -51,40 +70,195 @@ class FREDData(Base):
     def __repr__(self):
         return f"<FREDData(series_id='{self.series_id}', date='{self.date}', value={self.value})>"
 
+class SeriesPoint:
+    """A read-only observation returned by the read API.
+
+    Reads never modify observations, so they skip ORM hydration (identity
+    map, attribute instrumentation and a ``__dict__`` per row).
+    """
+    __slots__ = ('series_id', 'date', 'value')
+    
+    def __init__(self, series_id: str, date: datetime, value: float):
+        self.series_id = series_id
+        self.date = date
+        self.value = value
+    
+    def __repr__(self):
+        return f"<SeriesPoint(series_id='{self.series_id}', date='{self.date}', value={self.value})>"
+
+class BackfillCheckpoint(Base):
+    """Model recording a completed backfill window for a series"""
+    __tablename__ = 'backfill_checkpoints'
+    
+    id = Column(Integer, primary_key=True)
+    series_id = Column(String, nullable=False)
+    window_start = Column(DateTime, nullable=False)
+    window_end = Column(DateTime, nullable=False)
+    points = Column(Integer, nullable=False)
+    completed_at = Column(DateTime, nullable=False)
+    
+    __table_args__ = (
+        UniqueConstraint('series_id', 'window_start', 'window_end', name='uq_backfill_window'),
+    )
+    
+    def __repr__(self):
+        return f"<BackfillCheckpoint(series_id='{self.series_id}', window_start='{self.window_start}', window_end='{self.window_end}')>"
+
+class RegisteredSeries(Base):
+    """Model for a series tracked by ingest, analysis and the read API (see backend/services/registry.py)"""
+    __tablename__ = 'series_registry'
+    
+    id = Column(Integer, primary_key=True)
+    name = Column(String, unique=True, nullable=False)
+    series_id = Column(String, unique=True, nullable=False)
+    frequency = Column(String)
+    start_date = Column(DateTime)
+    prompt_template = Column(Text)
+    release_rule = Column(String)
+    revision_window_days = Column(Integer)
+    updated_at = Column(DateTime, nullable=False)
+    
+    def __repr__(self):
+        return f"<RegisteredSeries(name='{self.name}', series_id='{self.series_id}')>"
+
+class SeriesFamilyMember(Base):
+    """Model for a related series stored under a family key (see backend/services/families.py)"""
+    __tablename__ = 'series_family_members'
+    
+    id = Column(Integer, primary_key=True)
+    family = Column(String, nullable=False, index=True)
+    parent_series_id = Column(String, nullable=False, index=True)
+    series_id = Column(String, nullable=False)
+    name = Column(String, nullable=False)
+    updated_at = Column(DateTime, nullable=False)
+    
+    __table_args__ = (
+        UniqueConstraint('family', 'series_id', name='uq_family_series'),
+    )
+    
+    def __repr__(self):
+        return f"<SeriesFamilyMember(family='{self.family}', series_id='{self.series_id}')>"
+
+class SeriesWindowHash(Base):
+    """Model recording the digest of a series' trailing window at its last ingest"""
+    __tablename__ = 'series_window_hashes'
+    
+    id = Column(Integer, primary_key=True)
+    series_id = Column(String, unique=True, nullable=False)
+    window_start = Column(DateTime, nullable=False)
+    window_end = Column(DateTime, nullable=False)
+    points = Column(Integer, nullable=False)
+    digest = Column(String, nullable=False)
+    updated_at = Column(DateTime, nullable=False)
+    
+    def __repr__(self):
+        return f"<SeriesWindowHash(series_id='{self.series_id}', window_start='{self.window_start}', window_end='{self.window_end}')>"
+
+class SeriesRevision(Base):
+    """Model counting the writes that changed a series' history rather than extending it"""
+    __tablename__ = 'series_revisions'
+    
+    id = Column(Integer, primary_key=True)
+    series_id = Column(String, unique=True, nullable=False)
+    revision = Column(Integer, nullable=False)
+    updated_at = Column(DateTime, nullable=False)
+    
+    def __repr__(self):
+        return f"<SeriesRevision(series_id='{self.series_id}', revision={self.revision})>"
+
+_WINDOW_PAIR = struct.Struct('<qd')
+
+def window_digest(data_points: list, start_date: datetime, end_date: datetime) -> Tuple[str, int]:
+    """Digest of the ``(date, value)`` pairs dated within ``[start_date, end_date]``, and their count"""
+    pairs = sorted(
+        (compact.epoch_day(point['date']), float(point['value']))
+        for point in data_points if start_date <= point['date'] <= end_date
+    )
+    digest = hashlib.blake2b(digest_size=16)
+    for day, value in pairs:
+        digest.update(_WINDOW_PAIR.pack(day, value))
+    return digest.hexdigest(), len(pairs)
+
 def init_db():
     """Initialize the database, creating all tables if they don't exist"""
     try:
         Base.metadata.create_all(engine)
+        if STORAGE_LAYOUT == 'compact':
+            compact.create_tables(engine)
+        vintage.create_tables(engine)
         logger.info("Database initialized successfully")
     except Exception as e:
         logger.error(f"Error initializing database: {str(e)}")
         raise
 
+def dispose_engine():
+    """Discard pooled connections inherited from a parent process.
+
+    Must be called in each worker after fork so that no two processes share
+    a SQLite connection. ``close=False`` leaves the parent's connections
+    untouched.
+    """
+    engine.dispose(close=False)
+    read_engine.dispose(close=False)
+
+def configure_database(db_path: str, profile: Optional[EngineProfile] = None):
+    """Point the engines and session factories at another database file.
+
+    Sessions created afterwards use the new file (and ``profile``, if
+    given); callers that imported ``engine`` directly keep the old one.
+    Used by benchmarks and tools that work on a scratch copy instead of
+    ``FRED_DB_PATH``.
+    """
+    global DB_PATH, ENGINE_PROFILE, engine, read_engine
+    engine.dispose()
+    read_engine.dispose()
+    DB_PATH = db_path
+    ENGINE_PROFILE = profile or ENGINE_PROFILE
+    engine, read_engine = _create_engines(db_path, ENGINE_PROFILE)
+    Session.configure(bind=engine)
+    ReadSession.configure(bind=read_engine)
+    return engine
+
 def get_session():
     """Get a new database session"""
     return Session()
 
+def get_read_session():
+    """Get a new session on the read-only connection pool"""
+    return ReadSession()
+
+def upsert_series_metadata(session, series_id: str, metadata: dict) -> FREDSeries:
+    """Create or update the metadata row of a series (without committing)"""
+    series = session.query(FREDSeries).filter_by(series_id=series_id).first()
+    if not series:
+        series = FREDSeries(
+            series_id=series_id,
+            title=metadata.get('title'),
+            units=metadata.get('units'),
+            frequency=metadata.get('frequency'),
+            last_updated=datetime.now()
+        )
+        session.add(series)
+    else:
+        series.last_updated = datetime.now()
+        series.title = metadata.get('title', series.title)
+        series.units = metadata.get('units', series.units)
+        series.frequency = metadata.get('frequency', series.frequency)
+    return series
+
+@timed(DB_QUERY_SECONDS, 'store_series_data')
 def store_series_data(session, series_id: str, data_points: list, metadata: dict):
     """Store series data and metadata in the database"""
     try:
         # Store or update series metadata
-        series = session.query(FREDSeries).filter_by(series_id=series_id).first()
-        if not series:
-            series = FREDSeries(
-                series_id=series_id,
-                title=metadata.get('title'),
-                units=metadata.get('units'),
-                frequency=metadata.get('frequency'),
-                last_updated=datetime.now()
-            )
-            session.add(series)
-        else:
-            series.last_updated = datetime.now()
-            series.title = metadata.get('title', series.title)
-            series.units = metadata.get('units', series.units)
-            series.frequency = metadata.get('frequency', series.frequency)
+        upsert_series_metadata(session, series_id, metadata)
         
         # Store data points
+        latest = get_latest_point(session, series_id)
+        inserted = []
+        if STORAGE_LAYOUT == 'compact':
+            _insert_points(session, series_id, data_points, latest)
+            data_points = ()
         for point in data_points:
             existing = session.query(FREDData).filter_by(
                 series_id=series_id,
@@ -98,6 +272,9 @@ def store_series_data(session, series_id: str, data_points: list, metadata: dict
                     value=point['value']
                 )
                 session.add(data_point)
+                inserted.append(point)
+        if latest and any(point['date'] < latest.date for point in inserted):
+            mark_series_revised(session, series_id)
         
         session.commit()
         logger.info(f"Successfully stored data for series {series_id}")
@@ -107,42 +284,259 @@ def store_series_data(session, series_id: str, data_points: list, metadata: dict
         logger.error(f"Error storing data for series {series_id}: {str(e)}")
         raise
 
+# Insert a point unless one already exists for the series and date. The
+# typed date parameter keeps the stored format identical to ORM inserts.
+_INSERT_MISSING_POINT = text(
+    'INSERT INTO fred_data (series_id, date, value) '
+    'SELECT :series_id, :date, :value '
+    'WHERE NOT EXISTS (SELECT 1 FROM fred_data WHERE series_id = :series_id AND date = :date)'
+).bindparams(bindparam('date', type_=DateTime))
+
+def write_series_data(session, series_id: str, data_points: list, metadata: dict, overwrite: bool = False) -> int:
+    """Upsert metadata and insert new points (without committing); returns the number inserted.
+
+    The write-queue counterpart of ``store_series_data``. With ``overwrite``
+    points already stored take the new values (revisions).
+    """
+    upsert_series_metadata(session, series_id, metadata)
+    if overwrite:
+        update_series_values(session, series_id, data_points)
+    return bulk_store_series_data(session, series_id, data_points)
+
+@timed(DB_QUERY_SECONDS, 'bulk_store_series_data')
+def bulk_store_series_data(session, series_id: str, data_points: list) -> int:
+    """Insert points that are not stored yet in one executemany (without committing).
+
+    Unlike ``store_series_data`` this issues no per-point SELECT and creates
+    no ORM objects, so memory stays proportional to one batch. Returns the
+    number of points inserted. Inserting bumps the series' ``last_updated``,
+    which caches of stored data (e.g. aligned frames) are keyed on.
+    """
+    if not data_points:
+        return 0
+    inserted = _insert_points(session, series_id, data_points, get_latest_point(session, series_id))
+    if inserted:
+        session.execute(_TOUCH_SERIES, {'series_id': series_id, 'now': datetime.now()})
+    return inserted
+
+def _insert_missing(session, series_id: str, data_points: list) -> int:
+    if not data_points:
+        return 0
+    if STORAGE_LAYOUT == 'compact':
+        return compact.store_points(session, series_id, data_points)
+    return session.execute(_INSERT_MISSING_POINT, [
+        {'series_id': series_id, 'date': point['date'], 'value': point['value']}
+        for point in data_points
+    ]).rowcount
+
+def _insert_points(session, series_id: str, data_points: list, latest: Optional[SeriesPoint]) -> int:
+    """Insert missing points, marking the series revised if any inserted one predates ``latest``"""
+    if latest is None:
+        return _insert_missing(session, series_id, data_points)
+    earlier = [point for point in data_points if point['date'] < latest.date]
+    later = [point for point in data_points if point['date'] >= latest.date]
+    inserted_earlier = _insert_missing(session, series_id, earlier)
+    if inserted_earlier:
+        mark_series_revised(session, series_id)
+    return inserted_earlier + _insert_missing(session, series_id, later)
+
+_TOUCH_SERIES = text(
+    'UPDATE fred_series SET last_updated = :now WHERE series_id = :series_id'
+).bindparams(bindparam('now', type_=DateTime))
+
+_UPDATE_POINT_VALUE = text(
+    'UPDATE fred_data SET value = :value WHERE series_id = :series_id AND date = :date'
+).bindparams(bindparam('date', type_=DateTime))
+
+def update_series_values(session, series_id: str, data_points: list) -> int:
+    """Overwrite the values of already stored points (without committing); returns the number updated"""
+    if not data_points:
+        return 0
+    if STORAGE_LAYOUT == 'compact':
+        updated = compact.update_points(session, series_id, data_points)
+    else:
+        updated = session.execute(_UPDATE_POINT_VALUE, [
+            {'series_id': series_id, 'date': point['date'], 'value': point['value']}
+            for point in data_points
+        ]).rowcount
+    if updated:
+        mark_series_revised(session, series_id)
+    return updated
+
+_MARK_REVISED = text(
+    'INSERT INTO series_revisions (series_id, revision, updated_at) VALUES (:series_id, 1, :now) '
+    'ON CONFLICT (series_id) DO UPDATE SET revision = revision + 1, updated_at = :now'
+).bindparams(bindparam('now', type_=DateTime))
+
+def mark_series_revised(session, series_id: str) -> None:
+    """Record that stored points of a series were overwritten or inserted before its latest one (without committing).
+
+    Caches that extend themselves with newly appended points (e.g. range
+    indexes) rebuild when the count changes.
+    """
+    session.execute(_MARK_REVISED, {'series_id': series_id, 'now': datetime.now()})
+
+def get_series_revision(session, series_id: str) -> int:
+    """How many times the history of a series was revised (see ``mark_series_revised``)"""
+    revision = session.execute(
+        select(SeriesRevision.revision).where(SeriesRevision.series_id == series_id)
+    ).scalar()
+    return revision or 0
+
+@timed(DB_QUERY_SECONDS, 'write_series_vintage')
+def write_series_vintage(session, series_id: str, data_points: list, metadata: dict,
+                         realtime_start=None) -> vintage.VintageChanges:
+    """Like ``write_series_data``, but also records the values as a vintage (without committing).
+
+    Revised values (see backend/storage/vintage.py) overwrite the stored
+    ones, so reads keep returning the latest published value.
+    """
+    upsert_series_metadata(session, series_id, metadata)
+    changes = vintage.record_vintage(session, series_id, data_points, realtime_start)
+    # Dates new to the vintage store may still hold a stale value from before vintages were kept
+    update_series_values(session, series_id, changes.added + changes.revised)
+    bulk_store_series_data(session, series_id, changes.added)
+    if changes.revised:
+        logger.info(f"Recorded {len(changes.revised)} revised values for series {series_id}")
+    return changes
+
+def write_series_analysis(session, series_id: str, analysis: str) -> None:
+    """Set the stored AI analysis of a series (without committing)"""
+    series = session.query(FREDSeries).filter_by(series_id=series_id).first()
+    if not series:
+        logger.error(f"Series {series_id} not found")
+        raise ValueError(f"Series {series_id} not found")
+    series.latest_analysis = analysis
+    series.analysis_timestamp = datetime.now()
+
+@timed(DB_QUERY_SECONDS, 'store_series_analysis')
 def store_series_analysis(session, series_id: str, analysis: str):
     """Store AI analysis for a series"""
     try:
-        series = session.query(FREDSeries).filter_by(series_id=series_id).first()
-        if series:
-            series.latest_analysis = analysis
-            series.analysis_timestamp = datetime.now()
-            session.commit()
-            logger.info(f"Successfully stored analysis for series {series_id}")
-        else:
-            logger.error(f"Series {series_id} not found")
-            raise ValueError(f"Series {series_id} not found")
+        write_series_analysis(session, series_id, analysis)
+        session.commit()
+        logger.info(f"Successfully stored analysis for series {series_id}")
     except Exception as e:
         session.rollback()
         logger.error(f"Error storing analysis for series {series_id}: {str(e)}")
         raise
 
-def get_series_data(session, series_id: str, start_date=None, end_date=None):
-    """Retrieve series data from the database"""
-    query = session.query(FREDData).filter(FREDData.series_id == series_id)
-    
+# Stored dates are 'YYYY-MM-DD HH:MM:SS.ffffff'; this is their day since 1970-01-01
+_EPOCH_DAY = cast(func.julianday(func.substr(FREDData.date, 1, 10)) - 2440587.5, Integer)
+
+def _select_points(series_id: str, start_date=None, end_date=None, date_column=FREDData.date):
+    """Core select of one series' (date, value) rows in date order"""
+    query = select(date_column, FREDData.value).where(FREDData.series_id == series_id)
     if start_date:
-        query = query.filter(FREDData.date >= start_date)
+        query = query.where(FREDData.date >= start_date)
     if end_date:
-        query = query.filter(FREDData.date <= end_date)
-    
-    return query.order_by(FREDData.date).all()
+        query = query.where(FREDData.date <= end_date)
+    return query.order_by(FREDData.date)
+
+@timed(DB_QUERY_SECONDS, 'get_series_data')
+def get_series_data(session, series_id: str, start_date=None, end_date=None) -> List[SeriesPoint]:
+    """Retrieve series data from the database as read-only records"""
+    if STORAGE_LAYOUT == 'compact':
+        return [
+            SeriesPoint(series_id, compact.from_epoch_day(day), value)
+            for day, value in compact.get_points(session, series_id, start_date, end_date)
+        ]
+    return [
+        SeriesPoint(series_id, date, value)
+        for date, value in session.execute(_select_points(series_id, start_date, end_date))
+    ]
+
+@timed(DB_QUERY_SECONDS, 'get_series_arrays')
+def get_series_arrays(session, series_id: str, start_date=None, end_date=None) -> Tuple[np.ndarray, np.ndarray]:
+    """Retrieve series data as parallel ``datetime64[D]`` and ``float64`` arrays"""
+    if STORAGE_LAYOUT == 'compact':
+        rows = compact.get_points(session, series_id, start_date, end_date)
+    else:
+        rows = session.execute(_select_points(series_id, start_date, end_date, date_column=_EPOCH_DAY)).all()
+    # Days fit exactly in a float64; missing values become NaN. Plain tuples
+    # convert far faster than Row objects
+    table = np.array([tuple(row) for row in rows], dtype='f8').reshape(-1, 2)
+    return table[:, 0].astype('i8').view('datetime64[D]'), np.ascontiguousarray(table[:, 1])
+
+@timed(DB_QUERY_SECONDS, 'get_series_as_of')
+def get_series_as_of(session, series_id: str, as_of, start_date=None, end_date=None) -> List[SeriesPoint]:
+    """Get series data as it was published on ``as_of`` (requires recorded vintages)"""
+    return [
+        SeriesPoint(series_id, compact.from_epoch_day(day), value)
+        for day, value in vintage.as_of(session, series_id, as_of, start_date, end_date)
+    ]
+
+def get_window_hash(session, series_id: str) -> Optional[SeriesWindowHash]:
+    """Get the trailing-window digest stored at a series' last ingest"""
+    return session.query(SeriesWindowHash).filter_by(series_id=series_id).first()
+
+def write_window_hash(session, series_id: str, window_start: datetime, window_end: datetime,
+                      digest: str, points: int) -> None:
+    """Create or replace the trailing-window digest of a series (without committing)"""
+    window = get_window_hash(session, series_id)
+    if not window:
+        window = SeriesWindowHash(series_id=series_id)
+        session.add(window)
+    window.window_start = window_start
+    window.window_end = window_end
+    window.digest = digest
+    window.points = points
+    window.updated_at = datetime.now()
+
+def write_family_members(session, family: str, parent_series_id: str, members: list) -> dict:
+    """Store one wave of family members fetched together (without committing).
+
+    ``members`` are ``(name, series_id, data_points, metadata)`` tuples;
+    ``metadata`` is ``None`` for series whose metadata is already stored.
+    Returns the number of points inserted per series ID.
+    """
+    now = datetime.now()
+    existing = {
+        row.series_id: row
+        for row in session.query(SeriesFamilyMember).filter(
+            SeriesFamilyMember.family == family,
+            SeriesFamilyMember.series_id.in_([member[1] for member in members])
+        )
+    }
+    inserted = {}
+    for name, series_id, data_points, metadata in members:
+        if metadata is not None:
+            upsert_series_metadata(session, series_id, metadata)
+        inserted[series_id] = bulk_store_series_data(session, series_id, data_points)
+        row = existing.get(series_id)
+        if not row:
+            row = SeriesFamilyMember(family=family, series_id=series_id)
+            session.add(row)
+        row.parent_series_id = parent_series_id
+        row.name = name
+        row.updated_at = now
+    return inserted
+
+def get_family_members(session, parent_series_ids: list) -> List[SeriesFamilyMember]:
+    """Get the stored family members of the given parent series"""
+    return session.query(SeriesFamilyMember)\
+        .filter(SeriesFamilyMember.parent_series_id.in_(list(parent_series_ids)))\
+        .order_by(SeriesFamilyMember.family, SeriesFamilyMember.name)\
+        .all()
+
+def get_latest_point(session, series_id: str) -> Optional[SeriesPoint]:
+    """Retrieve the most recent data point of a series, or None"""
+    if STORAGE_LAYOUT == 'compact':
+        row = compact.latest_point(session, series_id)
+        return SeriesPoint(series_id, compact.from_epoch_day(row.day), row.value) if row else None
+    row = session.execute(
+        select(FREDData.date, FREDData.value)
+        .where(FREDData.series_id == series_id)
+        .order_by(FREDData.date.desc())
+        .limit(1)
+    ).first()
+    return SeriesPoint(series_id, row.date, row.value) if row else None
 
-def backup_database():
-    """Create a backup of the database"""
+def backup_database(directory: Optional[str] = None,
+                    policy: Optional[backup.BackupPolicy] = None) -> Optional[backup.BackupResult]:
+    """Create a verified online backup of the database (see backend/storage/backup.py)."""
     try:
-        import shutil
-        backup_path = f"{DB_PATH}.backup-{datetime.now().strftime('%Y%m%d-%H%M%S')}"
-        shutil.copy2(DB_PATH, backup_path)
-        logger.info(f"Database backed up to {backup_path}")
-        return True
+        return backup.create_backup(DB_PATH, directory or backup.BACKUP_DIR, policy or backup.policy_from_env())
     except Exception as e:
         logger.error(f"Error backing up database: {str(e)}")
-        return False
+        return None
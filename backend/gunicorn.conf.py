@@ -0,0 +1,60 @@
+"""
+Gunicorn configuration for production serving.
+
+Usage (from the project root):
+    gunicorn -c backend/gunicorn.conf.py backend.wsgi:app
+
+Worker and thread counts come from ``AppConfig`` and can be overridden with
+``WEB_CONCURRENCY`` and ``GUNICORN_THREADS``. Send ``HUP`` to the master for a
+graceful worker restart; because the app is preloaded, code changes require
+the ``USR2`` + ``TERM`` re-exec sequence instead.
+"""
+
+import os
+import sys
+
+# Gunicorn executes this file directly, so make the project root importable
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backend.core.config import AppConfig  # noqa: E402
+
+bind = f"{AppConfig.HOST}:{AppConfig.PORT}"
+workers = AppConfig.WORKERS
+threads = AppConfig.THREADS
+worker_class = 'gthread'
+preload_app = True
+
+timeout = AppConfig.WORKER_TIMEOUT
+graceful_timeout = AppConfig.GRACEFUL_TIMEOUT
+keepalive = 5
+
+# Recycle workers periodically to bound memory growth
+max_requests = AppConfig.MAX_REQUESTS
+max_requests_jitter = AppConfig.MAX_REQUESTS_JITTER
+
+accesslog = '-'
+errorlog = '-'
+
+def post_fork(server, worker):
+    """Reset per-process singletons inherited from the preloaded master."""
+    from backend.core.structured_logging import restart_after_fork
+
+    restart_after_fork()
+    if not AppConfig.READ_ONLY:
+        from backend.api import routes
+        from backend.database import dispose_engine
+
+        routes.reset_fred_client()
+        dispose_engine()
+    server.log.info(f"Worker {worker.pid} initialized")
+
+def worker_int(worker):
+    """Log workers interrupted during a graceful shutdown."""
+    worker.log.info(f"Worker {worker.pid} received INT or QUIT signal")
+
+def worker_exit(server, worker):
+    """Commit writes still queued for this worker's writer thread."""
+    if AppConfig.WRITE_QUEUE_ENABLED:
+        from backend.storage.write_queue import reset_write_queue
+
+        reset_write_queue()
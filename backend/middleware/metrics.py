@@ -0,0 +1,20 @@
+from flask import Response, g, request
+import time
+from backend.core.metrics import HTTP_REQUEST_SECONDS, HTTP_REQUESTS_TOTAL, REGISTRY
+
+def start_request_timer() -> None:
+    """Record when request handling started."""
+    g.request_start = time.perf_counter()
+
+def record_request_metrics(response: Response) -> Response:
+    """Observe request latency and count the response status."""
+    start = g.get('request_start')
+    if start is not None:
+        endpoint = request.endpoint or 'unmatched'
+        HTTP_REQUEST_SECONDS.labels(endpoint, request.method).observe(time.perf_counter() - start)
+        HTTP_REQUESTS_TOTAL.labels(endpoint, request.method, str(response.status_code)).inc()
+    return response
+
+def metrics_endpoint() -> Response:
+    """Expose metrics in the Prometheus text format."""
+    return Response(REGISTRY.render(), mimetype='text/plain; version=0.0.4')
@@ -0,0 +1,35 @@
+from flask import Response, g, request
+import logging
+from backend.core.config import AppConfig
+from backend.core.profiling import PROFILE_MODES, ProfileSession
+from backend.middleware.security import is_admin_request
+
+logger = logging.getLogger(__name__)
+
+def start_request_profile() -> None:
+    """Profile this request when enabled and asked for by an admin.
+
+    Send ``X-Profile: sampling`` or ``X-Profile: deterministic`` together
+    with a valid ``X-Admin-Token``.
+    """
+    if not AppConfig.PROFILING_ENABLED:
+        return
+    mode = request.headers.get('X-Profile')
+    if not mode or not is_admin_request():
+        return
+    if mode not in PROFILE_MODES:
+        mode = None
+    g.profile_session = ProfileSession(f"{request.method}-{request.endpoint}", mode).start()
+
+def finish_request_profile(response: Response) -> Response:
+    """Store the profile and report its artifact name."""
+    session = g.pop('profile_session', None)
+    if session is not None:
+        response.headers['X-Profile-Artifact'] = session.finish()
+    return response
+
+def teardown_request_profile(exc) -> None:
+    """Stop a profile left running by an unhandled exception."""
+    session = g.pop('profile_session', None)
+    if session is not None:
+        session.finish()
@@ -1,6 +1,10 @@
 from flask import Response, request
+import hmac
 import logging
+from functools import wraps
 from backend.core.config import AppConfig
+from backend.core.exceptions import AuthorizationError
+from backend.core.structured_logging import set_request_route
 
 logger = logging.getLogger(__name__)
 
@@ -12,6 +16,27 @@ def add_security_headers(response: Response) -> Response:
 
 def log_request_info() -> None:
     """Log request details."""
-    logger.info(f"Request: {request.method} {request.url}")
-    logger.debug(f"Headers: {dict(request.headers)}")
-    logger.debug(f"Body: {request.get_data()}")
+    # Route template (not the raw path) so sampling rates match per route
+    set_request_route(request.url_rule.rule if request.url_rule else None)
+    logger.info("Request: %s %s", request.method, request.path)
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Headers: %s", dict(request.headers))
+        logger.debug("Body: %s", request.get_data())
+
+def is_admin_request() -> bool:
+    """Check the X-Admin-Token header against the configured admin token.
+
+    Compared as bytes: ``compare_digest`` rejects ``str`` with non-ASCII
+    characters, which a client can send in the header.
+    """
+    token = request.headers.get('X-Admin-Token', '')
+    return bool(AppConfig.ADMIN_TOKEN) and hmac.compare_digest(token.encode(), AppConfig.ADMIN_TOKEN.encode())
+
+def require_admin(f):
+    """Decorator rejecting requests without a valid admin token."""
+    @wraps(f)
+    def wrapper(*args, **kwargs):
+        if not is_admin_request():
+            raise AuthorizationError('Admin token required')
+        return f(*args, **kwargs)
+    return wrapper
@@ -1,7 +1,12 @@
-from .inflation_tracker import InflationTracker
-from .data_fetcher import FREDDataFetcher
-from .data_analyzer import InflationAnalyzer
-from .config import SERIES_IDS, HISTORICAL_START_DATES
+import importlib
+
+_LAZY_ATTRIBUTES = {
+    'InflationTracker': '.inflation_tracker',
+    'FREDDataFetcher': '.data_fetcher',
+    'InflationAnalyzer': '.data_analyzer',
+    'SERIES_IDS': '.config',
+    'HISTORICAL_START_DATES': '.config',
+}
 
 __all__ = [
     'InflationTracker',
@@ -10,3 +15,13 @@ __all__ = [
     'SERIES_IDS',
     'HISTORICAL_START_DATES'
 ]
+
+def __getattr__(name):
+    # Resolve lazily so that importing services.config does not load the
+    # FRED and Anthropic clients
+    module_name = _LAZY_ATTRIBUTES.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
@@ -0,0 +1,340 @@
+"""
+Date-aligned multi-series frames and cross-series statistics.
+
+Registered series come at different frequencies (``GASREGW`` is weekly,
+the CPI series and ``CSUSHPISA`` monthly), so comparing them needs every
+series on one grid. ``build_frame`` puts them in a single ``(periods,
+series)`` float64 matrix on a monthly or weekly (Monday) grid:
+
+- observations are bucketed into periods for all series at once: one
+  ``np.bincount`` over ``period * n_series + column`` gives the period
+  sums and counts of every series (``how='mean'``, the period average), or
+  one fancy-index assignment keeps each period's last observation
+  (``how='last'``)
+- periods without an observation between a series' first and last one are
+  forward-filled, so a monthly series on the weekly grid holds its value
+  until the next release; periods outside that span stay NaN
+
+``get_frame`` caches frames per process by series, grid and start date,
+keyed by the data generation: the ``last_updated`` stamps that every store
+path sets on ``fred_series``. A cached frame costs one indexed query to
+revalidate and is rebuilt only after new data is stored.
+
+Cross-series operations work on the whole matrix in one vectorized pass:
+``period_changes`` (percentage change between consecutive periods) and
+``correlation`` (pairwise-complete Pearson correlation of every pair of
+columns as matrix products).
+
+Per-series range statistics (change between two dates, averages over a
+range, the annualized rate since the inauguration) come from a prefix-sum
+``RangeIndex`` (see ``backend/storage/prefix_index.py``) per series, cached
+by ``RangeIndexCache`` with the same data generation. When a series stores
+new data its index is extended with the points after its last indexed
+date, read on their own; an index whose series was revised since (the
+``series_revisions`` count) is rebuilt.
+
+Usage:
+    python -m backend.services.analytics [--frequency weekly] [--how last] \\
+        [--since 2020-01-01] [--levels] [SERIES_ID ...]
+    python -m backend.services.analytics --ranges [--since 2025-01-20] [SERIES_ID ...]
+"""
+
+import argparse
+import json
+import logging
+import threading
+from collections import OrderedDict
+from datetime import datetime
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+
+from ..core.config import AppConfig
+from ..database import FREDSeries, get_read_session, get_series_arrays, get_series_revision
+from ..storage.columnar import get_series_cache
+from ..storage.prefix_index import RangeIndex, RangeSummary
+from .config import INAUGURATION_DATE
+from .registry import get_registry
+
+logger = logging.getLogger(__name__)
+
+FREQUENCIES = ('monthly', 'weekly')
+AGGREGATIONS = ('mean', 'last')
+DEFAULT_CACHE_SIZE = 32
+
+class AlignedFrame(NamedTuple):
+    """Series on a common grid: ``values[period, column]``, NaN where a series has no value."""
+    series_ids: Tuple[str, ...]
+    dates: np.ndarray
+    values: np.ndarray
+    frequency: str
+    how: str
+
+    def to_dict(self) -> Dict:
+        """JSON-ready columns keyed by series ID; NaN becomes ``None``."""
+        return {
+            'frequency': self.frequency,
+            'how': self.how,
+            'dates': np.datetime_as_string(self.dates, unit='D').tolist(),
+            'series': {
+                series_id: [None if np.isnan(value) else value for value in self.values[:, column].tolist()]
+                for column, series_id in enumerate(self.series_ids)
+            }
+        }
+
+def period_of(days: np.ndarray, frequency: str) -> np.ndarray:
+    """Period numbers of ``datetime64[D]`` dates: months, or Monday-based weeks, since 1970."""
+    if frequency == 'monthly':
+        return days.astype('datetime64[M]').astype('i8')
+    if frequency == 'weekly':
+        # 1970-01-01 was a Thursday; shift so weeks start on Monday
+        return (days.astype('datetime64[D]').astype('i8') + 3) // 7
+    raise ValueError(f"frequency must be one of {', '.join(FREQUENCIES)}, got {frequency!r}")
+
+def period_start(periods: np.ndarray, frequency: str) -> np.ndarray:
+    """First day of each period number, as ``datetime64[D]``."""
+    if frequency == 'monthly':
+        return periods.astype('datetime64[M]').astype('datetime64[D]')
+    return (periods * 7 - 3).astype('datetime64[D]')
+
+def _forward_fill(values: np.ndarray) -> np.ndarray:
+    """Fill NaN periods from the previous value within each column's observed span."""
+    n_periods, n_series = values.shape
+    valid = ~np.isnan(values)
+    rows = np.arange(n_periods)[:, None]
+    source = np.where(valid, rows, 0)
+    np.maximum.accumulate(source, axis=0, out=source)
+    filled = values[source, np.arange(n_series)]
+    last = n_periods - 1 - np.argmax(valid[::-1], axis=0)
+    filled[(rows > last) | ~valid.any(axis=0)] = np.nan
+    return filled
+
+def align(columns: Sequence[Tuple[np.ndarray, np.ndarray]], frequency: str = 'monthly',
+          how: str = 'mean') -> Tuple[np.ndarray, np.ndarray]:
+    """Resample ``(dates, values)`` columns onto one grid; returns ``(grid dates, matrix)``."""
+    if how not in AGGREGATIONS:
+        raise ValueError(f"how must be one of {', '.join(AGGREGATIONS)}, got {how!r}")
+    n_series = len(columns)
+    periods, values, column_ids = [], [], []
+    for column, (dates, series_values) in enumerate(columns):
+        finite = np.isfinite(series_values)
+        periods.append(period_of(dates[finite], frequency))
+        values.append(series_values[finite])
+        column_ids.append(np.full(int(finite.sum()), column, dtype='i8'))
+    periods = np.concatenate(periods) if periods else np.empty(0, dtype='i8')
+    if len(periods) == 0:
+        return np.empty(0, dtype='datetime64[D]'), np.empty((0, n_series))
+    values = np.concatenate(values)
+    first = periods.min()
+    n_periods = int(periods.max() - first) + 1
+    cells = (periods - first) * n_series + np.concatenate(column_ids)
+
+    if how == 'mean':
+        counts = np.bincount(cells, minlength=n_periods * n_series)
+        sums = np.bincount(cells, weights=values, minlength=n_periods * n_series)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            matrix = np.where(counts > 0, sums / counts, np.nan)
+    else:
+        # Columns are in date order, and repeated indices keep the last value assigned
+        matrix = np.full(n_periods * n_series, np.nan)
+        matrix[cells] = values
+    matrix = _forward_fill(matrix.reshape(n_periods, n_series))
+    return period_start(np.arange(first, first + n_periods), frequency), matrix
+
+def _load_columns(session, series_ids: Sequence[str], start_date) -> List[Tuple[np.ndarray, np.ndarray]]:
+    if AppConfig.SERIES_CACHE_ENABLED:
+        cache = get_series_cache()
+        return [tuple(cache.get_or_sync(session, series_id).between(start_date)) for series_id in series_ids]
+    return [get_series_arrays(session, series_id, start_date=start_date) for series_id in series_ids]
+
+def build_frame(session, series_ids: Sequence[str], frequency: str = 'monthly', how: str = 'mean',
+                start_date: Optional[datetime] = None) -> AlignedFrame:
+    """Load ``series_ids`` since ``start_date`` and align them on a ``frequency`` grid."""
+    dates, values = align(_load_columns(session, series_ids, start_date), frequency, how)
+    return AlignedFrame(tuple(series_ids), dates, values, frequency, how)
+
+def data_generation(session, series_ids: Sequence[str]) -> Tuple:
+    """``(series_id, last_updated)`` of each series; changes whenever one of them is stored."""
+    return tuple(sorted(
+        session.query(FREDSeries.series_id, FREDSeries.last_updated)
+        .filter(FREDSeries.series_id.in_(list(series_ids)))
+        .all()
+    ))
+
+class FrameCache:
+    """Least recently used frames, each valid for the data generation it was built from."""
+
+    def __init__(self, max_frames: int = DEFAULT_CACHE_SIZE):
+        self.max_frames = max_frames
+        self._frames: 'OrderedDict[Tuple, Tuple[Tuple, AlignedFrame]]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, session, series_ids: Sequence[str], frequency: str, how: str,
+            start_date: Optional[datetime] = None) -> AlignedFrame:
+        """The frame of ``series_ids``, rebuilt only if their data generation changed."""
+        key = (tuple(series_ids), frequency, how, start_date)
+        generation = data_generation(session, series_ids)
+        with self._lock:
+            cached = self._frames.get(key)
+            if cached is not None and cached[0] == generation:
+                self._frames.move_to_end(key)
+                return cached[1]
+        frame = build_frame(session, series_ids, frequency, how, start_date)
+        with self._lock:
+            self._frames[key] = (generation, frame)
+            self._frames.move_to_end(key)
+            while len(self._frames) > self.max_frames:
+                self._frames.popitem(last=False)
+        return frame
+
+    def clear(self) -> None:
+        with self._lock:
+            self._frames.clear()
+
+_cache: Optional[FrameCache] = None
+
+def get_frame_cache() -> FrameCache:
+    """Get the process-wide frame cache."""
+    global _cache
+    if _cache is None:
+        _cache = FrameCache()
+    return _cache
+
+def get_frame(series_ids: Optional[Sequence[str]] = None, frequency: str = 'monthly', how: str = 'mean',
+              start_date: Optional[datetime] = None) -> AlignedFrame:
+    """The aligned frame of ``series_ids`` (default: every registered series), from the frame cache."""
+    series_ids = tuple(series_ids or get_registry().series_ids())
+    session = get_read_session()
+    try:
+        return get_frame_cache().get(session, series_ids, frequency, how, start_date)
+    finally:
+        session.close()
+
+class _CachedIndex(NamedTuple):
+    generation: Tuple
+    revision: int
+    index: RangeIndex
+
+class RangeIndexCache:
+    """Range index of each series, extended whenever its data generation changes.
+
+    While a series' revision count (``get_series_revision``) is the one its
+    index was built at, stored points were only appended, so only points
+    after the last indexed date are read. Otherwise the index is rebuilt.
+    """
+
+    def __init__(self):
+        self._indexes: Dict[str, _CachedIndex] = {}
+        self._lock = threading.Lock()
+
+    def get(self, session, series_id: str) -> RangeIndex:
+        """The range index of ``series_id``, with every stored point."""
+        generation = data_generation(session, [series_id])
+        cached = self._indexes.get(series_id)
+        if cached is not None and cached.generation == generation:
+            return cached.index
+        with self._lock:
+            cached = self._indexes.get(series_id)
+            if cached is not None and cached.generation == generation:
+                return cached.index
+            # Read before the points, so a revision stored meanwhile is seen next time
+            revision = get_series_revision(session, series_id)
+            if cached is not None and cached.revision == revision and len(cached.index):
+                index = cached.index
+                start = (index.last_date + np.timedelta64(1, 'D')).astype('datetime64[us]').astype(datetime)
+                appended = index.append(*get_series_arrays(session, series_id, start_date=start))
+                logger.debug("Appended %d points to the range index of %s", appended, series_id)
+            else:
+                index = RangeIndex.from_arrays(series_id, *_load_columns(session, [series_id], None)[0])
+                logger.debug("Built the range index of %s (%d points)", series_id, len(index))
+            self._indexes[series_id] = _CachedIndex(generation, revision, index)
+        return index
+
+    def clear(self) -> None:
+        with self._lock:
+            self._indexes.clear()
+
+_range_cache: Optional[RangeIndexCache] = None
+
+def get_range_cache() -> RangeIndexCache:
+    """Get the process-wide range index cache."""
+    global _range_cache
+    if _range_cache is None:
+        _range_cache = RangeIndexCache()
+    return _range_cache
+
+def get_range_summary(series_id: str, start_date=None, end_date=None) -> RangeSummary:
+    """Change, annualized rate and averages of ``series_id`` between two dates."""
+    session = get_read_session()
+    try:
+        index = get_range_cache().get(session, series_id)
+    finally:
+        session.close()
+    return index.summary(start_date, end_date)
+
+def period_changes(values: np.ndarray) -> np.ndarray:
+    """Percentage change of every column between consecutive periods."""
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return (values[1:] / values[:-1] - 1) * 100
+
+def correlation(values: np.ndarray, min_periods: int = 3) -> np.ndarray:
+    """Pearson correlation of every pair of columns over the periods where both have values.
+
+    Pairs with fewer than ``min_periods`` shared periods, or with no
+    variance over them, are NaN.
+    """
+    valid = np.isfinite(values).astype('f8')
+    x = np.where(valid > 0, values, 0.0)
+    n = valid.T @ valid
+    sums = x.T @ valid            # sums[i, j]: sum of column i where j is valid too
+    squares = (x * x).T @ valid
+    products = x.T @ x
+    with np.errstate(invalid='ignore', divide='ignore'):
+        covariance = n * products - sums * sums.T
+        variance = (n * squares - sums * sums) * (n * squares - sums * sums).T
+        result = covariance / np.sqrt(variance)
+    result[(n < min_periods) | ~(variance > 0)] = np.nan
+    return np.clip(result, -1.0, 1.0)
+
+def correlation_table(frame: AlignedFrame, on: str = 'changes', min_periods: int = 3) -> Dict[str, Dict]:
+    """``{series_id: {series_id: r}}`` of a frame's levels or period-over-period changes."""
+    if on not in ('changes', 'levels'):
+        raise ValueError(f"on must be 'changes' or 'levels', got {on!r}")
+    values = period_changes(frame.values) if on == 'changes' else frame.values
+    matrix = correlation(values, min_periods)
+    return {
+        row_id: {
+            column_id: None if np.isnan(matrix[i, j]) else round(float(matrix[i, j]), 4)
+            for j, column_id in enumerate(frame.series_ids)
+        }
+        for i, row_id in enumerate(frame.series_ids)
+    }
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('series_ids', nargs='*', help='series IDs (default: every registered series)')
+    parser.add_argument('--frequency', choices=FREQUENCIES, default='monthly')
+    parser.add_argument('--how', choices=AGGREGATIONS, default='mean')
+    parser.add_argument('--since', type=lambda value: datetime.strptime(value, '%Y-%m-%d'))
+    parser.add_argument('--levels', action='store_true', help='correlate levels instead of changes')
+    parser.add_argument('--ranges', action='store_true',
+                        help=f"print each series' range statistics since --since (default {INAUGURATION_DATE})")
+    args = parser.parse_args()
+
+    if args.ranges:
+        print(json.dumps({
+            series_id: get_range_summary(series_id, args.since or INAUGURATION_DATE)._asdict()
+            for series_id in args.series_ids or get_registry().series_ids()
+        }, indent=2))
+        return
+
+    frame = get_frame(args.series_ids or None, args.frequency, args.how, args.since)
+    print(json.dumps({
+        'periods': len(frame.dates),
+        'first': str(frame.dates[0]) if len(frame.dates) else None,
+        'last': str(frame.dates[-1]) if len(frame.dates) else None,
+        'correlation': correlation_table(frame, 'levels' if args.levels else 'changes'),
+    }, indent=2))
+
+if __name__ == '__main__':
+    main()
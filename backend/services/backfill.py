@@ -0,0 +1,206 @@
+"""
+Resumable, checkpointed full-history backfill.
+
+``fetch_and_store_historical_data`` loads each series from its registered
+start date in one ``get_series`` call and, because the retry
+wraps the whole method, restarts every series when any of them fails.
+``BackfillEngine`` instead splits each series' history (by default from the
+series' first FRED observation) into fixed date windows:
+
+- each window is fetched, validated and inserted with ``bulk_store_series_data``,
+  then dropped, so memory stays proportional to one window
+- the window's data and its ``BackfillCheckpoint`` row commit together, so a
+  window is either fully stored and checkpointed or not at all
+- retries apply to a single window; a rerun skips checkpointed windows and
+  resumes at the first missing one
+
+Usage:
+    python -m backend.services.backfill [--series CPIAUCSL ...] \\
+        [--start 1947-01-01] [--window-years 10] [--reset]
+"""
+
+import argparse
+import json
+import logging
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from ..database import (
+    BackfillCheckpoint,
+    bulk_store_series_data,
+    get_session,
+    upsert_series_metadata
+)
+from ..core.tracing import span
+from .data_fetcher import FREDDataFetcher, ValidationError, retry_on_failure, sync_series_cache
+from .registry import get_registry
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_START = datetime(1947, 1, 1)
+DEFAULT_WINDOW_YEARS = 10
+
+Window = Tuple[datetime, datetime]
+
+def plan_windows(start: datetime, end: datetime, window_years: int) -> List[Window]:
+    """Split ``[start, end]`` into consecutive inclusive windows of ``window_years``."""
+    windows = []
+    window_start = start
+    while window_start <= end:
+        try:
+            next_start = window_start.replace(year=window_start.year + window_years)
+        except ValueError:
+            # 29 February in a non-leap target year
+            next_start = window_start.replace(year=window_start.year + window_years, day=28)
+        windows.append((window_start, min(next_start - timedelta(days=1), end)))
+        window_start = next_start
+    return windows
+
+class BackfillEngine:
+    """Backfill series history window by window with per-window checkpoints."""
+
+    def __init__(self, fetcher: Optional[FREDDataFetcher] = None,
+                 window_years: int = DEFAULT_WINDOW_YEARS, session_factory=get_session):
+        if window_years < 1:
+            raise ValueError("window_years must be at least 1")
+        self.fetcher = fetcher or FREDDataFetcher()
+        self.window_years = window_years
+        self.session_factory = session_factory
+
+    def completed_windows(self, session, series_id: str) -> set:
+        """Windows of ``series_id`` that already have a checkpoint."""
+        rows = session.query(BackfillCheckpoint.window_start, BackfillCheckpoint.window_end)\
+            .filter_by(series_id=series_id)\
+            .all()
+        return {(row.window_start, row.window_end) for row in rows}
+
+    def reset(self, series_ids: Iterable[str]) -> int:
+        """Delete checkpoints so the next run refetches every window."""
+        session = self.session_factory()
+        try:
+            deleted = session.query(BackfillCheckpoint)\
+                .filter(BackfillCheckpoint.series_id.in_(list(series_ids)))\
+                .delete(synchronize_session=False)
+            session.commit()
+            return deleted
+        finally:
+            session.close()
+
+    def run(self, series_ids: Optional[Iterable[str]] = None,
+            start: Optional[datetime] = None, end: Optional[datetime] = None) -> Dict:
+        """Backfill each series and return per-series window and point counts."""
+        series_ids = list(series_ids or get_registry().series_ids())
+        end = end or datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+        summary = {}
+        with span('backfill', series=len(series_ids)):
+            for series_id in series_ids:
+                with span('backfill_series', series_id=series_id):
+                    summary[series_id] = self.backfill_series(series_id, start, end)
+        return summary
+
+    def backfill_series(self, series_id: str, start: Optional[datetime], end: datetime) -> Dict:
+        """Fetch and store every window of one series that is not checkpointed yet."""
+        self.fetcher._validate_series_id(series_id)
+        metadata = self._fetch_metadata(series_id)
+        start = start or self._first_observation(metadata)
+        windows = plan_windows(start, end, self.window_years)
+
+        session = self.session_factory()
+        try:
+            completed = self.completed_windows(session, series_id)
+            pending = [window for window in windows if window not in completed]
+            logger.info(
+                f"Backfilling {series_id}: {len(pending)} of {len(windows)} windows "
+                f"pending from {start:%Y-%m-%d} to {end:%Y-%m-%d}"
+            )
+            if pending:
+                upsert_series_metadata(session, series_id, metadata)
+                session.commit()
+
+            inserted = 0
+            for window in pending:
+                with span('backfill_window', series_id=series_id,
+                          window_start=f"{window[0]:%Y-%m-%d}", window_end=f"{window[1]:%Y-%m-%d}"):
+                    inserted += self._backfill_window(session, series_id, window)
+            if inserted:
+                sync_series_cache(session, [series_id])
+        finally:
+            session.close()
+
+        return {
+            'windows': len(windows),
+            'skipped': len(windows) - len(pending),
+            'fetched': len(pending),
+            'inserted': inserted,
+        }
+
+    @retry_on_failure(max_retries=3, delay=1)
+    def _fetch_metadata(self, series_id: str):
+        metadata = self.fetcher._fetch_series_info(series_id)
+        if metadata is None or len(metadata) == 0:
+            raise ValidationError(f"Failed to fetch metadata for series {series_id}")
+        return metadata
+
+    def _first_observation(self, metadata) -> datetime:
+        """The series' first observation date according to FRED, or 1947-01-01."""
+        try:
+            return self.fetcher._validate_date(metadata.get('observation_start'))
+        except ValidationError:
+            return DEFAULT_START
+
+    @retry_on_failure(max_retries=3, delay=1)
+    def _backfill_window(self, session, series_id: str, window: Window) -> int:
+        """Store one window's points and its checkpoint in a single transaction."""
+        window_start, window_end = window
+        series = self.fetcher._fetch_series(series_id, window_start, window_end)
+        data_points = [] if series is None else [
+            {'date': date, 'value': value} for date, value in series.items()
+        ]
+        validated_points = self.fetcher._validate_points(data_points)
+
+        try:
+            with span('store', series_id=series_id, points=len(validated_points)):
+                inserted = bulk_store_series_data(session, series_id, validated_points)
+            session.add(BackfillCheckpoint(
+                series_id=series_id,
+                window_start=window_start,
+                window_end=window_end,
+                points=len(validated_points),
+                completed_at=datetime.now()
+            ))
+            session.commit()
+        except Exception:
+            session.rollback()
+            raise
+        logger.debug("Backfilled %s %s..%s: %d points, %d new",
+                     series_id, window_start.date(), window_end.date(), len(validated_points), inserted)
+        return inserted
+
+def _parse_date(value: str) -> datetime:
+    return datetime.strptime(value, '%Y-%m-%d')
+
+def main() -> None:
+    from ..core.config import init_environment
+    from ..core.structured_logging import configure_logging
+    from ..database import init_db
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--series', nargs='+', help='series IDs (default: all configured series)')
+    parser.add_argument('--start', type=_parse_date, help="first date (default: each series' first observation)")
+    parser.add_argument('--end', type=_parse_date, help='last date (default: today)')
+    parser.add_argument('--window-years', type=int, default=DEFAULT_WINDOW_YEARS)
+    parser.add_argument('--reset', action='store_true', help='discard checkpoints and refetch every window')
+    args = parser.parse_args()
+
+    configure_logging(fmt='text')
+    init_environment()
+    init_db()
+
+    backfill = BackfillEngine(window_years=args.window_years)
+    series_ids = args.series or get_registry().series_ids()
+    if args.reset:
+        logger.info(f"Removed {backfill.reset(series_ids)} backfill checkpoints")
+    print(json.dumps(backfill.run(series_ids, args.start, args.end), indent=2))
+
+if __name__ == '__main__':
+    main()
@@ -7,10 +7,33 @@ def get_fred_api_key() -> str:
         raise ValueError("FRED_API_KEY environment variable is not set")
     return api_key
 
+def get_fred_api_url() -> str:
+    """Get an alternative FRED API root URL (e.g. a local stand-in), if set."""
+    return os.getenv('FRED_API_URL', '').rstrip('/') or None
+
+def get_fred_cassette_mode() -> str:
+    """Get the FRED record/replay mode ('record', 'replay' or 'once'), if enabled."""
+    return os.getenv('FRED_CASSETTE', '').strip().lower() or None
+
+def get_fred_cassette_path() -> str:
+    """Get the path of the FRED response cassette."""
+    return os.getenv(
+        'FRED_CASSETTE_PATH',
+        os.path.join(os.path.dirname(os.path.dirname(__file__)), 'cassettes', 'fred.sqlite')
+    )
+
+def get_revision_window_override() -> int:
+    """Get a trailing revision window applied to every series, in days, if set."""
+    override = os.getenv('REVISION_WINDOW_DAYS')
+    return int(override) if override else None
+
 def get_claude_model() -> str:
     """Get Claude model name from environment variables."""
     return os.getenv('CLAUDE_MODEL', 'claude-3-5-sonnet-20241022')
 
+# Built-in series, used until series are registered in the database
+# (see backend/services/registry.py)
+
 # FRED API Series IDs
 SERIES_IDS = {
     'cpi': 'CPIAUCSL',           # Consumer Price Index for All Urban Consumers
@@ -28,3 +51,88 @@ HISTORICAL_START_DATES = {
     'GASREGW': '2024-01-01',     # Weekly, released on Tuesday
     'CSUSHPISA': '2024-01-01'    # Monthly, released on last Tuesday
 }
+
+# Trailing windows re-fetched by update_daily_data to detect revisions
+DEFAULT_REVISION_WINDOW_DAYS = 400
+REVISION_WINDOW_DAYS = {
+    'CPIAUCSL': 400,             # Seasonal factors revised each February
+    'CPILFESL': 400,
+    'CPIUFDSL': 400,
+    'GASREGW': 35,               # Weekly prices are rarely revised
+    'CSUSHPISA': 400             # Recent months revised with each release
+}
+
+SERIES_FREQUENCIES = {
+    'CPIAUCSL': 'monthly',
+    'CPILFESL': 'monthly',
+    'CPIUFDSL': 'monthly',
+    'GASREGW': 'weekly',
+    'CSUSHPISA': 'monthly'
+}
+
+# Earliest day new observations can appear on FRED and, after "+", how many
+# periods back the release publishes; updates skip a series once the period
+# its latest release publishes is stored (see backend/services/registry.py)
+RELEASE_RULES = {
+    'CPIAUCSL': 'monthly:10+1',  # BLS releases the previous month between the 10th and 15th
+    'CPILFESL': 'monthly:10+1',
+    'CPIUFDSL': 'monthly:10+1',
+    'GASREGW': 'weekly:mon',     # EIA publishes Mondays (Tuesdays after holidays)
+    'CSUSHPISA': 'monthly:last-tue+2'  # S&P releases two months back on the last Tuesday
+}
+
+# Start of the tracked administration; range statistics (annualized rates)
+# are measured from it by default (see backend/services/analytics.py)
+INAUGURATION_DATE = '2025-01-20'
+
+# Related series ingested with a registered parent under one family key
+# (see backend/services/families.py)
+SERIES_FAMILIES = {
+    'case_shiller_metros': {
+        'parent': 'CSUSHPISA',
+        'members': {
+            'atlanta': 'ATXRSA',
+            'boston': 'BOXRSA',
+            'charlotte': 'CRXRSA',
+            'chicago': 'CHXRSA',
+            'cleveland': 'CEXRSA',
+            'dallas': 'DAXRSA',
+            'denver': 'DNXRSA',
+            'detroit': 'DEXRSA',
+            'las_vegas': 'LVXRSA',
+            'los_angeles': 'LXXRSA',
+            'miami': 'MIXRSA',
+            'minneapolis': 'MNXRSA',
+            'new_york': 'NYXRSA',
+            'phoenix': 'PHXRSA',
+            'portland': 'POXRSA',
+            'san_diego': 'SDXRSA',
+            'san_francisco': 'SFXRSA',
+            'seattle': 'SEXRSA',
+            'tampa': 'TPXRSA',
+            'washington': 'WDXRSA'
+        }
+    },
+    'cpi_components': {
+        'parent': 'CPIAUCSL',
+        'members': {
+            'energy': 'CPIENGSL',
+            'shelter': 'CUSR0000SAH1',
+            'medical_care': 'CPIMEDSL',
+            'transportation': 'CPITRNSL',
+            'apparel': 'CPIAPPSL',
+            'education_communication': 'CPIEDUSL',
+            'recreation': 'CPIRECSL',
+            'food_at_home': 'CUSR0000SAF11',
+            'food_away_from_home': 'CUSR0000SEFV'
+        }
+    },
+    'gas_grades': {
+        'parent': 'GASREGW',
+        'members': {
+            'midgrade': 'GASMIDW',
+            'premium': 'GASPRMW',
+            'diesel': 'GASDESW'
+        }
+    }
+}
@@ -4,75 +4,29 @@ from typing import Dict, Any
 import time
 from datetime import datetime, timedelta
 from functools import wraps
-from ..database import get_session, store_series_analysis
+from ..database import get_session, store_series_analysis, write_series_analysis
+from ..core.config import AppConfig
+from ..core.metrics import (
+    ANALYSIS_CACHE_TOTAL,
+    ANTHROPIC_REQUEST_SECONDS,
+    ANTHROPIC_TOKENS_TOTAL,
+    ANTHROPIC_ERRORS_TOTAL
+)
+from ..core.tracing import span
+from ..storage.write_queue import get_write_queue
+from .registry import PROMPT_FIELDS, get_registry
 
 logger = logging.getLogger(__name__)
 
-class AnalyzerError(Exception):
-    """Base exception for analyzer errors."""
-    pass
-
-class AnalysisCache:
-    def __init__(self, ttl_seconds: int = 300):  # 5 minutes TTL
-        self.cache = {}
-        self.ttl = ttl_seconds
-        self.last_request_time = 0
-        self.min_request_interval = 1.0  # Minimum 1 second between requests
-
-    def get(self, key: str) -> Any:
-        if key in self.cache:
-            entry = self.cache[key]
-            if datetime.now() - entry['timestamp'] < timedelta(seconds=self.ttl):
-                return entry['data']
-            else:
-                del self.cache[key]
-        return None
-
-    def set(self, key: str, data: Any) -> None:
-        self.cache[key] = {
-            'data': data,
-            'timestamp': datetime.now()
-        }
+# Prefixed to every prompt as {date_context}
+DATE_CONTEXT = """The current date is 11/6/2024 regardless of what you think and you will analyze data before this date since the data reporting lags a month or two behind the current date. You should analyze the available historical data and provide insights based on the trends and patterns shown in that data."""
 
-    def wait_if_needed(self) -> None:
-        """Implement rate limiting."""
-        now = time.time()
-        time_since_last_request = now - self.last_request_time
-        if time_since_last_request < self.min_request_interval:
-            time.sleep(self.min_request_interval - time_since_last_request)
-        self.last_request_time = time.time()
+# Analysis prompts by template name; registered series pick one by name or
+# bring their own (see backend/services/registry.py)
+PROMPT_TEMPLATES = {
+    'cpi': """{date_context}
 
-class InflationAnalyzer:
-    def __init__(self):
-        """Initialize Anthropic client and cache."""
-        try:
-            self.anthropic_client = anthropic.Anthropic()
-            self.cache = AnalysisCache()
-            self.model = self._validate_model()
-            logger.info(f"Using Claude model: {self.model}")
-        except Exception as e:
-            raise AnalyzerError(f"Failed to initialize analyzer: {str(e)}")
-
-    def _validate_model(self) -> str:
-        """Get and validate Claude model name."""
-        return 'claude-3-5-sonnet-20241022'
-
-    def _generate_cache_key(self, metrics: Dict) -> str:
-        """Generate a cache key based on metrics data."""
-        key_parts = []
-        for name, data in sorted(metrics.items()):
-            if 'current_value' in data and 'percentage_change' in data:
-                key_parts.append(f"{name}:{data['current_value']}:{data['percentage_change']}")
-        return "|".join(key_parts)
-
-    def _get_metric_prompt(self, metric_name: str, data: Dict) -> str:
-        """Get the appropriate analysis prompt for each metric type."""
-        date_context = """The current date is 11/6/2024 regardless of what you think and you will analyze data before this date since the data reporting lags a month or two behind the current date. You should analyze the available historical data and provide insights based on the trends and patterns shown in that data."""
-
-        if metric_name == 'cpi':
-            return f"""{date_context}
-
-Using the available CPI-U data (current value: {data['current_value']} {data['units']}), analyze:
+Using the available CPI-U data (current value: {current_value} {units}), analyze:
 1. Year-over-year percentage change
 2. 3-month trend analysis
 3. Key drivers of changes
@@ -87,11 +41,10 @@ Format the analysis with:
 - Forward-looking indicators
 - Consumer impact assessment
 
-Note: Base your analysis on the historical data available through {data['last_updated']}, which shows a current value of {data['current_value']} and a year-over-year change of {data['percentage_change']}%."""
-        elif metric_name == 'core_cpi':
-            return f"""{date_context}
+Note: Base your analysis on the historical data available through {last_updated}, which shows a current value of {current_value} and a year-over-year change of {percentage_change}%.{components}""",
+    'core_cpi': """{date_context}
 
-Using the available Core CPI data (current value: {data['current_value']} {data['units']}), examine:
+Using the available Core CPI data (current value: {current_value} {units}), examine:
 1. Underlying inflation trends excluding volatile components
 2. Month-over-month changes in:
    - Housing costs
@@ -108,11 +61,10 @@ Present findings as:
 - Structural vs cyclical factors
 - Policy implications
 
-Note: Base your analysis on the historical data available through {data['last_updated']}, which shows a current value of {data['current_value']} and a year-over-year change of {data['percentage_change']}%."""
-        elif metric_name == 'food':
-            return f"""{date_context}
+Note: Base your analysis on the historical data available through {last_updated}, which shows a current value of {current_value} and a year-over-year change of {percentage_change}%.{components}""",
+    'food': """{date_context}
 
-Using the available Food CPI data (current value: {data['current_value']} {data['units']}), analyze:
+Using the available Food CPI data (current value: {current_value} {units}), analyze:
 1. Categories showing largest increases/decreases:
    - Grocery store items
    - Restaurant prices
@@ -127,11 +79,10 @@ Include:
 - Consumer substitution patterns
 - Price elasticity impacts
 
-Note: Base your analysis on the historical data available through {data['last_updated']}, which shows a current value of {data['current_value']} and a year-over-year change of {data['percentage_change']}%."""
-        elif metric_name == 'gas':
-            return f"""{date_context}
+Note: Base your analysis on the historical data available through {last_updated}, which shows a current value of {current_value} and a year-over-year change of {percentage_change}%.{components}""",
+    'gas': """{date_context}
 
-Using the available gas price data (current value: {data['current_value']} {data['units']}), analyze:
+Using the available gas price data (current value: {current_value} {units}), analyze:
 1. National average vs regional breakdowns
 2. Price changes by grade:
    - Regular
@@ -153,11 +104,10 @@ Output format:
 - Supply/demand dynamics
 - Short-term forecast
 
-Note: Base your analysis on the historical data available through {data['last_updated']}, which shows a current value of {data['current_value']} and a year-over-year change of {data['percentage_change']}%."""
-        else:  # housing
-            return f"""{date_context}
+Note: Base your analysis on the historical data available through {last_updated}, which shows a current value of {current_value} and a year-over-year change of {percentage_change}%.{components}""",
+    'housing': """{date_context}
 
-Using the available Case-Shiller Housing Price Index data (current value: {data['current_value']} {data['units']}), analyze:
+Using the available Case-Shiller Housing Price Index data (current value: {current_value} {units}), analyze:
 1. National price trends
 2. Top 20 metropolitan areas:
    - Highest/lowest appreciation
@@ -176,7 +126,161 @@ Provide:
 - Leading indicator analysis
 - Affordability index trends
 
-Note: Base your analysis on the historical data available through {data['last_updated']}, which shows a current value of {data['current_value']} and a year-over-year change of {data['percentage_change']}%."""
+Note: Base your analysis on the historical data available through {last_updated}, which shows a current value of {current_value} and a year-over-year change of {percentage_change}%.{components}"""
+}
+
+# Series without a template of their own
+DEFAULT_PROMPT_TEMPLATE = """{date_context}
+
+Using the available {title} data (current value: {current_value} {units}), analyze:
+1. Year-over-year percentage change
+2. Recent trend and its drivers
+3. Notable turning points
+4. Implications for consumers
+
+Note: Base your analysis on the historical data available through {last_updated}, which shows a current value of {current_value} and a year-over-year change of {percentage_change}%.{components}"""
+
+class AnalyzerError(Exception):
+    """Base exception for analyzer errors."""
+    pass
+
+class AnalysisCache:
+    def __init__(self, ttl_seconds: int = 300):  # 5 minutes TTL
+        self.cache = {}
+        self.ttl = ttl_seconds
+        self.last_request_time = 0
+        self.min_request_interval = 1.0  # Minimum 1 second between requests
+
+    def get(self, key: str) -> Any:
+        if key in self.cache:
+            entry = self.cache[key]
+            if datetime.now() - entry['timestamp'] < timedelta(seconds=self.ttl):
+                ANALYSIS_CACHE_TOTAL.labels('hit').inc()
+                return entry['data']
+            else:
+                del self.cache[key]
+        ANALYSIS_CACHE_TOTAL.labels('miss').inc()
+        return None
+
+    def set(self, key: str, data: Any) -> None:
+        self.cache[key] = {
+            'data': data,
+            'timestamp': datetime.now()
+        }
+
+    def wait_if_needed(self) -> None:
+        """Implement rate limiting."""
+        now = time.time()
+        time_since_last_request = now - self.last_request_time
+        if time_since_last_request < self.min_request_interval:
+            time.sleep(self.min_request_interval - time_since_last_request)
+        self.last_request_time = time.time()
+
+class InflationAnalyzer:
+    def __init__(self):
+        """Initialize Anthropic client and cache."""
+        try:
+            self.anthropic_client = anthropic.Anthropic()
+            self.cache = AnalysisCache()
+            self.model = self._validate_model()
+            logger.info(f"Using Claude model: {self.model}")
+        except Exception as e:
+            raise AnalyzerError(f"Failed to initialize analyzer: {str(e)}")
+
+    def _validate_model(self) -> str:
+        """Get and validate Claude model name."""
+        return 'claude-3-5-sonnet-20241022'
+
+    def _generate_cache_key(self, metrics: Dict) -> str:
+        """Generate a cache key based on metrics data."""
+        key_parts = []
+        for name, data in sorted(metrics.items()):
+            if 'current_value' in data and 'percentage_change' in data:
+                key_parts.append(f"{name}:{data['current_value']}:{data['percentage_change']}")
+        return "|".join(key_parts)
+
+    def _get_metric_prompt(self, metric_name: str, data: Dict) -> str:
+        """Get the analysis prompt of a metric from its registered template."""
+        registry = get_registry()
+        spec = registry.get(data.get('series_id')) or registry.by_name(metric_name)
+        custom = spec.prompt_template if spec else None
+        if (custom or metric_name) in PROMPT_TEMPLATES:
+            template = PROMPT_TEMPLATES[custom or metric_name]
+        else:
+            template = custom or DEFAULT_PROMPT_TEMPLATE
+        fields = {field: data.get(field) for field in PROMPT_FIELDS}
+        fields.update(date_context=DATE_CONTEXT, name=metric_name,
+                      components=self._format_components(data.get('components')))
+        return template.format(**fields)
+
+    def _format_components(self, components) -> str:
+        """Render family member data for the {components} prompt field."""
+        if not components:
+            return ''
+        lines = [
+            f"- {component['name']} ({component['series_id']}): {component['current_value']:.2f}, "
+            f"{component['percentage_change']:+.2f}% over the year"
+            for component in components
+        ]
+        return "\n\nComponent series (latest value, change over the year):\n" + "\n".join(lines)
+
+    def _record_usage(self, response: Any, claude_span=None) -> None:
+        """Count input and output tokens reported by the API."""
+        usage = getattr(response, 'usage', None)
+        if usage is None:
+            return
+        for token_type in ('input_tokens', 'output_tokens'):
+            count = getattr(usage, token_type, None)
+            if isinstance(count, int):
+                ANTHROPIC_TOKENS_TOTAL.labels(self.model, token_type).inc(count)
+                if claude_span is not None:
+                    claude_span.set_attribute(token_type, count)
+
+    def _analyze_metric(self, session, metric_name: str, data: Dict) -> None:
+        """Request and store the analysis of a single metric."""
+        with span('render_prompt'):
+            try:
+                prompt = self._get_metric_prompt(metric_name, data)
+            except (KeyError, IndexError, ValueError, TypeError) as e:
+                # e.g. a numeric format on a field this metric has no value for
+                logger.error(f"Cannot render the analysis prompt for {metric_name}: {str(e)}")
+                return
+        
+        logger.info(f"Sending analysis request to Claude for {metric_name}")
+        try:
+            with span('claude.messages.create', model=self.model) as claude_span, \
+                    ANTHROPIC_REQUEST_SECONDS.labels(self.model).time():
+                response = self.anthropic_client.messages.create(
+                    model=self.model,
+                    max_tokens=1024,
+                    messages=[
+                        {
+                            "role": "user",
+                            "content": prompt
+                        }
+                    ],
+                    temperature=0,
+                    system="You are an expert economic analyst providing insights on inflation metrics."
+                )
+                self._record_usage(response, claude_span)
+            
+            analysis = response.content[0].text if isinstance(response.content, list) else response.content
+            
+            # Store analysis in database
+            series_id = data.get('series_id')
+            if series_id:
+                with span('store_analysis', series_id=series_id):
+                    if AppConfig.WRITE_QUEUE_ENABLED:
+                        get_write_queue().submit(write_series_analysis, series_id, analysis).result()
+                    else:
+                        store_series_analysis(session, series_id, analysis)
+                
+        except anthropic.RateLimitError:
+            ANTHROPIC_ERRORS_TOTAL.labels('rate_limit').inc()
+            logger.warning(f"Rate limit hit for {metric_name}")
+        except anthropic.APIError as e:
+            ANTHROPIC_ERRORS_TOTAL.labels(type(e).__name__).inc()
+            logger.error(f"Claude API error for {metric_name}: {str(e)}")
 
     def analyze_trends(self, metrics: Dict) -> str:
         """Analyze inflation trends with caching and rate limiting."""
@@ -197,36 +301,8 @@ Note: Base your analysis on the historical data available through {data['last_up
             try:
                 # Analyze each metric individually with specific prompts
                 for metric_name, data in metrics.items():
-                    prompt = self._get_metric_prompt(metric_name, data)
-                    
-                    logger.info(f"Sending analysis request to Claude for {metric_name}")
-                    try:
-                        response = self.anthropic_client.messages.create(
-                            model=self.model,
-                            max_tokens=1024,
-                            messages=[
-                                {
-                                    "role": "user",
-                                    "content": prompt
-                                }
-                            ],
-                            temperature=0,
-                            system="You are an expert economic analyst providing insights on inflation metrics."
-                        )
-                        
-                        analysis = response.content[0].text if isinstance(response.content, list) else response.content
-                        
-                        # Store analysis in database
-                        series_id = metrics[metric_name].get('series_id')
-                        if series_id:
-                            store_series_analysis(session, series_id, analysis)
-                            
-                    except anthropic.RateLimitError:
-                        logger.warning(f"Rate limit hit for {metric_name}")
-                        continue
-                    except anthropic.APIError as e:
-                        logger.error(f"Claude API error for {metric_name}: {str(e)}")
-                        continue
+                    with span('analyze_metric', metric=metric_name, series_id=data.get('series_id')):
+                        self._analyze_metric(session, metric_name, data)
 
                 # Return combined analysis
                 return "Analysis updated in database"
@@ -3,8 +3,35 @@ import pandas as pd
 from datetime import datetime, timedelta
 import logging
 from typing import Dict, List, Optional, Any
-from ..database import get_session, store_series_data, get_series_data, FREDSeries, FREDData
-from .config import SERIES_IDS, HISTORICAL_START_DATES, get_fred_api_key
+from ..database import (
+    get_session,
+    get_read_session,
+    store_series_data,
+    write_series_data,
+    write_series_vintage,
+    get_series_data,
+    get_series_arrays,
+    get_family_members,
+    get_latest_point,
+    get_window_hash,
+    window_digest,
+    write_window_hash,
+    FREDSeries,
+    SeriesPoint
+)
+from .config import (
+    get_fred_api_key,
+    get_fred_api_url,
+    get_fred_cassette_mode,
+    get_fred_cassette_path
+)
+from .registry import SeriesSpec, get_registry, is_due
+from ..core.config import AppConfig
+from ..core.metrics import FRED_REQUEST_SECONDS, FRED_ERRORS_TOTAL, INGEST_SERIES_UPDATES_TOTAL
+from ..core.tracing import span
+from ..storage.columnar import get_series_cache, invalidate_series, sync_series
+from ..storage.vintage import load_releases
+from ..storage.write_queue import get_write_queue
 import re
 from functools import wraps
 import time
@@ -37,13 +64,42 @@ class ValidationError(Exception):
     """Custom exception for validation errors."""
     pass
 
+def sync_series_cache(session, series_ids) -> None:
+    """Rewrite the columnar cache of freshly stored series, if the cache is enabled."""
+    if not AppConfig.SERIES_CACHE_ENABLED:
+        return
+    directory = get_series_cache().directory
+    for series_id in series_ids:
+        try:
+            with span('sync_cache', series_id=series_id):
+                sync_series(session, series_id, directory)
+        except Exception as e:
+            # Drop the stale file; readers rebuild it from the database
+            logger.error(f"Error syncing series cache for {series_id}: {str(e)}")
+            invalidate_series(series_id, directory)
+
 class FREDDataFetcher:
     def __init__(self):
         """Initialize FRED API client with validation."""
         self.api_key = self._validate_api_key(get_fred_api_key())
-        self.fred = Fred(api_key=self.api_key)
+        self.fred = self._create_client()
+        api_url = get_fred_api_url()
+        if api_url:
+            self.fred.root_url = api_url
+            logger.info(f"Using FRED API at {api_url}")
         logger.info("FRED API client initialized successfully")
         
+    def _create_client(self) -> Fred:
+        """Create the FRED client, wrapped in a record/replay cassette if enabled."""
+        cassette_mode = get_fred_cassette_mode()
+        if not cassette_mode:
+            return Fred(api_key=self.api_key)
+        from .fred_cassette import CassetteFred
+        from ..storage.cassette import Cassette
+        cassette_path = get_fred_cassette_path()
+        logger.info(f"FRED cassette in {cassette_mode} mode at {cassette_path}")
+        return CassetteFred(Cassette(cassette_path), cassette_mode, api_key=self.api_key)
+
     def _validate_api_key(self, api_key: Optional[str]) -> str:
         """Validate FRED API key."""
         if not api_key:
@@ -54,10 +110,46 @@ class FREDDataFetcher:
             raise ValidationError("FRED API key cannot be empty")
         return api_key.strip()
 
-    def _validate_series_id(self, series_id: str) -> None:
-        """Validate series ID."""
-        if series_id not in SERIES_IDS.values():
+    def _fetch_series(self, series_id: str, start_date=None, end_date=None) -> pd.Series:
+        """Fetch observations from FRED, recording latency and failures."""
+        with span('fred.get_series', series_id=series_id), \
+                FRED_REQUEST_SECONDS.labels('get_series').time():
+            try:
+                return self.fred.get_series(
+                    series_id,
+                    observation_start=start_date,
+                    observation_end=end_date
+                )
+            except Exception:
+                FRED_ERRORS_TOTAL.labels('get_series').inc()
+                raise
+
+    def _fetch_series_info(self, series_id: str) -> pd.Series:
+        """Fetch series metadata from FRED, recording latency and failures."""
+        with span('fred.get_series_info', series_id=series_id), \
+                FRED_REQUEST_SECONDS.labels('get_series_info').time():
+            try:
+                return self.fred.get_series_info(series_id)
+            except Exception:
+                FRED_ERRORS_TOTAL.labels('get_series_info').inc()
+                raise
+
+    def _fetch_all_releases(self, series_id: str) -> pd.DataFrame:
+        """Fetch every release of a series from ALFRED, recording latency and failures."""
+        with span('fred.get_series_all_releases', series_id=series_id), \
+                FRED_REQUEST_SECONDS.labels('get_series_all_releases').time():
+            try:
+                return self.fred.get_series_all_releases(series_id)
+            except Exception:
+                FRED_ERRORS_TOTAL.labels('get_series_all_releases').inc()
+                raise
+
+    def _validate_series_id(self, series_id: str) -> SeriesSpec:
+        """Validate series ID; returns its registry entry."""
+        spec = get_registry().get(series_id)
+        if spec is None:
             raise ValidationError(f"Invalid series ID: {series_id}")
+        return spec
 
     def _validate_date(self, date: Any) -> datetime:
         """Validate and parse date."""
@@ -86,7 +178,11 @@ class FREDDataFetcher:
             raise ValidationError("Empty or null series data")
         
         # Convert to pandas series for validation
-        series = pd.Series([point.value for point in data_points])
+        self._validate_values(pd.Series([point.value for point in data_points]))
+
+    def _validate_values(self, values) -> None:
+        """Warn about missing values and outliers in a series' values."""
+        series = pd.Series(values)
         
         # Check for missing values
         if series.isnull().any():
@@ -101,67 +197,50 @@ class FREDDataFetcher:
 
     def get_inflation_metrics(self) -> Dict:
         """Fetch and process inflation-related data series from database."""
-        session = get_session()
+        session = get_read_session()
         try:
             result_data = {}
             year_ago = datetime.now() - timedelta(days=365)
+            registry = get_registry()
             
-            for name, series_id in SERIES_IDS.items():
-                self._validate_series_id(series_id)
-                logger.info(f"Fetching data for {name} (series_id: {series_id})")
+            # Metadata of every series in one query rather than one per series
+            series_infos = {
+                row.series_id: row
+                for row in session.query(FREDSeries).filter(FREDSeries.series_id.in_(registry.series_ids()))
+            }
+            components = self._read_components(session, registry.series_ids(), year_ago) \
+                if AppConfig.FAMILY_INGEST_ENABLED else {}
+            
+            for spec in registry:
+                name, series_id = spec.name, spec.series_id
+                logger.debug("Fetching data for %s (series_id: %s)", name, series_id)
                 
                 try:
-                    # Get series data from database
-                    logger.info(f"Querying database for series {series_id} from {year_ago}")
-                    data_points = get_series_data(
-                        session,
-                        series_id,
-                        start_date=year_ago
-                    )
+                    if AppConfig.SERIES_CACHE_ENABLED:
+                        window = self._read_cached_window(session, series_id, year_ago)
+                    else:
+                        window = self._read_database_window(session, series_id, year_ago)
                     
-                    if not data_points:
+                    if window is None:
                         logger.warning(f"No data found in database for series {name} ({series_id})")
                         continue
                     
-                    logger.info(f"Retrieved {len(data_points)} data points from database for {series_id}")
-                    self._validate_series_data(data_points)
-                    
-                    # Get first and last data points
-                    baseline_value = data_points[0].value
-                    latest_value = data_points[-1].value
-                    logger.info(f"Series {series_id} - Baseline: {baseline_value}, Latest: {latest_value}")
+                    baseline_value, latest_value, historical_data = window
+                    logger.debug("Series %s - Baseline: %s, Latest: %s", series_id, baseline_value, latest_value)
                     
                     # Validate values are not zero to avoid division errors
                     if baseline_value == 0:
                         raise ValidationError(f"Baseline value is zero for series {name}")
                     
                     percentage_change = ((latest_value - baseline_value) / baseline_value) * 100
-                    logger.info(f"Series {series_id} - Percentage change: {percentage_change:.2f}%")
+                    logger.debug("Series %s - Percentage change: %.2f%%", series_id, percentage_change)
                     
                     # Get series metadata
-                    series_info = session.query(FREDSeries)\
-                        .filter_by(series_id=series_id)\
-                        .first()
+                    series_info = series_infos.get(series_id)
                     
                     if not series_info:
                         raise ValidationError(f"No metadata found in database for series {series_id}")
                     
-                    logger.info(f"Retrieved metadata from database for series {series_id}")
-                    
-                    # Format historical data for charts
-                    historical_data = []
-                    for point in data_points:
-                        try:
-                            validated_value = self._validate_data_point(point.value)
-                            validated_date = self._validate_date(point.date)
-                            historical_data.append({
-                                'date': validated_date.strftime('%Y-%m-%d'),
-                                'value': validated_value
-                            })
-                        except ValidationError as e:
-                            logger.warning(f"Skipping invalid historical data point: {str(e)}")
-                            continue
-                    
                     result_data[name] = {
                         'series_id': series_id,  # Include series_id in the result
                         'current_value': latest_value,
@@ -174,7 +253,9 @@ class FREDDataFetcher:
                         'analysis': series_info.latest_analysis,
                         'analysis_timestamp': series_info.analysis_timestamp.strftime('%Y-%m-%d %H:%M:%S') if series_info.analysis_timestamp else None
                     }
-                    logger.info(f"Successfully processed data for series {series_id}")
+                    if series_id in components:
+                        result_data[name]['components'] = components[series_id]
+                    logger.debug("Successfully processed data for series %s", series_id)
                 except Exception as e:
                     logger.error(f"Error processing series {name}: {str(e)}")
                     continue
@@ -190,59 +271,146 @@ class FREDDataFetcher:
         finally:
             session.close()
 
+    def _read_components(self, session, series_ids: List[str], start_date: datetime) -> Dict[str, List[Dict]]:
+        """Latest value and change since ``start_date`` of each stored family member, by parent series."""
+        components = {}
+        for member in get_family_members(session, series_ids):
+            values = get_series_arrays(session, member.series_id, start_date=start_date)[1]
+            values = values[np.isfinite(values)]
+            if len(values) == 0 or values[0] == 0:
+                continue
+            components.setdefault(member.parent_series_id, []).append({
+                'family': member.family,
+                'name': member.name,
+                'series_id': member.series_id,
+                'current_value': float(values[-1]),
+                'percentage_change': float((values[-1] - values[0]) / values[0] * 100)
+            })
+        return components
+
+    def _read_database_window(self, session, series_id: str, start_date: datetime) -> Optional[tuple]:
+        """Baseline, latest value and chart points of a series since ``start_date``, from the database."""
+        # Get series data from database
+        data_points = get_series_data(
+            session,
+            series_id,
+            start_date=start_date
+        )
+        
+        if not data_points:
+            return None
+        
+        logger.debug("Retrieved %d data points from database for %s", len(data_points), series_id)
+        self._validate_series_data(data_points)
+        
+        # Format historical data for charts
+        historical_data = []
+        for point in data_points:
+            try:
+                validated_value = self._validate_data_point(point.value)
+                validated_date = self._validate_date(point.date)
+                historical_data.append({
+                    'date': validated_date.strftime('%Y-%m-%d'),
+                    'value': validated_value
+                })
+            except ValidationError as e:
+                logger.warning(f"Skipping invalid historical data point: {str(e)}")
+                continue
+        
+        return data_points[0].value, data_points[-1].value, historical_data
+
+    def _read_cached_window(self, session, series_id: str, start_date: datetime) -> Optional[tuple]:
+        """Baseline, latest value and chart points of a series since ``start_date``, from the series cache."""
+        window = get_series_cache().get_or_sync(session, series_id).between(start_date)
+        if len(window.values) == 0:
+            return None
+        
+        logger.debug("Retrieved %d data points from series cache for %s", len(window.values), series_id)
+        self._validate_values(window.values)
+        
+        # Stored values are finite; the mask only guards against a corrupt cache
+        finite = np.isfinite(window.values)
+        historical_data = [
+            {'date': date, 'value': value}
+            for date, value in zip(
+                np.datetime_as_string(window.dates[finite], unit='D').tolist(),
+                window.values[finite].tolist()
+            )
+        ]
+        return float(window.values[0]), float(window.values[-1]), historical_data
+
+    def _validate_points(self, data_points: List[Dict]) -> List[Dict]:
+        """Validate raw FRED points, skipping invalid ones."""
+        with span('validate', points=len(data_points)):
+            validated_points = []
+            for point in data_points:
+                try:
+                    validated_value = self._validate_data_point(point['value'])
+                    validated_date = self._validate_date(point['date'])
+                    validated_points.append({
+                        'date': validated_date,
+                        'value': validated_value
+                    })
+                except ValidationError as e:
+                    logger.warning(f"Skipping invalid data point: {str(e)}")
+                    continue
+            return validated_points
+
+    def _store(self, session, series_id: str, validated_points: List[Dict], metadata,
+               overwrite: bool = False) -> None:
+        """Store validated points and metadata; ``overwrite`` also applies revised values."""
+        with span('store', series_id=series_id, points=len(validated_points)):
+            if AppConfig.VINTAGES_ENABLED:
+                self._write(session, write_series_vintage, series_id, validated_points, metadata)
+            elif AppConfig.WRITE_QUEUE_ENABLED or overwrite:
+                self._write(session, write_series_data, series_id, validated_points, metadata, overwrite)
+            else:
+                with get_session() as writer:
+                    store_series_data(writer, series_id, validated_points, metadata)
+        sync_series_cache(session, [series_id])
+
+    def _write(self, session, fn, *args):
+        """Run a non-committing write ``fn(session, *args)`` through the write queue or commit it here.
+
+        ``session`` is the caller's read session. Without the queue the
+        write gets its own short-lived writer session, so the single writer
+        connection is never held across FRED calls.
+        """
+        if AppConfig.WRITE_QUEUE_ENABLED:
+            return get_write_queue().submit(fn, *args).result()
+        with get_session() as writer, writer.begin():
+            return fn(writer, *args)
+
+    def _load_release_history(self, session, series_id: str) -> None:
+        """Replace a series' vintages with its full ALFRED release history."""
+        try:
+            releases = self._fetch_all_releases(series_id)
+        except Exception as e:
+            # Vintages then start from today's values
+            logger.warning(f"No release history for {series_id}: {str(e)}")
+            return
+        rows = [
+            (row.date, row.realtime_start, row.value)
+            for row in releases.itertuples(index=False) if pd.notna(row.value)
+        ]
+        stored = self._write(session, load_releases, series_id, rows)
+        logger.info(f"Loaded {stored} vintages of {series_id}")
+
+    def _ingest_session(self):
+        """Read session for ingest; every write opens its own writer session (see ``_write``)."""
+        return get_read_session()
+
     @retry_on_failure(max_retries=3, delay=1)
     def fetch_and_store_historical_data(self):
         """Fetch and store complete historical data for all series with validation."""
-        session = get_session()
+        session = self._ingest_session()
         try:
             # Set end_date to ensure we get the most recent data
             end_date = datetime.now() + timedelta(days=30)  # Look ahead to get any future releases
             
-            for series_id in SERIES_IDS.values():
-                self._validate_series_id(series_id)
-                logger.info(f"Fetching historical data for {series_id}")
-                
-                start_date = HISTORICAL_START_DATES.get(series_id)
-                if start_date:
-                    start_date = self._validate_date(start_date)
-                
-                # Get series data from FRED with specific end date
-                series = self.fred.get_series(
-                    series_id,
-                    observation_start=start_date,
-                    observation_end=end_date
-                )
-                
-                # Convert to list for validation
-                data_points = [{'date': date, 'value': value} for date, value in series.items()]
-                if not data_points:
-                    raise ValidationError("Empty or null series data")
-                
-                # Get series metadata
-                metadata = self.fred.get_series_info(series_id)
-                if metadata is None or len(metadata) == 0:
-                    raise ValidationError(f"Failed to fetch metadata for series {series_id}")
-                
-                # Format and validate data points
-                validated_points = []
-                for point in data_points:
-                    try:
-                        validated_value = self._validate_data_point(point['value'])
-                        validated_date = self._validate_date(point['date'])
-                        validated_points.append({
-                            'date': validated_date,
-                            'value': validated_value
-                        })
-                    except ValidationError as e:
-                        logger.warning(f"Skipping invalid data point: {str(e)}")
-                        continue
-                
-                if not validated_points:
-                    raise ValidationError(f"No valid data points for series {series_id}")
-                
-                # Store in database
-                store_series_data(session, series_id, validated_points, metadata)
-                logger.info(f"Successfully stored historical data for {series_id}")
+            for series_id in get_registry().series_ids():
+                with span('series', series_id=series_id):
+                    self._fetch_and_store_series(session, series_id, end_date)
                 
         except Exception as e:
             logger.error(f"Error fetching historical data: {str(e)}")
@@ -250,67 +418,149 @@ class FREDDataFetcher:
         finally:
             session.close()
 
+    def _fetch_and_store_series(self, session, series_id: str, end_date: datetime) -> None:
+        """Fetch and store the full configured history of one series."""
+        spec = self._validate_series_id(series_id)
+        logger.info(f"Fetching historical data for {series_id}")
+        
+        # Get series data from FRED with specific end date
+        series = self._fetch_series(series_id, spec.start_date, end_date)
+        
+        # Convert to list for validation
+        data_points = [{'date': date, 'value': value} for date, value in series.items()]
+        if not data_points:
+            raise ValidationError("Empty or null series data")
+        
+        # Get series metadata
+        metadata = self._fetch_series_info(series_id)
+        if metadata is None or len(metadata) == 0:
+            raise ValidationError(f"Failed to fetch metadata for series {series_id}")
+        
+        # Format and validate data points
+        validated_points = self._validate_points(data_points)
+        if not validated_points:
+            raise ValidationError(f"No valid data points for series {series_id}")
+        
+        # Store in database
+        self._store(session, series_id, validated_points, metadata)
+        if AppConfig.VINTAGES_ENABLED:
+            self._load_release_history(session, series_id)
+        if self._checks_revisions():
+            self._store_window_hash(session, series_id, validated_points, spec.revision_window_days)
+        logger.info(f"Successfully stored historical data for {series_id}")
+
     @retry_on_failure(max_retries=3, delay=1)
-    def update_daily_data(self):
-        """Check and update data for all series with validation."""
-        session = get_session()
+    def update_daily_data(self) -> Dict[str, str]:
+        """Check and update data for all series with validation.
+
+        Returns the outcome per series: ``new`` (first fetch), ``appended``
+        (new observations only), ``changed`` (revised values written),
+        ``unchanged`` (trailing window identical, nothing written),
+        ``empty`` (nothing to store) or ``not_due`` (the period its latest
+        release publishes is already stored, not fetched).
+        """
+        session = self._ingest_session()
         try:
             # Set end_date to ensure we get the most recent data
             end_date = datetime.now() + timedelta(days=30)  # Look ahead to get any future releases
             
-            for series_id in SERIES_IDS.values():
-                self._validate_series_id(series_id)
-                
-                # Get latest data point from database
-                latest = session.query(FREDData)\
-                    .filter_by(series_id=series_id)\
-                    .order_by(FREDData.date.desc())\
-                    .first()
-                
-                if latest:
-                    start_date = latest.date + timedelta(days=1)
+            outcomes = {}
+            for spec in get_registry():
+                series_id = spec.series_id
+                latest = get_latest_point(session, series_id)
+                if AppConfig.RELEASE_RULES_ENABLED and not is_due(spec, latest.date if latest else None):
+                    outcomes[series_id] = 'not_due'
                 else:
-                    start_date = self._validate_date(HISTORICAL_START_DATES.get(series_id))
-                
-                # Fetch new data from FRED with specific end date
-                series = self.fred.get_series(
-                    series_id,
-                    observation_start=start_date,
-                    observation_end=end_date
-                )
-                
-                if series is None or len(series) == 0:
-                    logger.info(f"No new data for {series_id}")
-                    continue
-                
-                # Convert to list for validation
-                data_points = [{'date': date, 'value': value} for date, value in series.items()]
-                if not data_points:
-                    continue
-                
-                # Format and validate new data points
-                validated_points = []
-                for point in data_points:
-                    try:
-                        validated_value = self._validate_data_point(point['value'])
-                        validated_date = self._validate_date(point['date'])
-                        validated_points.append({
-                            'date': validated_date,
-                            'value': validated_value
-                        })
-                    except ValidationError as e:
-                        logger.warning(f"Skipping invalid data point: {str(e)}")
-                        continue
-                
-                if validated_points:
-                    metadata = self.fred.get_series_info(series_id)
-                    if metadata is None or len(metadata) == 0:
-                        raise ValidationError(f"Failed to fetch metadata for series {series_id}")
-                    store_series_data(session, series_id, validated_points, metadata)
-                    logger.info(f"Successfully updated data for {series_id}")
+                    with span('series', series_id=series_id):
+                        outcomes[series_id] = self._update_series(session, series_id, end_date, latest)
+                INGEST_SERIES_UPDATES_TOTAL.labels(outcomes[series_id]).inc()
+            logger.info(f"Updated series: {outcomes}")
+            return outcomes
                 
         except Exception as e:
             logger.error(f"Error updating daily data: {str(e)}")
             raise
         finally:
             session.close()
+
+    def _checks_revisions(self) -> bool:
+        """Whether updates re-fetch and hash each series' trailing window."""
+        return AppConfig.REVISION_CHECK_ENABLED or AppConfig.VINTAGES_ENABLED
+
+    def _update_series(self, session, series_id: str, end_date: datetime, latest: Optional[SeriesPoint]) -> str:
+        """Fetch and store observations newer than ``latest``, the newest stored point.
+
+        With the revision check enabled the series' trailing window is
+        fetched as well and hashed. Only when its digest differs from the
+        one stored at the last ingest are the window's values written; an
+        unchanged window with no new observations costs one FRED call and
+        no writes.
+        """
+        spec = self._validate_series_id(series_id)
+        
+        window = None
+        if latest and self._checks_revisions():
+            # Re-fetch the window hashed last time so digests compare like for like
+            window = get_window_hash(session, series_id)
+            if window:
+                start_date = window.window_start
+            else:
+                start_date = latest.date - timedelta(days=spec.revision_window_days)
+        elif latest:
+            start_date = latest.date + timedelta(days=1)
+        else:
+            start_date = spec.start_date
+        
+        # Fetch new data from FRED with specific end date
+        series = self._fetch_series(series_id, start_date, end_date)
+        
+        if series is None or len(series) == 0:
+            logger.info(f"No new data for {series_id}")
+            return 'empty'
+        
+        # Convert to list for validation
+        data_points = [{'date': date, 'value': value} for date, value in series.items()]
+        if not data_points:
+            return 'empty'
+        
+        # Format and validate new data points
+        validated_points = self._validate_points(data_points)
+        if not validated_points:
+            return 'empty'
+        
+        outcome, to_store = ('appended' if latest else 'new'), validated_points
+        if latest and self._checks_revisions():
+            new_points = [point for point in validated_points if point['date'] > latest.date]
+            unchanged = window is not None and window_digest(
+                validated_points, window.window_start, window.window_end
+            )[0] == window.digest
+            if unchanged and not new_points:
+                logger.info(f"No revisions or new data for {series_id}")
+                return 'unchanged'
+            if unchanged:
+                to_store = new_points
+            else:
+                outcome = 'changed'
+        
+        metadata = self._fetch_series_info(series_id)
+        if metadata is None or len(metadata) == 0:
+            raise ValidationError(f"Failed to fetch metadata for series {series_id}")
+        self._store(session, series_id, to_store, metadata, overwrite=outcome == 'changed')
+        if self._checks_revisions():
+            self._store_window_hash(session, series_id, validated_points, spec.revision_window_days, latest)
+        logger.info(f"Successfully updated data for {series_id} ({outcome})")
+        return outcome
+
+    def _store_window_hash(self, session, series_id: str, validated_points: List[Dict],
+                           window_days: int, latest=None) -> None:
+        """Hash the trailing window ending at the newest point for the next revision check."""
+        window_end = max(point['date'] for point in validated_points)
+        if latest and latest.date > window_end:
+            window_end = latest.date
+        # Never start before the first fetched point, or the next fetch would see more
+        window_start = max(
+            window_end - timedelta(days=window_days),
+            min(point['date'] for point in validated_points)
+        )
+        digest, points = window_digest(validated_points, window_start, window_end)
+        self._write(session, write_window_hash, series_id, window_start, window_end, digest, points)
@@ -1,5 +1,7 @@
 """Custom exceptions for the inflation tracking service."""
 
+from ..core import exceptions as api_exceptions
+
 class TrackerError(Exception):
     """Base exception for tracker errors."""
     pass
@@ -12,6 +14,6 @@ class DataProcessingError(TrackerError):
     """Error processing data."""
     pass
 
-class BackupError(TrackerError):
-    """Error during backup operations."""
+class BackupError(TrackerError, api_exceptions.BackupError):
+    """Error during backup operations (reported by the API as a failed backup)."""
     pass
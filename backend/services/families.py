@@ -0,0 +1,221 @@
+"""
+Family fan-out ingestion of related series.
+
+The analysis prompts ask about Case-Shiller metros, CPI components and
+gas grades, but only the national series were stored. A family groups the
+related FRED series of a registered parent under one key
+(``SERIES_FAMILIES`` in ``services/config.py``), e.g. ``case_shiller_metros``
+expands ``CSUSHPISA`` into the 20 metro indexes. ``FamilyIngestor`` fetches
+a family's members in waves:
+
+- the members of a wave are fetched concurrently, ``wave_size`` at a time,
+  with every FRED call paced by a shared ``RateLimiter`` to
+  ``requests_per_second`` (FRED allows 120 requests a minute per key)
+- each wave is stored in one transaction (``write_family_members``), its
+  members recorded in ``series_family_members`` under the family key and
+  their parent's series ID
+- a member that still fails after its retries is reported ``failed``; the
+  rest of the family is stored regardless
+
+Members are fetched from the day after their latest stored point (or the
+parent's registered start date) and their metadata only on first fetch.
+With ``FAMILY_INGEST_ENABLED`` set, initialization and updates ingest the
+families of every registered series and ``get_inflation_metrics`` reports
+each member's change over the year as the parent's ``components``, which
+the analysis prompts include.
+
+Usage:
+    python -m backend.services.families [--family case_shiller_metros ...] \\
+        [--wave-size 5] [--requests-per-second 2]
+"""
+
+import argparse
+import json
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, NamedTuple, Optional
+
+from ..database import FREDSeries, get_latest_point, write_family_members
+from ..core.metrics import INGEST_FAMILY_MEMBERS_TOTAL, INGEST_FAMILY_WAVE_SECONDS
+from ..core.tracing import span
+from .config import SERIES_FAMILIES
+from .data_fetcher import FREDDataFetcher, ValidationError, retry_on_failure, sync_series_cache
+from .registry import get_registry
+
+logger = logging.getLogger(__name__)
+
+class SeriesFamily(NamedTuple):
+    """Related series ingested with a parent series."""
+    key: str
+    parent: str
+    members: Dict[str, str]
+
+class FamilyPolicy(NamedTuple):
+    """How many members are fetched at once and how fast FRED is called."""
+    wave_size: int = 5
+    requests_per_second: float = 2.0
+
+_ENV_OVERRIDES = {
+    'wave_size': ('FAMILY_WAVE_SIZE', int),
+    'requests_per_second': ('FAMILY_REQUESTS_PER_SECOND', float),
+}
+
+def policy_from_env() -> FamilyPolicy:
+    """The default policy with any ``FAMILY_*`` overrides."""
+    return FamilyPolicy(**{
+        field: convert(os.environ[var])
+        for field, (var, convert) in _ENV_OVERRIDES.items() if os.environ.get(var)
+    })
+
+def configured_families(parents: Optional[Iterable[str]] = None) -> List[SeriesFamily]:
+    """Families in ``SERIES_FAMILIES``, optionally only those of ``parents``."""
+    parents = None if parents is None else set(parents)
+    return [
+        SeriesFamily(key, family['parent'], dict(family['members']))
+        for key, family in SERIES_FAMILIES.items()
+        if parents is None or family['parent'] in parents
+    ]
+
+class RateLimiter:
+    """Spaces calls at least ``1 / rate`` seconds apart across threads."""
+
+    def __init__(self, rate: float):
+        self.interval = 1.0 / rate if rate > 0 else 0.0
+        self._next = 0.0
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        """Block until the next call slot."""
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next)
+            self._next = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+
+class FamilyIngestor:
+    """Fetch family members in rate-limited waves and store each wave together."""
+
+    def __init__(self, fetcher: Optional[FREDDataFetcher] = None, policy: FamilyPolicy = FamilyPolicy()):
+        if policy.wave_size < 1:
+            raise ValueError("wave_size must be at least 1")
+        self.fetcher = fetcher or FREDDataFetcher()
+        self.policy = policy
+        self.limiter = RateLimiter(policy.requests_per_second)
+
+    def run(self, families: Optional[List[SeriesFamily]] = None) -> Dict[str, Dict[str, str]]:
+        """Ingest ``families`` (default: those of every registered series); returns outcomes per member."""
+        if families is None:
+            families = configured_families(get_registry().series_ids())
+        return {family.key: self.ingest_family(family) for family in families}
+
+    def ingest_family(self, family: SeriesFamily) -> Dict[str, str]:
+        """Ingest one family; returns ``new``, ``appended``, ``empty`` or ``failed`` per member."""
+        parent = get_registry().get(family.parent)
+        default_start = parent.start_date if parent else None
+        members = list(family.members.items())
+        outcomes = {}
+
+        session = self.fetcher._ingest_session()
+        try:
+            known = {
+                row.series_id for row in session.query(FREDSeries.series_id)
+                .filter(FREDSeries.series_id.in_([series_id for _, series_id in members]))
+            }
+            starts = {}
+            for _, series_id in members:
+                latest = get_latest_point(session, series_id)
+                starts[series_id] = latest.date + timedelta(days=1) if latest else default_start
+
+            with span('family', family=family.key, members=len(members)):
+                for i in range(0, len(members), self.policy.wave_size):
+                    wave = members[i:i + self.policy.wave_size]
+                    with span('family_wave', family=family.key, size=len(wave)), \
+                            INGEST_FAMILY_WAVE_SECONDS.labels(family.key).time():
+                        outcomes.update(self._ingest_wave(session, family, wave, starts, known))
+        finally:
+            session.close()
+
+        for outcome in outcomes.values():
+            INGEST_FAMILY_MEMBERS_TOTAL.labels(outcome).inc()
+        logger.info(f"Ingested family {family.key}: {outcomes}")
+        return outcomes
+
+    def _ingest_wave(self, session, family: SeriesFamily, wave, starts: Dict, known: set) -> Dict[str, str]:
+        """Fetch one wave concurrently, then store everything it returned in one transaction."""
+        end_date = datetime.now() + timedelta(days=30)
+        with ThreadPoolExecutor(max_workers=len(wave)) as pool:
+            futures = [
+                (name, series_id, pool.submit(
+                    self._fetch_member, series_id, starts[series_id], end_date, series_id not in known))
+                for name, series_id in wave
+            ]
+
+        outcomes, fetched = {}, []
+        for name, series_id, future in futures:
+            try:
+                points, metadata = future.result()
+            except Exception as e:
+                logger.error(f"Error fetching {series_id} of family {family.key}: {str(e)}")
+                outcomes[series_id] = 'failed'
+                continue
+            if points or metadata is not None:
+                fetched.append((name, series_id, points, metadata))
+            outcomes[series_id] = 'empty'
+
+        if fetched:
+            try:
+                inserted = self.fetcher._write(session, write_family_members, family.key, family.parent, fetched)
+            except Exception as e:
+                logger.error(f"Error storing a wave of family {family.key}: {str(e)}")
+                outcomes.update({series_id: 'failed' for _, series_id, _, _ in fetched})
+                return outcomes
+            for series_id, count in inserted.items():
+                if count:
+                    outcomes[series_id] = 'appended' if series_id in known else 'new'
+            sync_series_cache(session, [series_id for series_id, count in inserted.items() if count])
+        return outcomes
+
+    @retry_on_failure(max_retries=3, delay=1)
+    def _fetch_member(self, series_id: str, start_date, end_date, with_metadata: bool):
+        """Validated points of one member since ``start_date`` and, if asked, its metadata."""
+        self.limiter.acquire()
+        series = self.fetcher._fetch_series(series_id, start_date, end_date)
+        points = [] if series is None else self.fetcher._validate_points(
+            [{'date': date, 'value': value} for date, value in series.items()]
+        )
+        metadata = None
+        if with_metadata:
+            self.limiter.acquire()
+            metadata = self.fetcher._fetch_series_info(series_id)
+            if metadata is None or len(metadata) == 0:
+                raise ValidationError(f"Failed to fetch metadata for series {series_id}")
+        return points, metadata
+
+def main() -> None:
+    from ..core.config import init_environment
+    from ..core.structured_logging import configure_logging
+    from ..database import init_db
+
+    defaults = policy_from_env()
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--family', nargs='+', choices=sorted(SERIES_FAMILIES),
+                        help='families to ingest (default: those of every registered series)')
+    parser.add_argument('--wave-size', type=int, default=defaults.wave_size)
+    parser.add_argument('--requests-per-second', type=float, default=defaults.requests_per_second)
+    args = parser.parse_args()
+
+    configure_logging(fmt='text')
+    init_environment()
+    init_db()
+
+    ingestor = FamilyIngestor(policy=FamilyPolicy(args.wave_size, args.requests_per_second))
+    families = [family for family in configured_families() if family.key in args.family] if args.family else None
+    print(json.dumps(ingestor.run(families), indent=2))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,71 @@
+"""
+Record/replay layer for the FRED client.
+
+``CassetteFred`` is a drop-in ``fredapi.Fred`` that routes every API call
+through a ``Cassette``:
+
+- ``record``: always call FRED and store the raw XML response
+- ``replay``: serve only from the cassette; a missing recording is an error
+- ``once``: replay when recorded, otherwise call FRED and record
+
+Only successful responses are recorded. ``observation_end`` is left out of
+request keys by default because ingest always asks for data through 30 days
+ahead, which would otherwise make yesterday's recordings unreachable today.
+"""
+
+import logging
+import xml.etree.ElementTree as ET
+from typing import Iterable
+from urllib.error import HTTPError
+from urllib.request import urlopen
+
+from fredapi import Fred
+
+from ..storage.cassette import Cassette, request_key, split_url
+
+logger = logging.getLogger(__name__)
+
+MODES = ('record', 'replay', 'once')
+DEFAULT_IGNORED_PARAMS = ('observation_end',)
+
+class CassetteMiss(Exception):
+    """Raised in replay mode when a request was never recorded."""
+    pass
+
+class CassetteFred(Fred):
+    """A FRED client that records responses to, or replays them from, a cassette."""
+
+    def __init__(self, cassette: Cassette, mode: str = 'once',
+                 ignore_params: Iterable[str] = DEFAULT_IGNORED_PARAMS, **kwargs):
+        if mode not in MODES:
+            raise ValueError(f"Invalid cassette mode {mode!r}; expected one of {', '.join(MODES)}")
+        super().__init__(**kwargs)
+        self.cassette = cassette
+        self.mode = mode
+        self.ignore_params = tuple(ignore_params)
+
+    def _download(self, url: str) -> bytes:
+        """Fetch a raw response from FRED, raising like ``fredapi`` on API errors."""
+        try:
+            with urlopen(f"{url}&api_key={self.api_key}") as response:
+                return response.read()
+        except HTTPError as exc:
+            root = ET.fromstring(exc.read())
+            raise ValueError(root.get('message'))
+
+    # Name-mangled override of Fred.__fetch_data, which every API call goes through
+    def _Fred__fetch_data(self, url: str):
+        path, params = split_url(url, self.root_url)
+        key = request_key(path, params, ignore=self.ignore_params)
+
+        if self.mode != 'record':
+            body = self.cassette.get(key)
+            if body is not None:
+                return ET.fromstring(body)
+            if self.mode == 'replay':
+                raise CassetteMiss(f"No recorded FRED response for {key} in {self.cassette.path}")
+
+        body = self._download(url)
+        self.cassette.put(key, body)
+        logger.debug("Recorded FRED response for %s (%d bytes)", key, len(body))
+        return ET.fromstring(body)
@@ -1,18 +1,31 @@
 import logging
-from typing import Dict, Optional
+import os
+from typing import Dict, List, Optional
 from datetime import datetime
 from .data_fetcher import FREDDataFetcher
 from .data_analyzer import InflationAnalyzer
-from ..database import get_session, get_series_data
+from .exceptions import BackupError
+from .families import FamilyIngestor, configured_families, policy_from_env
+from ..database import backup_database, get_session, get_series_data
+from ..storage.snapshot import publish_snapshot
+from ..core.config import AppConfig
+from ..core.profiling import profile_job
+from ..core.tracing import span
 
 logger = logging.getLogger(__name__)
 
+# Update outcomes after which a parent's family is fetched again; members
+# publish with their parent, so a parent that was not due or unchanged
+# has nothing new in its family either
+FAMILY_REFRESH_OUTCOMES = ('new', 'appended', 'changed')
+
 class InflationTracker:
     def __init__(self):
         """Initialize services with validation."""
         try:
             self.data_fetcher = FREDDataFetcher()
             self.analyzer = InflationAnalyzer()
+            self.family_ingestor = FamilyIngestor(self.data_fetcher, policy_from_env())
             logger.info("Services initialized successfully")
         except Exception as e:
             raise RuntimeError(f"Failed to initialize services: {str(e)}")
@@ -27,10 +40,17 @@ class InflationTracker:
     def fetch_and_store_historical_data(self) -> Dict:
         """Initialize database with historical data."""
         try:
-            self.data_fetcher.fetch_and_store_historical_data()
-            # Generate initial analysis after fetching historical data
-            metrics = self.data_fetcher.get_inflation_metrics()
-            self.analyzer.analyze_trends(metrics)
+            with span('initialize'):
+                with span('fetch_historical'):
+                    self._run_ingest('fetch_and_store_historical_data', self.data_fetcher.fetch_and_store_historical_data)
+                self._ingest_families()
+                # Generate initial analysis after fetching historical data
+                with span('get_inflation_metrics'):
+                    metrics = self.data_fetcher.get_inflation_metrics()
+                with span('analyze_trends'):
+                    self.analyzer.analyze_trends(metrics)
+                with span('publish_snapshot'):
+                    self._publish_snapshot()
             return {
                 'status': 'Success',
                 'message': 'Historical data fetched and stored successfully',
@@ -43,28 +63,70 @@ class InflationTracker:
     def update_daily_data(self) -> Dict:
         """Update data with latest values."""
         try:
-            # Store current values to check if data changed
-            old_metrics = self.data_fetcher.get_inflation_metrics()
-            
-            # Update data
-            self.data_fetcher.update_daily_data()
+            with span('update'):
+                # Store current values to check if data changed
+                with span('get_inflation_metrics', phase='before'):
+                    old_metrics = self.data_fetcher.get_inflation_metrics()
+                
+                # Update data
+                with span('fetch_updates'):
+                    outcomes = self._run_ingest('update_daily_data', self.data_fetcher.update_daily_data)
+                families = self._ingest_families([
+                    series_id for series_id, outcome in outcomes.items() if outcome in FAMILY_REFRESH_OUTCOMES
+                ])
+                
+                # Get new metrics
+                with span('get_inflation_metrics', phase='after'):
+                    new_metrics = self.data_fetcher.get_inflation_metrics()
+                
+                # Always generate new analysis after update
+                logger.info("Generating new analysis")
+                with span('analyze_trends'):
+                    self.analyzer.analyze_trends(new_metrics)
+                with span('publish_snapshot'):
+                    self._publish_snapshot()
             
-            # Get new metrics
-            new_metrics = self.data_fetcher.get_inflation_metrics()
-            
-            # Always generate new analysis after update
-            logger.info("Generating new analysis")
-            self.analyzer.analyze_trends(new_metrics)
-            
-            return {
+            result = {
                 'status': 'Success',
                 'message': 'Data updated successfully',
+                'series': outcomes,
                 'timestamp': datetime.now().isoformat()
             }
+            if families is not None:
+                result['families'] = families
+            return result
         except Exception as e:
             logger.error(f"Error updating data: {str(e)}")
             raise
 
+    def _run_ingest(self, name: str, job):
+        """Run an ingest job, profiling it when PROFILE_INGEST is enabled."""
+        if AppConfig.PROFILE_INGEST:
+            with profile_job(name):
+                return job()
+        return job()
+
+    def _ingest_families(self, parents: Optional[List[str]] = None) -> Optional[Dict]:
+        """Ingest series families when FAMILY_INGEST_ENABLED is set.
+
+        Only the families of ``parents`` are ingested (default: those of
+        every registered series).
+        """
+        if not AppConfig.FAMILY_INGEST_ENABLED:
+            return None
+        families = None if parents is None else configured_families(parents)
+        with span('fetch_families'):
+            return self._run_ingest('ingest_families', lambda: self.family_ingestor.run(families))
+
+    def _publish_snapshot(self) -> Optional[int]:
+        """Publish current data (including fresh analysis) to the shared snapshot."""
+        try:
+            return publish_snapshot(self.get_inflation_data())
+        except Exception as e:
+            # Readers fall back to the database, so a failed publish is not fatal
+            logger.error(f"Error publishing metrics snapshot: {str(e)}")
+            return None
+
     def _data_changed(self, old_metrics: Dict, new_metrics: Dict) -> bool:
         """Check if metric values have changed."""
         try:
@@ -94,12 +156,21 @@ class InflationTracker:
             raise
 
     def backup_data(self) -> Dict:
-        """Create a backup of the database."""
+        """Create a verified online backup of the database."""
         try:
-            # TODO: Implement database backup functionality
+            result = backup_database()
+            if not result:
+                raise BackupError("Database backup failed")
             return {
                 'status': 'Success',
                 'message': 'Database backup created successfully',
+                'backup': {
+                    'file': os.path.basename(result.path),
+                    'bytes': result.bytes,
+                    'seconds': result.seconds,
+                    'tables': result.tables,
+                    'removed': [os.path.basename(path) for path in result.removed],
+                },
                 'timestamp': datetime.now().isoformat()
             }
         except Exception as e:
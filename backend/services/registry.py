@@ -0,0 +1,338 @@
+"""
+Registry of the series tracked by ingest, analysis and the read API.
+
+Series used to be hard-coded in ``config.SERIES_IDS``: adding one meant a
+code change, and every check that a series is tracked scanned the
+mapping's values. They are now rows of ``series_registry``
+(``RegisteredSeries``), each with
+
+- ``name``: the metric key of the read API (``cpi``, ``gas``, ...)
+- ``series_id``: the FRED series ID
+- ``frequency``: the declared observation frequency
+- ``start_date``: the first date ingest fetches (``None``: full history)
+- ``prompt_template``: a key of ``PROMPT_TEMPLATES`` in
+  ``data_analyzer`` or a ``str.format`` template over ``PROMPT_FIELDS``
+  (``NUMERIC_PROMPT_FIELDS`` take numeric formats such as ``:.2f``)
+- ``release_rule``: the earliest day new observations can appear (below)
+- ``revision_window_days``: the trailing window re-checked for revisions
+
+``SeriesRegistry`` indexes the rows by series ID and by name, so lookups
+are dictionary hits however many series are registered. ``get_registry``
+keeps one per process and reloads it after ``SERIES_REGISTRY_TTL`` seconds
+(default 60), so series registered by another process are picked up
+without a restart. While the table is empty the built-in series in
+``config`` are used.
+
+Release rules:
+    daily               every day
+    weekly:<day>        every <day> (mon ... sun)
+    monthly:<n>         the n-th of each month (the last day in short months)
+    monthly:last-<day>  the last <day> of each month
+
+A release publishes the period (day, week or month, following the rule)
+containing the release day; a ``+<n>`` suffix says it publishes the period
+n before that instead, e.g. ``monthly:10+1`` for a monthly index released
+around the 10th of the following month. An update only fetches a series
+while its latest stored observation is older than the period its latest
+release should have published (``is_due``), so a release that lands late,
+or after the series was first stored, is still picked up; a series without
+a rule is always fetched, as is every series with
+``RELEASE_RULES_ENABLED=0``. ``add`` registers the built-in series first, so adding a series
+does not drop them.
+
+Usage:
+    python -m backend.services.registry list
+    python -m backend.services.registry seed
+    python -m backend.services.registry add ppi PPIACO --frequency monthly \\
+        --start 2024-01-01 --release-rule monthly:11+1 --template "{date_context} ..."
+"""
+
+import argparse
+import calendar
+import json
+import logging
+import os
+import threading
+import time
+from datetime import date, datetime, timedelta
+from typing import Dict, Iterator, List, NamedTuple, Optional
+
+from ..database import RegisteredSeries, get_read_session
+from .config import (
+    SERIES_IDS,
+    HISTORICAL_START_DATES,
+    SERIES_FREQUENCIES,
+    RELEASE_RULES,
+    REVISION_WINDOW_DAYS,
+    DEFAULT_REVISION_WINDOW_DAYS,
+    get_revision_window_override
+)
+
+logger = logging.getLogger(__name__)
+
+REGISTRY_TTL = float(os.environ.get('SERIES_REGISTRY_TTL', 60))
+
+# Fields available to prompt templates
+PROMPT_FIELDS = (
+    'date_context', 'name', 'series_id', 'title', 'units',
+    'current_value', 'baseline_value', 'percentage_change', 'last_updated', 'components'
+)
+# Fields filled with floats, so templates may give them numeric formats ({current_value:.2f})
+NUMERIC_PROMPT_FIELDS = ('current_value', 'baseline_value', 'percentage_change')
+
+_WEEKDAYS = ('mon', 'tue', 'wed', 'thu', 'fri', 'sat', 'sun')
+
+class SeriesSpec(NamedTuple):
+    """One registered series."""
+    name: str
+    series_id: str
+    frequency: Optional[str] = None
+    start_date: Optional[datetime] = None
+    prompt_template: Optional[str] = None
+    release_rule: Optional[str] = None
+    revision_window_days: int = DEFAULT_REVISION_WINDOW_DAYS
+
+class SeriesRegistry:
+    """Registered series indexed by series ID and by name."""
+
+    def __init__(self, specs: List[SeriesSpec]):
+        self._by_id: Dict[str, SeriesSpec] = {spec.series_id: spec for spec in specs}
+        self._by_name: Dict[str, SeriesSpec] = {spec.name: spec for spec in specs}
+        self.loaded_at = time.monotonic()
+
+    def __len__(self) -> int:
+        return len(self._by_id)
+
+    def __iter__(self) -> Iterator[SeriesSpec]:
+        return iter(self._by_id.values())
+
+    def __contains__(self, series_id: str) -> bool:
+        return series_id in self._by_id
+
+    def get(self, series_id: str) -> Optional[SeriesSpec]:
+        """The spec of ``series_id``, or ``None`` if it is not registered."""
+        return self._by_id.get(series_id)
+
+    def by_name(self, name: str) -> Optional[SeriesSpec]:
+        """The spec registered under metric ``name``, or ``None``."""
+        return self._by_name.get(name)
+
+    def series_ids(self) -> List[str]:
+        """Registered series IDs in registration order."""
+        return list(self._by_id)
+
+def _parse_date(value: Optional[str]) -> Optional[datetime]:
+    return datetime.strptime(value, '%Y-%m-%d') if value else None
+
+def builtin_specs() -> List[SeriesSpec]:
+    """The series configured in ``services/config.py``."""
+    return [
+        SeriesSpec(
+            name=name,
+            series_id=series_id,
+            frequency=SERIES_FREQUENCIES.get(series_id),
+            start_date=_parse_date(HISTORICAL_START_DATES.get(series_id)),
+            prompt_template=name,
+            release_rule=RELEASE_RULES.get(series_id),
+            revision_window_days=REVISION_WINDOW_DAYS.get(series_id, DEFAULT_REVISION_WINDOW_DAYS)
+        )
+        for name, series_id in SERIES_IDS.items()
+    ]
+
+def _spec(row: RegisteredSeries) -> SeriesSpec:
+    return SeriesSpec(
+        name=row.name,
+        series_id=row.series_id,
+        frequency=row.frequency,
+        start_date=row.start_date,
+        prompt_template=row.prompt_template,
+        release_rule=row.release_rule,
+        revision_window_days=row.revision_window_days or DEFAULT_REVISION_WINDOW_DAYS
+    )
+
+def load_registry(session) -> SeriesRegistry:
+    """Build the registry from ``series_registry``, or the built-in series if it is empty."""
+    rows = session.query(RegisteredSeries).order_by(RegisteredSeries.id).all()
+    specs = [_spec(row) for row in rows] if rows else builtin_specs()
+    override = get_revision_window_override()
+    if override:
+        specs = [spec._replace(revision_window_days=override) for spec in specs]
+    return SeriesRegistry(specs)
+
+_registry: Optional[SeriesRegistry] = None
+_registry_lock = threading.Lock()
+
+def refresh_registry() -> SeriesRegistry:
+    """Reload the process-wide registry from the database."""
+    global _registry
+    with _registry_lock:
+        session = get_read_session()
+        try:
+            _registry = load_registry(session)
+        except Exception as e:
+            # Keep serving the last registry (or the built-ins) rather than failing every caller
+            logger.error(f"Error loading series registry: {str(e)}")
+            if _registry is None:
+                _registry = SeriesRegistry(builtin_specs())
+        finally:
+            session.close()
+        return _registry
+
+def get_registry() -> SeriesRegistry:
+    """Get the process-wide registry, reloading it once it is older than ``REGISTRY_TTL``."""
+    registry = _registry
+    if registry is None or time.monotonic() - registry.loaded_at > REGISTRY_TTL:
+        registry = refresh_registry()
+    return registry
+
+def _weekday(name: str) -> int:
+    if name not in _WEEKDAYS:
+        raise ValueError(f"Unknown weekday {name!r}, expected one of {', '.join(_WEEKDAYS)}")
+    return _WEEKDAYS.index(name)
+
+def _last_weekday_of_month(year: int, month: int, weekday: int) -> date:
+    last = date(year, month, calendar.monthrange(year, month)[1])
+    return last - timedelta(days=(last.weekday() - weekday) % 7)
+
+def _previous_month(day: date) -> date:
+    return day.replace(day=1) - timedelta(days=1)
+
+def _split_lag(rule: str):
+    rule, plus, lag = rule.partition('+')
+    if plus and not lag.isdigit():
+        raise ValueError(f"Invalid release rule {rule + plus + lag!r}")
+    return rule, int(lag or 0)
+
+def last_release(rule: str, today: date) -> date:
+    """The latest release day of ``rule`` on or before ``today``."""
+    rule, _ = _split_lag(rule)
+    kind, _, arg = rule.partition(':')
+    if kind == 'daily' and not arg:
+        return today
+    if kind == 'weekly':
+        return today - timedelta(days=(today.weekday() - _weekday(arg)) % 7)
+    if kind == 'monthly' and arg.startswith('last-'):
+        weekday = _weekday(arg[len('last-'):])
+        release = _last_weekday_of_month(today.year, today.month, weekday)
+        if release > today:
+            previous = _previous_month(today)
+            release = _last_weekday_of_month(previous.year, previous.month, weekday)
+        return release
+    if kind == 'monthly' and arg.isdigit() and 1 <= int(arg) <= 31:
+        release = today.replace(day=min(int(arg), calendar.monthrange(today.year, today.month)[1]))
+        if release > today:
+            previous = _previous_month(today)
+            release = previous.replace(day=min(int(arg), previous.day))
+        return release
+    raise ValueError(f"Invalid release rule {rule!r}")
+
+def _period_start(kind: str, day: date, periods_back: int = 0) -> date:
+    """Start of the day, week or month ``periods_back`` before the one containing ``day``."""
+    if kind == 'weekly':
+        return day - timedelta(days=day.weekday() + 7 * periods_back)
+    if kind == 'monthly':
+        months = day.year * 12 + day.month - 1 - periods_back
+        return date(months // 12, months % 12 + 1, 1)
+    return day - timedelta(days=periods_back)
+
+def published_period(rule: str, today: date) -> date:
+    """Start of the newest period the latest release of ``rule`` should have published."""
+    base, lag = _split_lag(rule)
+    return _period_start(base.partition(':')[0], last_release(rule, today), lag)
+
+def is_due(spec: SeriesSpec, latest_observation: Optional[datetime], today: Optional[date] = None) -> bool:
+    """Whether the latest release should have published a period not stored yet.
+
+    ``latest_observation`` is the date of the series' newest stored point.
+    """
+    if latest_observation is None or not spec.release_rule:
+        return True
+    kind = _split_lag(spec.release_rule)[0].partition(':')[0]
+    return (_period_start(kind, latest_observation.date())
+            < published_period(spec.release_rule, today or date.today()))
+
+def validate_spec(spec: SeriesSpec) -> None:
+    """Raise ``ValueError`` if the release rule or prompt template cannot be used."""
+    if not spec.name or not spec.series_id:
+        raise ValueError("A series needs a name and a series ID")
+    if spec.release_rule:
+        last_release(spec.release_rule, date.today())
+    if spec.prompt_template:
+        sample = {field: 1.0 if field in NUMERIC_PROMPT_FIELDS else '' for field in PROMPT_FIELDS}
+        try:
+            spec.prompt_template.format(**sample)
+        except (KeyError, IndexError, ValueError, TypeError) as e:
+            raise ValueError(f"Invalid prompt template for {spec.name}: {str(e)}")
+
+def write_registered_series(session, spec: SeriesSpec) -> RegisteredSeries:
+    """Create or update the registry row of ``spec.series_id`` (without committing)"""
+    validate_spec(spec)
+    row = session.query(RegisteredSeries).filter_by(series_id=spec.series_id).first()
+    if not row:
+        row = RegisteredSeries(series_id=spec.series_id)
+        session.add(row)
+    row.name = spec.name
+    row.frequency = spec.frequency
+    row.start_date = spec.start_date
+    row.prompt_template = spec.prompt_template
+    row.release_rule = spec.release_rule
+    row.revision_window_days = spec.revision_window_days
+    row.updated_at = datetime.now()
+    return row
+
+def seed_registry(session) -> int:
+    """Register the built-in series if the registry is empty (without committing); returns rows added."""
+    if session.query(RegisteredSeries.id).first() is not None:
+        return 0
+    specs = builtin_specs()
+    for spec in specs:
+        write_registered_series(session, spec)
+    return len(specs)
+
+def _describe(spec: SeriesSpec) -> Dict:
+    described = spec._asdict()
+    described['start_date'] = spec.start_date.strftime('%Y-%m-%d') if spec.start_date else None
+    return described
+
+def main() -> None:
+    from ..database import get_session, init_db
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('command', choices=['list', 'seed', 'add'])
+    parser.add_argument('name', nargs='?', help='metric name (add)')
+    parser.add_argument('series_id', nargs='?', help='FRED series ID (add)')
+    parser.add_argument('--frequency')
+    parser.add_argument('--start', type=_parse_date, help='first date fetched (default: full history)')
+    parser.add_argument('--template', help='prompt template, or a built-in template name')
+    parser.add_argument('--release-rule')
+    parser.add_argument('--revision-window-days', type=int, default=DEFAULT_REVISION_WINDOW_DAYS)
+    args = parser.parse_args()
+
+    if args.command == 'add' and not (args.name and args.series_id):
+        parser.error("add needs a name and a series ID")
+    init_db()
+    if args.command != 'list':
+        session = get_session()
+        try:
+            if args.command == 'seed':
+                logger.info(f"Registered {seed_registry(session)} built-in series")
+            else:
+                seed_registry(session)
+                write_registered_series(session, SeriesSpec(
+                    name=args.name,
+                    series_id=args.series_id,
+                    frequency=args.frequency,
+                    start_date=args.start,
+                    prompt_template=args.template,
+                    release_rule=args.release_rule,
+                    revision_window_days=args.revision_window_days
+                ))
+            session.commit()
+        except ValueError as e:
+            parser.error(str(e))
+        finally:
+            session.close()
+    print(json.dumps([_describe(spec) for spec in refresh_registry()], indent=2))
+
+if __name__ == '__main__':
+    main()
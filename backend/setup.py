@@ -9,6 +9,7 @@ setup(
         'flask==3.0.0',
         'flask-cors==4.0.0',
         'flask-limiter>=3.5.0',
+        'gunicorn>=21.2.0',
         'pandas>=2.0.0',
         'numpy>=1.24.0',
         'python-dateutil>=2.8.2',
@@ -0,0 +1,6 @@
+"""
+Storage layers that sit alongside the SQLite database.
+
+These modules depend only on the standard library (and the database module
+where noted) so that they can be imported by lightweight serving processes.
+"""
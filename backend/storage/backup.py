@@ -0,0 +1,292 @@
+"""
+Online backups of the SQLite database.
+
+``create_backup`` copies the live database with SQLite's online backup API
+instead of copying the file: the copy is a consistent snapshot even while
+writes are in progress, and it is taken ``pages_per_step`` pages at a time
+with a pause between steps so the read lock is held only briefly and
+readers and the writer are never starved. Each backup then
+
+- is switched to a rollback journal, so it is one self-contained file
+- is optionally gzip-compressed
+- is verified by restoring it to a scratch file and running
+  ``PRAGMA integrity_check`` (the table row counts are reported)
+- replaces older backups beyond ``keep`` (newest kept)
+
+A write to the source from another connection restarts the copy at its
+next step. After ``max_restarts`` restarts the rest of the copy is done in
+a single step, which in WAL mode still does not block the writer.
+
+Settings come from ``BACKUP_*`` environment variables (see
+``policy_from_env``); backups go to ``backend/backups`` or ``BACKUP_DIR``.
+
+Usage:
+    python -m backend.storage.backup create [--db path] [--dir backups]
+    python -m backend.storage.backup list
+    python -m backend.storage.backup verify backups/fred_data-20240101-000000-000000.db.gz
+    python -m backend.storage.backup restore backups/fred_data-...db.gz --db restored.db
+"""
+
+import argparse
+import gzip
+import json
+import logging
+import os
+import shutil
+import sqlite3
+import tempfile
+import threading
+import time
+from datetime import datetime
+from typing import Dict, List, NamedTuple
+
+from ..core.metrics import DB_BACKUP_SECONDS, DB_BACKUPS_TOTAL
+
+logger = logging.getLogger(__name__)
+
+BACKUP_DIR = os.environ.get(
+    'BACKUP_DIR',
+    os.path.join(os.path.dirname(os.path.dirname(__file__)), 'backups')
+)
+
+COMPRESSED_SUFFIX = '.gz'
+_PARTIAL = '.partial'
+_GZIP_MAGIC = b'\x1f\x8b'
+
+class BackupError(Exception):
+    """Error creating, verifying or restoring a backup."""
+    pass
+
+class BackupPolicy(NamedTuple):
+    """How backups are paced, stored and retained (``pages_per_step`` -1 copies in one step)."""
+    pages_per_step: int = 256
+    step_sleep_ms: float = 5.0
+    max_restarts: int = 5
+    compress: bool = True
+    compression_level: int = 6
+    keep: int = 7
+    verify: bool = True
+    busy_timeout_ms: int = 5000
+
+class BackupResult(NamedTuple):
+    """Outcome of one ``create_backup`` call."""
+    path: str
+    bytes: int
+    pages: int
+    steps: int
+    restarts: int
+    seconds: float
+    tables: Dict[str, int]
+    removed: List[str]
+
+def _flag(value: str) -> bool:
+    return value.lower() in ('1', 'true', 'yes', 'on')
+
+_ENV_OVERRIDES = {
+    'pages_per_step': ('BACKUP_PAGES_PER_STEP', int),
+    'step_sleep_ms': ('BACKUP_STEP_SLEEP_MS', float),
+    'max_restarts': ('BACKUP_MAX_RESTARTS', int),
+    'compress': ('BACKUP_COMPRESS', _flag),
+    'compression_level': ('BACKUP_COMPRESSION_LEVEL', int),
+    'keep': ('BACKUP_KEEP', int),
+    'verify': ('BACKUP_VERIFY', _flag),
+}
+
+def policy_from_env() -> BackupPolicy:
+    """The default policy with any ``BACKUP_*`` overrides."""
+    return BackupPolicy(**{
+        field: convert(os.environ[var])
+        for field, (var, convert) in _ENV_OVERRIDES.items() if os.environ.get(var)
+    })
+
+def _backup_name(db_path: str) -> str:
+    stem = os.path.splitext(os.path.basename(db_path))[0]
+    return f"{stem}-{datetime.now().strftime('%Y%m%d-%H%M%S-%f')}.db"
+
+def list_backups(directory: str = BACKUP_DIR) -> List[str]:
+    """Completed backups in ``directory``, newest first."""
+    if not os.path.isdir(directory):
+        return []
+    names = [
+        name for name in os.listdir(directory)
+        if name.endswith(('.db', '.db' + COMPRESSED_SUFFIX))
+    ]
+    # Names embed their creation time, so they sort chronologically
+    return [os.path.join(directory, name) for name in sorted(names, reverse=True)]
+
+def rotate_backups(directory: str, keep: int) -> List[str]:
+    """Delete all but the newest ``keep`` backups; returns the removed paths."""
+    removed = list_backups(directory)[max(keep, 1):]
+    for path in removed:
+        os.remove(path)
+        logger.info(f"Removed old backup {path}")
+    return removed
+
+def _copy_online(source: sqlite3.Connection, target: sqlite3.Connection, policy: BackupPolicy) -> Dict:
+    """Copy ``source`` into ``target`` in paced steps; returns pages, steps and restarts."""
+    stats = {'pages': 0, 'steps': 0, 'restarts': 0}
+    remaining_before = [None]
+
+    class _TooManyRestarts(Exception):
+        pass
+
+    def progress(status, remaining, total):
+        stats['pages'] = total
+        stats['steps'] += 1
+        if remaining_before[0] is not None and remaining > remaining_before[0]:
+            stats['restarts'] += 1
+            if stats['restarts'] > policy.max_restarts:
+                raise _TooManyRestarts()
+        remaining_before[0] = remaining
+        if remaining and policy.step_sleep_ms > 0:
+            time.sleep(policy.step_sleep_ms / 1000)
+
+    try:
+        source.backup(target, pages=policy.pages_per_step, progress=progress)
+    except _TooManyRestarts:
+        logger.warning(f"Backup restarted {stats['restarts']} times under writes; copying in one step")
+        source.backup(target)
+        stats['steps'] += 1
+    return stats
+
+def _compress(path: str, target: str, level: int) -> None:
+    with open(path, 'rb') as src, gzip.open(target, 'wb', compresslevel=level) as dst:
+        shutil.copyfileobj(src, dst, 1 << 20)
+
+def _table_counts(conn: sqlite3.Connection) -> Dict[str, int]:
+    tables = [row[0] for row in conn.execute(
+        "SELECT name FROM sqlite_master WHERE type = 'table' AND name NOT LIKE 'sqlite_%' ORDER BY name"
+    )]
+    return {table: conn.execute(f'SELECT COUNT(*) FROM "{table}"').fetchone()[0] for table in tables}
+
+def _restore_file(path: str, target: str) -> None:
+    """Write the database held in backup ``path`` to the plain file ``target``."""
+    with open(path, 'rb') as f:
+        compressed = f.read(2) == _GZIP_MAGIC
+    if compressed:
+        with gzip.open(path, 'rb') as src, open(target, 'wb') as dst:
+            shutil.copyfileobj(src, dst, 1 << 20)
+    else:
+        shutil.copyfile(path, target)
+
+def verify_backup(path: str) -> Dict[str, int]:
+    """Restore ``path`` to a scratch file and check it; returns row counts per table."""
+    with tempfile.TemporaryDirectory() as tmp:
+        restored = os.path.join(tmp, 'restore.db')
+        try:
+            _restore_file(path, restored)
+            conn = sqlite3.connect(restored)
+            try:
+                result = conn.execute('PRAGMA integrity_check').fetchone()[0]
+                if result != 'ok':
+                    raise BackupError(f"Backup {path} failed integrity check: {result}")
+                return _table_counts(conn)
+            finally:
+                conn.close()
+        except (OSError, EOFError, sqlite3.DatabaseError) as e:
+            raise BackupError(f"Backup {path} could not be restored: {str(e)}")
+
+_backup_lock = threading.Lock()
+
+def create_backup(db_path: str, directory: str = BACKUP_DIR, policy: BackupPolicy = BackupPolicy()) -> BackupResult:
+    """Back up the database at ``db_path`` into ``directory`` under ``policy``."""
+    if not os.path.exists(db_path):
+        raise BackupError(f"No database at {db_path}")
+    os.makedirs(directory, exist_ok=True)
+    start = time.perf_counter()
+    name = _backup_name(db_path)
+    final = os.path.join(directory, name + (COMPRESSED_SUFFIX if policy.compress else ''))
+    staging = os.path.join(directory, name + _PARTIAL)
+
+    with _backup_lock:
+        try:
+            source = sqlite3.connect(
+                f'file:{db_path}?mode=ro', uri=True, timeout=policy.busy_timeout_ms / 1000)
+            target = sqlite3.connect(staging)
+            try:
+                stats = _copy_online(source, target, policy)
+                # The copy inherits the source's WAL mode; make it one self-contained file
+                target.execute('PRAGMA journal_mode=DELETE')
+            finally:
+                target.close()
+                source.close()
+
+            if policy.compress:
+                _compress(staging, final + _PARTIAL, policy.compression_level)
+                os.remove(staging)
+                staging = final + _PARTIAL
+            tables = verify_backup(staging) if policy.verify else {}
+            os.replace(staging, final)
+        except Exception as e:
+            for path in (staging, final + _PARTIAL):
+                if os.path.exists(path):
+                    os.remove(path)
+            DB_BACKUPS_TOTAL.labels('failed').inc()
+            if isinstance(e, BackupError):
+                raise
+            raise BackupError(f"Backup of {db_path} failed: {str(e)}")
+
+        removed = rotate_backups(directory, policy.keep)
+
+    seconds = time.perf_counter() - start
+    DB_BACKUP_SECONDS.observe(seconds)
+    DB_BACKUPS_TOTAL.labels('created').inc()
+    result = BackupResult(
+        path=final,
+        bytes=os.path.getsize(final),
+        pages=stats['pages'],
+        steps=stats['steps'],
+        restarts=stats['restarts'],
+        seconds=round(seconds, 3),
+        tables=tables,
+        removed=removed,
+    )
+    logger.info(f"Database backed up to {final} ({result.bytes} bytes, {result.steps} steps)")
+    return result
+
+def restore_backup(path: str, db_path: str, policy: BackupPolicy = BackupPolicy()) -> Dict[str, int]:
+    """Verify backup ``path`` and copy it over the database at ``db_path``.
+
+    The copy goes through the backup API into ``db_path``, so open
+    connections see the restored contents on their next transaction. Returns
+    the row counts per table of the restored database.
+    """
+    tables = verify_backup(path)
+    with tempfile.TemporaryDirectory() as tmp:
+        restored = os.path.join(tmp, 'restore.db')
+        _restore_file(path, restored)
+        source = sqlite3.connect(restored)
+        target = sqlite3.connect(db_path, timeout=policy.busy_timeout_ms / 1000)
+        try:
+            source.backup(target, pages=policy.pages_per_step)
+        finally:
+            target.close()
+            source.close()
+    logger.info(f"Restored {db_path} from {path}")
+    return tables
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('command', choices=['create', 'list', 'verify', 'restore'])
+    parser.add_argument('backup', nargs='?', help='backup file (verify, restore)')
+    parser.add_argument('--db', default=os.environ.get(
+        'FRED_DB_PATH', os.path.join(os.path.dirname(os.path.dirname(__file__)), 'fred_data.db')
+    ))
+    parser.add_argument('--dir', default=BACKUP_DIR, help='backup directory')
+    args = parser.parse_args()
+
+    if args.command in ('verify', 'restore') and not args.backup:
+        parser.error(f"{args.command} needs a backup file")
+    policy = policy_from_env()
+    if args.command == 'create':
+        output = create_backup(args.db, args.dir, policy)._asdict()
+    elif args.command == 'list':
+        output = [{'path': path, 'bytes': os.path.getsize(path)} for path in list_backups(args.dir)]
+    elif args.command == 'verify':
+        output = {'path': args.backup, 'tables': verify_backup(args.backup)}
+    else:
+        output = {'db': args.db, 'tables': restore_backup(args.backup, args.db, policy)}
+    print(json.dumps(output, indent=2))
+
+if __name__ == '__main__':
+    main()
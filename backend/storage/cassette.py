@@ -0,0 +1,126 @@
+"""
+Compressed archive of raw upstream API responses.
+
+A cassette is a single SQLite file mapping a normalized request key (path
+plus sorted query parameters, without credentials) to the zlib-compressed
+response body. Recording the same key again replaces the stored response.
+Connections are per thread and per process, and the file runs in WAL mode so
+concurrent workers can record and replay from one cassette.
+
+Usage:
+    python -m backend.storage.cassette <path> [--keys]
+"""
+
+import argparse
+import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from typing import Dict, Iterable, Optional
+from urllib.parse import parse_qsl, urlencode
+
+COMPRESSION_LEVEL = 6
+
+def request_key(path: str, params: Dict[str, str], ignore: Iterable[str] = ()) -> str:
+    """Build a cassette key from a request path and its query parameters."""
+    kept = sorted((k, v) for k, v in params.items() if k not in set(ignore))
+    return f"{path.strip('/')}?{urlencode(kept)}"
+
+def split_url(url: str, root_url: str) -> tuple:
+    """Split ``url`` under ``root_url`` into a relative path and parameters."""
+    relative = url[len(root_url):] if url.startswith(root_url) else url
+    path, _, query = relative.partition('?')
+    return path, dict(parse_qsl(query, keep_blank_values=True))
+
+class Cassette:
+    """Record and replay raw response bodies keyed by request."""
+
+    def __init__(self, path: str, timeout: float = 30.0):
+        self.path = path
+        self.timeout = timeout
+        self._local = threading.local()
+        self.hits = 0
+        self.misses = 0
+        self.recorded = 0
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self._connection().execute(
+            'CREATE TABLE IF NOT EXISTS responses ('
+            ' key TEXT PRIMARY KEY,'
+            ' body BLOB NOT NULL,'
+            ' size INTEGER NOT NULL,'
+            ' recorded_at REAL NOT NULL'
+            ') WITHOUT ROWID'
+        )
+
+    def _connection(self) -> sqlite3.Connection:
+        """Get this thread's connection, reopening it after a fork."""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=self.timeout, isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def get(self, key: str) -> Optional[bytes]:
+        """Return the recorded body for ``key``, or ``None``."""
+        row = self._connection().execute(
+            'SELECT body FROM responses WHERE key = ?', (key,)
+        ).fetchone()
+        if row is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return zlib.decompress(row[0])
+
+    def put(self, key: str, body: bytes) -> None:
+        """Record ``body`` for ``key``, replacing any earlier recording."""
+        self._connection().execute(
+            'INSERT OR REPLACE INTO responses (key, body, size, recorded_at) VALUES (?, ?, ?, ?)',
+            (key, zlib.compress(body, COMPRESSION_LEVEL), len(body), time.time())
+        )
+        self.recorded += 1
+
+    def summary(self) -> Dict:
+        """Entry count and raw versus stored size."""
+        count, raw, stored, first, last = self._connection().execute(
+            'SELECT COUNT(*), COALESCE(SUM(size), 0), COALESCE(SUM(LENGTH(body)), 0),'
+            ' MIN(recorded_at), MAX(recorded_at) FROM responses'
+        ).fetchone()
+        return {
+            'path': self.path,
+            'entries': count,
+            'raw_bytes': raw,
+            'stored_bytes': stored,
+            'first_recorded': first,
+            'last_recorded': last,
+        }
+
+    def close(self) -> None:
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Summarize a response cassette.')
+    parser.add_argument('path')
+    parser.add_argument('--keys', action='store_true', help='also list recorded request keys')
+    args = parser.parse_args()
+
+    if not os.path.exists(args.path):
+        parser.error(f"No cassette at {args.path}")
+    cassette = Cassette(args.path)
+    summary = cassette.summary()
+    if args.keys:
+        summary['keys'] = [
+            key for (key,) in cassette._connection().execute('SELECT key FROM responses ORDER BY key')
+        ]
+    print(json.dumps(summary, indent=2))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,219 @@
+"""
+Columnar, memory-mapped cache of series observations.
+
+Each series is kept in its own file as two contiguous little-endian
+columns, so readers get NumPy ``datetime64[D]`` and ``float64`` arrays that
+are zero-copy, read-only views into a shared mapping instead of one ORM
+object per observation. The database stays the source of truth: ingest
+rewrites a series' file after storing it (``sync_series``, which reads
+through ``backend.database``) and readers rebuild missing files on demand.
+
+File layout (little endian)::
+
+    0   8s  magic            b'TTCOL\\x00\\x00\\x00'
+    8   I   format version
+    12  Q   count            number of observations
+    20  d   created_at       unix timestamp
+    28  I   crc32            of both columns
+    32  ..  padding up to HEADER_SIZE
+    64  ..  count * int64    days since 1970-01-01, ascending
+    ..  ..  count * float64  values
+
+Files are written to a temporary path and ``os.replace``-d over the live
+one; ``SeriesCache`` re-maps a series only when its inode changes.
+
+Inspect a cache directory with:
+    python -m backend.storage.columnar [directory]
+"""
+
+import argparse
+import json
+import logging
+import mmap
+import os
+import struct
+import threading
+import time
+import zlib
+from datetime import datetime
+from typing import Dict, NamedTuple, Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+SERIES_CACHE_DIR = os.environ.get(
+    'SERIES_CACHE_DIR',
+    os.path.join(os.path.dirname(os.path.dirname(__file__)), 'series_cache')
+)
+
+MAGIC = b'TTCOL\x00\x00\x00'
+FORMAT_VERSION = 1
+HEADER = struct.Struct('<8sIQdI')
+HEADER_SIZE = 64
+SUFFIX = '.col'
+
+class SeriesCacheError(Exception):
+    """Error reading or writing a series cache file."""
+    pass
+
+def _first_day(value) -> np.datetime64:
+    """First whole day at or after ``value``."""
+    day = np.datetime64(value, 'D')
+    if isinstance(value, datetime) and value != datetime.combine(value.date(), datetime.min.time()):
+        day += 1
+    return day
+
+class SeriesArrays(NamedTuple):
+    """Parallel date and value columns of one series, in date order."""
+    dates: np.ndarray
+    values: np.ndarray
+
+    def between(self, start=None, end=None) -> 'SeriesArrays':
+        """Views of the observations with ``start <= date <= end``."""
+        lo = 0 if start is None else int(np.searchsorted(self.dates, _first_day(start), side='left'))
+        hi = len(self.dates) if end is None else int(
+            np.searchsorted(self.dates, np.datetime64(end, 'D'), side='right')
+        )
+        return SeriesArrays(self.dates[lo:hi], self.values[lo:hi])
+
+def series_path(series_id: str, directory: str = None) -> str:
+    """Cache file of ``series_id``."""
+    return os.path.join(directory or SERIES_CACHE_DIR, f"{series_id}{SUFFIX}")
+
+def write_series(series_id: str, dates, values, directory: str = None) -> str:
+    """Atomically replace the cache file of a series with ``dates`` and ``values``."""
+    days = np.ascontiguousarray(np.asarray(dates, dtype='datetime64[D]').view('<i8'))
+    values = np.ascontiguousarray(values, dtype='<f8')
+    if days.shape != values.shape:
+        raise SeriesCacheError(f"{series_id}: {len(days)} dates but {len(values)} values")
+    if len(days) > 1 and np.any(np.diff(days) <= 0):
+        raise SeriesCacheError(f"{series_id}: dates must be unique and ascending")
+
+    path = series_path(series_id, directory)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    crc = zlib.crc32(values.tobytes(), zlib.crc32(days.tobytes()))
+    header = HEADER.pack(MAGIC, FORMAT_VERSION, len(days), time.time(), crc).ljust(HEADER_SIZE, b'\0')
+    tmp_path = f"{path}.tmp-{os.getpid()}-{threading.get_ident()}"
+    with open(tmp_path, 'wb') as f:
+        f.write(header)
+        f.write(days.tobytes())
+        f.write(values.tobytes())
+    os.replace(tmp_path, path)
+    return path
+
+def invalidate_series(series_id: str, directory: str = None) -> None:
+    """Remove the cache file of a series so the next read rebuilds it."""
+    try:
+        os.remove(series_path(series_id, directory))
+    except FileNotFoundError:
+        pass
+
+def sync_series(session, series_id: str, directory: str = None) -> int:
+    """Rewrite the cache file of a series from the database; returns its length."""
+    from ..database import get_series_arrays
+    dates, values = get_series_arrays(session, series_id)
+    write_series(series_id, dates, values, directory)
+    logger.debug("Synced series cache for %s (%d points)", series_id, len(dates))
+    return len(dates)
+
+class _Mapping(NamedTuple):
+    """An open mapping of one series file."""
+    identity: tuple
+    arrays: SeriesArrays
+
+def _map(path: str, identity: tuple) -> Optional[_Mapping]:
+    try:
+        with open(path, 'rb') as f:
+            buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except (FileNotFoundError, ValueError):
+        return None
+    if len(buffer) < HEADER_SIZE:
+        raise SeriesCacheError(f"{path}: file is truncated")
+    magic, version, count, _, crc = HEADER.unpack_from(buffer, 0)
+    if magic != MAGIC:
+        raise SeriesCacheError(f"{path}: not a series cache file")
+    if version != FORMAT_VERSION:
+        raise SeriesCacheError(f"{path}: unsupported format version {version}")
+    if HEADER_SIZE + 16 * count > len(buffer):
+        raise SeriesCacheError(f"{path}: columns are truncated")
+    if zlib.crc32(memoryview(buffer)[HEADER_SIZE:HEADER_SIZE + 16 * count]) != crc:
+        raise SeriesCacheError(f"{path}: checksum mismatch")
+    # The arrays keep the mapping alive; it is released with the last view
+    days = np.frombuffer(buffer, dtype='<i8', count=count, offset=HEADER_SIZE)
+    values = np.frombuffer(buffer, dtype='<f8', count=count, offset=HEADER_SIZE + 8 * count)
+    return _Mapping(identity, SeriesArrays(days.view('datetime64[D]'), values))
+
+class SeriesCache:
+    """Serve series columns from read-only mappings shared by all workers.
+
+    Each ``get`` costs one ``stat`` call; a file is only re-mapped when
+    ingest has swapped in a new inode.
+    """
+
+    def __init__(self, directory: str = None):
+        self.directory = directory or SERIES_CACHE_DIR
+        self._mappings: Dict[str, _Mapping] = {}
+        self._lock = threading.Lock()
+
+    def get(self, series_id: str) -> Optional[SeriesArrays]:
+        """Return the columns of ``series_id``, or ``None`` if it is not cached."""
+        path = series_path(series_id, self.directory)
+        try:
+            st = os.stat(path)
+        except FileNotFoundError:
+            return None
+        identity = (st.st_dev, st.st_ino, st.st_mtime_ns, st.st_size)
+        mapping = self._mappings.get(series_id)
+        if mapping is None or mapping.identity != identity:
+            with self._lock:
+                mapping = self._mappings.get(series_id)
+                if mapping is None or mapping.identity != identity:
+                    try:
+                        mapping = _map(path, identity)
+                    except SeriesCacheError as e:
+                        logger.warning(f"Ignoring invalid series cache file: {str(e)}")
+                        return None
+                    if mapping is None:
+                        return None
+                    self._mappings[series_id] = mapping
+        return mapping.arrays
+
+    def get_or_sync(self, session, series_id: str) -> SeriesArrays:
+        """Return the columns of ``series_id``, building its file from the database if missing."""
+        arrays = self.get(series_id)
+        if arrays is None:
+            sync_series(session, series_id, self.directory)
+            arrays = self.get(series_id)
+        return arrays
+
+_cache: Optional[SeriesCache] = None
+
+def get_series_cache() -> SeriesCache:
+    """Get the process-wide series cache."""
+    global _cache
+    if _cache is None:
+        _cache = SeriesCache()
+    return _cache
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('directory', nargs='?', default=SERIES_CACHE_DIR)
+    args = parser.parse_args()
+
+    cache = SeriesCache(args.directory)
+    summary = {}
+    for name in sorted(os.listdir(args.directory)) if os.path.isdir(args.directory) else []:
+        if not name.endswith(SUFFIX):
+            continue
+        series_id = name[:-len(SUFFIX)]
+        arrays = cache.get(series_id)
+        summary[series_id] = None if arrays is None else {
+            'points': len(arrays.dates),
+            'first': str(arrays.dates[0]) if len(arrays.dates) else None,
+            'last': str(arrays.dates[-1]) if len(arrays.dates) else None,
+        }
+    print(json.dumps({'directory': args.directory, 'series': summary}, indent=2))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,192 @@
+"""
+Compact, clustered storage layout for series observations.
+
+The default ``fred_data`` table stores a surrogate ``id``, the series ID as
+a string and a ``DateTime`` string on every row, and range scans go through
+the secondary index ``idx_series_date`` and then back to the table. The
+compact layout (``FRED_STORAGE_LAYOUT=compact``) stores instead:
+
+- ``series_keys``: series ID to a small integer ``series_key``
+- ``fred_points``: ``(series_key, day, value)`` in a ``WITHOUT ROWID`` table
+  whose primary key ``(series_key, day)`` is the clustering key, with
+  ``day`` as days since 1970-01-01
+
+A series' points are then contiguous in one B-tree, so a date range scan
+reads consecutive leaf pages and nothing else.
+
+This module works in integer keys and epoch days; ``backend.database``
+converts to and from the records the rest of the app uses.
+
+Migrate an existing database in place with:
+    python -m backend.storage.compact [--db backend/fred_data.db] [--drop-legacy]
+"""
+
+import argparse
+import json
+import os
+import time
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import Column, Float, Integer, MetaData, String, Table, create_engine, func, select, text
+
+EPOCH = datetime(1970, 1, 1)
+
+metadata = MetaData()
+
+series_keys = Table(
+    'series_keys', metadata,
+    Column('series_key', Integer, primary_key=True),
+    Column('series_id', String, unique=True, nullable=False),
+)
+
+fred_points = Table(
+    'fred_points', metadata,
+    Column('series_key', Integer, primary_key=True),
+    Column('day', Integer, primary_key=True),
+    Column('value', Float),
+    sqlite_with_rowid=False,
+)
+
+_INSERT_POINT = text('INSERT OR IGNORE INTO fred_points (series_key, day, value) VALUES (:series_key, :day, :value)')
+_UPDATE_POINT = text('UPDATE fred_points SET value = :value WHERE series_key = :series_key AND day = :day')
+
+def epoch_day(value) -> int:
+    """Days since 1970-01-01 for a ``date`` or ``datetime`` (time of day dropped)."""
+    if isinstance(value, datetime):
+        value = value.date()
+    return (value - EPOCH.date()).days
+
+def from_epoch_day(day: int) -> datetime:
+    """Midnight ``datetime`` for an epoch day."""
+    return EPOCH + timedelta(days=day)
+
+def create_tables(bind) -> None:
+    """Create the compact tables if they do not exist."""
+    metadata.create_all(bind)
+
+def series_key(session, series_id: str, create: bool = False) -> Optional[int]:
+    """Look up (and optionally assign) the integer key of a series.
+
+    Not cached: a key assigned in a transaction that is later rolled back
+    must not outlive it.
+    """
+    key = session.execute(
+        select(series_keys.c.series_key).where(series_keys.c.series_id == series_id)
+    ).scalar()
+    if key is None and create:
+        session.execute(text('INSERT OR IGNORE INTO series_keys (series_id) VALUES (:series_id)'),
+                        {'series_id': series_id})
+        key = session.execute(
+            select(series_keys.c.series_key).where(series_keys.c.series_id == series_id)
+        ).scalar()
+    return key
+
+def store_points(session, series_id: str, data_points: Iterable[Dict]) -> int:
+    """Insert points whose day is not stored yet; returns the number inserted."""
+    key = series_key(session, series_id, create=True)
+    rows = [
+        {'series_key': key, 'day': epoch_day(point['date']), 'value': point['value']}
+        for point in data_points
+    ]
+    if not rows:
+        return 0
+    return session.execute(_INSERT_POINT, rows).rowcount
+
+def update_points(session, series_id: str, data_points: Iterable[Dict]) -> int:
+    """Overwrite the values of stored days; returns the number updated."""
+    key = series_key(session, series_id)
+    rows = [
+        {'series_key': key, 'day': epoch_day(point['date']), 'value': point['value']}
+        for point in data_points
+    ]
+    if key is None or not rows:
+        return 0
+    return session.execute(_UPDATE_POINT, rows).rowcount
+
+def get_points(session, series_id: str, start_date=None, end_date=None) -> List[Tuple[int, float]]:
+    """``(day, value)`` rows of a series in day order, optionally limited to a date range."""
+    key = series_key(session, series_id)
+    if key is None:
+        return []
+    query = select(fred_points.c.day, fred_points.c.value).where(fred_points.c.series_key == key)
+    if start_date is not None:
+        query = query.where(fred_points.c.day >= _ceil_day(start_date))
+    if end_date is not None:
+        query = query.where(fred_points.c.day <= epoch_day(end_date))
+    return session.execute(query.order_by(fred_points.c.day)).all()
+
+def latest_point(session, series_id: str) -> Optional[Tuple[int, float]]:
+    """The ``(day, value)`` row with the highest day, or ``None``."""
+    key = series_key(session, series_id)
+    if key is None:
+        return None
+    return session.execute(
+        select(fred_points.c.day, fred_points.c.value)
+        .where(fred_points.c.series_key == key)
+        .order_by(fred_points.c.day.desc())
+        .limit(1)
+    ).first()
+
+def _ceil_day(value) -> int:
+    """Epoch day of ``value``, rounded up when it falls after midnight."""
+    day = epoch_day(value)
+    if isinstance(value, datetime) and value != datetime.combine(value.date(), datetime.min.time()):
+        day += 1
+    return day
+
+def migrate(engine, drop_legacy: bool = False) -> Dict:
+    """Copy ``fred_data`` into the compact tables of the same database.
+
+    Safe to rerun: existing keys and points are kept. With ``drop_legacy``
+    the old table is dropped and the file vacuumed afterwards.
+    """
+    start = time.perf_counter()
+    create_tables(engine)
+    with engine.begin() as conn:
+        conn.execute(text(
+            'INSERT OR IGNORE INTO series_keys (series_id) '
+            'SELECT DISTINCT series_id FROM fred_data ORDER BY series_id'
+        ))
+        # Dates are stored as 'YYYY-MM-DD HH:MM:SS.ffffff'; julianday() parses them
+        copied = conn.execute(text(
+            'INSERT OR IGNORE INTO fred_points (series_key, day, value) '
+            'SELECT k.series_key, CAST(julianday(substr(d.date, 1, 10)) - 2440587.5 AS INTEGER), d.value '
+            'FROM fred_data d JOIN series_keys k ON k.series_id = d.series_id '
+            'ORDER BY k.series_key, d.date'
+        )).rowcount
+        legacy_rows = conn.execute(text('SELECT COUNT(*) FROM fred_data')).scalar()
+        compact_rows = conn.execute(select(func.count()).select_from(fred_points)).scalar()
+    if drop_legacy:
+        with engine.begin() as conn:
+            conn.execute(text('DROP TABLE fred_data'))
+        with engine.connect() as conn:
+            conn.execution_options(isolation_level='AUTOCOMMIT').execute(text('VACUUM'))
+    return {
+        'legacy_rows': legacy_rows,
+        'copied': copied,
+        'compact_rows': compact_rows,
+        'dropped_legacy': drop_legacy,
+        'seconds': round(time.perf_counter() - start, 3),
+    }
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--db', default=os.environ.get(
+        'FRED_DB_PATH', os.path.join(os.path.dirname(os.path.dirname(__file__)), 'fred_data.db')
+    ))
+    parser.add_argument('--drop-legacy', action='store_true',
+                        help='drop fred_data and VACUUM after copying (back up first)')
+    args = parser.parse_args()
+
+    if not os.path.exists(args.db):
+        parser.error(f"No database at {args.db}")
+    engine = create_engine(f'sqlite:///{args.db}')
+    size_before = os.path.getsize(args.db)
+    result = migrate(engine, drop_legacy=args.drop_legacy)
+    engine.dispose()
+    result.update({'db': args.db, 'bytes_before': size_before, 'bytes_after': os.path.getsize(args.db)})
+    print(json.dumps(result, indent=2))
+
+if __name__ == '__main__':
+    main()
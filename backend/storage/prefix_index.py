@@ -0,0 +1,241 @@
+"""
+Prefix-sum index of one series for constant-time range queries.
+
+Changes over a period were computed by reading every observation of a fixed
+trailing year. ``RangeIndex`` keeps, next to a series' date and value
+columns:
+
+- running sums of the values and of their logarithms (``sums[k]`` is the
+  sum of the first ``k`` values), so the arithmetic or geometric average of
+  any range is two lookups and a division
+- a dense day table: ``counts[day - first_day]`` is the number of
+  observations on or before ``day``, so any date maps to its offset without
+  a search
+
+With those, the change between two dates, the average over a range and the
+annualized rate since a start date (e.g. the inauguration) each cost a
+fixed number of array reads, whatever the length of the series or range.
+Dates resolve to the latest observation on or before them, the value that
+was current that day.
+
+The index is append-only: ``append`` extends every column in place in
+amortized O(points appended + days covered). Readers take one immutable
+``_State`` per query, so appends never disturb a query in flight; revised
+values need a rebuild (``RangeIndex.from_arrays``).
+"""
+
+import math
+from typing import NamedTuple, Optional, Tuple
+
+import numpy as np
+
+DAYS_PER_YEAR = 365.25
+
+class RangeIndexError(Exception):
+    """Points that cannot be appended to a range index."""
+    pass
+
+class _State(NamedTuple):
+    """One consistent view of the index; arrays may be longer than ``n``."""
+    n: int
+    first_day: int
+    span: int
+    days: np.ndarray
+    values: np.ndarray
+    sums: np.ndarray
+    log_sums: np.ndarray
+    nonpositive: np.ndarray
+    counts: np.ndarray
+
+class RangeSummary(NamedTuple):
+    """Change and averages of a series between two dates; ``None`` where undefined."""
+    start_date: Optional[str]
+    end_date: Optional[str]
+    start_value: Optional[float]
+    end_value: Optional[float]
+    percentage_change: Optional[float]
+    annualized_rate: Optional[float]
+    average: Optional[float]
+    geometric_average: Optional[float]
+    observations: int
+
+def _day(value) -> int:
+    """Days since 1970-01-01 of a date, datetime, ``datetime64`` or ISO string."""
+    return int(np.datetime64(value, 'D').astype('i8'))
+
+def _grow(array: np.ndarray, size: int) -> np.ndarray:
+    """``array`` if it holds ``size`` items, else a copy with at least double the room."""
+    if len(array) >= size:
+        return array
+    grown = np.empty(max(size, 2 * len(array)), dtype=array.dtype)
+    grown[:len(array)] = array
+    return grown
+
+_EMPTY = _State(0, 0, 0, np.empty(0, dtype='i8'), np.empty(0), np.zeros(1), np.zeros(1),
+                np.zeros(1, dtype='i8'), np.empty(0, dtype='i4'))
+
+class RangeIndex:
+    """Running sums and a day-to-offset table of one series, extended on append."""
+
+    def __init__(self, series_id: str):
+        self.series_id = series_id
+        self._state = _EMPTY
+
+    @classmethod
+    def from_arrays(cls, series_id: str, dates, values) -> 'RangeIndex':
+        """Index ``dates`` (ascending ``datetime64[D]``) and ``values``."""
+        index = cls(series_id)
+        index.append(dates, values)
+        return index
+
+    def __len__(self) -> int:
+        return self._state.n
+
+    @property
+    def last_date(self) -> Optional[np.datetime64]:
+        """Date of the last indexed observation."""
+        state = self._state
+        return state.days[state.n - 1].astype('datetime64[D]') if state.n else None
+
+    def append(self, dates, values) -> int:
+        """Add points dated after the last indexed one; non-finite values are skipped.
+
+        Returns the number of points added.
+        """
+        days = np.asarray(dates, dtype='datetime64[D]').view('i8')
+        values = np.asarray(values, dtype='f8')
+        if days.shape != values.shape:
+            raise RangeIndexError(f"{self.series_id}: {len(days)} dates but {len(values)} values")
+        finite = np.isfinite(values)
+        days, values = days[finite], values[finite]
+        if len(days) == 0:
+            return 0
+        state = self._state
+        if np.any(np.diff(days) <= 0) or (state.n and days[0] <= state.days[state.n - 1]):
+            raise RangeIndexError(f"{self.series_id}: appended dates must be unique, ascending "
+                                  "and after the last indexed date")
+
+        n, k = state.n, len(days)
+        first_day = state.first_day if n else int(days[0])
+        span = int(days[-1]) - first_day + 1
+
+        positive = values > 0
+        logs = np.log(values, where=positive, out=np.zeros(k))
+        index_days = _grow(state.days, n + k)
+        index_values = _grow(state.values, n + k)
+        sums = _grow(state.sums, n + k + 1)
+        log_sums = _grow(state.log_sums, n + k + 1)
+        nonpositive = _grow(state.nonpositive, n + k + 1)
+        counts = _grow(state.counts, span)
+
+        index_days[n:n + k] = days
+        index_values[n:n + k] = values
+        sums[n + 1:n + k + 1] = sums[n] + np.cumsum(values)
+        log_sums[n + 1:n + k + 1] = log_sums[n] + np.cumsum(logs)
+        nonpositive[n + 1:n + k + 1] = nonpositive[n] + np.cumsum(~positive)
+        # Days newly covered count the old points plus the appended ones up to that day
+        new_days = np.arange(state.span, span) + first_day
+        counts[state.span:span] = n + np.searchsorted(days, new_days, side='right')
+
+        self._state = _State(n + k, first_day, span, index_days, index_values,
+                             sums, log_sums, nonpositive, counts)
+        return k
+
+    @staticmethod
+    def _through(state: _State, day: int) -> int:
+        """Number of observations on or before ``day``."""
+        offset = day - state.first_day
+        if state.n == 0 or offset < 0:
+            return 0
+        if offset >= state.span:
+            return state.n
+        return int(state.counts[offset])
+
+    def _point(self, state: _State, date) -> Optional[int]:
+        """Offset of the latest observation on or before ``date`` (default: the last one)."""
+        k = state.n if date is None else self._through(state, _day(date))
+        return k - 1 if k else None
+
+    def _range(self, state: _State, start, end) -> Tuple[int, int]:
+        """Offsets ``lo:hi`` of the observations with ``start <= date <= end``."""
+        lo = 0 if start is None else self._through(state, _day(start) - 1)
+        hi = state.n if end is None else self._through(state, _day(end))
+        return lo, max(lo, hi)
+
+    @staticmethod
+    def _change(state: _State, i: Optional[int], j: Optional[int]) -> Optional[float]:
+        if i is None or j is None or state.values[i] == 0:
+            return None
+        return float((state.values[j] / state.values[i] - 1) * 100)
+
+    @staticmethod
+    def _annualized(state: _State, i: Optional[int], j: Optional[int]) -> Optional[float]:
+        if i is None or j is None or j <= i or state.values[i] <= 0 or state.values[j] <= 0:
+            return None
+        log_change = math.log(state.values[j]) - math.log(state.values[i])
+        years = (int(state.days[j]) - int(state.days[i])) / DAYS_PER_YEAR
+        return math.expm1(log_change / years) * 100
+
+    @staticmethod
+    def _average(state: _State, lo: int, hi: int) -> Optional[float]:
+        return float((state.sums[hi] - state.sums[lo]) / (hi - lo)) if hi > lo else None
+
+    @staticmethod
+    def _geometric_average(state: _State, lo: int, hi: int) -> Optional[float]:
+        # Logs of non-positive values are not summed; a range holding any has no geometric mean
+        if hi == lo or state.nonpositive[hi] != state.nonpositive[lo]:
+            return None
+        return math.exp((state.log_sums[hi] - state.log_sums[lo]) / (hi - lo))
+
+    def value_at(self, date=None) -> Optional[float]:
+        """The latest value on or before ``date``, or ``None`` before the first observation."""
+        state = self._state
+        i = self._point(state, date)
+        return None if i is None else float(state.values[i])
+
+    def change(self, start, end=None) -> Optional[float]:
+        """Percentage change from the value at ``start`` to the value at ``end`` (default: latest)."""
+        state = self._state
+        return self._change(state, self._point(state, start), self._point(state, end))
+
+    def annualized_rate(self, start, end=None) -> Optional[float]:
+        """Compound yearly percentage rate between the values at ``start`` and ``end``.
+
+        The rate is measured over the days between the two observations,
+        from the difference of their logarithms.
+        """
+        state = self._state
+        return self._annualized(state, self._point(state, start), self._point(state, end))
+
+    def count(self, start=None, end=None) -> int:
+        """Number of observations with ``start <= date <= end``."""
+        lo, hi = self._range(self._state, start, end)
+        return hi - lo
+
+    def average(self, start=None, end=None) -> Optional[float]:
+        """Mean of the observations with ``start <= date <= end``."""
+        state = self._state
+        return self._average(state, *self._range(state, start, end))
+
+    def geometric_average(self, start=None, end=None) -> Optional[float]:
+        """Geometric mean of the observations with ``start <= date <= end``, if all are positive."""
+        state = self._state
+        return self._geometric_average(state, *self._range(state, start, end))
+
+    def summary(self, start=None, end=None) -> RangeSummary:
+        """Values at ``start`` and ``end`` (default: first and last) with the change, rate and averages."""
+        state = self._state
+        i = (0 if state.n else None) if start is None else self._point(state, start)
+        j = self._point(state, end)
+        lo, hi = self._range(state, start, end)
+        return RangeSummary(
+            start_date=None if i is None else str(state.days[i].astype('datetime64[D]')),
+            end_date=None if j is None else str(state.days[j].astype('datetime64[D]')),
+            start_value=None if i is None else float(state.values[i]),
+            end_value=None if j is None else float(state.values[j]),
+            percentage_change=self._change(state, i, j),
+            annualized_rate=self._annualized(state, i, j),
+            average=self._average(state, lo, hi),
+            geometric_average=self._geometric_average(state, lo, hi),
+            observations=hi - lo,
+        )
@@ -0,0 +1,218 @@
+"""
+Memory-mapped metrics snapshot shared by all worker processes.
+
+Ingest serializes the computed ``/inflation/data`` document once and writes it
+to a single file with a fixed-size versioned header. Every worker maps that
+file read-only, so all processes serve the same bytes from the page cache
+instead of each holding its own copy of the metrics.
+
+File layout (little endian)::
+
+    0   8s  magic            b'TTSNAP\\x00\\x00'
+    8   I   format version
+    12  Q   generation       incremented on every publish
+    20  d   created_at       unix timestamp
+    28  Q   payload length
+    36  I   payload crc32
+    40  ..  padding up to HEADER_SIZE
+    64  ..  payload (UTF-8 JSON)
+
+Publishing writes a temporary file and ``os.replace``-s it over the live one,
+so readers observe either the old or the new generation, never a mix.
+"""
+
+import fcntl
+import json
+import logging
+import mmap
+import os
+import struct
+import threading
+import time
+import zlib
+from typing import Any, Dict, NamedTuple, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_PATH = os.environ.get(
+    'SNAPSHOT_PATH',
+    os.path.join(os.path.dirname(os.path.dirname(__file__)), 'metrics.snap')
+)
+
+MAGIC = b'TTSNAP\x00\x00'
+FORMAT_VERSION = 1
+HEADER = struct.Struct('<8sIQdQI')
+HEADER_SIZE = 64
+
+class SnapshotError(Exception):
+    """Error reading or writing a metrics snapshot."""
+    pass
+
+class Snapshot(NamedTuple):
+    """A validated view of one snapshot generation.
+
+    ``payload`` is a zero-copy view into the shared mapping.
+    """
+    generation: int
+    created_at: float
+    payload: memoryview
+
+def _read_header(buffer, file_size: int) -> tuple:
+    """Parse and validate the snapshot header."""
+    if len(buffer) < HEADER_SIZE:
+        raise SnapshotError("Snapshot file is truncated")
+    magic, version, generation, created_at, length, crc = HEADER.unpack_from(buffer, 0)
+    if magic != MAGIC:
+        raise SnapshotError("Not a metrics snapshot file")
+    if version != FORMAT_VERSION:
+        raise SnapshotError(f"Unsupported snapshot format version: {version}")
+    if HEADER_SIZE + length > file_size:
+        raise SnapshotError("Snapshot payload is truncated")
+    return generation, created_at, length, crc
+
+def current_generation(path: str = None) -> int:
+    """Return the generation of the published snapshot, or 0 if none exists."""
+    path = path or SNAPSHOT_PATH
+    try:
+        with open(path, 'rb') as f:
+            generation, _, _, _ = _read_header(f.read(HEADER_SIZE), os.fstat(f.fileno()).st_size)
+            return generation
+    except (FileNotFoundError, SnapshotError):
+        return 0
+
+def publish_snapshot(document: Dict[str, Any], path: str = None, if_absent: bool = False) -> int:
+    """Serialize ``document`` and atomically swap it in as the new snapshot.
+
+    Returns the new generation number. Concurrent publishers are serialized
+    with an advisory lock so generations stay strictly increasing. With
+    ``if_absent`` the document is only written when no snapshot exists yet
+    (returns 0 otherwise); read paths use this to bootstrap without ever
+    overwriting a newer generation published by ingest.
+    """
+    path = path or SNAPSHOT_PATH
+    payload = json.dumps(document, separators=(',', ':'), default=str).encode('utf-8')
+    directory = os.path.dirname(os.path.abspath(path))
+
+    with open(f"{path}.lock", 'a') as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            generation = current_generation(path) + 1
+            if if_absent and generation > 1:
+                return 0
+            header = HEADER.pack(
+                MAGIC, FORMAT_VERSION, generation, time.time(),
+                len(payload), zlib.crc32(payload)
+            ).ljust(HEADER_SIZE, b'\0')
+
+            tmp_path = f"{path}.tmp-{os.getpid()}"
+            with open(tmp_path, 'wb') as f:
+                f.write(header)
+                f.write(payload)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, path)
+
+            dir_fd = os.open(directory, os.O_RDONLY)
+            try:
+                os.fsync(dir_fd)
+            finally:
+                os.close(dir_fd)
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    logger.info(f"Published metrics snapshot generation {generation} ({len(payload)} bytes)")
+    return generation
+
+class _Mapping(NamedTuple):
+    """An open mapping of one snapshot file."""
+    identity: tuple
+    buffer: mmap.mmap
+    snapshot: Snapshot
+
+class SnapshotReader:
+    """Serve the latest published snapshot from a shared read-only mapping.
+
+    Each ``read`` costs one ``stat`` call; the file is only re-mapped when
+    the publisher has swapped in a new inode.
+    """
+
+    def __init__(self, path: str = None):
+        self.path = path or SNAPSHOT_PATH
+        self._mapping: Optional[_Mapping] = None
+        self._lock = threading.Lock()
+        self._parsed_generation = 0
+        self._parsed: Optional[Dict[str, Any]] = None
+        self._body: Tuple[Optional[Snapshot], bytes] = (None, b'')
+
+    def _identity(self) -> Optional[tuple]:
+        try:
+            st = os.stat(self.path)
+        except FileNotFoundError:
+            return None
+        return (st.st_dev, st.st_ino, st.st_mtime_ns, st.st_size)
+
+    def _map(self, identity: tuple) -> Optional[_Mapping]:
+        try:
+            with open(self.path, 'rb') as f:
+                buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (FileNotFoundError, ValueError):
+            return None
+        try:
+            generation, created_at, length, crc = _read_header(buffer, len(buffer))
+            payload = memoryview(buffer)[HEADER_SIZE:HEADER_SIZE + length]
+            if zlib.crc32(payload) != crc:
+                raise SnapshotError("Snapshot checksum mismatch")
+        except SnapshotError as e:
+            logger.warning(f"Ignoring invalid snapshot {self.path}: {str(e)}")
+            return None
+        return _Mapping(identity, buffer, Snapshot(generation, created_at, payload))
+
+    def read(self) -> Optional[Snapshot]:
+        """Return the current snapshot, re-mapping if a new one was published."""
+        identity = self._identity()
+        if identity is None:
+            return None
+        mapping = self._mapping
+        if mapping is None or mapping.identity != identity:
+            with self._lock:
+                mapping = self._mapping
+                if mapping is None or mapping.identity != identity:
+                    mapping = self._map(identity)
+                    if mapping is None:
+                        return None
+                    previous, self._mapping = self._mapping, mapping
+                    if previous is not None:
+                        logger.info(f"Switched to metrics snapshot generation {mapping.snapshot.generation}")
+        return mapping.snapshot
+
+    def body(self, snapshot: Snapshot) -> bytes:
+        """The payload of ``snapshot`` as ``bytes``, copied once per mapping.
+
+        WSGI servers only write ``bytes``, so responses need a copy of the
+        mapped payload; it is shared by every request until a new snapshot
+        is mapped.
+        """
+        cached, body = self._body
+        if cached is not snapshot:
+            body = bytes(snapshot.payload)
+            self._body = (snapshot, body)
+        return body
+
+    def load(self) -> Optional[Dict[str, Any]]:
+        """Return the decoded snapshot document, parsed once per generation."""
+        snapshot = self.read()
+        if snapshot is None:
+            return None
+        if snapshot.generation != self._parsed_generation:
+            self._parsed = json.loads(self.body(snapshot))
+            self._parsed_generation = snapshot.generation
+        return self._parsed
+
+_reader: Optional[SnapshotReader] = None
+
+def get_snapshot_reader() -> SnapshotReader:
+    """Get the process-wide snapshot reader."""
+    global _reader
+    if _reader is None:
+        _reader = SnapshotReader()
+    return _reader
@@ -0,0 +1,158 @@
+"""
+SQLite engine profiles: journaling, pragmas and pooling.
+
+SQLite allows any number of concurrent readers but one writer per file, and
+in the default rollback-journal mode a writer blocks every reader while it
+commits. A pool of 10 (+20 overflow) interchangeable connections only turns
+that into "database is locked" errors. An ``EngineProfile`` instead builds:
+
+- a writer engine with ``writer_pool_size`` connections (one by default),
+  so writers in a process queue on the pool rather than on the file lock
+- a reader engine with ``read_pool_size`` ``query_only`` connections; in WAL
+  mode they read the last committed state while the writer works
+
+and applies the profile's pragmas to every connection it opens.
+
+Profiles:
+    wal      WAL journal, synchronous=NORMAL, 64 MiB page cache, 256 MiB mmap,
+             one writer, 8 readers (default)
+    legacy   the previous behaviour: rollback journal, synchronous=FULL and
+             one shared pool of 30 connections for reads and writes
+
+Pick one with ``SQLITE_PROFILE`` and override single settings with
+``SQLITE_JOURNAL_MODE``, ``SQLITE_SYNCHRONOUS``, ``SQLITE_BUSY_TIMEOUT_MS``,
+``SQLITE_CACHE_SIZE_KIB``, ``SQLITE_MMAP_SIZE``, ``SQLITE_READ_POOL_SIZE`` and
+``SQLITE_WRITER_POOL_SIZE``.
+"""
+
+import logging
+import os
+from typing import NamedTuple
+
+from sqlalchemy import create_engine, event
+
+logger = logging.getLogger(__name__)
+
+JOURNAL_MODES = ('wal', 'delete', 'truncate', 'persist', 'memory')
+SYNCHRONOUS_MODES = ('off', 'normal', 'full', 'extra')
+
+class EngineProfile(NamedTuple):
+    """Pragmas and pool sizes for one SQLite database."""
+    journal_mode: str = 'wal'
+    synchronous: str = 'normal'
+    busy_timeout_ms: int = 5000
+    cache_size_kib: int = 65536
+    mmap_size: int = 256 * 1024 * 1024
+    read_pool_size: int = 8
+    writer_pool_size: int = 1
+
+    @property
+    def shared_pool(self) -> bool:
+        """Whether reads use the writer engine instead of a reader pool."""
+        return self.read_pool_size == 0
+
+    def validate(self) -> 'EngineProfile':
+        """Return the profile, or raise ``ValueError`` for unknown modes and bad pool sizes."""
+        if self.journal_mode not in JOURNAL_MODES:
+            raise ValueError(f"journal_mode must be one of {', '.join(JOURNAL_MODES)}, got {self.journal_mode!r}")
+        if self.synchronous not in SYNCHRONOUS_MODES:
+            raise ValueError(f"synchronous must be one of {', '.join(SYNCHRONOUS_MODES)}, got {self.synchronous!r}")
+        if self.writer_pool_size < 1 or self.read_pool_size < 0:
+            raise ValueError("writer_pool_size must be at least 1 and read_pool_size at least 0")
+        return self
+
+PROFILES = {
+    'wal': EngineProfile(),
+    'legacy': EngineProfile(
+        journal_mode='delete',
+        synchronous='full',
+        cache_size_kib=2000,
+        mmap_size=0,
+        read_pool_size=0,
+        writer_pool_size=30,
+    ),
+}
+
+_ENV_OVERRIDES = {
+    'journal_mode': ('SQLITE_JOURNAL_MODE', str.lower),
+    'synchronous': ('SQLITE_SYNCHRONOUS', str.lower),
+    'busy_timeout_ms': ('SQLITE_BUSY_TIMEOUT_MS', int),
+    'cache_size_kib': ('SQLITE_CACHE_SIZE_KIB', int),
+    'mmap_size': ('SQLITE_MMAP_SIZE', int),
+    'read_pool_size': ('SQLITE_READ_POOL_SIZE', int),
+    'writer_pool_size': ('SQLITE_WRITER_POOL_SIZE', int),
+}
+
+def profile_from_env() -> EngineProfile:
+    """The profile named by ``SQLITE_PROFILE`` with any per-setting overrides."""
+    name = os.environ.get('SQLITE_PROFILE', 'wal').lower()
+    if name not in PROFILES:
+        raise ValueError(f"SQLITE_PROFILE must be one of {', '.join(PROFILES)}, got {name!r}")
+    overrides = {
+        field: convert(os.environ[var])
+        for field, (var, convert) in _ENV_OVERRIDES.items() if os.environ.get(var)
+    }
+    return PROFILES[name]._replace(**overrides).validate()
+
+def _install_pragmas(engine, profile: EngineProfile, read_only: bool) -> None:
+    """Apply the profile's pragmas to every new connection of ``engine``."""
+    @event.listens_for(engine, 'connect')
+    def set_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            if not read_only:
+                # Persistent in the file; readers inherit it
+                cursor.execute(f'PRAGMA journal_mode={profile.journal_mode}')
+            cursor.execute(f'PRAGMA synchronous={profile.synchronous}')
+            cursor.execute(f'PRAGMA busy_timeout={int(profile.busy_timeout_ms)}')
+            cursor.execute(f'PRAGMA cache_size={-int(profile.cache_size_kib)}')
+            cursor.execute(f'PRAGMA mmap_size={int(profile.mmap_size)}')
+            if read_only:
+                cursor.execute('PRAGMA query_only=ON')
+        finally:
+            cursor.close()
+
+def _install_transaction_control(engine) -> None:
+    """Make every transaction of ``engine`` start with an explicit ``BEGIN``.
+
+    pysqlite only sends ``BEGIN`` before data-modifying statements, so a
+    ``SAVEPOINT`` issued first opens the outermost transaction itself and
+    its ``RELEASE`` commits. With the driver's own handling turned off,
+    savepoints nest inside the transaction and only ``COMMIT`` publishes
+    their writes (SQLAlchemy's recipe for pysqlite).
+    """
+    @event.listens_for(engine, 'connect')
+    def disable_driver_transactions(dbapi_connection, connection_record):
+        dbapi_connection.isolation_level = None
+
+    @event.listens_for(engine, 'begin')
+    def begin(connection):
+        # Statements that cannot run in a transaction (VACUUM) ask for autocommit
+        if connection.get_execution_options().get('isolation_level') != 'AUTOCOMMIT':
+            connection.exec_driver_sql('BEGIN')
+
+def _engine(db_path: str, profile: EngineProfile, pool_size: int, read_only: bool):
+    engine = create_engine(
+        f'sqlite:///{db_path}',
+        pool_size=pool_size,
+        max_overflow=0,
+        connect_args={'timeout': profile.busy_timeout_ms / 1000, 'check_same_thread': False},
+    )
+    _install_pragmas(engine, profile, read_only)
+    # A shared pool also serves read sessions, which must not hold a
+    # transaction (and its locks) open until they close
+    if not read_only and not profile.shared_pool:
+        _install_transaction_control(engine)
+    return engine
+
+def create_writer_engine(db_path: str, profile: EngineProfile):
+    """Engine for sessions that write, limited to ``writer_pool_size`` connections.
+
+    Unless the profile shares one pool for reads and writes, its sessions
+    run in explicit transactions, so savepoints nest inside them.
+    """
+    return _engine(db_path, profile, profile.writer_pool_size, read_only=False)
+
+def create_reader_engine(db_path: str, profile: EngineProfile):
+    """Engine of ``query_only`` connections for read paths."""
+    return _engine(db_path, profile, profile.read_pool_size, read_only=True)
@@ -0,0 +1,242 @@
+"""
+Vintage (as-of) store of series observations.
+
+FRED revises published values: CPI seasonal factors are recomputed every
+year and Case-Shiller indexes are revised for months after release. The
+observation tables keep one value per date, so this module keeps every
+value a date has had, with the span of real time it was current:
+
+- ``fred_vintages``: ``(series_key, day, realtime_start, realtime_end,
+  value)`` in a ``WITHOUT ROWID`` table clustered on ``(series_key, day,
+  realtime_start)``; days are days since 1970-01-01 and ``realtime_end`` of
+  the current value is ``OPEN_END`` (FRED's 9999-12-31)
+- ``idx_vintage_interval``: ``(series_key, realtime_end, day, value)``, the
+  interval index. A value is current at ``t`` when ``realtime_start <= t
+  <= realtime_end``; the index range ``realtime_end >= t`` holds only the
+  values still current at ``t`` or later, so as-of queries over a whole
+  series near the present skip superseded revisions, and the current
+  values (``realtime_end = OPEN_END``) that every recorded snapshot is
+  compared against are one covering index range. As-of queries limited
+  to a date range use the clustered primary key instead
+
+Storage is delta-only: recording a snapshot whose value for a date equals
+the current one writes nothing, so a series costs one row per observation
+plus one per actual revision, however often it is fetched.
+
+Series keys are shared with the compact layout (``series_keys``). Inspect a
+database with:
+    python -m backend.storage.vintage [--db backend/fred_data.db] [SERIES_ID ...]
+"""
+
+import argparse
+import json
+import os
+from collections import defaultdict
+from datetime import datetime
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from sqlalchemy import Column, Float, Index, Integer, MetaData, Table, create_engine, func, select, text
+from sqlalchemy.orm import Session
+
+from . import compact
+from .compact import epoch_day, from_epoch_day
+
+OPEN_END = epoch_day(datetime(9999, 12, 31))
+
+metadata = MetaData()
+
+fred_vintages = Table(
+    'fred_vintages', metadata,
+    Column('series_key', Integer, primary_key=True),
+    Column('day', Integer, primary_key=True),
+    Column('realtime_start', Integer, primary_key=True),
+    Column('realtime_end', Integer, nullable=False),
+    Column('value', Float),
+    Index('idx_vintage_interval', 'series_key', 'realtime_end', 'day', 'value'),
+    sqlite_with_rowid=False,
+)
+
+_INSERT_VINTAGE = text(
+    'INSERT OR REPLACE INTO fred_vintages (series_key, day, realtime_start, realtime_end, value) '
+    'VALUES (:series_key, :day, :realtime_start, :realtime_end, :value)'
+)
+_AS_OF = text(
+    'SELECT day, value FROM fred_vintages INDEXED BY idx_vintage_interval '
+    'WHERE series_key = :series_key AND realtime_end >= :t AND realtime_start <= :t ORDER BY day'
+)
+_CLOSE_VINTAGE = text(
+    'UPDATE fred_vintages SET realtime_end = :realtime_end '
+    'WHERE series_key = :series_key AND day = :day AND realtime_start = :realtime_start'
+)
+
+class VintageChanges(NamedTuple):
+    """What recording one snapshot changed."""
+    added: List[Dict]
+    revised: List[Dict]
+    unchanged: int
+
+def create_tables(bind) -> None:
+    """Create the vintage table (and the shared series keys) if they do not exist."""
+    compact.series_keys.create(bind, checkfirst=True)
+    metadata.create_all(bind)
+
+def _current(session, key: int, first_day: int, last_day: int) -> Dict[int, Tuple[int, float]]:
+    """``{day: (realtime_start, value)}`` of the open values in a day range."""
+    rows = session.execute(
+        select(fred_vintages.c.day, fred_vintages.c.realtime_start, fred_vintages.c.value)
+        .where(fred_vintages.c.series_key == key)
+        .where(fred_vintages.c.realtime_end == OPEN_END)
+        .where(fred_vintages.c.day.between(first_day, last_day))
+    )
+    return {row.day: (row.realtime_start, row.value) for row in rows}
+
+def record_vintage(session, series_id: str, data_points: Iterable[Dict], realtime_start=None) -> VintageChanges:
+    """Record values of a series as published at ``realtime_start`` (default today).
+
+    Dates without a stored value are added, dates whose value differs close
+    the current value the day before and open the new one, and unchanged
+    values write nothing. Snapshots older than a date's current value are
+    ignored. Does not commit.
+    """
+    key = compact.series_key(session, series_id, create=True)
+    start = epoch_day(realtime_start or datetime.now())
+    points = {epoch_day(point['date']): point for point in data_points}
+    if not points:
+        return VintageChanges([], [], 0)
+
+    current = _current(session, key, min(points), max(points))
+    added, revised, inserts, closes = [], [], [], []
+    unchanged = 0
+    for day, point in sorted(points.items()):
+        value = point['value']
+        if day not in current:
+            added.append(point)
+        else:
+            current_start, current_value = current[day]
+            if current_value == value or current_start > start:
+                unchanged += 1
+                continue
+            revised.append({'date': point['date'], 'value': value, 'previous': current_value})
+            if current_start < start:
+                closes.append({'series_key': key, 'day': day, 'realtime_start': current_start,
+                               'realtime_end': start - 1})
+        # A second snapshot on the same day replaces that day's value
+        inserts.append({'series_key': key, 'day': day, 'realtime_start': start,
+                        'realtime_end': OPEN_END, 'value': value})
+    if closes:
+        session.execute(_CLOSE_VINTAGE, closes)
+    if inserts:
+        session.execute(_INSERT_VINTAGE, inserts)
+    return VintageChanges(added, revised, unchanged)
+
+def load_releases(session, series_id: str, releases: Iterable[Tuple]) -> int:
+    """Replace a series' vintages with a full release history; returns rows stored.
+
+    ``releases`` are ``(date, realtime_start, value)`` rows such as those of
+    ``Fred.get_series_all_releases``. Consecutive releases of an unchanged
+    value are merged. Does not commit.
+    """
+    key = compact.series_key(session, series_id, create=True)
+    by_day = defaultdict(list)
+    for date, realtime_start, value in releases:
+        by_day[epoch_day(date)].append((epoch_day(realtime_start), float(value)))
+
+    rows = []
+    for day, versions in by_day.items():
+        versions.sort()
+        merged = [versions[0]]
+        for start, value in versions[1:]:
+            if start == merged[-1][0]:
+                merged[-1] = (start, value)
+            elif value != merged[-1][1]:
+                merged.append((start, value))
+        for i, (start, value) in enumerate(merged):
+            end = merged[i + 1][0] - 1 if i + 1 < len(merged) else OPEN_END
+            rows.append({'series_key': key, 'day': day, 'realtime_start': start,
+                         'realtime_end': end, 'value': value})
+
+    session.execute(fred_vintages.delete().where(fred_vintages.c.series_key == key))
+    if rows:
+        session.execute(_INSERT_VINTAGE, rows)
+    return len(rows)
+
+def as_of(session, series_id: str, as_of_date, start_date=None, end_date=None) -> List[Tuple[int, float]]:
+    """``(day, value)`` rows of a series as published on ``as_of_date``, in day order."""
+    key = compact.series_key(session, series_id)
+    if key is None:
+        return []
+    t = epoch_day(as_of_date)
+    if start_date is None and end_date is None:
+        # SQLite prefers the primary key for ORDER BY day, which reads every revision
+        return session.execute(_AS_OF, {'series_key': key, 't': t}).all()
+    query = (
+        select(fred_vintages.c.day, fred_vintages.c.value)
+        .where(fred_vintages.c.series_key == key)
+        .where(fred_vintages.c.realtime_end >= t)
+        .where(fred_vintages.c.realtime_start <= t)
+    )
+    if start_date is not None:
+        query = query.where(fred_vintages.c.day >= compact._ceil_day(start_date))
+    if end_date is not None:
+        query = query.where(fred_vintages.c.day <= epoch_day(end_date))
+    return session.execute(query.order_by(fred_vintages.c.day)).all()
+
+def history(session, series_id: str, date) -> List[Tuple[datetime, Optional[datetime], float]]:
+    """Every value one observation has had: ``(realtime_start, realtime_end, value)``.
+
+    ``realtime_end`` is ``None`` for the current value.
+    """
+    key = compact.series_key(session, series_id)
+    if key is None:
+        return []
+    rows = session.execute(
+        select(fred_vintages.c.realtime_start, fred_vintages.c.realtime_end, fred_vintages.c.value)
+        .where(fred_vintages.c.series_key == key)
+        .where(fred_vintages.c.day == epoch_day(date))
+        .order_by(fred_vintages.c.realtime_start)
+    )
+    return [
+        (from_epoch_day(row.realtime_start),
+         None if row.realtime_end == OPEN_END else from_epoch_day(row.realtime_end),
+         row.value)
+        for row in rows
+    ]
+
+def stats(session, series_ids: Optional[List[str]] = None) -> Dict[str, Dict]:
+    """Observations, stored vintage rows and revisions per series."""
+    query = (
+        select(compact.series_keys.c.series_id,
+               func.count(func.distinct(fred_vintages.c.day)).label('observations'),
+               func.count().label('rows'))
+        .join(fred_vintages, fred_vintages.c.series_key == compact.series_keys.c.series_key)
+        .group_by(compact.series_keys.c.series_id)
+    )
+    if series_ids:
+        query = query.where(compact.series_keys.c.series_id.in_(series_ids))
+    return {
+        row.series_id: {
+            'observations': row.observations,
+            'rows': row.rows,
+            'revisions': row.rows - row.observations,
+        }
+        for row in session.execute(query)
+    }
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('series_ids', nargs='*')
+    parser.add_argument('--db', default=os.environ.get(
+        'FRED_DB_PATH', os.path.join(os.path.dirname(os.path.dirname(__file__)), 'fred_data.db')
+    ))
+    args = parser.parse_args()
+
+    if not os.path.exists(args.db):
+        parser.error(f"No database at {args.db}")
+    engine = create_engine(f'sqlite:///{args.db}')
+    create_tables(engine)
+    with Session(engine) as session:
+        print(json.dumps(stats(session, args.series_ids), indent=2))
+    engine.dispose()
+
+if __name__ == '__main__':
+    main()
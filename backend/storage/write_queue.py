@@ -0,0 +1,168 @@
+"""
+Single-writer queue for database writes.
+
+SQLite serializes writers per file. When every caller opens a session and
+commits its own transaction, concurrent callers queue on the file lock,
+pay one commit (and journal sync) each and fail with "database is locked"
+once the busy timeout runs out. ``WriteQueue`` instead gives each process
+one writer thread:
+
+- callers ``submit`` a write batch, a function ``fn(session, *args)`` that
+  writes without committing, and get a ``concurrent.futures.Future``
+- the writer takes every batch already queued, plus any arriving within an
+  optional ``flush_interval`` (up to ``max_batches``), runs each in its own
+  SAVEPOINT and commits them all in one transaction
+- each future resolves to its batch's return value, or to its exception if
+  the batch (or the shared commit) failed; a failed batch is rolled back to
+  its savepoint without affecting the others
+
+Commits per second are then bounded by the flush rate rather than the
+number of callers. Grouping relies on the writer engine's explicit
+transactions (``sqlite_engine.create_writer_engine``); with the legacy
+shared pool pysqlite commits each released savepoint, so every batch is
+committed on its own.
+
+Usage:
+    future = get_write_queue().submit(write_series_data, series_id, points, metadata)
+    inserted = future.result()
+"""
+
+import logging
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Callable, List, NamedTuple, Optional
+
+from ..core.metrics import DB_WRITE_BATCHES_TOTAL, DB_WRITE_FLUSH_BATCHES, DB_WRITE_FLUSH_SECONDS
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_FLUSH_INTERVAL = 0.0
+DEFAULT_MAX_BATCHES = 500
+
+class WriteQueueClosed(RuntimeError):
+    """Raised when submitting to a write queue that has been closed."""
+    pass
+
+class _Batch(NamedTuple):
+    """One submitted write and the future its caller waits on."""
+    fn: Callable
+    args: tuple
+    kwargs: dict
+    future: Future
+
+_STOP = object()
+
+class WriteQueue:
+    """Run submitted write batches on one thread, one transaction per flush."""
+
+    def __init__(self, session_factory: Callable = None,
+                 flush_interval: float = DEFAULT_FLUSH_INTERVAL, max_batches: int = DEFAULT_MAX_BATCHES):
+        if session_factory is None:
+            from ..database import get_session as session_factory
+        self.session_factory = session_factory
+        self.flush_interval = flush_interval
+        self.max_batches = max_batches
+        self._queue: queue.Queue = queue.Queue()
+        self._closed = False
+        self._lock = threading.Lock()
+        self._thread = threading.Thread(target=self._run, name='db-writer', daemon=True)
+        self._thread.start()
+
+    def submit(self, fn: Callable, *args, **kwargs) -> Future:
+        """Queue ``fn(session, *args, **kwargs)`` for the writer thread."""
+        future = Future()
+        with self._lock:
+            if self._closed:
+                raise WriteQueueClosed("Write queue is closed")
+            self._queue.put(_Batch(fn, args, kwargs, future))
+        return future
+
+    def close(self, timeout: Optional[float] = None) -> None:
+        """Flush queued batches and stop the writer thread."""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._queue.put(_STOP)
+        self._thread.join(timeout)
+
+    def _collect(self, first) -> List:
+        """The first item plus everything arriving within the flush window."""
+        items = [first]
+        deadline = time.perf_counter() + self.flush_interval
+        while len(items) < self.max_batches and items[-1] is not _STOP:
+            remaining = deadline - time.perf_counter()
+            try:
+                items.append(self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return items
+
+    def _run(self) -> None:
+        while True:
+            items = self._collect(self._queue.get())
+            batches = [item for item in items if item is not _STOP]
+            if batches:
+                self._flush(batches)
+            if len(batches) < len(items):
+                return
+
+    def _flush(self, batches: List[_Batch]) -> None:
+        """Run batches in savepoints of one transaction and resolve their futures."""
+        start = time.perf_counter()
+        results = []
+        session = self.session_factory()
+        try:
+            for batch in batches:
+                if not batch.future.set_running_or_notify_cancel():
+                    continue
+                savepoint = session.begin_nested()
+                try:
+                    result = batch.fn(session, *batch.args, **batch.kwargs)
+                    savepoint.commit()
+                    results.append((batch, result))
+                except Exception as e:
+                    savepoint.rollback()
+                    DB_WRITE_BATCHES_TOTAL.labels('failed').inc()
+                    batch.future.set_exception(e)
+            session.commit()
+        except Exception as e:
+            session.rollback()
+            logger.error(f"Write queue flush of {len(results)} batches failed: {str(e)}")
+            for batch, _ in results:
+                DB_WRITE_BATCHES_TOTAL.labels('failed').inc()
+                batch.future.set_exception(e)
+            return
+        finally:
+            session.close()
+            DB_WRITE_FLUSH_SECONDS.observe(time.perf_counter() - start)
+
+        DB_WRITE_FLUSH_BATCHES.observe(len(results))
+        DB_WRITE_BATCHES_TOTAL.labels('committed').inc(len(results))
+        for batch, result in results:
+            batch.future.set_result(result)
+        logger.debug("Write queue committed %d batches", len(results))
+
+_write_queue: Optional[WriteQueue] = None
+_write_queue_pid: Optional[int] = None
+_write_queue_lock = threading.Lock()
+
+def get_write_queue() -> WriteQueue:
+    """Get this process's write queue, starting it on first use (and after a fork)."""
+    global _write_queue, _write_queue_pid
+    with _write_queue_lock:
+        if _write_queue is None or _write_queue_pid != os.getpid():
+            _write_queue = WriteQueue()
+            _write_queue_pid = os.getpid()
+        return _write_queue
+
+def reset_write_queue() -> None:
+    """Close this process's write queue; the next ``get_write_queue`` starts a new one."""
+    global _write_queue
+    with _write_queue_lock:
+        write_queue, _write_queue = _write_queue, None
+    if write_queue is not None and _write_queue_pid == os.getpid():
+        write_queue.close()
@@ -3,6 +3,39 @@ from unittest.mock import Mock, patch, MagicMock
 import anthropic
 import os
 
+@pytest.fixture(autouse=True)
+def isolated_snapshot(tmp_path, monkeypatch):
+    """Keep metrics snapshots written during tests out of the source tree."""
+    from backend.storage import snapshot
+    monkeypatch.setattr(snapshot, 'SNAPSHOT_PATH', str(tmp_path / 'metrics.snap'))
+    monkeypatch.setattr(snapshot, '_reader', None)
+    yield str(tmp_path / 'metrics.snap')
+
+@pytest.fixture(autouse=True)
+def isolated_rate_limits(monkeypatch):
+    """Keep rate-limit counters in memory so apps created in tests start with a fresh budget."""
+    from backend.core.config import AppConfig
+    monkeypatch.setattr(AppConfig, 'RATE_LIMIT_STORAGE', 'memory://')
+
+@pytest.fixture
+def scratch_db(tmp_path):
+    """Point the database layer at an empty temporary database."""
+    from backend import database
+    previous = database.DB_PATH
+    database.configure_database(str(tmp_path / 'fred_data.db'))
+    database.init_db()
+    yield
+    database.configure_database(previous)
+
+@pytest.fixture
+def register_series(monkeypatch):
+    """Replace the series registry with ``{name: series_id}`` series sharing ``fields``."""
+    from backend.services import registry
+    def register(series, **fields):
+        specs = [registry.SeriesSpec(name, series_id, **fields) for name, series_id in series.items()]
+        monkeypatch.setattr(registry, '_registry', registry.SeriesRegistry(specs))
+    return register
+
 @pytest.fixture
 def mock_fred_api_key():
     """Mock FRED API key."""
@@ -0,0 +1,119 @@
+import pytest
+from datetime import datetime, timedelta
+import numpy as np
+import pandas as pd
+from backend import database
+from backend.services.analytics import FrameCache, align, correlation
+
+def _days(*dates):
+    return np.array(dates, dtype='datetime64[D]')
+
+WEEKLY = (_days('2024-01-01', '2024-01-08', '2024-01-15', '2024-01-22', '2024-01-29', '2024-02-05'),
+          np.array([3.0, 3.1, 3.2, 3.3, 3.4, 3.6]))
+MONTHLY = (_days('2024-01-01', '2024-02-01', '2024-03-01'), np.array([300.0, 301.0, 302.0]))
+
+def test_align_monthly_averages_weekly_series():
+    """Test weekly observations are averaged per month next to a monthly series."""
+    dates, matrix = align([WEEKLY, MONTHLY], 'monthly', 'mean')
+    assert dates.tolist() == _days('2024-01-01', '2024-02-01', '2024-03-01').tolist()
+    assert matrix[:, 0][:2] == pytest.approx([3.2, 3.6])
+    # No observation after February: not filled past the series' last period
+    assert np.isnan(matrix[2, 0])
+    assert matrix[:, 1].tolist() == [300.0, 301.0, 302.0]
+
+    assert align([WEEKLY, MONTHLY], 'monthly', 'last')[1][:2, 0].tolist() == [3.4, 3.6]
+
+def test_align_weekly_forward_fills_monthly_series():
+    """Test a monthly series holds its value on the weekly grid until its next observation."""
+    dates, matrix = align([WEEKLY, MONTHLY], 'weekly', 'mean')
+    assert str(dates[0]) == '2024-01-01' and np.all(dates.astype('datetime64[D]').view('i8') % 7 == 4)
+    # 2024-02-01 falls in the week of Monday 2024-01-29
+    assert matrix[:6, 1].tolist() == [300.0] * 4 + [301.0] * 2
+    assert np.isnan(matrix[-1, 0]) and matrix[-1, 1] == 302.0
+
+def test_correlation_matches_pairwise_pandas():
+    """Test the vectorized correlation equals pandas' pairwise-complete correlation."""
+    rng = np.random.default_rng(0)
+    values = rng.normal(size=(60, 4)).cumsum(axis=0)
+    values[:10, 1] = np.nan
+    values[rng.random(60) < 0.2, 3] = np.nan
+    expected = pd.DataFrame(values).corr(min_periods=3).to_numpy()
+    assert correlation(values) == pytest.approx(expected, nan_ok=True)
+
+def test_frame_cache_rebuilds_on_new_data(scratch_db):
+    """Test a cached frame is reused until one of its series stores new data."""
+    start = datetime(2024, 1, 1)
+    session = database.get_session()
+    try:
+        for series_id in ('CPIAUCSL', 'GASREGW'):
+            database.store_series_data(session, series_id, [
+                {'date': start + timedelta(days=7 * i), 'value': 100.0 + i} for i in range(10)
+            ], {'title': series_id})
+        cache = FrameCache()
+        frame = cache.get(session, ('CPIAUCSL', 'GASREGW'), 'monthly', 'mean')
+        assert cache.get(session, ('CPIAUCSL', 'GASREGW'), 'monthly', 'mean') is frame
+
+        database.bulk_store_series_data(session, 'GASREGW', [{'date': datetime(2024, 4, 1), 'value': 120.0}])
+        session.commit()
+        rebuilt = cache.get(session, ('CPIAUCSL', 'GASREGW'), 'monthly', 'mean')
+    finally:
+        session.close()
+    assert rebuilt is not frame
+    assert rebuilt.values[-1].tolist()[1] == 120.0
+
+def test_range_index_extends_on_append_and_rebuilds_on_revision(scratch_db):
+    """Test a cached range index gains appended points and is rebuilt after a revision."""
+    from backend.services.analytics import RangeIndexCache
+    session = database.get_session()
+    try:
+        database.store_series_data(session, 'CPIAUCSL', [
+            {'date': datetime(2024, month, 1), 'value': 100.0 + month} for month in range(1, 7)
+        ], {'title': 'CPI'})
+        cache = RangeIndexCache()
+        index = cache.get(session, 'CPIAUCSL')
+        assert index.change('2024-01-01') == pytest.approx(5 / 101 * 100)
+
+        database.bulk_store_series_data(session, 'CPIAUCSL', [{'date': datetime(2024, 7, 1), 'value': 110.0}])
+        session.commit()
+        assert cache.get(session, 'CPIAUCSL') is index
+        assert len(index) == 7 and index.value_at() == 110.0
+
+        database.write_series_data(session, 'CPIAUCSL', [{'date': datetime(2024, 1, 1), 'value': 99.0}],
+                                   {'title': 'CPI'}, overwrite=True)
+        session.commit()
+        revised = cache.get(session, 'CPIAUCSL')
+    finally:
+        session.close()
+    assert revised is not index
+    assert revised.value_at('2024-01-15') == 99.0
+
+def test_range_index_reads_only_new_points(scratch_db, monkeypatch):
+    """Test extending a cached range index reads the points after its last date only."""
+    from backend.services import analytics
+    session = database.get_session()
+    try:
+        database.store_series_data(session, 'CPIAUCSL', [
+            {'date': datetime(2024, month, 1), 'value': 100.0 + month} for month in range(2, 7)
+        ], {'title': 'CPI'})
+        cache = analytics.RangeIndexCache()
+        index = cache.get(session, 'CPIAUCSL')
+
+        reads = []
+        def get_series_arrays(session, series_id, start_date=None, end_date=None):
+            reads.append(start_date)
+            return database.get_series_arrays(session, series_id, start_date, end_date)
+        monkeypatch.setattr(analytics, 'get_series_arrays', get_series_arrays)
+        database.bulk_store_series_data(session, 'CPIAUCSL', [{'date': datetime(2024, 7, 1), 'value': 110.0}])
+        session.commit()
+        assert cache.get(session, 'CPIAUCSL') is index
+        assert reads == [datetime(2024, 6, 2)]
+        assert len(index) == 6 and index.value_at() == 110.0
+
+        # Inserting before the latest point (a backfill) is a revision too
+        database.bulk_store_series_data(session, 'CPIAUCSL', [{'date': datetime(2024, 1, 1), 'value': 95.0}])
+        session.commit()
+        rebuilt = cache.get(session, 'CPIAUCSL')
+    finally:
+        session.close()
+    assert rebuilt is not index
+    assert len(rebuilt) == 7 and rebuilt.change('2024-01-01') == pytest.approx(15 / 95 * 100)
@@ -0,0 +1,67 @@
+"""Tests for the checkpointed backfill engine."""
+
+import pytest
+import pandas as pd
+from datetime import datetime
+from unittest.mock import patch
+
+from backend import database
+from backend.services.backfill import BackfillEngine, plan_windows
+from backend.services.data_fetcher import FREDDataFetcher
+
+@pytest.fixture
+def engine(scratch_db, mock_fred_api_key):
+    """A backfill engine whose FRED calls return monthly observations."""
+    with patch('backend.services.data_fetcher.Fred'):
+        fetcher = FREDDataFetcher()
+    fetcher._fetch_series_info = lambda series_id: pd.Series({
+        'title': 'Consumer Price Index', 'units': 'Index', 'frequency': 'Monthly',
+        'observation_start': '2000-01-01'
+    })
+    fetcher._fetch_series = lambda series_id, start, end: pd.Series({
+        date.to_pydatetime(): 100.0 + i for i, date in enumerate(pd.date_range(start, end, freq='MS'))
+    })
+    return BackfillEngine(fetcher, window_years=5)
+
+def test_plan_windows():
+    """Test windows are contiguous, inclusive and clipped to the end date."""
+    windows = plan_windows(datetime(2000, 1, 1), datetime(2012, 6, 30), 5)
+    assert windows == [
+        (datetime(2000, 1, 1), datetime(2004, 12, 31)),
+        (datetime(2005, 1, 1), datetime(2009, 12, 31)),
+        (datetime(2010, 1, 1), datetime(2012, 6, 30)),
+    ]
+
+def test_backfill_resumes_after_failure(engine):
+    """Test a failed window is retried on the next run without refetching completed ones."""
+    fetch = engine.fetcher._fetch_series
+    calls = []
+
+    def failing_fetch(series_id, start, end):
+        calls.append(start)
+        if start.year == 2010:
+            raise RuntimeError('FRED unavailable')
+        return fetch(series_id, start, end)
+
+    engine.fetcher._fetch_series = failing_fetch
+    with patch('backend.services.data_fetcher.time.sleep'):
+        with pytest.raises(RuntimeError):
+            engine.run(['CPIAUCSL'], end=datetime(2012, 6, 30))
+
+    engine.fetcher._fetch_series = fetch
+    summary = engine.run(['CPIAUCSL'], end=datetime(2012, 6, 30))['CPIAUCSL']
+    assert summary == {'windows': 3, 'skipped': 2, 'fetched': 1, 'inserted': 30}
+
+    with database.get_session() as session:
+        assert session.query(database.FREDData).count() == 150
+        assert session.query(database.BackfillCheckpoint).count() == 3
+        assert session.query(database.FREDSeries).one().title == 'Consumer Price Index'
+
+def test_bulk_store_skips_existing_points(scratch_db):
+    """Test the bulk writer only inserts dates that are not stored yet."""
+    points = [{'date': datetime(2024, 1, 1), 'value': 1.0}, {'date': datetime(2024, 2, 1), 'value': 2.0}]
+    with database.get_session() as session:
+        database.store_series_data(session, 'CPIAUCSL', points[:1], {})
+        assert database.bulk_store_series_data(session, 'CPIAUCSL', points) == 1
+        session.commit()
+        assert [p.value for p in database.get_series_data(session, 'CPIAUCSL')] == [1.0, 2.0]
@@ -0,0 +1,64 @@
+"""Tests for online database backups."""
+
+import os
+import sqlite3
+from datetime import datetime
+import pytest
+
+from backend import database
+from backend.storage.backup import (
+    BackupError, BackupPolicy, create_backup, list_backups, restore_backup, verify_backup
+)
+
+def _store(day: int, value: float) -> None:
+    session = database.get_session()
+    try:
+        database.bulk_store_series_data(session, 'CPIAUCSL', [{'date': datetime(2024, 1, day), 'value': value}])
+        session.commit()
+    finally:
+        session.close()
+
+def _values():
+    session = database.get_session()
+    try:
+        return [point.value for point in database.get_series_data(session, 'CPIAUCSL')]
+    finally:
+        session.close()
+
+def test_backup_and_restore(scratch_db, tmp_path):
+    """Test a paced, compressed backup restores the data it was taken from."""
+    for day in range(1, 21):
+        _store(day, 300.0 + day)
+    policy = BackupPolicy(pages_per_step=1, step_sleep_ms=0)
+
+    result = create_backup(database.DB_PATH, str(tmp_path / 'backups'), policy)
+    assert result.path.endswith('.db.gz')
+    assert result.steps > 1
+    assert result.tables['fred_data'] == 20
+    assert not [name for name in os.listdir(tmp_path / 'backups') if name.endswith('.partial')]
+
+    _store(21, 999.0)
+    assert restore_backup(result.path, database.DB_PATH)['fred_data'] == 20
+    assert _values() == [300.0 + day for day in range(1, 21)]
+
+def test_rotation_keeps_newest(scratch_db, tmp_path):
+    """Test only the newest ``keep`` backups are retained."""
+    directory = str(tmp_path / 'backups')
+    policy = BackupPolicy(compress=False, keep=2, verify=False)
+    paths = [create_backup(database.DB_PATH, directory, policy).path for _ in range(4)]
+
+    assert list_backups(directory) == paths[:1:-1]
+    with sqlite3.connect(paths[-1]) as conn:
+        assert conn.execute('PRAGMA journal_mode').fetchone()[0] == 'delete'
+
+def test_verify_rejects_damaged_backup(scratch_db, tmp_path):
+    """Test verification fails on a truncated backup."""
+    _store(1, 308.4)
+    result = create_backup(database.DB_PATH, str(tmp_path / 'backups'), BackupPolicy())
+    with open(result.path, 'r+b') as f:
+        f.truncate(os.path.getsize(result.path) // 2)
+
+    with pytest.raises(BackupError):
+        verify_backup(result.path)
+    with pytest.raises(BackupError):
+        create_backup(str(tmp_path / 'missing.db'), str(tmp_path / 'backups'))
@@ -0,0 +1,62 @@
+"""Tests for the bulk FRED CSV/ZIP importer."""
+
+import io
+import zipfile
+import pytest
+
+from backend import database
+from backend.services.bulk_import import BulkImporter, BulkImportError, parse_notes
+
+CSV_DATA = (
+    "observation_date,CPIAUCSL,CPILFESL,UNRATE\n"
+    "2024-01-01,308.417,313.225,3.7\n"
+    "2024-02-01,.,314.439,3.9\n"
+    "2024-03-01,312.230,inf,3.9\n"
+    "not-a-date,1,1,1\n"
+)
+
+NOTES = "Title: Consumer Price Index\nUnits: Index 1982-1984=100\nFrequency: Monthly\nNotes: Title: ignored\n"
+
+def _archive(tmp_path):
+    path = tmp_path / 'fred.zip'
+    with zipfile.ZipFile(path, 'w', zipfile.ZIP_DEFLATED) as archive:
+        archive.writestr('download/prices.csv', CSV_DATA)
+        archive.writestr('download/CPIAUCSL.txt', NOTES)
+    return str(path)
+
+def test_parse_notes():
+    """Test the first title, units and frequency lines are used."""
+    assert parse_notes(NOTES) == {
+        'title': 'Consumer Price Index',
+        'units': 'Index 1982-1984=100',
+        'frequency': 'Monthly'
+    }
+
+def test_import_zip(scratch_db, tmp_path):
+    """Test selected series are validated and loaded with their notes."""
+    importer = BulkImporter(series_ids=['CPIAUCSL', 'CPILFESL'], batch_size=2)
+    stats = importer.import_paths([_archive(tmp_path)])
+
+    assert stats['rows'] == 4
+    assert stats['invalid_dates'] == 1
+    assert stats['missing'] == 1
+    assert stats['rejected'] == 1
+    assert stats['inserted'] == 4
+    assert stats['series'] == 2
+
+    with database.get_session() as session:
+        assert [p.value for p in database.get_series_data(session, 'CPIAUCSL')] == [308.417, 312.23]
+        assert [p.value for p in database.get_series_data(session, 'CPILFESL')] == [313.225, 314.439]
+        assert session.query(database.FREDSeries).filter_by(series_id='CPIAUCSL').one().title == 'Consumer Price Index'
+        assert session.query(database.FREDSeries).filter_by(series_id='UNRATE').first() is None
+
+def test_reimport_inserts_nothing(scratch_db, tmp_path):
+    """Test importing the same archive twice does not duplicate observations."""
+    path = _archive(tmp_path)
+    BulkImporter(series_ids=['CPIAUCSL']).import_paths([path])
+    assert BulkImporter(series_ids=['CPIAUCSL']).import_paths([path])['inserted'] == 0
+
+def test_rejects_non_fred_csv(scratch_db):
+    """Test files without a leading date column are rejected."""
+    with pytest.raises(BulkImportError):
+        BulkImporter().import_csv(io.StringIO("value,date\n1,2024-01-01\n"))
@@ -0,0 +1,61 @@
+"""Tests for the columnar memory-mapped series cache."""
+
+import numpy as np
+import pandas as pd
+import pytest
+from datetime import datetime, timedelta
+from unittest.mock import patch
+
+from backend import database
+from backend.core.config import AppConfig
+from backend.services.data_fetcher import FREDDataFetcher
+from backend.storage import columnar
+
+@pytest.fixture
+def cache(tmp_path, monkeypatch):
+    """Test series cache in a temporary directory, enabled for ingest and reads."""
+    cache = columnar.SeriesCache(str(tmp_path / 'series_cache'))
+    monkeypatch.setattr(columnar, '_cache', cache)
+    monkeypatch.setattr(AppConfig, 'SERIES_CACHE_ENABLED', True)
+    return cache
+
+def test_write_and_map(tmp_path):
+    """Test columns round-trip as read-only views and slice by date."""
+    dates = np.array(['2024-01-01', '2024-02-01', '2024-03-01'], dtype='datetime64[D]')
+    columnar.write_series('CPIAUCSL', dates, [308.4, 310.3, 312.2], str(tmp_path))
+    arrays = columnar.SeriesCache(str(tmp_path)).get('CPIAUCSL')
+
+    assert arrays.dates.tolist() == dates.tolist()
+    assert not arrays.values.flags.writeable
+    window = arrays.between(datetime(2024, 1, 1, 12), datetime(2024, 3, 1))
+    assert window.values.tolist() == [310.3, 312.2]
+    assert np.shares_memory(window.values, arrays.values)
+
+def test_invalid_file_is_ignored(tmp_path):
+    """Test a corrupted file reads as missing."""
+    path = columnar.write_series('CPIAUCSL', np.array(['2024-01-01'], dtype='datetime64[D]'), [1.0], str(tmp_path))
+    with open(path, 'r+b') as f:
+        f.seek(columnar.HEADER_SIZE)
+        f.write(b'\xff')
+    assert columnar.SeriesCache(str(tmp_path)).get('CPIAUCSL') is None
+
+def test_ingest_syncs_and_metrics_read_cache(scratch_db, cache, register_series, mock_fred_api_key):
+    """Test stored series are synced and metrics match the database path."""
+    with patch('backend.services.data_fetcher.Fred'):
+        fetcher = FREDDataFetcher()
+    start = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0) - timedelta(days=500)
+    points = [{'date': start + timedelta(days=30 * i), 'value': 100.0 + i} for i in range(17)]
+    metadata = pd.Series({'title': 'Consumer Price Index', 'units': 'Index', 'frequency': 'Monthly'})
+
+    session = database.get_session()
+    try:
+        fetcher._store(session, 'CPIAUCSL', points, metadata)
+    finally:
+        session.close()
+    assert cache.get('CPIAUCSL').values.tolist() == [point['value'] for point in points]
+
+    register_series({'CPI': 'CPIAUCSL'})
+    cached = fetcher.get_inflation_metrics()
+    AppConfig.SERIES_CACHE_ENABLED = False
+    uncached = fetcher.get_inflation_metrics()
+    assert cached == uncached
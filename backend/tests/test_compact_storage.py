@@ -0,0 +1,67 @@
+"""Tests for the compact integer-keyed storage layout."""
+
+from datetime import date, datetime
+import pytest
+
+from backend import database
+from backend.storage import compact
+
+POINTS = [
+    {'date': datetime(2024, 1, 1), 'value': 308.4},
+    {'date': datetime(2024, 2, 1), 'value': 310.3},
+    {'date': datetime(2024, 3, 1), 'value': 312.2},
+]
+
+@pytest.fixture
+def compact_layout(scratch_db, monkeypatch):
+    """Test database using the compact layout."""
+    monkeypatch.setattr(database, 'STORAGE_LAYOUT', 'compact')
+    database.init_db()
+
+def test_epoch_day_round_trip():
+    """Test epoch days convert both ways and ignore the time of day."""
+    assert compact.epoch_day(date(1970, 1, 1)) == 0
+    assert compact.epoch_day(datetime(1947, 1, 1, 15, 30)) == -8401
+    assert compact.from_epoch_day(compact.epoch_day(datetime(2024, 2, 29))) == datetime(2024, 2, 29)
+
+def test_store_and_read(compact_layout):
+    """Test the database functions read and write the compact tables."""
+    session = database.get_session()
+    try:
+        database.store_series_data(session, 'CPIAUCSL', POINTS, {'title': 'CPI'})
+        assert database.bulk_store_series_data(session, 'CPIAUCSL', POINTS + [
+            {'date': datetime(2024, 4, 1), 'value': 313.5}
+        ]) == 1
+        session.commit()
+
+        rows = database.get_series_data(session, 'CPIAUCSL', start_date=datetime(2024, 1, 1, 12))
+        assert [(row.date, row.value) for row in rows] == [
+            (datetime(2024, 2, 1), 310.3), (datetime(2024, 3, 1), 312.2), (datetime(2024, 4, 1), 313.5)
+        ]
+        latest = database.get_latest_point(session, 'CPIAUCSL')
+        assert (latest.date, latest.value) == (datetime(2024, 4, 1), 313.5)
+        assert database.get_latest_point(session, 'UNRATE') is None
+        assert session.query(database.FREDData).count() == 0
+    finally:
+        session.close()
+
+def test_migrate(scratch_db):
+    """Test migration copies every legacy row and keeps dates."""
+    session = database.get_session()
+    try:
+        database.store_series_data(session, 'CPIAUCSL', POINTS, {'title': 'CPI'})
+        database.store_series_data(session, 'UNRATE', POINTS[:1], {'title': 'Unemployment'})
+    finally:
+        session.close()
+
+    result = compact.migrate(database.engine, drop_legacy=True)
+    assert result['legacy_rows'] == result['compact_rows'] == 4
+
+    session = database.get_session()
+    try:
+        assert [(day, value) for day, value in compact.get_points(session, 'CPIAUCSL')] == [
+            (compact.epoch_day(point['date']), point['value']) for point in POINTS
+        ]
+        assert len(compact.get_points(session, 'UNRATE')) == 1
+    finally:
+        session.close()
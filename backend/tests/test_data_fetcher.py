@@ -19,7 +19,8 @@ def mock_fred():
 def mock_session():
     """Create a mock database session."""
     mock = Mock()
-    with patch('backend.services.data_fetcher.get_session', return_value=mock):
+    with patch('backend.services.data_fetcher.get_session', return_value=mock), \
+            patch('backend.services.data_fetcher.get_read_session', return_value=mock):
         yield mock
 
 @pytest.fixture
@@ -43,11 +44,17 @@ def test_validate_api_key(data_fetcher):
     with pytest.raises(ValidationError):
         data_fetcher._validate_api_key("invalid_key")
 
-def test_validate_series_id(data_fetcher):
+def test_fred_api_url_override(mock_fred, mock_fred_api_key):
+    """Test FRED_API_URL points the client at another API root."""
+    with patch.dict('os.environ', {'FRED_API_URL': 'http://127.0.0.1:8081/fred/'}):
+        fetcher = FREDDataFetcher()
+    assert fetcher.fred.root_url == 'http://127.0.0.1:8081/fred'
+
+def test_validate_series_id(data_fetcher, register_series):
     """Test series ID validation."""
     # Test valid series ID
-    with patch('backend.services.data_fetcher.SERIES_IDS', {'test': 'TEST123'}):
-        data_fetcher._validate_series_id('TEST123')
+    register_series({'test': 'TEST123'})
+    assert data_fetcher._validate_series_id('TEST123').name == 'test'
     
     # Test invalid series ID
     with pytest.raises(ValidationError):
@@ -140,24 +147,26 @@ async def test_update_daily_data(data_fetcher, mock_fred, mock_session):
     # Verify database calls
     mock_session.commit.assert_called()
 
-def test_get_inflation_metrics(data_fetcher, mock_session):
+def test_get_inflation_metrics(data_fetcher, mock_session, register_series):
     """Test getting inflation metrics."""
+    register_series({'test': 'TEST123'})
     # Mock database queries
     mock_data_points = [
         Mock(date=datetime.now() - timedelta(days=365), value=100.0),
         Mock(date=datetime.now(), value=102.0)
     ]
-    mock_session.query.return_value.filter_by.return_value.first.return_value = Mock(
+    mock_session.query.return_value.filter.return_value = [Mock(
+        series_id='TEST123',
         title='Test Series',
         units='Index',
         last_updated=datetime.now()
-    )
+    )]
     
     with patch('backend.services.data_fetcher.get_series_data', return_value=mock_data_points):
         result = data_fetcher.get_inflation_metrics()
     
     # Verify result structure
-    assert isinstance(result, dict)
+    assert list(result) == ['test']
     for metric in result.values():
         assert 'current_value' in metric
         assert 'baseline_value' in metric
@@ -187,3 +196,61 @@ def test_retry_decorator(mock_retry_func):
     with pytest.raises(ValueError):
         decorated_func()
     assert mock_retry_func.call_count == 3  # Should try 3 times before giving up
+
+@pytest.fixture
+def revision_fetcher(data_fetcher, scratch_db, register_series, monkeypatch):
+    """Fetcher updating one series against a test database with the revision check on."""
+    from backend.core.config import AppConfig
+    monkeypatch.setattr(AppConfig, 'REVISION_CHECK_ENABLED', True)
+    register_series({'cpi': 'CPIAUCSL'}, start_date=datetime(2024, 1, 1), revision_window_days=60)
+    data_fetcher._fetch_series_info = Mock(return_value=pd.Series({'title': 'CPI'}))
+    return data_fetcher
+
+def _monthly(values, start='2024-01-01'):
+    return pd.Series(values, index=pd.date_range(start, periods=len(values), freq='MS'))
+
+def test_update_skips_unchanged_window(revision_fetcher):
+    """Test an unchanged trailing window is not written and revisions are."""
+    from backend import database
+    revision_fetcher._fetch_series = Mock(return_value=_monthly([308.4, 310.3, 312.2]))
+    assert revision_fetcher.update_daily_data() == {'CPIAUCSL': 'new'}
+
+    # Same window again: one FRED call, no metadata call, no writes
+    revision_fetcher._fetch_series_info.reset_mock()
+    assert revision_fetcher.update_daily_data() == {'CPIAUCSL': 'unchanged'}
+    revision_fetcher._fetch_series_info.assert_not_called()
+
+    revision_fetcher._fetch_series = Mock(return_value=_monthly([308.4, 310.1, 312.2, 313.5]))
+    assert revision_fetcher.update_daily_data() == {'CPIAUCSL': 'changed'}
+    session = database.get_session()
+    try:
+        values = [point.value for point in database.get_series_data(session, 'CPIAUCSL')]
+        window = database.get_window_hash(session, 'CPIAUCSL')
+    finally:
+        session.close()
+    assert values == [308.4, 310.1, 312.2, 313.5]
+    assert (window.window_start, window.window_end) == (datetime(2024, 2, 1), datetime(2024, 4, 1))
+
+    revision_fetcher._fetch_series = Mock(return_value=_monthly([310.1, 312.2, 313.5, 314.0], '2024-02-01'))
+    assert revision_fetcher.update_daily_data() == {'CPIAUCSL': 'appended'}
+    assert revision_fetcher._fetch_series.call_args[0][1] == datetime(2024, 2, 1)
+
+def test_update_leaves_writer_free_during_fred_calls(data_fetcher, scratch_db, register_series):
+    """Test another writer session can commit while an update waits on FRED."""
+    from backend import database
+    register_series({'cpi': 'CPIAUCSL', 'gas': 'GASREGW'}, start_date=datetime(2024, 1, 1))
+    data_fetcher._fetch_series_info = Mock(return_value=pd.Series({'title': 'Series'}))
+    concurrent_writes = []
+
+    def fetch(series_id, start_date, end_date):
+        # The single writer connection must not be held by the update
+        assert database.engine.pool.checkedout() == 0
+        with database.get_session() as other:
+            database.store_series_data(other, f"OTHER_{series_id}", [{'date': datetime(2024, 1, 1), 'value': 1.0}],
+                                       {'title': 'Other'})
+        concurrent_writes.append(series_id)
+        return _monthly([100.0, 101.0])
+
+    data_fetcher._fetch_series = Mock(side_effect=fetch)
+    assert data_fetcher.update_daily_data() == {'CPIAUCSL': 'new', 'GASREGW': 'new'}
+    assert concurrent_writes == ['CPIAUCSL', 'GASREGW']
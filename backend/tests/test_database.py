@@ -0,0 +1,67 @@
+"""Tests for the database read API."""
+
+from datetime import datetime
+import numpy as np
+import pytest
+
+from backend import database
+
+POINTS = [
+    {'date': datetime(2024, 1, 1), 'value': 308.4},
+    {'date': datetime(2024, 2, 1), 'value': 310.3},
+    {'date': datetime(2024, 3, 1), 'value': 312.2},
+]
+
+@pytest.fixture(params=database.STORAGE_LAYOUTS)
+def stored(request, scratch_db, monkeypatch):
+    """Test database holding POINTS for CPIAUCSL in each storage layout."""
+    monkeypatch.setattr(database, 'STORAGE_LAYOUT', request.param)
+    database.init_db()
+    session = database.get_session()
+    database.store_series_data(session, 'CPIAUCSL', POINTS, {'title': 'CPI'})
+    yield session
+    session.close()
+
+def test_get_series_data_records(stored):
+    """Test reads return slotted records instead of ORM instances."""
+    rows = database.get_series_data(stored, 'CPIAUCSL', start_date=datetime(2024, 2, 1))
+    assert [(row.date, row.value) for row in rows] == [(datetime(2024, 2, 1), 310.3), (datetime(2024, 3, 1), 312.2)]
+    assert all(isinstance(row, database.SeriesPoint) for row in rows)
+    assert not hasattr(rows[0], '__dict__')
+    assert not any(isinstance(obj, database.FREDData) for obj in stored.identity_map.values())
+
+def test_get_series_arrays(stored):
+    """Test reads as parallel day and value arrays."""
+    dates, values = database.get_series_arrays(stored, 'CPIAUCSL', end_date=datetime(2024, 2, 1))
+    assert dates.dtype == np.dtype('datetime64[D]')
+    assert dates.tolist() == [datetime(2024, 1, 1).date(), datetime(2024, 2, 1).date()]
+    assert values.tolist() == [308.4, 310.3]
+
+    dates, values = database.get_series_arrays(stored, 'UNRATE')
+    assert len(dates) == len(values) == 0
+
+def test_get_latest_point(stored):
+    """Test the latest point is read without hydrating models."""
+    latest = database.get_latest_point(stored, 'CPIAUCSL')
+    assert (latest.date, latest.value) == (datetime(2024, 3, 1), 312.2)
+    assert database.get_latest_point(stored, 'UNRATE') is None
+
+def test_series_revision_counts_history_changes(stored):
+    """Test overwrites and inserts before the latest point bump the revision, appends do not."""
+    assert database.get_series_revision(stored, 'CPIAUCSL') == 0
+    database.bulk_store_series_data(stored, 'CPIAUCSL', [{'date': datetime(2024, 4, 1), 'value': 313.5}])
+    assert database.get_series_revision(stored, 'CPIAUCSL') == 0
+
+    # Re-storing the stored history along with one new point is an append
+    assert database.bulk_store_series_data(
+        stored, 'CPIAUCSL', POINTS + [{'date': datetime(2024, 5, 1), 'value': 314.0}]) == 1
+    database.store_series_data(stored, 'CPIAUCSL', POINTS + [{'date': datetime(2024, 6, 1), 'value': 314.2}],
+                               {'title': 'CPI'})
+    assert database.get_series_revision(stored, 'CPIAUCSL') == 0
+
+    database.update_series_values(stored, 'CPIAUCSL', [{'date': datetime(2024, 2, 1), 'value': 310.1}])
+    assert database.get_series_revision(stored, 'CPIAUCSL') == 1
+    database.bulk_store_series_data(stored, 'CPIAUCSL', [{'date': datetime(2023, 12, 1), 'value': 306.7}])
+    assert database.get_series_revision(stored, 'CPIAUCSL') == 2
+    database.store_series_data(stored, 'CPIAUCSL', [{'date': datetime(2023, 11, 1), 'value': 305.0}], {'title': 'CPI'})
+    assert database.get_series_revision(stored, 'CPIAUCSL') == 3
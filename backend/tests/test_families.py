@@ -0,0 +1,73 @@
+import pytest
+from datetime import datetime
+from unittest.mock import Mock, patch
+import pandas as pd
+from backend import database
+from backend.services.families import FamilyIngestor, FamilyPolicy, SeriesFamily
+
+FAMILY = SeriesFamily('metros', 'CSUSHPISA', {'atlanta': 'ATXRSA', 'boston': 'BOXRSA', 'chicago': 'CHXRSA'})
+
+def _monthly(values, start='2024-01-01'):
+    return pd.Series(values, index=pd.date_range(start, periods=len(values), freq='MS'))
+
+@pytest.fixture
+def ingestor(scratch_db, register_series, mock_fred_api_key):
+    """Family ingestor with two-member waves, no rate limit and a mocked FRED client."""
+    from backend.services.data_fetcher import FREDDataFetcher
+    register_series({'housing': 'CSUSHPISA'}, start_date=datetime(2024, 1, 1))
+    with patch('backend.services.data_fetcher.Fred'):
+        fetcher = FREDDataFetcher()
+    fetcher._fetch_series_info = Mock(side_effect=lambda series_id: pd.Series({'title': series_id}))
+    return FamilyIngestor(fetcher, FamilyPolicy(wave_size=2, requests_per_second=0))
+
+def test_ingest_family_stores_members_under_family_key(ingestor):
+    """Test members are fetched in waves from the parent's start date and stored under the family."""
+    ingestor.fetcher._fetch_series = Mock(return_value=_monthly([100.0, 101.0, 102.0]))
+    assert ingestor.ingest_family(FAMILY) == {'ATXRSA': 'new', 'BOXRSA': 'new', 'CHXRSA': 'new'}
+    assert {call.args[1] for call in ingestor.fetcher._fetch_series.call_args_list} == {datetime(2024, 1, 1)}
+
+    session = database.get_session()
+    try:
+        members = database.get_family_members(session, ['CSUSHPISA'])
+        points = database.get_series_data(session, 'BOXRSA')
+    finally:
+        session.close()
+    assert [(member.family, member.name, member.series_id) for member in members] == [
+        ('metros', 'atlanta', 'ATXRSA'), ('metros', 'boston', 'BOXRSA'), ('metros', 'chicago', 'CHXRSA')]
+    assert [point.value for point in points] == [100.0, 101.0, 102.0]
+
+    # Later runs fetch from the day after the latest point, without metadata
+    ingestor.fetcher._fetch_series_info.reset_mock()
+    ingestor.fetcher._fetch_series = Mock(return_value=_monthly([103.0], '2024-04-01'))
+    assert ingestor.ingest_family(FAMILY) == {'ATXRSA': 'appended', 'BOXRSA': 'appended', 'CHXRSA': 'appended'}
+    assert ingestor.fetcher._fetch_series.call_args.args[1] == datetime(2024, 3, 2)
+    ingestor.fetcher._fetch_series_info.assert_not_called()
+
+def test_failed_member_does_not_stop_family(ingestor):
+    """Test a member failing every retry is reported and the rest are stored."""
+    def fetch(series_id, start_date, end_date):
+        if series_id == 'BOXRSA':
+            raise RuntimeError('FRED unavailable')
+        return _monthly([100.0, 101.0])
+
+    ingestor.fetcher._fetch_series = Mock(side_effect=fetch)
+    with patch('backend.services.data_fetcher.time.sleep'):
+        outcomes = ingestor.ingest_family(FAMILY)
+    assert outcomes == {'ATXRSA': 'new', 'BOXRSA': 'failed', 'CHXRSA': 'new'}
+
+def test_metrics_report_family_components(ingestor, monkeypatch):
+    """Test get_inflation_metrics reports stored members as components of their parent."""
+    from backend.core.config import AppConfig
+    monkeypatch.setattr(AppConfig, 'FAMILY_INGEST_ENABLED', True)
+    now = datetime.now().replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+    ingestor.fetcher._fetch_series = Mock(return_value=_monthly([100.0, 105.0], now - pd.DateOffset(months=1)))
+    ingestor.ingest_family(FAMILY)
+    session = database.get_session()
+    try:
+        database.store_series_data(session, 'CSUSHPISA', [{'date': now, 'value': 300.0}], {'title': 'Home prices'})
+    finally:
+        session.close()
+
+    components = ingestor.fetcher.get_inflation_metrics()['housing']['components']
+    assert [component['name'] for component in components] == ['atlanta', 'boston', 'chicago']
+    assert components[0]['percentage_change'] == pytest.approx(5.0)
@@ -0,0 +1,67 @@
+"""Tests for the FRED record/replay cassette."""
+
+import io
+import pytest
+from unittest.mock import patch
+
+from backend.storage.cassette import Cassette, request_key, split_url
+from backend.services.fred_cassette import CassetteFred, CassetteMiss
+
+OBSERVATIONS_XML = (
+    b'<?xml version="1.0" encoding="utf-8" ?><observations count="2">'
+    b'<observation date="2024-01-01" value="308.417"/>'
+    b'<observation date="2024-02-01" value="310.326"/>'
+    b'</observations>'
+)
+
+@pytest.fixture
+def cassette(tmp_path):
+    """A cassette in a temporary directory."""
+    cassette = Cassette(str(tmp_path / 'cassettes' / 'fred.sqlite'))
+    yield cassette
+    cassette.close()
+
+def test_request_key_is_normalized():
+    """Test keys ignore parameter order and excluded parameters."""
+    path, params = split_url(
+        'https://api.stlouisfed.org/fred/series/observations?series_id=CPIAUCSL&observation_end=2025-01-01',
+        'https://api.stlouisfed.org/fred'
+    )
+    assert request_key(path, params) == 'series/observations?observation_end=2025-01-01&series_id=CPIAUCSL'
+    assert request_key(path, params, ignore=['observation_end']) == 'series/observations?series_id=CPIAUCSL'
+
+def test_cassette_round_trip(cassette):
+    """Test bodies are stored compressed and re-recording replaces them."""
+    assert cassette.get('series?series_id=X') is None
+    cassette.put('series?series_id=X', OBSERVATIONS_XML)
+    cassette.put('series?series_id=X', OBSERVATIONS_XML * 2)
+    assert cassette.get('series?series_id=X') == OBSERVATIONS_XML * 2
+
+    summary = cassette.summary()
+    assert summary['entries'] == 1
+    assert summary['stored_bytes'] < summary['raw_bytes']
+
+def test_once_mode_records_then_replays(cassette):
+    """Test the first call downloads and later calls are served from the cassette."""
+    client = CassetteFred(cassette, 'once', api_key='test')
+    with patch('backend.services.fred_cassette.urlopen', return_value=io.BytesIO(OBSERVATIONS_XML)) as mock_urlopen:
+        first = client.get_series('CPIAUCSL', observation_start='2024-01-01', observation_end='2025-01-01')
+        second = client.get_series('CPIAUCSL', observation_start='2024-01-01', observation_end='2025-06-01')
+
+    assert mock_urlopen.call_count == 1
+    assert 'api_key=test' in mock_urlopen.call_args[0][0]
+    assert list(first.values) == list(second.values) == [308.417, 310.326]
+    assert cassette.recorded == 1
+
+def test_replay_mode_never_downloads(cassette):
+    """Test replay mode raises on unrecorded requests instead of calling FRED."""
+    client = CassetteFred(cassette, 'replay', api_key='test')
+    with patch('backend.services.fred_cassette.urlopen') as mock_urlopen:
+        with pytest.raises(CassetteMiss):
+            client.get_series('CPIAUCSL')
+    mock_urlopen.assert_not_called()
+
+def test_invalid_mode(cassette):
+    """Test unknown modes are rejected."""
+    with pytest.raises(ValueError):
+        CassetteFred(cassette, 'rewind', api_key='test')
@@ -9,6 +9,7 @@ from backend.services.exceptions import ServiceInitializationError, DataProcessi
 from backend.services.validators import validate_services, validate_response_format
 from backend.services.data_fetcher import FREDDataFetcher
 from backend.services.data_analyzer import InflationAnalyzer
+from backend.storage.backup import BackupResult
 
 @pytest.fixture
 def mock_data_fetcher():
@@ -105,6 +106,25 @@ def test_update_daily_data_failure(tracker):
     with pytest.raises(DataProcessingError):
         tracker.update_daily_data()
 
+def test_update_ingests_families_of_updated_parents(tracker, monkeypatch):
+    """Test an update only re-fetches the families of parents with new or revised data."""
+    from backend.core.config import AppConfig
+    monkeypatch.setattr(AppConfig, 'FAMILY_INGEST_ENABLED', True)
+    tracker.family_ingestor = MagicMock()
+    tracker.family_ingestor.run.return_value = {}
+    tracker.data_fetcher.update_daily_data.return_value = {
+        'CPIAUCSL': 'appended', 'GASREGW': 'not_due', 'CSUSHPISA': 'unchanged'
+    }
+
+    result = tracker.update_daily_data()
+    families = tracker.family_ingestor.run.call_args[0][0]
+    assert {family.parent for family in families} == {'CPIAUCSL'}
+    assert result['families'] == {}
+
+    tracker.data_fetcher.update_daily_data.return_value = {'CPIAUCSL': 'not_due', 'GASREGW': 'empty'}
+    tracker.update_daily_data()
+    assert tracker.family_ingestor.run.call_args[0][0] == []
+
 def test_get_inflation_data_success(tracker):
     """Test successful inflation data retrieval."""
     tracker.data_fetcher.get_inflation_metrics.return_value = {'CPI': {'value': 100}}
@@ -134,9 +154,13 @@ def test_get_inflation_data_analysis_failure(tracker):
 
 def test_backup_data_success(tracker):
     """Test successful data backup."""
-    with patch('backend.services.inflation_tracker.backup_database', return_value=True):
+    backup = BackupResult(
+        path='/backups/fred_data-20240101-000000-000000.db.gz', bytes=1024, pages=4, steps=1,
+        restarts=0, seconds=0.01, tables={'fred_data': 2}, removed=[])
+    with patch('backend.services.inflation_tracker.backup_database', return_value=backup):
         result = tracker.backup_data()
         assert result['status'] == 'Success'
+        assert result['backup']['file'] == 'fred_data-20240101-000000-000000.db.gz'
 
 def test_backup_data_failure(tracker):
     """Test failed data backup."""
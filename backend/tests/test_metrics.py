@@ -0,0 +1,59 @@
+"""Tests for the in-process metrics registry."""
+
+import pytest
+
+from backend.core.metrics import Counter, Histogram, Registry, timed
+
+@pytest.fixture
+def registry():
+    """Create an isolated metrics registry."""
+    return Registry()
+
+def test_counter(registry):
+    """Test labelled counters accumulate and render."""
+    counter = Counter('cache_total', 'Cache lookups.', ('result',), registry=registry)
+    counter.labels('hit').inc()
+    counter.labels('hit').inc(2)
+    counter.labels('miss').inc()
+
+    output = registry.render()
+    assert '# TYPE cache_total counter' in output
+    assert 'cache_total{result="hit",pid=' in output
+    assert counter.labels('hit').value == 3
+
+def test_histogram_buckets(registry):
+    """Test observations land in cumulative buckets."""
+    histogram = Histogram('latency_seconds', 'Latency.', buckets=(0.1, 1.0), registry=registry)
+    histogram.observe(0.05)
+    histogram.observe(0.5)
+    histogram.observe(5.0)
+
+    output = registry.render()
+    assert 'le="0.1"} 1' in output
+    assert 'le="1.0"} 2' in output
+    assert 'le="+Inf"} 3' in output
+    assert 'latency_seconds_count{' in output and '} 3\n' in output
+
+def test_label_count_mismatch(registry):
+    """Test labels must match the declared label names."""
+    counter = Counter('errors_total', 'Errors.', ('call',), registry=registry)
+    with pytest.raises(ValueError):
+        counter.labels('a', 'b')
+
+def test_duplicate_metric_name(registry):
+    """Test metric names are unique within a registry."""
+    Counter('dup_total', 'First.', registry=registry)
+    with pytest.raises(ValueError):
+        Counter('dup_total', 'Second.', registry=registry)
+
+def test_timed_decorator(registry):
+    """Test the timing decorator observes even when the call raises."""
+    histogram = Histogram('op_seconds', 'Operation time.', ('op',), registry=registry)
+
+    @timed(histogram, 'fail')
+    def failing():
+        raise RuntimeError('boom')
+
+    with pytest.raises(RuntimeError):
+        failing()
+    assert sum(histogram.labels('fail').counts) == 1
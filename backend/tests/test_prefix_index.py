@@ -0,0 +1,59 @@
+import pytest
+import numpy as np
+from backend.storage.prefix_index import RangeIndex, RangeIndexError
+
+@pytest.fixture
+def series():
+    """Weekly dates with irregular gaps and positive values."""
+    rng = np.random.default_rng(0)
+    days = np.datetime64('2020-01-06') + np.cumsum(rng.integers(1, 15, size=300))
+    values = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, size=300)))
+    return days.astype('datetime64[D]'), values
+
+def _as_of(days, day):
+    return np.searchsorted(days, day, side='right') - 1
+
+def test_range_queries_match_full_scans(series):
+    """Test changes and averages over random ranges equal those computed from every row."""
+    days, values = series
+    index = RangeIndex.from_arrays('TEST', days, values)
+    rng = np.random.default_rng(1)
+    span = int((days[-1] - days[0]).astype(int))
+    for _ in range(200):
+        start, end = np.sort(days[0] + rng.integers(-10, span + 10, size=2))
+        i, j = _as_of(days, start), _as_of(days, end)
+        in_range = (days >= start) & (days <= end)
+
+        expected_change = None if i < 0 else (values[j] / values[i] - 1) * 100
+        assert index.change(start, end) == pytest.approx(expected_change)
+        assert index.count(start, end) == in_range.sum()
+        if in_range.any():
+            assert index.average(start, end) == pytest.approx(values[in_range].mean())
+            assert index.geometric_average(start, end) == pytest.approx(np.exp(np.log(values[in_range]).mean()))
+        else:
+            assert index.average(start, end) is None
+
+    years = span / 365.25
+    assert index.annualized_rate(days[0]) == pytest.approx(((values[-1] / values[0]) ** (1 / years) - 1) * 100)
+    assert index.value_at(days[0] - 1) is None
+
+def test_append_extends_index(series):
+    """Test appending in batches gives the same answers as building at once, and rejects old dates."""
+    days, values = series
+    index = RangeIndex('TEST')
+    for batch in np.array_split(np.arange(len(days)), 7):
+        index.append(days[batch], values[batch])
+    full = RangeIndex.from_arrays('TEST', days, values)
+    assert len(index) == len(full) == len(days)
+    assert index.summary('2021-03-01', '2022-06-30') == pytest.approx(full.summary('2021-03-01', '2022-06-30'))
+
+    with pytest.raises(RangeIndexError):
+        index.append(days[-1:], values[-1:])
+
+def test_geometric_average_skips_ranges_with_nonpositive_values():
+    """Test a range holding a non-positive value has no geometric mean but keeps its average."""
+    days = np.array(['2024-01-01', '2024-02-01', '2024-03-01'], dtype='datetime64[D]')
+    index = RangeIndex.from_arrays('TEST', days, np.array([2.0, -1.0, 8.0]))
+    assert index.geometric_average() is None
+    assert index.average() == pytest.approx(3.0)
+    assert index.geometric_average('2024-03-01') == pytest.approx(8.0)
@@ -0,0 +1,79 @@
+"""Tests for on-demand profiling."""
+
+import pytest
+
+from backend.core.config import AppConfig
+from backend.core.profiling import (
+    profile_job,
+    list_artifacts,
+    artifact_path,
+    is_profiling,
+    ProfilingError
+)
+
+@pytest.fixture(autouse=True)
+def profile_dir(tmp_path, monkeypatch):
+    """Store profiles in a temporary directory."""
+    monkeypatch.setattr(AppConfig, 'PROFILE_DIR', str(tmp_path))
+    monkeypatch.setattr(AppConfig, 'PROFILE_MAX_ARTIFACTS', 2)
+    return tmp_path
+
+def _work():
+    return sum(i * i for i in range(50000))
+
+@pytest.mark.parametrize('mode,extension', [('sampling', '.folded'), ('deterministic', '.prof')])
+def test_profile_job_stores_artifact(mode, extension):
+    """Test a profiled job leaves an artifact of the right format."""
+    with profile_job('ingest', mode) as session:
+        assert is_profiling()
+        _work()
+    assert not is_profiling()
+    assert session.artifact.endswith(extension)
+    assert [a['name'] for a in list_artifacts()] == [session.artifact]
+
+def test_nested_jobs_are_not_profiled_twice():
+    """Test an inner job inside a profiled request is not profiled again."""
+    with profile_job('outer', 'deterministic'):
+        with profile_job('inner') as inner:
+            assert inner is None
+    assert len(list_artifacts()) == 1
+
+def test_failed_start_does_not_block_later_profiles(monkeypatch):
+    """Test a profiler that fails to start leaves the thread free to profile again."""
+    from backend.core.profiling import DeterministicProfiler
+    def fail(self):
+        raise RuntimeError('profiler unavailable')
+    with monkeypatch.context() as patched:
+        patched.setattr(DeterministicProfiler, 'start', fail)
+        with pytest.raises(RuntimeError):
+            with profile_job('broken', 'deterministic'):
+                pass
+    assert not is_profiling()
+    with profile_job('next', 'deterministic') as session:
+        _work()
+    assert session.artifact is not None
+
+def test_artifacts_are_rotated():
+    """Test only the newest artifacts are kept."""
+    for _ in range(3):
+        with profile_job('job', 'deterministic'):
+            _work()
+    assert len(list_artifacts()) == 2
+
+def test_artifact_path_rejects_unsafe_names():
+    """Test artifact names cannot escape the profile directory."""
+    with pytest.raises(ProfilingError):
+        artifact_path('../fred_data.db')
+    with pytest.raises(FileNotFoundError):
+        artifact_path('missing.prof')
+
+def test_admin_token_with_non_ascii_characters(monkeypatch):
+    """Test admin tokens with non-ASCII characters are compared instead of raising."""
+    from flask import Flask
+    from backend.middleware.security import is_admin_request
+    monkeypatch.setattr(AppConfig, 'ADMIN_TOKEN', 'sécret')
+    app = Flask(__name__)
+    with app.test_request_context(headers={'X-Admin-Token': 'wrông'}):
+        assert not is_admin_request()
+    with app.test_request_context(headers={'X-Admin-Token': 'sécret'}):
+        assert is_admin_request()
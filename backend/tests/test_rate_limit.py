@@ -0,0 +1,51 @@
+"""Tests for the shared SQLite rate-limit storage."""
+
+import time
+import pytest
+
+from backend.core.rate_limit import SQLiteStorage
+
+@pytest.fixture
+def storage_uri(tmp_path):
+    """URI of a rate-limit database in a temporary directory."""
+    return f"sqlite:///{tmp_path / 'rate_limits.db'}"
+
+def test_incr_and_get(storage_uri):
+    """Test counters accumulate within a window."""
+    storage = SQLiteStorage(storage_uri)
+    assert storage.incr('key', 60) == 1
+    assert storage.incr('key', 60) == 2
+    assert storage.get('key') == 2
+    assert storage.get('missing') == 0
+
+def test_counters_shared_between_instances(storage_uri):
+    """Test separate storage instances (one per worker) share counters."""
+    first = SQLiteStorage(storage_uri)
+    second = SQLiteStorage(storage_uri)
+    first.incr('key', 60)
+    second.incr('key', 60)
+    assert first.get('key') == 2
+
+def test_cost_weighted_increment(storage_uri):
+    """Test expensive endpoints consume more of the budget."""
+    storage = SQLiteStorage(storage_uri)
+    assert storage.incr('key', 60, amount=5) == 5
+    assert storage.incr('key', 60) == 6
+
+def test_window_expiry(storage_uri):
+    """Test a new window starts once the previous one expires."""
+    storage = SQLiteStorage(storage_uri)
+    storage.incr('key', 1, amount=3)
+    time.sleep(1.1)
+    assert storage.get('key') == 0
+    assert storage.incr('key', 1) == 1
+
+def test_clear_and_reset(storage_uri):
+    """Test clearing a single key and resetting all counters."""
+    storage = SQLiteStorage(storage_uri)
+    storage.incr('a', 60)
+    storage.incr('b', 60)
+    storage.clear('a')
+    assert storage.get('a') == 0
+    assert storage.reset() == 1
+    assert storage.check()
@@ -0,0 +1,49 @@
+"""Tests for the read-only serving mode."""
+
+import pytest
+
+from backend.core.factory import create_app
+from backend.storage.snapshot import publish_snapshot
+
+@pytest.fixture
+def client(monkeypatch):
+    """Create a test client for a read-only app."""
+    from backend.core.config import AppConfig
+    # The limiter reads this when the app is created
+    monkeypatch.setattr(AppConfig, 'RATE_LIMIT_ENABLED', False)
+    app = create_app(read_only=True)
+    app.config['TESTING'] = True
+    with app.test_client() as client:
+        yield client
+
+def test_health_without_snapshot(client):
+    """Test health check reports unhealthy until a snapshot exists."""
+    response = client.get('/api/v1/health')
+    assert response.status_code == 503
+    assert response.get_json()['status'] == 'unhealthy'
+
+def test_data_served_from_snapshot(client, isolated_snapshot):
+    """Test inflation data is served from the published snapshot."""
+    response = client.get('/api/v1/inflation/data')
+    assert response.status_code == 503
+
+    publish_snapshot({'status': 'Success', 'metrics': {'cpi': {}}}, isolated_snapshot)
+    response = client.get('/api/v1/inflation/data')
+    assert response.status_code == 200
+    assert response.headers['X-Snapshot-Generation'] == '1'
+    assert response.get_json()['metrics'] == {'cpi': {}}
+
+    health = client.get('/api/v1/health').get_json()
+    assert health['services']['mode'] == 'read-only'
+    assert health['services']['snapshot_generation'] == 1
+
+@pytest.mark.parametrize('path', [
+    '/api/v1/inflation/initialize',
+    '/api/v1/inflation/update',
+    '/api/v1/inflation/backup'
+])
+def test_writes_rejected(client, path):
+    """Test write endpoints are rejected on read-only replicas."""
+    response = client.post(path)
+    assert response.status_code == 403
+    assert response.get_json()['status'] == 'Error'
@@ -0,0 +1,156 @@
+import pytest
+from datetime import date, datetime
+from unittest.mock import Mock, patch
+import pandas as pd
+from backend import database
+from backend.services import registry
+from backend.services.registry import SeriesSpec, is_due, last_release, load_registry, write_registered_series
+
+@pytest.mark.parametrize('rule, today, expected', [
+    ('daily', date(2024, 3, 5), date(2024, 3, 5)),
+    ('weekly:mon', date(2024, 3, 6), date(2024, 3, 4)),
+    ('weekly:mon', date(2024, 3, 4), date(2024, 3, 4)),
+    ('monthly:10', date(2024, 3, 12), date(2024, 3, 10)),
+    ('monthly:10', date(2024, 3, 9), date(2024, 2, 10)),
+    ('monthly:31', date(2024, 3, 15), date(2024, 2, 29)),
+    ('monthly:last-tue', date(2024, 3, 30), date(2024, 3, 26)),
+    ('monthly:last-tue', date(2024, 3, 25), date(2024, 2, 27)),
+    ('monthly:10+1', date(2024, 3, 12), date(2024, 3, 10)),
+])
+def test_last_release(rule, today, expected):
+    """Test release rules resolve to the latest release day on or before today."""
+    assert last_release(rule, today) == expected
+
+@pytest.mark.parametrize('rule, today, expected', [
+    ('daily', date(2024, 3, 5), date(2024, 3, 5)),
+    ('daily+1', date(2024, 3, 5), date(2024, 3, 4)),
+    ('weekly:mon', date(2024, 3, 6), date(2024, 3, 4)),
+    ('weekly:fri+1', date(2024, 3, 6), date(2024, 2, 19)),
+    ('monthly:10+1', date(2024, 3, 12), date(2024, 2, 1)),
+    ('monthly:10+1', date(2024, 3, 9), date(2024, 1, 1)),
+    ('monthly:last-tue+2', date(2024, 3, 30), date(2024, 1, 1)),
+])
+def test_published_period(rule, today, expected):
+    """Test the period a release publishes follows the rule's cadence and lag."""
+    assert registry.published_period(rule, today) == expected
+
+def test_is_due():
+    """Test a series is due until the period its latest release publishes is stored."""
+    spec = SeriesSpec('cpi', 'CPIAUCSL', release_rule='monthly:10+1')
+    assert is_due(spec, None, date(2024, 3, 12))
+    assert is_due(spec, datetime(2024, 1, 1), date(2024, 3, 12))
+    assert not is_due(spec, datetime(2024, 2, 1), date(2024, 3, 12))
+    assert not is_due(spec, datetime(2024, 2, 1), date(2024, 4, 9))
+    assert is_due(spec._replace(release_rule=None), datetime(2024, 3, 1), date(2024, 3, 12))
+
+def test_initialized_before_release_is_due():
+    """Test storing a series after its release day but before the release does not skip it."""
+    spec = SeriesSpec('cpi', 'CPIAUCSL', release_rule='monthly:10+1')
+    # Initialized on 2024-11-11 with September; October is released on the 13th
+    assert is_due(spec, datetime(2024, 9, 1), date(2024, 11, 11))
+    assert is_due(spec, datetime(2024, 9, 1), date(2024, 11, 12))
+    assert not is_due(spec, datetime(2024, 10, 1), date(2024, 11, 13))
+    assert not is_due(spec, datetime(2024, 10, 1), date(2024, 12, 9))
+
+def test_late_release_is_due_until_stored():
+    """Test a release later than its rule's day keeps the series due until it lands."""
+    spec = SeriesSpec('gas', 'GASREGW', release_rule='weekly:mon')
+    # Monday 2024-03-11 is delayed to Tuesday: Monday's update stores nothing new
+    assert is_due(spec, datetime(2024, 3, 4), date(2024, 3, 11))
+    assert is_due(spec, datetime(2024, 3, 4), date(2024, 3, 12))
+    assert not is_due(spec, datetime(2024, 3, 11), date(2024, 3, 12))
+
+def test_load_registry(scratch_db):
+    """Test the registry falls back to the built-in series and indexes registered ones."""
+    session = database.get_session()
+    try:
+        builtin = load_registry(session)
+        assert builtin.get('CPIAUCSL').release_rule == 'monthly:10+1'
+        assert builtin.by_name('gas').series_id == 'GASREGW'
+
+        write_registered_series(session, SeriesSpec(
+            'ppi', 'PPIACO', frequency='monthly', start_date=datetime(2024, 1, 1),
+            prompt_template='{date_context} {title} is at {current_value}', release_rule='monthly:11'
+        ))
+        session.commit()
+        loaded = load_registry(session)
+    finally:
+        session.close()
+    assert loaded.series_ids() == ['PPIACO']
+    assert 'PPIACO' in loaded and 'CPIAUCSL' not in loaded
+    assert loaded.by_name('ppi').start_date == datetime(2024, 1, 1)
+
+    with pytest.raises(ValueError):
+        registry.validate_spec(SeriesSpec('bad', 'BAD', release_rule='monthly:32'))
+    with pytest.raises(ValueError):
+        registry.validate_spec(SeriesSpec('bad', 'BAD', release_rule='monthly:10+x'))
+    with pytest.raises(ValueError):
+        registry.validate_spec(SeriesSpec('bad', 'BAD', prompt_template='{unknown_field}'))
+    with pytest.raises(ValueError):
+        registry.validate_spec(SeriesSpec('bad', 'BAD', prompt_template='{title:.2f}'))
+    registry.validate_spec(SeriesSpec('ok', 'OK', prompt_template='{current_value:.2f} ({percentage_change:+.1f}%)'))
+
+def test_unrenderable_prompt_skips_metric(register_series, mock_anthropic, mock_anthropic_response):
+    """Test a template that cannot be rendered for one metric skips it without stopping the others."""
+    from backend.services.data_analyzer import InflationAnalyzer
+    register_series({'cpi': 'CPIAUCSL', 'gas': 'GASREGW'}, prompt_template='{name} at {current_value:.2f}')
+    mock_anthropic.messages.create.return_value = mock_anthropic_response
+    with patch('backend.services.data_analyzer.anthropic.Anthropic', return_value=mock_anthropic):
+        analyzer = InflationAnalyzer()
+    with patch('backend.services.data_analyzer.get_session'), \
+            patch('backend.services.data_analyzer.store_series_analysis') as store:
+        analyzer.analyze_trends({
+            'cpi': {'series_id': 'CPIAUCSL', 'current_value': None},
+            'gas': {'series_id': 'GASREGW', 'current_value': 3.1},
+        })
+    prompts = [call.kwargs['messages'][0]['content'] for call in mock_anthropic.messages.create.call_args_list]
+    assert prompts == ['gas at 3.10']
+    assert store.call_args[0][1] == 'GASREGW'
+
+def _months_back(months: int) -> datetime:
+    today = date.today()
+    total = today.year * 12 + today.month - 1 - months
+    return datetime(total // 12, total % 12 + 1, 1)
+
+def _monthly(start: datetime, periods: int):
+    return pd.Series([300.0 + i for i in range(periods)], index=pd.date_range(start, periods=periods, freq='MS'))
+
+@pytest.fixture
+def monthly_fetcher(scratch_db, register_series, mock_fred_api_key):
+    """Fetcher updating one monthly series whose release publishes the previous month."""
+    from backend.services.data_fetcher import FREDDataFetcher
+    with patch('backend.services.data_fetcher.Fred'):
+        fetcher = FREDDataFetcher()
+    register_series({'cpi': 'CPIAUCSL'}, start_date=_months_back(3), release_rule='monthly:1+1')
+    fetcher._fetch_series_info = Mock(return_value=pd.Series({'title': 'CPI'}))
+    return fetcher
+
+def test_update_skips_series_not_due(monthly_fetcher):
+    """Test an update does not fetch a series once its latest release is stored."""
+    monthly_fetcher._fetch_series = Mock(return_value=_monthly(_months_back(3), 3))
+    assert monthly_fetcher.update_daily_data() == {'CPIAUCSL': 'new'}
+    assert monthly_fetcher.update_daily_data() == {'CPIAUCSL': 'not_due'}
+    assert monthly_fetcher._fetch_series.call_count == 1
+
+def test_update_ignores_release_rules_when_disabled(monthly_fetcher, monkeypatch):
+    """Test RELEASE_RULES_ENABLED=0 fetches a series whose latest release is stored."""
+    from backend.core.config import AppConfig
+    monkeypatch.setattr(AppConfig, 'RELEASE_RULES_ENABLED', False)
+    monthly_fetcher._fetch_series = Mock(return_value=_monthly(_months_back(3), 3))
+    assert monthly_fetcher.update_daily_data() == {'CPIAUCSL': 'new'}
+    monthly_fetcher._fetch_series = Mock(return_value=_monthly(_months_back(0), 1))
+    assert monthly_fetcher.update_daily_data() == {'CPIAUCSL': 'appended'}
+
+def test_update_fetches_release_missing_after_initialize(monthly_fetcher):
+    """Test a series initialized before its latest release landed is fetched until it does."""
+    monthly_fetcher._fetch_series = Mock(return_value=_monthly(_months_back(3), 2))
+    monthly_fetcher.fetch_and_store_historical_data()
+
+    # The release is late: nothing new yet, so the series stays due
+    monthly_fetcher._fetch_series = Mock(return_value=pd.Series(dtype=float))
+    assert monthly_fetcher.update_daily_data() == {'CPIAUCSL': 'empty'}
+
+    monthly_fetcher._fetch_series = Mock(return_value=_monthly(_months_back(1), 1))
+    assert monthly_fetcher.update_daily_data() == {'CPIAUCSL': 'appended'}
+    assert monthly_fetcher.update_daily_data() == {'CPIAUCSL': 'not_due'}
+    assert monthly_fetcher._fetch_series.call_count == 1
@@ -0,0 +1,69 @@
+"""Tests for the shared metrics snapshot."""
+
+import pytest
+
+from backend.storage.snapshot import (
+    SnapshotReader,
+    publish_snapshot,
+    current_generation,
+    HEADER_SIZE
+)
+
+@pytest.fixture
+def snapshot_path(tmp_path):
+    """Path for a snapshot file in a temporary directory."""
+    return str(tmp_path / 'metrics.snap')
+
+def test_read_missing_snapshot(snapshot_path):
+    """Test reading when nothing has been published."""
+    reader = SnapshotReader(snapshot_path)
+    assert reader.read() is None
+    assert reader.load() is None
+    assert current_generation(snapshot_path) == 0
+
+def test_publish_and_read(snapshot_path):
+    """Test a published document is served byte for byte."""
+    generation = publish_snapshot({'status': 'Success', 'metrics': {}}, snapshot_path)
+    assert generation == 1
+
+    snapshot = SnapshotReader(snapshot_path).read()
+    assert snapshot.generation == 1
+    assert bytes(snapshot.payload) == b'{"status":"Success","metrics":{}}'
+
+def test_reader_picks_up_new_generation(snapshot_path):
+    """Test readers switch to a newly published snapshot."""
+    reader = SnapshotReader(snapshot_path)
+    publish_snapshot({'value': 1}, snapshot_path)
+    first = reader.read()
+    assert reader.load() == {'value': 1}
+
+    publish_snapshot({'value': 2}, snapshot_path)
+    assert reader.read().generation == 2
+    assert reader.load() == {'value': 2}
+    # Views of the previous generation stay valid after the swap
+    assert bytes(first.payload) == b'{"value":1}'
+
+def test_publish_if_absent(snapshot_path):
+    """Test bootstrap publishing never overwrites an existing snapshot."""
+    assert publish_snapshot({'value': 1}, snapshot_path, if_absent=True) == 1
+    assert publish_snapshot({'value': 2}, snapshot_path, if_absent=True) == 0
+    assert SnapshotReader(snapshot_path).load() == {'value': 1}
+
+def test_corrupt_snapshot_is_ignored(snapshot_path):
+    """Test a snapshot with a bad checksum is not served."""
+    publish_snapshot({'value': 1}, snapshot_path)
+    with open(snapshot_path, 'r+b') as f:
+        f.seek(HEADER_SIZE)
+        f.write(b'X')
+    assert SnapshotReader(snapshot_path).read() is None
+
+def test_body_is_copied_once_per_snapshot(snapshot_path):
+    """Test the response bytes are reused until a new snapshot is mapped."""
+    reader = SnapshotReader(snapshot_path)
+    publish_snapshot({'value': 1}, snapshot_path)
+    body = reader.body(reader.read())
+    assert body == b'{"value":1}'
+    assert reader.body(reader.read()) is body
+
+    publish_snapshot({'value': 2}, snapshot_path)
+    assert reader.body(reader.read()) == b'{"value":2}'
@@ -0,0 +1,50 @@
+"""Tests for SQLite engine profiles."""
+
+from datetime import datetime
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+
+from backend import database
+from backend.storage.sqlite_engine import PROFILES, profile_from_env
+
+def test_profile_from_env(monkeypatch):
+    """Test a named profile with per-setting overrides."""
+    monkeypatch.setenv('SQLITE_PROFILE', 'legacy')
+    monkeypatch.setenv('SQLITE_BUSY_TIMEOUT_MS', '250')
+    profile = profile_from_env()
+    assert profile == PROFILES['legacy']._replace(busy_timeout_ms=250)
+    assert profile.shared_pool
+
+    monkeypatch.setenv('SQLITE_PROFILE', 'wal')
+    monkeypatch.setenv('SQLITE_SYNCHRONOUS', 'sometimes')
+    with pytest.raises(ValueError):
+        profile_from_env()
+
+def test_wal_profile_connections(scratch_db):
+    """Test writer pragmas and that reader connections cannot write."""
+    with database.engine.connect() as conn:
+        assert conn.execute(text('PRAGMA journal_mode')).scalar() == 'wal'
+        assert conn.execute(text('PRAGMA synchronous')).scalar() == 1
+    with database.read_engine.connect() as conn:
+        assert conn.execute(text('PRAGMA query_only')).scalar() == 1
+        with pytest.raises(OperationalError):
+            conn.execute(text("INSERT INTO fred_series (series_id) VALUES ('CPIAUCSL')"))
+
+def test_readers_do_not_wait_for_writer(scratch_db):
+    """Test reads see committed data while a write transaction is open."""
+    writer = database.get_session()
+    reader = database.get_read_session()
+    try:
+        database.bulk_store_series_data(writer, 'CPIAUCSL', [{'date': datetime(2024, 1, 1), 'value': 308.4}])
+        writer.commit()
+        database.bulk_store_series_data(writer, 'CPIAUCSL', [{'date': datetime(2024, 2, 1), 'value': 310.3}])
+        writer.flush()
+
+        assert [point.value for point in database.get_series_data(reader, 'CPIAUCSL')] == [308.4]
+        writer.commit()
+        reader.rollback()
+        assert len(database.get_series_data(reader, 'CPIAUCSL')) == 2
+    finally:
+        writer.close()
+        reader.close()
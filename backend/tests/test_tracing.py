@@ -0,0 +1,56 @@
+"""Tests for ingest span tracing."""
+
+import pytest
+
+from backend.core.config import AppConfig
+from backend.core.tracing import span, load_spans, critical_path, to_chrome_trace
+
+@pytest.fixture
+def trace_path(tmp_path, monkeypatch):
+    """Enable tracing with spans exported to a temporary file."""
+    path = str(tmp_path / 'spans.jsonl')
+    monkeypatch.setattr(AppConfig, 'TRACING_ENABLED', True)
+    monkeypatch.setattr(AppConfig, 'TRACE_EXPORT_PATH', path)
+    return path
+
+def test_disabled_tracing_exports_nothing(tmp_path, monkeypatch):
+    """Test spans are no-ops when tracing is disabled."""
+    path = tmp_path / 'spans.jsonl'
+    monkeypatch.setattr(AppConfig, 'TRACING_ENABLED', False)
+    monkeypatch.setattr(AppConfig, 'TRACE_EXPORT_PATH', str(path))
+    with span('update') as s:
+        s.set_attribute('ignored', True)
+    assert not path.exists()
+
+def test_nested_spans_share_trace(trace_path):
+    """Test child spans link to their parent within one trace."""
+    with span('update'):
+        with span('series', series_id='CPIAUCSL'):
+            pass
+
+    spans = {s['name']: s for s in load_spans(trace_path)}
+    assert spans['series']['parent_id'] == spans['update']['span_id']
+    assert spans['series']['trace_id'] == spans['update']['trace_id']
+    assert spans['series']['attributes'] == {'series_id': 'CPIAUCSL'}
+
+def test_failed_span_records_error(trace_path):
+    """Test exceptions mark the span as failed and propagate."""
+    with pytest.raises(ValueError):
+        with span('store'):
+            raise ValueError('boom')
+    assert load_spans(trace_path)[0]['status'] == 'error'
+
+def test_critical_path():
+    """Test the critical path follows the sequential chain of children."""
+    spans = [
+        {'trace_id': 't', 'span_id': 'root', 'parent_id': None, 'name': 'update',
+         'start': 0.0, 'duration_ms': 100.0, 'status': 'ok', 'attributes': {}},
+        {'trace_id': 't', 'span_id': 'a', 'parent_id': 'root', 'name': 'fetch',
+         'start': 0.0, 'duration_ms': 60.0, 'status': 'ok', 'attributes': {}},
+        {'trace_id': 't', 'span_id': 'b', 'parent_id': 'root', 'name': 'analyze',
+         'start': 0.06, 'duration_ms': 35.0, 'status': 'ok', 'attributes': {}},
+    ]
+    path = critical_path(spans)
+    assert [entry['name'] for entry in path] == ['update', 'fetch', 'analyze']
+    assert path[0]['self_ms'] == pytest.approx(5.0)
+    assert len(to_chrome_trace(spans)['traceEvents']) == 3
@@ -0,0 +1,66 @@
+"""Tests for the vintage (as-of) store."""
+
+from datetime import datetime
+import pytest
+
+from backend import database
+from backend.storage import compact, vintage
+
+def _points(values):
+    return [{'date': datetime(2024, month, 1), 'value': value} for month, value in values]
+
+@pytest.fixture
+def session(scratch_db):
+    """Session on an empty test database."""
+    session = database.get_session()
+    yield session
+    session.close()
+
+def test_snapshots_store_only_changes(session):
+    """Test unchanged values add no rows and revisions close the old value."""
+    first = vintage.record_vintage(session, 'CPIAUCSL', _points([(1, 308.4), (2, 310.3)]), datetime(2024, 3, 12))
+    second = vintage.record_vintage(session, 'CPIAUCSL', _points([(1, 308.4), (2, 310.3)]), datetime(2024, 3, 20))
+    third = vintage.record_vintage(
+        session, 'CPIAUCSL', _points([(1, 308.4), (2, 310.1), (3, 312.2)]), datetime(2024, 4, 10))
+    session.commit()
+
+    assert (len(first.added), len(second.added), second.unchanged) == (2, 0, 2)
+    assert third.revised == [{'date': datetime(2024, 2, 1), 'value': 310.1, 'previous': 310.3}]
+    assert vintage.stats(session)['CPIAUCSL'] == {'observations': 3, 'rows': 4, 'revisions': 1}
+
+    as_of = lambda day: [(compact.from_epoch_day(d).month, v) for d, v in vintage.as_of(session, 'CPIAUCSL', day)]
+    assert as_of(datetime(2024, 3, 1)) == []
+    assert as_of(datetime(2024, 4, 9)) == [(1, 308.4), (2, 310.3)]
+    assert as_of(datetime(2024, 4, 10)) == [(1, 308.4), (2, 310.1), (3, 312.2)]
+    assert vintage.history(session, 'CPIAUCSL', datetime(2024, 2, 1)) == [
+        (datetime(2024, 3, 12), datetime(2024, 4, 9), 310.3),
+        (datetime(2024, 4, 10), None, 310.1),
+    ]
+
+def test_load_releases_merges_repeats(session):
+    """Test a release history keeps one row per distinct value."""
+    stored = vintage.load_releases(session, 'GDP', [
+        (datetime(2013, 10, 1), datetime(2014, 1, 30), 17102.5),
+        (datetime(2013, 10, 1), datetime(2014, 2, 28), 17080.7),
+        (datetime(2013, 10, 1), datetime(2014, 3, 27), 17080.7),
+        (datetime(2014, 1, 1), datetime(2014, 4, 30), 17149.6),
+    ])
+    session.commit()
+
+    assert stored == 3
+    assert [value for _, value in vintage.as_of(session, 'GDP', datetime(2014, 2, 1))] == [17102.5]
+    assert [value for _, value in vintage.as_of(session, 'GDP', datetime(2014, 5, 1))] == [17080.7, 17149.6]
+
+@pytest.mark.parametrize('layout', database.STORAGE_LAYOUTS)
+def test_write_series_vintage_applies_revisions(session, monkeypatch, layout):
+    """Test revised values replace stored observations in either layout."""
+    monkeypatch.setattr(database, 'STORAGE_LAYOUT', layout)
+    database.init_db()
+    database.write_series_vintage(session, 'CPIAUCSL', _points([(1, 308.4), (2, 310.3)]), {}, datetime(2024, 3, 12))
+    changes = database.write_series_vintage(
+        session, 'CPIAUCSL', _points([(2, 310.1), (3, 312.2)]), {}, datetime(2024, 4, 10))
+    session.commit()
+
+    assert len(changes.revised) == len(changes.added) == 1
+    assert [point.value for point in database.get_series_data(session, 'CPIAUCSL')] == [308.4, 310.1, 312.2]
+    assert [point.value for point in database.get_series_as_of(session, 'CPIAUCSL', datetime(2024, 4, 1))] == [308.4, 310.3]
@@ -0,0 +1,89 @@
+"""Tests for the single-writer queue."""
+
+import sqlite3
+import threading
+from datetime import datetime
+import pytest
+
+from backend import database
+from backend.storage.write_queue import WriteQueue, WriteQueueClosed
+
+def _point(day: int):
+    return [{'date': datetime(2024, 1, day), 'value': float(day)}]
+
+def _store(session, series_id: str, day: int) -> int:
+    return database.bulk_store_series_data(session, series_id, _point(day))
+
+def _fail(session):
+    _store(session, 'CPIAUCSL', 28)
+    raise ValueError("rejected")
+
+@pytest.fixture
+def write_queue(scratch_db):
+    """Test write queue with a flush window long enough to group submissions."""
+    write_queue = WriteQueue(flush_interval=0.2)
+    yield write_queue
+    write_queue.close()
+
+def _stored_days(series_id: str):
+    session = database.get_session()
+    try:
+        return [point.date.day for point in database.get_series_data(session, series_id)]
+    finally:
+        session.close()
+
+def test_batches_share_a_transaction(write_queue):
+    """Test concurrent submissions resolve and commit in one flush."""
+    flushes = []
+    flush = write_queue._flush
+    write_queue._flush = lambda batches: flushes.append(len(batches)) or flush(batches)
+
+    futures = []
+    threads = [
+        threading.Thread(target=lambda day=day: futures.append(write_queue.submit(_store, 'CPIAUCSL', day)))
+        for day in range(1, 11)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert sorted(future.result(timeout=5) for future in futures) == [1] * 10
+    assert flushes == [10]
+    assert _stored_days('CPIAUCSL') == list(range(1, 11))
+
+def test_flush_commits_once(write_queue):
+    """Test batches of a flush are invisible to other connections until it commits."""
+    def visible_rows(session):
+        _store(session, 'CPIAUCSL', 2)
+        connection = sqlite3.connect(database.DB_PATH)
+        try:
+            return connection.execute("SELECT COUNT(*) FROM fred_data").fetchone()[0]
+        finally:
+            connection.close()
+
+    first = write_queue.submit(_store, 'CPIAUCSL', 1)
+    second = write_queue.submit(visible_rows)
+    assert first.result(timeout=5) == 1
+    assert second.result(timeout=5) == 0
+    assert _stored_days('CPIAUCSL') == [1, 2]
+
+def test_failed_batch_is_isolated(write_queue):
+    """Test a failing batch rolls back alone and reports its exception."""
+    first = write_queue.submit(_store, 'CPIAUCSL', 1)
+    failed = write_queue.submit(_fail)
+    last = write_queue.submit(_store, 'CPIAUCSL', 2)
+
+    assert first.result(timeout=5) == last.result(timeout=5) == 1
+    with pytest.raises(ValueError):
+        failed.result(timeout=5)
+    assert _stored_days('CPIAUCSL') == [1, 2]
+
+def test_close_flushes_and_rejects(write_queue):
+    """Test closing commits queued batches and refuses new ones."""
+    future = write_queue.submit(_store, 'UNRATE', 5)
+    write_queue.close()
+    assert future.done()
+    assert _stored_days('UNRATE') == [5]
+    with pytest.raises(WriteQueueClosed):
+        write_queue.submit(_store, 'UNRATE', 6)
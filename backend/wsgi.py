@@ -0,0 +1,35 @@
+"""
+WSGI entry point for production serving.
+
+Run with:
+    gunicorn -c backend/gunicorn.conf.py backend.wsgi:app
+
+The module is imported once in the gunicorn master (``preload_app``), so
+environment validation and schema creation happen before workers fork.
+Per-process state is reset in the ``post_fork`` hook of the gunicorn config.
+
+With ``READ_ONLY=1`` the replica serves only the shared metrics snapshot:
+no credentials are required and neither the services stack nor SQLAlchemy
+is imported.
+"""
+
+import logging
+from backend.core.config import init_environment, AppConfig
+from backend.core.factory import create_app
+from backend.core.structured_logging import configure_logging
+
+logger = logging.getLogger(__name__)
+
+configure_logging()
+
+if AppConfig.READ_ONLY:
+    init_environment(require_credentials=False)
+else:
+    from backend.database import init_db, dispose_engine
+
+    init_environment()
+    init_db()
+    # Connections opened by init_db must not leak into forked workers
+    dispose_engine()
+
+app = create_app()